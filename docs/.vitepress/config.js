@@ -112,6 +112,7 @@ export default defineConfig({
           { text: 'create', link: '/cli/create' },
           { text: 'enhance', link: '/cli/enhance' },
           { text: 'list', link: '/cli/list' },
+          { text: 'restore', link: '/cli/restore' },
           { text: 'setup-cicd', link: '/cli/setup_cicd' }
         ]
       },
@@ -12,23 +12,43 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import datetime
+import json
 import logging
 import os
 import pathlib
 import shutil
 import subprocess
+import sys
 import tempfile
+import time
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext, redirect_stdout
+from typing import TextIO
 
 import click
 from click.core import ParameterSource
 from rich.console import Console
 from rich.prompt import IntPrompt, Prompt
-
+from rich.table import Table
+
+from ..utils.archive import ARCHIVE_FORMATS, open_archive
+from ..utils.backup import (
+    create_snapshot,
+    get_backup_retention,
+    is_ignored,
+    prune_snapshots,
+)
 from ..utils.datastores import DATASTORE_TYPES, DATASTORES
-from ..utils.gcp import verify_credentials, verify_vertex_connection
+from ..utils.gcp import (
+    UNKNOWN_ACCOUNT,
+    is_vertex_connection_verified,
+    verify_credentials,
+    verify_vertex_connection,
+)
 from ..utils.logging import display_welcome_banner, handle_cli_error
+from ..utils.matrix import MatrixResult, expand_matrix, load_matrix_spec, run_matrix
+from ..utils.profiler import Profiler, phase, start_profiling, stop_profiling
 from ..utils.remote_template import (
     fetch_remote_template,
     get_base_template_name,
@@ -41,12 +61,14 @@ from ..utils.template import (
     get_deployment_targets,
     get_template_path,
     load_template_config,
+    plan_template,
     process_template,
     prompt_cicd_runner_selection,
     prompt_datastore_selection,
     prompt_deployment_target,
     prompt_session_type_selection,
 )
+from ..utils.version import get_current_version
 
 console = Console()
 
@@ -57,6 +79,23 @@ __all__ = ["create", "shared_template_options"]
 def shared_template_options(f: Callable) -> Callable:
     """Decorator to add shared options for template-based commands."""
     # Apply options in reverse order since decorators are applied bottom-up
+    f = click.option(
+        "--profile-output",
+        type=click.Path(dir_okay=False, path_type=pathlib.Path),
+        help="Also write the --profile timings as JSON to this file (implies --profile)",
+    )(f)
+    f = click.option(
+        "--plan",
+        is_flag=True,
+        help="Print the files that would be created, overwritten, preserved or deleted as JSON, without writing anything",
+        default=False,
+    )(f)
+    f = click.option(
+        "--profile",
+        is_flag=True,
+        help="Print how long each phase took, with file and byte counts of the copy steps",
+        default=False,
+    )(f)
     f = click.option(
         "-ag",
         "--agent-garden",
@@ -144,29 +183,9 @@ def get_standard_ignore_patterns() -> Callable[[str, list[str]], list[str]]:
     Returns:
         A callable that can be used with shutil.copytree's ignore parameter.
     """
-    exclude_dirs = {
-        ".git",
-        ".venv",
-        "venv",
-        "__pycache__",
-        ".pytest_cache",
-        "node_modules",
-        ".next",
-        "dist",
-        "build",
-        ".DS_Store",
-        ".vscode",
-        ".idea",
-        "*.egg-info",
-        ".mypy_cache",
-        ".coverage",
-        "htmlcov",
-        ".tox",
-        ".cache",
-    }
 
     def ignore_patterns(dir: str, files: list[str]) -> list[str]:
-        return [f for f in files if f in exclude_dirs or f.startswith(".backup_")]
+        return [f for f in files if is_ignored(f)]
 
     return ignore_patterns
 
@@ -226,6 +245,27 @@ def normalize_project_name(project_name: str) -> str:
     help="Template files directly into the current directory instead of creating a new project directory",
     default=False,
 )
+@click.option(
+    "--matrix",
+    type=click.Path(exists=True, dir_okay=False, path_type=pathlib.Path),
+    help="Generate one project per combination of a YAML or JSON matrix spec. PROJECT_NAME is used as the name prefix.",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    help="Worker processes for --matrix (default: number of CPUs)",
+)
+@click.option(
+    "--output-archive",
+    type=click.Path(dir_okay=False, allow_dash=True),
+    help="Write the project to a tar or zip archive instead of a directory. Use - for stdout.",
+)
+@click.option(
+    "--archive-format",
+    type=click.Choice(ARCHIVE_FORMATS),
+    help="Format of --output-archive (default: from the file name, tar.gz for stdout)",
+)
 @shared_template_options
 @handle_cli_error
 def create(
@@ -248,8 +288,60 @@ def create(
     base_template: str | None = None,
     skip_welcome: bool = False,
     cli_overrides: dict | None = None,
+    matrix: pathlib.Path | None = None,
+    jobs: int | None = None,
+    output_archive: str | None = None,
+    archive_format: str | None = None,
+    profile: bool = False,
+    profile_output: pathlib.Path | None = None,
+    plan: bool = False,
 ) -> None:
     """Create GCP-based AI agent projects from templates."""
+    if matrix:
+        conflicting = {
+            "--output-archive": output_archive,
+            "--plan": plan,
+            "--profile": profile or profile_output,
+            "--agent": agent,
+            "--deployment-target": deployment_target,
+            "--session-type": session_type,
+            "--datastore": datastore,
+            "--include-data-ingestion": include_data_ingestion,
+            "--in-folder": in_folder,
+            "--agent-directory": agent_directory,
+        }
+        used = [option for option, value in conflicting.items() if value]
+        if used:
+            raise click.UsageError(
+                f"{', '.join(used)} can't be combined with --matrix; "
+                "set them in the matrix spec instead."
+            )
+        if debug:
+            logging.basicConfig(level=logging.DEBUG)
+        explicit_region = (
+            ctx.get_parameter_source("region") == ParameterSource.COMMANDLINE
+        )
+        create_matrix(
+            matrix,
+            normalize_project_name(project_name),
+            pathlib.Path(output_dir) if output_dir else pathlib.Path.cwd(),
+            jobs=jobs,
+            cicd_runner=cicd_runner,
+            region=region if explicit_region else None,
+        )
+        return
+
+    if output_archive and (in_folder or plan):
+        raise click.UsageError(
+            "--output-archive can't be combined with --in-folder or --plan"
+        )
+    archive_stdout = None
+    if output_archive == "-":
+        archive_stdout = take_over_stdout(ctx).buffer
+    plan_stdout = take_over_stdout(ctx) if plan else None
+
+    profiler = Profiler() if profile or profile_output else None
+    profiler_token = start_profiling(profiler) if profiler else None
     try:
         console = Console()
 
@@ -281,31 +373,40 @@ def create(
             project_path = destination_dir
             # In-folder mode is permissive - we assume the user wants to enhance their existing repo
 
-            # Create backup of entire directory before in-folder templating
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_dir = project_path / f".backup_{project_path.name}_{timestamp}"
-
-            console.print("📦 [blue]Creating backup before modification...[/blue]")
+            # A plan only reads the directory, so it needs no backup
+            if not plan:
+                # Snapshot the directory before in-folder templating. Files that
+                # are unchanged since the previous snapshot are hardlinked to it.
+                console.print("📦 [blue]Creating backup before modification...[/blue]")
 
-            try:
-                shutil.copytree(
-                    project_path, backup_dir, ignore=get_standard_ignore_patterns()
-                )
-                console.print(f"Backup created: [cyan]{backup_dir.name}[/cyan]")
-            except Exception as e:
-                console.print(
-                    f"⚠️  [yellow]Warning: Could not create backup: {e}[/yellow]"
-                )
-                if not auto_approve:
-                    if not click.confirm("Continue without backup?", default=True):
-                        console.print("✋ [red]Operation cancelled.[/red]")
-                        return
+                try:
+                    with phase("backup"):
+                        snapshot = create_snapshot(project_path)
+                        pruned = prune_snapshots(project_path, get_backup_retention())
+                    console.print(
+                        f"Backup created: [cyan]{snapshot.path.name}[/cyan] "
+                        f"[dim]({snapshot.copied} files copied, {snapshot.linked} "
+                        "unchanged files linked to the previous backup)[/dim]"
+                    )
+                    if pruned:
+                        console.print(
+                            f"[dim]Removed {len(pruned)} old backup(s), keeping the "
+                            f"newest {get_backup_retention()}[/dim]"
+                        )
+                except Exception as e:
+                    console.print(
+                        f"⚠️  [yellow]Warning: Could not create backup: {e}[/yellow]"
+                    )
+                    if not auto_approve:
+                        if not click.confirm("Continue without backup?", default=True):
+                            console.print("✋ [red]Operation cancelled.[/red]")
+                            return
 
-            console.print()
+                console.print()
         else:
             # Check if project would exist in output directory
             project_path = destination_dir / project_name
-            if project_path.exists():
+            if not output_archive and project_path.exists():
                 console.print(
                     f"Error: Project directory '{project_path}' already exists",
                     style="bold red",
@@ -353,9 +454,10 @@ def create(
                         )
                     else:
                         console.print(f"Fetching remote template: {agent}")
-                    template_source_path, temp_dir_path = fetch_remote_template(
-                        remote_spec
-                    )
+                    with phase("fetch remote template"):
+                        template_source_path, temp_dir_path = fetch_remote_template(
+                            remote_spec
+                        )
                     temp_dir_to_clean = str(temp_dir_path)
                     selected_agent = f"remote_{hash(agent)}"  # Generate unique name for remote template
 
@@ -415,9 +517,10 @@ def create(
                         )
                     else:
                         console.print(f"Fetching remote template: {agent}")
-                    template_source_path, temp_dir_path = fetch_remote_template(
-                        remote_spec
-                    )
+                    with phase("fetch remote template"):
+                        template_source_path, temp_dir_path = fetch_remote_template(
+                            remote_spec
+                        )
                     temp_dir_to_clean = str(temp_dir_path)
                     final_agent = f"remote_{hash(agent)}"  # Generate unique name for remote template
 
@@ -625,16 +728,17 @@ def create(
         logging.debug("Setting up GCP...")
 
         creds_info = {}
-        if not skip_checks:
+        if not skip_checks and not plan:
             # Set up GCP environment
             try:
-                creds_info = setup_gcp_environment(
-                    auto_approve=auto_approve,
-                    skip_checks=skip_checks,
-                    region=region,
-                    debug=debug,
-                    agent_garden=agent_garden,
-                )
+                with phase("gcp checks"):
+                    creds_info = setup_gcp_environment(
+                        auto_approve=auto_approve,
+                        skip_checks=skip_checks,
+                        region=region,
+                        debug=debug,
+                        agent_garden=agent_garden,
+                    )
             except Exception as e:
                 if debug:
                     logging.warning(f"GCP environment setup failed: {e}")
@@ -660,7 +764,7 @@ def create(
             logging.debug(f"Processing template for project: {project_name}")
 
         # Create output directory if it doesn't exist
-        if not destination_dir.exists():
+        if not output_archive and not plan and not destination_dir.exists():
             destination_dir.mkdir(parents=True)
 
         if debug:
@@ -674,27 +778,45 @@ def create(
             final_cli_overrides["settings"]["agent_directory"] = agent_directory
 
         try:
+            template_options = {
+                "deployment_target": final_deployment,
+                "cicd_runner": final_cicd_runner,
+                "include_data_ingestion": include_data_ingestion,
+                "datastore": datastore,
+                "session_type": final_session_type,
+                "output_dir": destination_dir,
+                "remote_template_path": template_source_path,
+                "remote_config": config,
+                "in_folder": in_folder,
+                "cli_overrides": final_cli_overrides,
+                "agent_garden": agent_garden,
+                "region": region,
+            }
+            if plan_stdout is not None:
+                with phase("plan"):
+                    render_plan = plan_template(
+                        final_agent, template_path, project_name, **template_options
+                    )
+                json.dump(render_plan.to_dict(), plan_stdout, indent=2)
+                plan_stdout.write("\n")
+                return
+
             # Process template (handles both local and remote templates)
-            process_template(
-                final_agent,
-                template_path,
-                project_name,
-                deployment_target=final_deployment,
-                cicd_runner=final_cicd_runner,
-                include_data_ingestion=include_data_ingestion,
-                datastore=datastore,
-                session_type=final_session_type,
-                output_dir=destination_dir,
-                remote_template_path=template_source_path,
-                remote_config=config,
-                in_folder=in_folder,
-                cli_overrides=final_cli_overrides,
-                agent_garden=agent_garden,
+            archive_context = (
+                open_archive(
+                    archive_stdout or pathlib.Path(output_archive), archive_format
+                )
+                if output_archive
+                else nullcontext(None)
             )
-
-            # Replace region in all files if a different region was specified
-            if region != "us-central1":
-                replace_region_in_files(project_path, region, debug=debug)
+            with archive_context as archive, phase("process_template"):
+                apply_summary = process_template(
+                    final_agent,
+                    template_path,
+                    project_name,
+                    archive=archive,
+                    **template_options,
+                )
         finally:
             # Clean up the temporary directory if one was created
             if temp_dir_to_clean:
@@ -708,12 +830,21 @@ def create(
                         f"Failed to clean up temporary directory {temp_dir_to_clean}: {e}"
                     )
 
+        if output_archive:
+            console.print(
+                f"\n> Project archive written to "
+                f"{'stdout' if archive_stdout else output_archive}"
+            )
+            return
+
         if not in_folder:
             project_path = destination_dir / project_name
             cd_path = project_path if output_dir else project_name
         else:
             project_path = destination_dir
             cd_path = "."
+            if apply_summary is not None:
+                console.print(f"\n📝 Files: {apply_summary}")
 
         if include_data_ingestion:
             project_id = creds_info.get("project", "")
@@ -752,6 +883,125 @@ def create(
                 "An error occurred:"
             )  # This will print the full stack trace
         raise
+    finally:
+        if profiler is not None and profiler_token is not None:
+            stop_profiling(profiler_token)
+            report_profile(profiler, profile_output, agent=agent)
+
+
+def take_over_stdout(ctx: click.Context) -> TextIO:
+    """Send console output to stderr, keeping stdout for a plan or an archive.
+
+    Returns:
+        The original stdout
+    """
+    if "asp.stdout" not in ctx.meta:
+        ctx.meta["asp.stdout"] = sys.stdout
+        ctx.with_resource(redirect_stdout(sys.stderr))
+    return ctx.meta["asp.stdout"]
+
+
+def report_profile(
+    profiler: Profiler, output: pathlib.Path | None, **metadata: str | None
+) -> None:
+    """Print the --profile table and write it as JSON if requested."""
+    console.print()
+    console.print(profiler.table(title="create profile"))
+    if output is not None:
+        profiler.write_json(output, package_version=get_current_version(), **metadata)
+        console.print(f"Profile written to [cyan]{output}[/cyan]")
+
+
+def create_matrix(
+    spec_path: pathlib.Path,
+    name_prefix: str,
+    output_dir: pathlib.Path,
+    jobs: int | None = None,
+    cicd_runner: str | None = None,
+    region: str | None = None,
+) -> None:
+    """Generate every project of a matrix spec and print a timing table.
+
+    Args:
+        spec_path: YAML or JSON matrix spec
+        name_prefix: Prefix of the generated project names
+        output_dir: Directory the projects are created in
+        jobs: Worker processes, defaults to the number of CPUs
+        cicd_runner: CI/CD runner, unless the spec sets one
+        region: GCP region, unless the spec sets one
+    """
+    try:
+        spec = load_matrix_spec(spec_path)
+        if cicd_runner:
+            spec.setdefault("cicd_runner", cicd_runner)
+        if region:
+            spec.setdefault("region", region)
+        matrix_jobs = expand_matrix(spec, name_prefix)
+    except ValueError as e:
+        raise click.ClickException(str(e)) from e
+    if not matrix_jobs:
+        raise click.ClickException(f"Matrix spec {spec_path} has no combinations")
+
+    output_dir = output_dir.resolve()
+    existing = [
+        job.project_name
+        for job in matrix_jobs
+        if (output_dir / job.project_name).exists()
+    ]
+    if existing:
+        raise click.ClickException(
+            f"Project directories already exist in {output_dir}: {', '.join(existing)}"
+        )
+
+    console.print(
+        f"> Generating {len(matrix_jobs)} projects from [bold]{spec_path}[/] "
+        f"into [cyan]{output_dir}[/]"
+    )
+    start = time.perf_counter()
+    with console.status("Rendering projects...") as status:
+        done = 0
+
+        def on_result(result: MatrixResult) -> None:
+            nonlocal done
+            done += 1
+            status.update(f"Rendering projects... {done}/{len(matrix_jobs)}")
+
+        results = run_matrix(
+            matrix_jobs, output_dir, max_workers=jobs, on_result=on_result
+        )
+    elapsed = time.perf_counter() - start
+
+    table = Table(title="Matrix results")
+    table.add_column("Project")
+    table.add_column("Agent")
+    table.add_column("Target")
+    table.add_column("Session")
+    table.add_column("Datastore")
+    table.add_column("Time (s)", justify="right")
+    table.add_column("Status")
+    for result in results:
+        job = result.job
+        table.add_row(
+            job.project_name,
+            job.agent,
+            job.deployment_target,
+            job.session_type or "-",
+            job.datastore or "-",
+            f"{result.seconds:.2f}",
+            "[green]ok[/]" if result.ok else f"[red]{result.error}[/]",
+        )
+    console.print(table)
+
+    failed = [result for result in results if not result.ok]
+    console.print(
+        f"\n> {len(results) - len(failed)}/{len(results)} projects generated in "
+        f"{elapsed:.2f}s (sum of project times: "
+        f"{sum(result.seconds for result in results):.2f}s)"
+    )
+    if failed:
+        raise click.ClickException(
+            f"{len(failed)} of {len(results)} projects failed to generate"
+        )
 
 
 def prompt_region_confirmation(default_region: str = "us-central1") -> str:
@@ -803,7 +1053,7 @@ def display_agent_selection(deployment_target: str | None = None) -> str:
 def display_adk_samples_selection() -> str:
     """Display adk-samples agents and prompt for selection."""
 
-    from ..utils.remote_template import fetch_remote_template, parse_agent_spec
+    from ..utils.remote_template import get_adk_agents, parse_agent_spec
 
     console.print("\n> Fetching agents from [bold blue]google/adk-samples[/]...")
 
@@ -813,13 +1063,8 @@ def display_adk_samples_selection() -> str:
         if not spec:
             raise RuntimeError("Failed to parse adk-samples repository")
 
-        # Fetch the repository
-        repo_path, _ = fetch_remote_template(spec)
-
-        # Use shared ADK discovery function
-        from ..utils.remote_template import discover_adk_agents
-
-        adk_agents = discover_adk_agents(repo_path)
+        # Use the shared, cached ADK discovery
+        adk_agents = get_adk_agents(spec)
 
         if not adk_agents:
             console.print("No agents found in adk-samples repository", style="yellow")
@@ -877,34 +1122,41 @@ def set_gcp_project(project_id: str, set_quota_project: bool = True) -> None:
         project_id: The GCP project ID to set.
         set_quota_project: Whether to set the application default quota project.
     """
-    try:
-        subprocess.run(
-            ["gcloud", "config", "set", "project", project_id],
-            check=True,
-            capture_output=True,
-            text=True,
-        )
-    except subprocess.CalledProcessError as e:
-        console.print(f"\n> Error setting project to {project_id}:")
-        console.print(e.stderr)
-        raise
-
+    commands = {
+        f"\n> Error setting project to {project_id}:": [
+            "gcloud",
+            "config",
+            "set",
+            "project",
+            project_id,
+        ]
+    }
     if set_quota_project:
-        try:
-            subprocess.run(
-                [
-                    "gcloud",
-                    "auth",
-                    "application-default",
-                    "set-quota-project",
-                    project_id,
-                ],
+        commands["> Error setting application default quota project:"] = [
+            "gcloud",
+            "auth",
+            "application-default",
+            "set-quota-project",
+            project_id,
+        ]
+
+    # The two settings live in different files, so gcloud can set them at once
+    with ThreadPoolExecutor(max_workers=len(commands)) as executor:
+        futures = {
+            error: executor.submit(
+                subprocess.run,
+                command,
                 check=True,
                 capture_output=True,
                 text=True,
             )
+            for error, command in commands.items()
+        }
+    for error, future in futures.items():
+        try:
+            future.result()
         except subprocess.CalledProcessError as e:
-            console.print("> Error setting application default quota project:")
+            console.print(error)
             console.print(e.stderr)
             raise
 
@@ -940,7 +1192,8 @@ def setup_gcp_environment(
     # Verify current GCP credentials
     if debug:
         logging.debug("Verifying GCP credentials...")
-    creds_info = verify_credentials()
+    with phase("credentials"):
+        creds_info = verify_credentials()
     # Handle credential verification and project selection
     if not auto_approve:
         creds_info = _handle_credential_verification(creds_info)
@@ -949,20 +1202,52 @@ def setup_gcp_environment(
             console.print("> Skipping Vertex AI connection test", style="yellow")
         else:
             # Test Vertex AI connection
-            _test_vertex_ai_connection(
-                creds_info["project"], region, agent_garden=agent_garden
-            )
+            with phase("vertex ai"):
+                _test_vertex_ai_connection(
+                    creds_info["project"],
+                    region,
+                    agent_garden=agent_garden,
+                    account=_known_account(creds_info),
+                )
+    elif _known_account(creds_info) and is_vertex_connection_verified(
+        creds_info["account"],
+        creds_info["project"],
+        region,
+        "agent-garden" if agent_garden else None,
+    ):
+        # The project was set and verified by a recent run
+        console.print(
+            f"> ✓ Vertex AI connection in project {creds_info['project']} "
+            "was verified recently"
+        )
     else:
         # Even with auto_approve, we should still set the GCP project
-        set_gcp_project(creds_info["project"], set_quota_project=True)
+        with phase("set project"):
+            set_gcp_project(creds_info["project"], set_quota_project=True)
         # Test Vertex AI connection
-        _test_vertex_ai_connection(
-            creds_info["project"], region, agent_garden=agent_garden
-        )
+        with phase("vertex ai"):
+            _test_vertex_ai_connection(
+                creds_info["project"],
+                region,
+                agent_garden=agent_garden,
+                account=_known_account(creds_info),
+            )
 
     return creds_info
 
 
+def _known_account(creds_info: dict) -> str | None:
+    """Get the account of the credentials, or None if it couldn't be found.
+
+    Recent Vertex AI verifications are only reused for a known account, so
+    credentials of unknown accounts never share one.
+    """
+    account = creds_info.get("account")
+    if not account or account == UNKNOWN_ACCOUNT:
+        return None
+    return account
+
+
 def _handle_credential_verification(creds_info: dict) -> dict:
     """Handle verification of credentials and project selection.
 
@@ -1046,7 +1331,11 @@ def _handle_credential_verification(creds_info: dict) -> dict:
 
 
 def _test_vertex_ai_connection(
-    project_id: str, region: str, auto_approve: bool = False, agent_garden: bool = False
+    project_id: str,
+    region: str,
+    auto_approve: bool = False,
+    agent_garden: bool = False,
+    account: str | None = None,
 ) -> None:
     """Test connection to Vertex AI.
 
@@ -1055,6 +1344,7 @@ def _test_vertex_ai_connection(
         region: GCP region for deployment
         auto_approve: Whether to auto-approve API enablement
         agent_garden: Whether this deployment is from Agent Garden
+        account: Account of the credentials, to reuse a recent verification
     """
     console.print("> Testing GCP and Vertex AI Connection...")
     try:
@@ -1064,6 +1354,7 @@ def _test_vertex_ai_connection(
             location=region,
             auto_approve=auto_approve,
             context=context,
+            account=account,
         )
         console.print(
             f"> ✓ Successfully verified connection to Vertex AI in project {project_id}"
@@ -1076,112 +1367,3 @@ def _test_vertex_ai_connection(
             style="bold red",
         )
         raise
-
-
-def replace_region_in_files(
-    project_path: pathlib.Path, new_region: str, debug: bool = False
-) -> None:
-    """Replace all instances of 'us-central1' with the specified region in project files.
-    Also handles vertex_ai_search region mapping.
-
-    Args:
-        project_path: Path to the project directory
-        new_region: The new region to use
-        debug: Whether to enable debug logging
-    """
-    if debug:
-        logging.debug(
-            f"Replacing region 'us-central1' with '{new_region}' in {project_path}"
-        )
-
-    # Define allowed file extensions
-    allowed_extensions = {
-        ".md",
-        ".py",
-        ".tfvars",
-        ".yaml",
-        ".tf",
-        ".yml",
-        "Makefile",
-        "makefile",
-    }
-
-    # Skip directories that shouldn't be modified
-    skip_dirs = {".git", "__pycache__", "venv", ".venv", "node_modules"}
-
-    # Determine data_store_region region value
-    if new_region.startswith("us"):
-        data_store_region = "us"
-    elif new_region.startswith("europe"):
-        data_store_region = "eu"
-    else:
-        data_store_region = "global"
-
-    for file_path in project_path.rglob("*"):
-        # Skip directories and files with unwanted extensions
-        if (
-            file_path.is_dir()
-            or any(skip_dir in file_path.parts for skip_dir in skip_dirs)
-            or (
-                file_path.suffix not in allowed_extensions
-                and file_path.name not in allowed_extensions
-            )
-        ):
-            continue
-
-        try:
-            content = file_path.read_text()
-            modified = False
-
-            # Replace standard region references
-            if "us-central1" in content:
-                if debug:
-                    logging.debug(f"Replacing region in {file_path}")
-                content = content.replace("us-central1", new_region)
-                modified = True
-
-            # Replace data_store_region region if present (all variants)
-            if 'data_store_region = "us"' in content:
-                if debug:
-                    logging.debug(f"Replacing vertex_ai_search region in {file_path}")
-                content = content.replace(
-                    'data_store_region = "us"',
-                    f'data_store_region = "{data_store_region}"',
-                )
-                modified = True
-            elif 'data_store_region="us"' in content:
-                if debug:
-                    logging.debug(f"Replacing data_store_region in {file_path}")
-                content = content.replace(
-                    'data_store_region="us"', f'data_store_region="{data_store_region}"'
-                )
-                modified = True
-            elif 'data-store-region="us"' in content:
-                if debug:
-                    logging.debug(f"Replacing data-store-region in {file_path}")
-                content = content.replace(
-                    'data-store-region="us"', f'data-store-region="{data_store_region}"'
-                )
-                modified = True
-            elif "_DATA_STORE_REGION: us" in content:
-                if debug:
-                    logging.debug(f"Replacing _DATA_STORE_REGION in {file_path}")
-                content = content.replace(
-                    "_DATA_STORE_REGION: us", f"_DATA_STORE_REGION: {data_store_region}"
-                )
-                modified = True
-            elif '"DATA_STORE_REGION", "us"' in content:
-                if debug:
-                    logging.debug(f"Replacing DATA_STORE_REGION in {file_path}")
-                content = content.replace(
-                    '"DATA_STORE_REGION", "us"',
-                    f'"DATA_STORE_REGION", "{data_store_region}"',
-                )
-                modified = True
-
-            if modified:
-                file_path.write_text(content)
-
-        except UnicodeDecodeError:
-            # Skip files that can't be read as text
-            continue
@@ -31,6 +31,7 @@ from .create import (
     create,
     get_available_base_templates,
     shared_template_options,
+    take_over_stdout,
     validate_base_template,
 )
 
@@ -118,6 +119,9 @@ def enhance(
     agent_garden: bool,
     base_template: str | None,
     agent_directory: str | None,
+    profile: bool = False,
+    profile_output: pathlib.Path | None = None,
+    plan: bool = False,
 ) -> None:
     """Enhance your existing project with AI agent capabilities.
 
@@ -136,6 +140,9 @@ def enhance(
 
     The command will validate your project structure and provide guidance if needed.
     """
+    if plan:
+        # Keep stdout for the JSON plan
+        take_over_stdout(ctx)
 
     # Display welcome banner for enhance command
     display_welcome_banner(enhance_mode=True)
@@ -163,8 +170,8 @@ def enhance(
             f"Using current directory name as project name: {project_name}", style="dim"
         )
 
-    # Show confirmation prompt for enhancement unless auto-approved
-    if not auto_approve:
+    # Show confirmation prompt for enhancement unless auto-approved or planning
+    if not auto_approve and not plan:
         current_dir = pathlib.Path.cwd()
         console.print()
         console.print(
@@ -336,7 +343,7 @@ def enhance(
                 )
             console.print()
 
-            if not auto_approve:
+            if not auto_approve and not plan:
                 if not click.confirm(
                     f"Continue with enhancement despite missing /{final_agent_directory} folder?",
                     default=True,
@@ -384,4 +391,7 @@ def enhance(
         base_template=base_template,
         skip_welcome=True,  # Skip welcome message since enhance shows its own
         cli_overrides=final_cli_overrides if final_cli_overrides else None,
+        profile=profile,
+        profile_output=profile_output,
+        plan=plan,
     )
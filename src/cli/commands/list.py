@@ -14,7 +14,9 @@
 
 import logging
 import pathlib
+import shutil
 import sys
+from typing import Any
 
 import click
 
@@ -25,16 +27,17 @@ else:
 from rich.console import Console
 from rich.table import Table
 
-from ..utils.remote_template import fetch_remote_template, parse_agent_spec
+from ..utils.remote_template import (
+    fetch_remote_template,
+    get_adk_agents,
+    parse_agent_spec,
+)
 from ..utils.template import get_available_agents
 
 console = Console()
 
 
-def display_agents_from_path(
-    base_path: pathlib.Path, source_name: str, is_adk_samples: bool = False
-) -> None:
-    """Scans a directory and displays available agents."""
+def _agents_table(source_name: str) -> Table:
     table = Table(
         title=f"Available agents in [bold blue]{source_name}[/]",
         show_header=True,
@@ -43,76 +46,103 @@ def display_agents_from_path(
     table.add_column("Name", style="bold")
     table.add_column("Path", style="cyan")
     table.add_column("Description", style="dim")
+    return table
+
 
+def display_adk_agents(adk_agents: dict[int, dict[str, Any]], source_name: str) -> None:
+    """Displays agents discovered in an ADK samples repository."""
+    table = _agents_table(source_name)
+    for agent_info in adk_agents.values():
+        # Add indicator for inferred agents
+        name_with_indicator = agent_info["name"]
+        if not agent_info.get("has_explicit_config", True):
+            name_with_indicator += " *"
+
+        table.add_row(
+            name_with_indicator, f"/{agent_info['path']}", agent_info["description"]
+        )
+
+    if not adk_agents:
+        console.print(f"No agents found in {source_name}", style="yellow")
+    else:
+        # Show explanation for inferred agents at the top
+        from ..utils.remote_template import display_adk_caveat_if_needed
+
+        display_adk_caveat_if_needed(adk_agents)
+        console.print(table)
+
+
+def display_agents_from_path(
+    base_path: pathlib.Path, source_name: str, is_adk_samples: bool = False
+) -> None:
+    """Scans a directory and displays available agents."""
     if not base_path.is_dir():
         console.print(f"Directory not found: {base_path}", style="bold red")
         return
 
-    found_agents = False
-    adk_agents = {}
-
     if is_adk_samples:
         # For ADK samples, use the shared discovery function
         from ..utils.remote_template import discover_adk_agents
 
-        adk_agents = discover_adk_agents(base_path)
-
-        for agent_info in adk_agents.values():
-            # Add indicator for inferred agents
-            name_with_indicator = agent_info["name"]
-            if not agent_info.get("has_explicit_config", True):
-                name_with_indicator += " *"
+        display_adk_agents(discover_adk_agents(base_path), source_name)
+        return
 
-            table.add_row(
-                name_with_indicator, f"/{agent_info['path']}", agent_info["description"]
-            )
-            found_agents = True
-    else:
-        # Original logic for non-ADK sources: Search for pyproject.toml files with explicit config
-        for config_path in sorted(base_path.glob("**/pyproject.toml")):
-            try:
-                with open(config_path, "rb") as f:
-                    pyproject_data = tomllib.load(f)
+    table = _agents_table(source_name)
+    found_agents = False
+    # Search for pyproject.toml files with explicit config
+    for config_path in sorted(base_path.glob("**/pyproject.toml")):
+        try:
+            with open(config_path, "rb") as f:
+                pyproject_data = tomllib.load(f)
 
-                config = pyproject_data.get("tool", {}).get("agent-starter-pack", {})
+            config = pyproject_data.get("tool", {}).get("agent-starter-pack", {})
 
-                # Skip pyproject.toml files that don't have agent-starter-pack config
-                if not config:
-                    continue
+            # Skip pyproject.toml files that don't have agent-starter-pack config
+            if not config:
+                continue
 
-                template_root = config_path.parent
+            template_root = config_path.parent
 
-                # Use fallbacks to [project] section if needed
-                project_info = pyproject_data.get("project", {})
-                agent_name = (
-                    config.get("name") or project_info.get("name") or template_root.name
-                )
-                description = (
-                    config.get("description") or project_info.get("description") or ""
-                )
+            # Use fallbacks to [project] section if needed
+            project_info = pyproject_data.get("project", {})
+            agent_name = (
+                config.get("name") or project_info.get("name") or template_root.name
+            )
+            description = (
+                config.get("description") or project_info.get("description") or ""
+            )
 
-                # Display the agent's path relative to the scanned directory
-                relative_path = template_root.relative_to(base_path)
+            # Display the agent's path relative to the scanned directory
+            relative_path = template_root.relative_to(base_path)
 
-                table.add_row(agent_name, f"/{relative_path}", description)
-                found_agents = True
+            table.add_row(agent_name, f"/{relative_path}", description)
+            found_agents = True
 
-            except Exception as e:
-                logging.warning(f"Could not load agent from {config_path.parent}: {e}")
+        except Exception as e:
+            logging.warning(f"Could not load agent from {config_path.parent}: {e}")
 
     if not found_agents:
         console.print(f"No agents found in {source_name}", style="yellow")
     else:
-        # Show explanation for inferred agents at the top (only for ADK samples)
-        if is_adk_samples:
-            from ..utils.remote_template import display_adk_caveat_if_needed
+        console.print(table)
 
-            display_adk_caveat_if_needed(adk_agents)
 
-        console.print(table)
+def list_adk_agents(remote_source: str) -> None:
+    """Lists agents from an ADK samples repository, using the manifest cache."""
+    spec = parse_agent_spec(remote_source)
+    if not spec:
+        console.print(f"Invalid remote source: {remote_source}", style="bold red")
+        return
+
+    console.print(f"\nFetching agents from [bold blue]{remote_source}[/]...")
 
+    try:
+        display_adk_agents(get_adk_agents(spec), remote_source)
+    except RuntimeError as e:
+        console.print(f"Error: {e}", style="bold red")
 
-def list_remote_agents(remote_source: str, scan_from_root: bool = False) -> None:
+
+def list_remote_agents(remote_source: str) -> None:
     """Lists agents from a remote source (Git URL)."""
     spec = parse_agent_spec(remote_source)
     if not spec:
@@ -121,14 +151,12 @@ def list_remote_agents(remote_source: str, scan_from_root: bool = False) -> None
 
     console.print(f"\nFetching agents from [bold blue]{remote_source}[/]...")
 
+    temp_dir = None
     try:
-        # fetch_remote_template clones the repo and returns a path to the
-        # specific template directory within the repo.
-        template_dir_path = fetch_remote_template(spec)
-
-        # fetch_remote_template always returns a tuple of (repo_path, template_path)
-        repo_path, template_path = template_dir_path
-        scan_path = repo_path if scan_from_root else template_path
+        # fetch_remote_template clones the repo and returns a tuple of
+        # (repo_path, template_path) for the template directory within it.
+        _, template_path = fetch_remote_template(spec)
+        temp_dir = template_path
 
         # Check if this is ADK samples to enable inference
         is_adk_samples = (
@@ -136,11 +164,14 @@ def list_remote_agents(remote_source: str, scan_from_root: bool = False) -> None
         )
 
         display_agents_from_path(
-            scan_path, remote_source, is_adk_samples=is_adk_samples
+            template_path, remote_source, is_adk_samples=is_adk_samples
         )
 
     except (RuntimeError, FileNotFoundError) as e:
         console.print(f"Error: {e}", style="bold red")
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
 
 
 @click.command("list")
@@ -167,7 +198,7 @@ def list_agents(adk: bool, source: str | None) -> None:
         return
 
     if adk:
-        list_remote_agents("https://github.com/google/adk-samples", scan_from_root=True)
+        list_adk_agents("https://github.com/google/adk-samples")
         return
 
     if source:
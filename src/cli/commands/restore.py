@@ -0,0 +1,109 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pathlib
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from ..utils.backup import list_snapshots, prune_snapshots, restore_snapshot
+
+console = Console()
+
+
+def display_snapshots(snapshots: list[pathlib.Path]) -> None:
+    """Displays the backups of a project, newest first."""
+    table = Table(title="Backups", show_header=True, header_style="bold magenta")
+    table.add_column("Name", style="bold")
+    table.add_column("Files", justify="right")
+    for snapshot in reversed(snapshots):
+        files = sum(1 for path in snapshot.rglob("*") if not path.is_dir())
+        table.add_row(snapshot.name, str(files))
+    console.print(table)
+
+
+@click.command()
+@click.argument("backup", required=False)
+@click.option(
+    "--dir",
+    "-d",
+    "project_dir",
+    type=click.Path(file_okay=False, exists=True, path_type=pathlib.Path),
+    default=".",
+    help="Project directory holding the backups (defaults to the current directory)",
+)
+@click.option("--list", "list_only", is_flag=True, help="List backups and exit.")
+@click.option(
+    "--delete",
+    is_flag=True,
+    help="Also delete files that aren't in the backup, such as files added by enhance.",
+)
+@click.option(
+    "--keep",
+    type=click.IntRange(min=1),
+    help="Delete all but the newest KEEP backups and exit.",
+)
+@click.option("--auto-approve", is_flag=True, help="Skip the confirmation prompt.")
+def restore(
+    backup: str | None,
+    project_dir: pathlib.Path,
+    list_only: bool,
+    delete: bool,
+    keep: int | None,
+    auto_approve: bool,
+) -> None:
+    """Restore a project from a backup taken by --in-folder or enhance.
+
+    BACKUP is the name of a .backup_* directory; defaults to the newest one.
+    """
+    project_dir = project_dir.resolve()
+    snapshots = list_snapshots(project_dir)
+    if not snapshots:
+        raise click.ClickException(f"No backups found in {project_dir}")
+
+    if list_only:
+        display_snapshots(snapshots)
+        return
+
+    if keep is not None:
+        pruned = prune_snapshots(project_dir, keep)
+        console.print(
+            f"Removed {len(pruned)} backup(s), kept {len(snapshots) - len(pruned)}"
+        )
+        return
+
+    if backup:
+        matches = [s for s in snapshots if s.name == pathlib.Path(backup).name]
+        if not matches:
+            raise click.ClickException(
+                f"Backup '{backup}' not found, use --list to see available backups"
+            )
+        snapshot = matches[0]
+    else:
+        snapshot = snapshots[-1]
+
+    prompt = f"Restore {project_dir} from {snapshot.name}?"
+    if delete:
+        prompt += " Files added since the backup will be deleted."
+    if not auto_approve and not click.confirm(prompt, default=False):
+        console.print("✋ [red]Restore cancelled.[/red]")
+        return
+
+    result = restore_snapshot(snapshot, project_dir, delete=delete)
+    console.print(
+        f"✅ Restored [cyan]{snapshot.name}[/cyan]: {result.restored} files restored, "
+        f"{result.unchanged} unchanged"
+        + (f", {result.removed} deleted" if delete else "")
+    )
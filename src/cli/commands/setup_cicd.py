@@ -31,6 +31,8 @@ from src.cli.utils.cicd import (
     is_github_authenticated,
     run_command,
 )
+from src.cli.utils.profiler import Profiler, profiling
+from src.cli.utils.terraform import TerraformStage, run_stages
 
 console = Console()
 
@@ -689,16 +691,18 @@ def setup_cicd(
 
     console.print("\n📦 Starting CI/CD Infrastructure Setup", style="bold blue")
     console.print("=====================================")
+    profiler = Profiler()
 
     # Setup Terraform backend if not using local state
     if not local_state:
         console.print("\n🔧 Setting up remote Terraform backend...")
-        setup_terraform_backend(
-            tf_dir=tf_dir,
-            project_id=cicd_project,
-            region=region,
-            repository_name=repository_name,
-        )
+        with profiler.phase("state backend"):
+            setup_terraform_backend(
+                tf_dir=tf_dir,
+                project_id=cicd_project,
+                region=region,
+                repository_name=repository_name,
+            )
         console.print("✅ Remote Terraform backend configured")
     else:
         console.print("\n📝 Using local Terraform state (remote backend disabled)")
@@ -753,36 +757,6 @@ def setup_cicd(
                 f.write(f'dev_project_id = "{dev_project}"\n')
             console.print("✅ Updated dev env.tfvars")
 
-    # Apply dev Terraform if dev project is provided
-    if dev_project:
-        dev_tf_dir = tf_dir / "dev"
-        if dev_tf_dir.exists():
-            console.print("\n🏗️ Applying dev Terraform configuration...")
-            if local_state:
-                run_command(["terraform", "init", "-backend=false"], cwd=dev_tf_dir)
-            else:
-                run_command(["terraform", "init"], cwd=dev_tf_dir)
-            run_command(
-                [
-                    "terraform",
-                    "apply",
-                    "-auto-approve",
-                    "--var-file",
-                    "vars/env.tfvars",
-                ],
-                cwd=dev_tf_dir,
-            )
-            console.print("✅ Dev environment deployed")
-        else:
-            console.print("ℹ️ No dev Terraform directory found")
-
-    # Apply prod Terraform
-    console.print("\n🚀 Applying prod Terraform configuration...")
-    if local_state:
-        run_command(["terraform", "init", "-backend=false"], cwd=tf_dir)
-    else:
-        run_command(["terraform", "init"], cwd=tf_dir)
-
     # Prepare environment variables for Terraform
     terraform_env_vars = {}
     if (
@@ -794,11 +768,34 @@ def setup_cicd(
             github_pat  # For GitHub provider authentication
         )
 
-    run_command(
-        ["terraform", "apply", "-auto-approve", "--var-file", "vars/env.tfvars"],
-        cwd=tf_dir,
-        env_vars=terraform_env_vars if terraform_env_vars else None,
+    # Dev and prod have separate state, so they are applied concurrently
+    stages = []
+    if dev_project:
+        dev_tf_dir = tf_dir / "dev"
+        if dev_tf_dir.exists():
+            stages.append(TerraformStage("dev", dev_tf_dir, local_state=local_state))
+        else:
+            console.print("ℹ️ No dev Terraform directory found")
+    stages.append(
+        TerraformStage(
+            "prod",
+            tf_dir,
+            local_state=local_state,
+            env_vars=terraform_env_vars if terraform_env_vars else None,
+        )
     )
+
+    console.print(
+        f"\n🚀 Applying {' and '.join(stage.name for stage in stages)} "
+        "Terraform configuration..."
+    )
+    with profiling(profiler):
+        try:
+            run_stages(stages, run_command)
+        finally:
+            console.print(profiler.table("Terraform setup"))
+    if len(stages) > 1:
+        console.print("✅ Dev environment deployed")
     console.print("✅ Prod/Staging infrastructure deployed")
 
     config = ProjectConfig(
@@ -12,19 +12,50 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import importlib
 import importlib.metadata
 
 import click
 from rich.console import Console
 
-from .commands.create import create
-from .commands.enhance import enhance
-from .commands.list import list_agents
-from .commands.setup_cicd import setup_cicd
-from .utils import display_update_message
-
 console = Console()
 
+# Command name -> "module:attribute". Command modules pull in cookiecutter, the
+# Google Cloud client libraries and backoff, so they are only imported when
+# the command is actually invoked (or its help is shown).
+LAZY_COMMANDS = {
+    "create": "src.cli.commands.create:create",
+    "enhance": "src.cli.commands.enhance:enhance",
+    "list": "src.cli.commands.list:list_agents",
+    "restore": "src.cli.commands.restore:restore",
+    "setup-cicd": "src.cli.commands.setup_cicd:setup_cicd",
+}
+
+
+class LazyGroup(click.Group):
+    """Click group that imports its commands on first use."""
+
+    def __init__(
+        self,
+        *args: object,
+        lazy_commands: dict[str, str] | None = None,
+        **kwargs: object,
+    ):
+        super().__init__(*args, **kwargs)  # type: ignore[arg-type]
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name in self.lazy_commands and cmd_name not in self.commands:
+            module_name, attr = self.lazy_commands[cmd_name].split(":")
+            command = getattr(importlib.import_module(module_name), attr)
+            if not isinstance(command, click.Command):
+                raise TypeError(f"{self.lazy_commands[cmd_name]} is not a command")
+            self.add_command(command, name=cmd_name)
+        return super().get_command(ctx, cmd_name)
+
 
 def print_version(ctx: click.Context, param: click.Parameter, value: bool) -> None:
     if not value or ctx.resilient_parsing:
@@ -37,7 +68,11 @@ def print_version(ctx: click.Context, param: click.Parameter, value: bool) -> No
     ctx.exit()
 
 
-@click.group(help="Production-ready Generative AI Agent templates for Google Cloud")
+@click.group(
+    cls=LazyGroup,
+    lazy_commands=LAZY_COMMANDS,
+    help="Production-ready Generative AI Agent templates for Google Cloud",
+)
 @click.option(
     "--version",
     "-v",
@@ -47,16 +82,14 @@ def print_version(ctx: click.Context, param: click.Parameter, value: bool) -> No
     is_eager=True,
     help="Show the version and exit.",
 )
-def cli() -> None:
-    # Check for updates at startup
-    display_update_message()
-
+@click.pass_context
+def cli(ctx: click.Context) -> None:
+    from .utils.version import display_update_message, start_update_check
 
-# Register commands
-cli.add_command(create)
-cli.add_command(enhance)
-cli.add_command(setup_cicd)
-cli.add_command(list_agents, name="list")
+    # Check for updates in the background and report once the command is done
+    update_check = start_update_check()
+    if update_check is not None:
+        ctx.call_on_close(lambda: display_update_message(update_check))
 
 
 if __name__ == "__main__":
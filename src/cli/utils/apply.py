@@ -0,0 +1,252 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Content-aware writes of generated files into an existing directory.
+
+Each generated file is compared with the file it would replace (size first,
+then a content hash) and only written if it differs. Unchanged files keep
+their mtime, so re-applying a template to an up-to-date project doesn't
+invalidate Docker layer caches, pytest caches or IDE indexes.
+"""
+
+import hashlib
+import logging
+import os
+import pathlib
+import shutil
+import uuid
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+
+from .profiler import count, get_profiler
+from .region import RegionRewriter
+
+ADDED = "added"
+MODIFIED = "modified"
+UNCHANGED = "unchanged"
+REMOVED = "removed"
+
+_CHUNK_SIZE = 1 << 20
+
+
+def file_digest(path: pathlib.Path) -> str:
+    """Get the sha256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class ApplySummary:
+    """Paths, relative to the destination, by what happened to them."""
+
+    added: list[str] = field(default_factory=list)
+    modified: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+    def record(self, status: str, rel_path: str) -> None:
+        getattr(self, status).append(rel_path)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.modified or self.removed)
+
+    def __str__(self) -> str:
+        counts = [
+            f"{len(self.added)} added",
+            f"{len(self.modified)} modified",
+            f"{len(self.unchanged)} unchanged",
+        ]
+        if self.removed:
+            counts.append(f"{len(self.removed)} removed")
+        return ", ".join(counts)
+
+
+class ApplyEngine:
+    """Writes files below a destination directory only when they change.
+
+    Args:
+        root: Destination directory, paths in the summary are relative to it
+        rewriter: Region rewriter applied to copied files, if any
+    """
+
+    def __init__(self, root: pathlib.Path, rewriter: RegionRewriter | None = None):
+        self.root = root
+        self.rewriter = rewriter
+        self.summary = ApplySummary()
+
+    def _rel(self, path: pathlib.Path) -> str:
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def _record(self, status: str, dst: pathlib.Path) -> str:
+        rel_path = self._rel(dst)
+        self.summary.record(status, rel_path)
+        if status != UNCHANGED:
+            logging.debug(f"Apply: {status} {rel_path}")
+            if status != REMOVED and get_profiler() is not None:
+                count(files=1, bytes=dst.stat().st_size)
+        return status
+
+    @staticmethod
+    def _prepare(dst: pathlib.Path) -> str:
+        """Clear the way for writing dst and return its status."""
+        if dst.is_symlink() or dst.is_file():
+            dst.unlink()
+            return MODIFIED
+        if dst.is_dir():
+            shutil.rmtree(dst)
+            return MODIFIED
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        return ADDED
+
+    @staticmethod
+    def _same_mode(src: pathlib.Path, dst: pathlib.Path) -> bool:
+        return (src.stat().st_mode & 0o7777) == (dst.stat().st_mode & 0o7777)
+
+    def write_text(
+        self, dst: pathlib.Path, content: str, mode_from: pathlib.Path | None = None
+    ) -> str:
+        """Write text to dst unless it already has this content.
+
+        Args:
+            dst: File to write
+            content: Text to write
+            mode_from: File whose permission bits dst should have
+
+        Returns:
+            "added", "modified" or "unchanged"
+        """
+        if dst.is_file() and not dst.is_symlink():
+            try:
+                same = dst.read_text(encoding="utf-8") == content
+            except UnicodeDecodeError:
+                same = False
+            if same and (mode_from is None or self._same_mode(mode_from, dst)):
+                return self._record(UNCHANGED, dst)
+        status = self._prepare(dst)
+        dst.write_text(content, encoding="utf-8")
+        if mode_from is not None:
+            shutil.copymode(mode_from, dst)
+        return self._record(status, dst)
+
+    def write_chunks(self, dst: pathlib.Path, chunks: Iterable[str]) -> str:
+        """Stream text to dst unless it already has this content.
+
+        The text is written to a temporary file next to dst first, which then
+        replaces dst if the two differ.
+
+        Returns:
+            "added", "modified" or "unchanged"
+        """
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dst.with_name(f".{dst.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            if (
+                dst.is_file()
+                and not dst.is_symlink()
+                and tmp.stat().st_size == dst.stat().st_size
+                and file_digest(tmp) == file_digest(dst)
+            ):
+                return self._record(UNCHANGED, dst)
+            status = self._prepare(dst)
+            os.replace(tmp, dst)
+            return self._record(status, dst)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def copy_file(self, src: pathlib.Path, dst: pathlib.Path) -> str:
+        """Copy a file to dst unless dst already has the same content.
+
+        Returns:
+            "added", "modified" or "unchanged"
+        """
+        if self.rewriter is not None:
+            substituted = self.rewriter.rewrite_file(src)
+            if substituted is not None:
+                return self.write_text(dst, substituted, mode_from=src)
+
+        if (
+            dst.is_file()
+            and not dst.is_symlink()
+            and src.stat().st_size == dst.stat().st_size
+            and self._same_mode(src, dst)
+            and file_digest(src) == file_digest(dst)
+        ):
+            return self._record(UNCHANGED, dst)
+        status = self._prepare(dst)
+        shutil.copy2(src, dst)
+        return self._record(status, dst)
+
+    def copy_tree(
+        self,
+        src: pathlib.Path,
+        dst: pathlib.Path,
+        skip: Callable[[str], bool] | None = None,
+    ) -> None:
+        """Make dst a copy of src, only writing files that differ.
+
+        Files and directories in dst that aren't in src are removed.
+
+        Args:
+            src: Source directory
+            dst: Destination directory
+            skip: Names in src for which this returns True are not copied
+        """
+        if dst.is_symlink() or dst.is_file():
+            dst.unlink()
+            self._record(REMOVED, dst)
+        dst.mkdir(parents=True, exist_ok=True)
+
+        kept = set()
+        for item in sorted(src.iterdir()):
+            if skip is not None and skip(item.name):
+                continue
+            kept.add(item.name)
+            if item.is_dir():
+                self.copy_tree(item, dst / item.name, skip)
+            else:
+                self.copy_file(item, dst / item.name)
+
+        for existing in sorted(dst.iterdir()):
+            if existing.name in kept:
+                continue
+            if existing.is_dir() and not existing.is_symlink():
+                for path in sorted(existing.rglob("*")):
+                    if not path.is_dir() or path.is_symlink():
+                        self._record(REMOVED, path)
+                shutil.rmtree(existing)
+            else:
+                existing.unlink()
+                self._record(REMOVED, existing)
+
+    def apply(
+        self,
+        src: pathlib.Path,
+        dst: pathlib.Path,
+        skip: Callable[[str], bool] | None = None,
+    ) -> None:
+        """Apply a generated file or directory to dst."""
+        if src.is_dir():
+            self.copy_tree(src, dst, skip)
+        else:
+            self.copy_file(src, dst)
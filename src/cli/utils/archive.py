@@ -0,0 +1,200 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Streaming tar and zip output of generated projects.
+
+A project is written to the archive one entry at a time, and file contents
+are copied in chunks, so memory use doesn't grow with the size of the
+template. Tar archives are written in stream mode and zip archives with data
+descriptors, so the output can be a pipe or stdout rather than a seekable file.
+"""
+
+import io
+import logging
+import os
+import pathlib
+import shutil
+import stat
+import tarfile
+import uuid
+import zipfile
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from typing import BinaryIO
+
+from .profiler import count
+
+ARCHIVE_FORMATS = ["tar", "tar.gz", "zip"]
+DEFAULT_ARCHIVE_FORMAT = "tar.gz"
+
+_SUFFIXES = {".tar": "tar", ".tar.gz": "tar.gz", ".tgz": "tar.gz", ".zip": "zip"}
+_CHUNK_SIZE = 1 << 20
+
+
+def guess_archive_format(name: str) -> str:
+    """Get the archive format for a file name, defaulting to tar.gz."""
+    lowered = name.lower()
+    for suffix, archive_format in _SUFFIXES.items():
+        if lowered.endswith(suffix):
+            return archive_format
+    return DEFAULT_ARCHIVE_FORMAT
+
+
+class ArchiveWriter:
+    """Writes files and directories to a tar or zip stream."""
+
+    def __init__(self, stream: BinaryIO, archive_format: str = DEFAULT_ARCHIVE_FORMAT):
+        if archive_format not in ARCHIVE_FORMATS:
+            raise ValueError(
+                f"Unknown archive format '{archive_format}'. "
+                f"Available formats: {ARCHIVE_FORMATS}"
+            )
+        self.archive_format = archive_format
+        self._tar: tarfile.TarFile | None = None
+        self._zip: zipfile.ZipFile | None = None
+        if archive_format == "zip":
+            self._zip = zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED)
+        else:
+            mode = "w|gz" if archive_format == "tar.gz" else "w|"
+            self._tar = tarfile.open(fileobj=stream, mode=mode)
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Write the end of the archive; the stream itself stays open."""
+        if self._tar is not None:
+            self._tar.close()
+        if self._zip is not None:
+            self._zip.close()
+
+    def add_dir(self, path: pathlib.Path, arcname: str) -> None:
+        if self._tar is not None:
+            self._tar.addfile(self._tar.gettarinfo(path, arcname))
+        elif self._zip is not None:
+            self._zip.writestr(zipfile.ZipInfo.from_file(path, arcname), b"")
+
+    def add_symlink(self, path: pathlib.Path, arcname: str) -> None:
+        if self._tar is not None:
+            self._tar.addfile(self._tar.gettarinfo(path, arcname))
+        elif self._zip is not None:
+            # Zip has no portable symlinks, so the link target is stored
+            info = zipfile.ZipInfo.from_file(path, arcname)
+            info.external_attr = (stat.S_IFLNK | 0o777) << 16
+            self._zip.writestr(info, os.readlink(path))
+
+    def add_file(
+        self, path: pathlib.Path, arcname: str, content: bytes | None = None
+    ) -> None:
+        """Add a file, with its mode and mtime.
+
+        Args:
+            path: File to add
+            arcname: Name in the archive
+            content: Content to store instead of the file's own
+        """
+        if self._tar is not None:
+            info = self._tar.gettarinfo(path, arcname)
+            if content is not None:
+                info.size = len(content)
+                self._tar.addfile(info, io.BytesIO(content))
+            else:
+                with open(path, "rb") as f:
+                    self._tar.addfile(info, f)
+        elif self._zip is not None:
+            info = zipfile.ZipInfo.from_file(path, arcname)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with self._zip.open(info, "w") as out:
+                if content is not None:
+                    out.write(content)
+                else:
+                    with open(path, "rb") as f:
+                        shutil.copyfileobj(f, out, _CHUNK_SIZE)
+        count(
+            files=1,
+            bytes=len(content) if content is not None else path.stat().st_size,
+        )
+
+    def add_tree(
+        self,
+        root: pathlib.Path,
+        prefix: str,
+        rewrite: Callable[[pathlib.Path], str | None] | None = None,
+    ) -> None:
+        """Add a directory tree in sorted order, below prefix in the archive.
+
+        Args:
+            root: Directory to add
+            prefix: Archive path of root
+            rewrite: Returns the substituted text of a file, or None to store
+                the file as is
+        """
+        self.add_dir(root, prefix)
+        for dirpath, dirs, files in os.walk(root):
+            dirs.sort()
+            current = pathlib.Path(dirpath)
+            rel = current.relative_to(root).as_posix()
+            base = prefix if rel == "." else f"{prefix}/{rel}"
+            for name in sorted(files) + [d for d in dirs if (current / d).is_symlink()]:
+                path = current / name
+                arcname = f"{base}/{name}"
+                if path.is_symlink():
+                    self.add_symlink(path, arcname)
+                    continue
+                substituted = rewrite(path) if rewrite is not None else None
+                self.add_file(
+                    path,
+                    arcname,
+                    substituted.encode("utf-8") if substituted is not None else None,
+                )
+            for name in dirs:
+                if not (current / name).is_symlink():
+                    self.add_dir(current / name, f"{base}/{name}")
+            logging.debug(f"Archived {current}")
+
+
+@contextmanager
+def open_archive(
+    target: pathlib.Path | BinaryIO, archive_format: str | None = None
+) -> Generator[ArchiveWriter, None, None]:
+    """Open an archive on a stream, or on a file that appears only when complete.
+
+    A file is written under a temporary name next to it and renamed into
+    place once the archive is complete, so a failed render leaves nothing
+    behind.
+
+    Args:
+        target: File path or binary stream to write to
+        archive_format: One of ARCHIVE_FORMATS, guessed from the file name
+            (or the default for streams) if not given
+    """
+    if not isinstance(target, pathlib.Path):
+        with ArchiveWriter(target, archive_format or DEFAULT_ARCHIVE_FORMAT) as writer:
+            yield writer
+        target.flush()
+        return
+
+    archive_format = archive_format or guess_archive_format(target.name)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp, "wb") as stream:
+            with ArchiveWriter(stream, archive_format) as writer:
+                yield writer
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
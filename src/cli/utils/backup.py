@@ -0,0 +1,268 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Incremental snapshots of a project taken before in-folder templating.
+
+Snapshots live in `.backup_<name>_<timestamp>` directories inside the project.
+A file that hasn't changed (same size and mtime) since the previous snapshot
+is hardlinked to that snapshot's copy instead of being copied again, so
+repeated runs on a large repository only copy what changed. Snapshot files
+never share an inode with the working tree: new copies are reflinked when the
+filesystem supports it (copy-on-write) and copied otherwise, so editing the
+project can't modify a snapshot.
+"""
+
+import datetime
+import logging
+import os
+import pathlib
+import re
+import shutil
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from .copy_engine import copy_many
+
+BACKUP_PREFIX = ".backup_"
+BACKUP_RETENTION_ENV_VAR = "ASP_BACKUP_RETENTION"
+DEFAULT_BACKUP_RETENTION = 5
+
+# Names that are neither backed up nor restored
+IGNORED_NAMES = {
+    ".git",
+    ".venv",
+    "venv",
+    "__pycache__",
+    ".pytest_cache",
+    "node_modules",
+    ".next",
+    "dist",
+    "build",
+    ".DS_Store",
+    ".vscode",
+    ".idea",
+    "*.egg-info",
+    ".mypy_cache",
+    ".coverage",
+    "htmlcov",
+    ".tox",
+    ".cache",
+}
+
+_SNAPSHOT_NAME = re.compile(r"^\.backup_.+_(\d{8}_\d{6})(?:_(\d+))?$")
+
+
+def is_ignored(name: str) -> bool:
+    """Check whether a file or directory name is excluded from snapshots."""
+    return name in IGNORED_NAMES or name.startswith(BACKUP_PREFIX)
+
+
+@dataclass(frozen=True)
+class SnapshotResult:
+    """Outcome of taking a snapshot."""
+
+    path: pathlib.Path
+    copied: int
+    linked: int
+
+
+@dataclass(frozen=True)
+class RestoreResult:
+    """Outcome of restoring a snapshot."""
+
+    restored: int
+    unchanged: int
+    removed: int
+
+
+def list_snapshots(project_path: pathlib.Path) -> list[pathlib.Path]:
+    """List the snapshots of a project, oldest first."""
+    if not project_path.is_dir():
+        return []
+    snapshots = []
+    for path in project_path.iterdir():
+        match = _SNAPSHOT_NAME.match(path.name)
+        if match and path.is_dir():
+            snapshots.append(((match.group(1), int(match.group(2) or 1)), path))
+    return [path for _, path in sorted(snapshots)]
+
+
+def get_backup_retention() -> int:
+    """Number of snapshots to keep, from ASP_BACKUP_RETENTION (0 keeps all)."""
+    value = os.environ.get(BACKUP_RETENTION_ENV_VAR, "")
+    try:
+        return max(0, int(value)) if value else DEFAULT_BACKUP_RETENTION
+    except ValueError:
+        return DEFAULT_BACKUP_RETENTION
+
+
+def _walk(root: pathlib.Path) -> Iterator[tuple[str, bool]]:
+    """Yield (relative POSIX path, is_dir) for everything not ignored below root."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not is_ignored(d))
+        rel_dir = pathlib.Path(dirpath).relative_to(root)
+        for dirname in dirnames:
+            yield (rel_dir / dirname).as_posix(), True
+        for filename in sorted(filenames):
+            if not is_ignored(filename):
+                yield (rel_dir / filename).as_posix(), False
+
+
+def _unchanged(a: os.stat_result, b: os.stat_result) -> bool:
+    return (a.st_size, a.st_mtime_ns) == (b.st_size, b.st_mtime_ns)
+
+
+def create_snapshot(
+    project_path: pathlib.Path, now: datetime.datetime | None = None
+) -> SnapshotResult:
+    """Take a snapshot of a project, linking unchanged files to the last one.
+
+    The snapshot is assembled in a staging directory and renamed into place,
+    so an interrupted run never leaves a partial snapshot behind.
+
+    Args:
+        project_path: Project directory to snapshot
+        now: Time used in the snapshot name, defaults to the current time
+
+    Returns:
+        The snapshot path and how many files were copied and linked
+    """
+    snapshots = list_snapshots(project_path)
+    previous = snapshots[-1] if snapshots else None
+    timestamp = (now or datetime.datetime.now()).strftime("%Y%m%d_%H%M%S")
+    name = f"{BACKUP_PREFIX}{project_path.name}_{timestamp}"
+    snapshot = project_path / name
+    counter = 1
+    while snapshot.exists():
+        counter += 1
+        snapshot = project_path / f"{name}_{counter}"
+
+    staging = snapshot.with_name(f"{snapshot.name}.partial")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir()
+    to_copy = []
+    linked = 0
+    try:
+        for rel_path, is_dir in _walk(project_path):
+            src = project_path / rel_path
+            dst = staging / rel_path
+            if src.is_symlink():
+                os.symlink(os.readlink(src), dst)
+            elif is_dir:
+                dst.mkdir()
+            else:
+                prev = previous / rel_path if previous else None
+                try:
+                    if prev and _unchanged(prev.lstat(), src.stat()):
+                        os.link(prev, dst)
+                        linked += 1
+                        continue
+                except OSError:
+                    pass
+                to_copy.append((src, dst, True))
+        copy_many(to_copy)
+        staging.rename(snapshot)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    logging.debug(
+        f"Snapshot {snapshot.name}: copied {len(to_copy)} files, linked {linked}"
+    )
+    return SnapshotResult(snapshot, copied=len(to_copy), linked=linked)
+
+
+def prune_snapshots(project_path: pathlib.Path, keep: int) -> list[pathlib.Path]:
+    """Delete all but the newest snapshots of a project.
+
+    Args:
+        project_path: Project directory holding the snapshots
+        keep: Number of snapshots to keep, 0 keeps all of them
+
+    Returns:
+        The deleted snapshots
+    """
+    snapshots = list_snapshots(project_path)
+    if keep <= 0 or len(snapshots) <= keep:
+        return []
+    pruned = snapshots[:-keep]
+    for snapshot in pruned:
+        logging.debug(f"Pruning snapshot {snapshot.name}")
+        shutil.rmtree(snapshot, ignore_errors=True)
+    return pruned
+
+
+def restore_snapshot(
+    snapshot: pathlib.Path, project_path: pathlib.Path, delete: bool = False
+) -> RestoreResult:
+    """Restore the files of a snapshot into a project.
+
+    Files are written as new copies, never as links to the snapshot.
+
+    Args:
+        snapshot: Snapshot directory to restore
+        project_path: Project directory to restore into
+        delete: Also delete files that aren't in the snapshot (ignored names,
+            such as .git and .venv, are never deleted)
+
+    Returns:
+        How many files were restored, already up to date and deleted
+    """
+    snapshot_paths = set()
+    to_copy = []
+    relinked = unchanged = 0
+    for rel_path, is_dir in _walk(snapshot):
+        src = snapshot / rel_path
+        dst = project_path / rel_path
+        snapshot_paths.add(rel_path)
+        if is_dir and not src.is_symlink():
+            if dst.is_symlink() or (dst.exists() and not dst.is_dir()):
+                dst.unlink()
+            dst.mkdir(exist_ok=True)
+            continue
+        if dst.is_dir() and not dst.is_symlink():
+            shutil.rmtree(dst)
+        if src.is_symlink():
+            if dst.is_symlink() and os.readlink(dst) == os.readlink(src):
+                unchanged += 1
+                continue
+            dst.unlink(missing_ok=True)
+            os.symlink(os.readlink(src), dst)
+            relinked += 1
+        elif dst.is_file() and _unchanged(src.stat(), dst.stat()):
+            unchanged += 1
+            continue
+        else:
+            # Replace rather than overwrite, in case dst is linked elsewhere
+            dst.unlink(missing_ok=True)
+            to_copy.append((src, dst, True))
+    copy_many(to_copy)
+
+    removed = 0
+    if delete:
+        # Deepest paths first, so directories are empty by the time they're seen
+        for rel_path, is_dir in reversed(list(_walk(project_path))):
+            if rel_path in snapshot_paths:
+                continue
+            path = project_path / rel_path
+            if is_dir and not path.is_symlink():
+                if not any(path.iterdir()):
+                    path.rmdir()
+            else:
+                path.unlink()
+                removed += 1
+
+    return RestoreResult(
+        restored=len(to_copy) + relinked, unchanged=unchanged, removed=removed
+    )
@@ -0,0 +1,50 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Location and switches for the CLI's on-disk caches."""
+
+import os
+import pathlib
+
+CACHE_DIR_ENV_VAR = "ASP_CACHE_DIR"
+NO_CACHE_ENV_VAR = "ASP_NO_CACHE"
+
+
+def is_cache_enabled() -> bool:
+    """Return False when caching has been disabled through the environment."""
+    return os.environ.get(NO_CACHE_ENV_VAR, "").lower() not in ("1", "true", "yes")
+
+
+def get_cache_dir(*parts: str) -> pathlib.Path:
+    """Get (and create) a directory inside the user cache for this CLI.
+
+    Honours ASP_CACHE_DIR, then XDG_CACHE_HOME, and falls back to ~/.cache.
+
+    Args:
+        *parts: Optional sub-directory components below the cache root
+
+    Returns:
+        Path to the cache directory
+    """
+    root = os.environ.get(CACHE_DIR_ENV_VAR)
+    if root:
+        cache_dir = pathlib.Path(root)
+    else:
+        xdg_cache = os.environ.get("XDG_CACHE_HOME")
+        base = pathlib.Path(xdg_cache) if xdg_cache else pathlib.Path.home() / ".cache"
+        cache_dir = base / "agent-starter-pack"
+
+    cache_dir = cache_dir.joinpath(*parts)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
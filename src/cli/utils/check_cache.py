@@ -0,0 +1,96 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Short-lived cache of successful GCP environment checks.
+
+Looking up the account and testing the Vertex AI connection take gcloud calls
+and network round-trips, and their results rarely change between CLI runs in
+a shell session. Successful results are kept for ASP_CHECK_TTL seconds (15
+minutes by default) in the user cache, one small JSON file per check, named
+by a hash of the check's key such as (account, project, region). Setting
+ASP_CHECK_TTL to 0 or ASP_NO_CACHE disables the cache.
+"""
+
+import hashlib
+import json
+import os
+import time
+import uuid
+from typing import Any
+
+from .cache import get_cache_dir, is_cache_enabled
+
+CHECK_TTL_ENV_VAR = "ASP_CHECK_TTL"
+DEFAULT_CHECK_TTL = 15 * 60
+
+
+def get_check_ttl() -> float:
+    """Get how many seconds a successful check is reused for."""
+    if not is_cache_enabled():
+        return 0
+    try:
+        return max(float(os.environ.get(CHECK_TTL_ENV_VAR, DEFAULT_CHECK_TTL)), 0)
+    except ValueError:
+        return DEFAULT_CHECK_TTL
+
+
+def _entry_name(kind: str, key: tuple[str, ...]) -> str:
+    digest = hashlib.sha256(json.dumps([kind, *key]).encode()).hexdigest()
+    return f"{kind}-{digest[:32]}.json"
+
+
+def get_cached_check(kind: str, *key: str) -> dict[str, Any] | None:
+    """Get the result of a check that succeeded less than the TTL ago.
+
+    Args:
+        kind: Name of the check, such as "vertex"
+        *key: What the result depends on, such as account, project and region
+
+    Returns:
+        The stored result, or None if there is no fresh one
+    """
+    ttl = get_check_ttl()
+    if not ttl:
+        return None
+    path = get_cache_dir("checks") / _entry_name(kind, key)
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+        checked_at = float(entry["checked_at"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if not 0 <= time.time() - checked_at < ttl:
+        return None
+    return entry.get("result", {})
+
+
+def store_check(kind: str, *key: str, result: dict[str, Any] | None = None) -> None:
+    """Record a successful check.
+
+    Args:
+        kind: Name of the check
+        *key: What the result depends on
+        result: Values to return from get_cached_check, such as the account
+    """
+    if not get_check_ttl():
+        return
+    path = get_cache_dir("checks") / _entry_name(kind, key)
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        tmp.write_text(
+            json.dumps({"checked_at": time.time(), "result": result or {}}),
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
@@ -18,6 +18,7 @@ import json
 import re
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
@@ -27,6 +28,8 @@ import click
 from rich.console import Console
 from rich.prompt import IntPrompt, Prompt
 
+from .terraform import TerraformStage, run_stages
+
 console = Console()
 
 
@@ -306,88 +309,135 @@ def print_cicd_summary(
     )
 
 
-def ensure_apis_enabled(project_id: str, apis: list[str]) -> None:
+def get_enabled_services(project_id: str) -> set[str]:
+    """Get the names of all services enabled in a project, in one gcloud call."""
+    result = run_command(
+        [
+            "gcloud",
+            "services",
+            "list",
+            "--enabled",
+            f"--project={project_id}",
+            "--format=value(config.name)",
+        ],
+        capture_output=True,
+    )
+    return {line.strip() for line in result.stdout.splitlines() if line.strip()}
+
+
+def get_project_number(project_id: str) -> str:
+    """Get the number of a project."""
+    return run_command(
+        [
+            "gcloud",
+            "projects",
+            "describe",
+            project_id,
+            "--format=value(projectNumber)",
+        ],
+        capture_output=True,
+    ).stdout.strip()
+
+
+def wait_for_services(
+    project_id: str,
+    apis: list[str],
+    poll_interval: float = 2.0,
+    timeout: float = 120.0,
+) -> None:
+    """Poll the enabled services of a project until all of apis are listed.
+
+    Raises:
+        TimeoutError: If some of the APIs aren't reported enabled in time
+    """
+    deadline = time.monotonic() + timeout
+    pending = set(apis) - get_enabled_services(project_id)
+    while pending:
+        if time.monotonic() >= deadline:
+            raise TimeoutError(
+                f"APIs not enabled after {timeout:.0f}s: {', '.join(sorted(pending))}"
+            )
+        time.sleep(poll_interval)
+        pending -= get_enabled_services(project_id)
+
+
+def ensure_apis_enabled(
+    project_id: str,
+    apis: list[str],
+    poll_interval: float = 2.0,
+    timeout: float = 120.0,
+) -> None:
     """Check and enable required APIs and set up necessary permissions.
 
+    The enabled services are listed once and the missing APIs are enabled in
+    a single gcloud call, while the project number for the IAM binding is
+    looked up concurrently. Instead of a fixed delay, the enabled services are
+    then polled until every API is reported enabled.
+
     Args:
         project_id: GCP project ID where APIs should be enabled
         apis: List of API service names to check and enable
+        poll_interval: Seconds between checks of the enabled services
+        timeout: Seconds to wait for the APIs to be reported enabled
     """
     console.print("\n🔍 Checking required APIs...")
-    for api in apis:
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        project_number = executor.submit(get_project_number, project_id)
         try:
-            # Check if API is enabled
-            result = run_command(
-                [
-                    "gcloud",
-                    "services",
-                    "list",
-                    f"--project={project_id}",
-                    f"--filter=config.name:{api}",
-                    "--format=json",
-                ],
-                capture_output=True,
-            )
-
-            services = json.loads(result.stdout)
-            if not services:  # API not enabled
-                console.print(f"📡 Enabling {api}...")
+            enabled = get_enabled_services(project_id)
+            missing = [api for api in dict.fromkeys(apis) if api not in enabled]
+            for api in apis:
+                if api in enabled:
+                    console.print(f"✅ {api} already enabled")
+            if missing:
+                console.print(f"📡 Enabling {', '.join(missing)}...")
                 run_command(
-                    ["gcloud", "services", "enable", api, f"--project={project_id}"]
+                    [
+                        "gcloud",
+                        "services",
+                        "enable",
+                        *missing,
+                        f"--project={project_id}",
+                    ]
                 )
-                console.print(f"✅ Enabled {api}")
-            else:
-                console.print(f"✅ {api} already enabled")
+                # The Cloud Build service agent only exists once its API is on
+                wait_for_services(project_id, missing, poll_interval, timeout)
+                for api in missing:
+                    console.print(f"✅ Enabled {api}")
         except subprocess.CalledProcessError as e:
-            console.print(f"❌ Failed to check/enable {api}: {e!s}", style="bold red")
+            console.print(f"❌ Failed to check/enable APIs: {e!s}", style="bold red")
             raise
 
-    # Get the Cloud Build service account
-    console.print("\n🔑 Setting up service account permissions...")
-    try:
-        result = run_command(
-            ["gcloud", "projects", "get-iam-policy", project_id, "--format=json"],
-            capture_output=True,
-        )
-
-        project_number = run_command(
-            [
-                "gcloud",
-                "projects",
-                "describe",
-                project_id,
-                "--format=value(projectNumber)",
-            ],
-            capture_output=True,
-        ).stdout.strip()
-
-        cloudbuild_sa = (
-            f"service-{project_number}@gcp-sa-cloudbuild.iam.gserviceaccount.com"
-        )
-
-        # Grant Secret Manager Admin role to Cloud Build service account
-        console.print(f"📦 Granting Secret Manager Admin role to {cloudbuild_sa}...")
-        run_command(
-            [
-                "gcloud",
-                "projects",
-                "add-iam-policy-binding",
-                project_id,
-                f"--member=serviceAccount:{cloudbuild_sa}",
-                "--role=roles/secretmanager.admin",
-                "--condition=None",
-            ]
-        )
-        console.print("✅ Permissions granted to Cloud Build service account")
+        console.print("\n🔑 Setting up service account permissions...")
+        try:
+            cloudbuild_sa = (
+                f"service-{project_number.result()}"
+                "@gcp-sa-cloudbuild.iam.gserviceaccount.com"
+            )
 
-    except subprocess.CalledProcessError as e:
-        console.print(
-            f"❌ Failed to set up service account permissions: {e!s}", style="bold red"
-        )
-        raise
+            # Grant Secret Manager Admin role to Cloud Build service account
+            console.print(
+                f"📦 Granting Secret Manager Admin role to {cloudbuild_sa}..."
+            )
+            run_command(
+                [
+                    "gcloud",
+                    "projects",
+                    "add-iam-policy-binding",
+                    project_id,
+                    f"--member=serviceAccount:{cloudbuild_sa}",
+                    "--role=roles/secretmanager.admin",
+                    "--condition=None",
+                ]
+            )
+            console.print("✅ Permissions granted to Cloud Build service account")
 
-    # Add a small delay to allow API enablement and IAM changes to propagate
-    time.sleep(10)
+        except subprocess.CalledProcessError as e:
+            console.print(
+                f"❌ Failed to set up service account permissions: {e!s}",
+                style="bold red",
+            )
+            raise
 
 
 @backoff.on_exception(
@@ -407,13 +457,20 @@ def run_command(
     shell: bool = False,
     input: str | None = None,
     env_vars: dict[str, str] | None = None,
+    log_file: Path | None = None,
 ) -> subprocess.CompletedProcess:
-    """Run a command and display it to the user"""
+    """Run a command and display it to the user
+
+    With log_file, the output of the command is appended to that file instead
+    of going to the terminal, so that concurrent commands don't interleave.
+    """
     # Format command for display
     cmd_str = cmd if isinstance(cmd, str) else " ".join(cmd)
     print(f"\n🔄 Running command: {cmd_str}")
     if cwd:
         print(f"📂 In directory: {cwd}")
+    if log_file:
+        print(f"📝 Output in: {log_file}")
 
     # Prepare environment variables
     env = None
@@ -424,16 +481,23 @@ def run_command(
         env.update(env_vars)
 
     # Run the command
-    result = subprocess.run(
-        cmd,
-        check=check,
-        cwd=cwd,
-        capture_output=capture_output,
-        text=True,
-        shell=shell,
-        input=input,
-        env=env,
-    )
+    log = open(log_file, "a", encoding="utf-8") if log_file else None
+    try:
+        result = subprocess.run(
+            cmd,
+            check=check,
+            cwd=cwd,
+            capture_output=capture_output,
+            stdout=log,
+            stderr=subprocess.STDOUT if log else None,
+            text=True,
+            shell=shell,
+            input=input,
+            env=env,
+        )
+    finally:
+        if log:
+            log.close()
 
     # Display output if captured
     if capture_output and result.stdout:
@@ -701,35 +765,10 @@ class E2EDeployment:
         if not local_state:
             self.setup_terraform_state(project_dir, env)
 
-        # Determine which directories to process and their corresponding var files
-        tf_configs = []
-        if env == Environment.DEV:
-            tf_configs = [
-                (project_dir / "deployment" / "terraform" / "dev", "vars/env.tfvars")
-            ]
-        else:
-            # For prod/staging, we need both directories but with their own var files
-            tf_configs = [
-                (
-                    project_dir / "deployment" / "terraform",
-                    "vars/env.tfvars",
-                ),  # Prod vars
-                (
-                    project_dir / "deployment" / "terraform" / "dev",
-                    "vars/env.tfvars",
-                ),  # Dev vars
-            ]
-
-        # Initialize and apply Terraform for each directory
-        for tf_dir, var_file in tf_configs:
-            print(f"\n🔧 Initializing Terraform in {tf_dir}...")
-            if local_state:
-                run_command(["terraform", "init", "-backend=false"], cwd=tf_dir)
-            else:
-                run_command(["terraform", "init"], cwd=tf_dir)
-
-            print(f"\n🚀 Applying Terraform configuration in {tf_dir}...")
-            run_command(
-                ["terraform", "apply", f"-var-file={var_file}", "-auto-approve"],
-                cwd=tf_dir,
-            )
+        # Dev and prod/staging have separate state, so they are applied
+        # concurrently, each with its own var file
+        tf_root = project_dir / "deployment" / "terraform"
+        stages = [TerraformStage("dev", tf_root / "dev", local_state=local_state)]
+        if env != Environment.DEV:
+            stages.insert(0, TerraformStage("prod", tf_root, local_state=local_state))
+        run_stages(stages, run_command)
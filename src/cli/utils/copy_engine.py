@@ -0,0 +1,141 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Bulk file copy engine used when assembling projects.
+
+Copies run on a bounded thread pool. Files that are copied verbatim (matching
+the cookiecutter ``_copy_without_render`` patterns) are cloned with a reflink
+when the filesystem supports it, or hardlinked when the destination is a
+throwaway staging directory, falling back to ``shutil.copy2``.
+"""
+
+import errno
+import fnmatch
+import logging
+import os
+import pathlib
+import shutil
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+from .profiler import count, get_profiler
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+# Linux ioctl to share the extents of one file with another (btrfs, xfs, ...)
+FICLONE = 0x40049409
+
+COPY_MAX_WORKERS = min(16, (os.cpu_count() or 1) * 2)
+
+# Below this many files the thread pool costs more than it saves
+_PARALLEL_THRESHOLD = 8
+
+_reflink_supported = fcntl is not None
+
+
+def _reflink(src: pathlib.Path, dst: pathlib.Path) -> bool:
+    """Try to clone src into dst. Returns False if the filesystem can't."""
+    global _reflink_supported
+    if not _reflink_supported or fcntl is None:
+        return False
+    try:
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+    except OSError as e:
+        # EOPNOTSUPP/EINVAL/ENOTTY mean the filesystem never supports it, so
+        # stop trying. EXDEV only rules out this particular pair of paths.
+        if e.errno != errno.EXDEV:
+            _reflink_supported = False
+        return False
+    shutil.copystat(src, dst)
+    return True
+
+
+def copy_file(
+    src: pathlib.Path,
+    dst: pathlib.Path,
+    clone: bool = False,
+    allow_hardlink: bool = False,
+) -> str:
+    """Copy a single file, preferring cheap clones when allowed.
+
+    Args:
+        src: Source file
+        dst: Destination file (overwritten if it exists)
+        clone: Whether the file may be reflinked or hardlinked instead of copied
+        allow_hardlink: Whether dst may share an inode with src. Only safe when
+            nothing will modify dst in place (e.g. a staging directory).
+
+    Returns:
+        The method used: "reflink", "hardlink" or "copy"
+    """
+    if clone:
+        if _reflink(src, dst):
+            return "reflink"
+        if allow_hardlink:
+            try:
+                if dst.exists() or dst.is_symlink():
+                    dst.unlink()
+                os.link(src, dst)
+                return "hardlink"
+            except OSError:
+                pass
+    shutil.copy2(src, dst)
+    return "copy"
+
+
+def matches_any(rel_path: str, patterns: Iterable[str]) -> bool:
+    """Check a relative POSIX path against cookiecutter style fnmatch patterns."""
+    return any(pattern and fnmatch.fnmatch(rel_path, pattern) for pattern in patterns)
+
+
+def copy_many(
+    pairs: Iterable[tuple[pathlib.Path, pathlib.Path, bool]],
+    allow_hardlink: bool = False,
+    max_workers: int | None = None,
+) -> dict[str, int]:
+    """Copy many files concurrently on a bounded thread pool.
+
+    Destination directories must already exist.
+
+    Args:
+        pairs: (source, destination, clone) triples, see copy_file
+        allow_hardlink: Whether cloned files may be hardlinked
+        max_workers: Thread pool size (defaults to COPY_MAX_WORKERS)
+
+    Returns:
+        Number of files copied per method
+    """
+    jobs = list(pairs)
+    workers = max_workers or COPY_MAX_WORKERS
+    counts: dict[str, int] = {}
+
+    def run(job: tuple[pathlib.Path, pathlib.Path, bool]) -> str:
+        src, dst, clone = job
+        return copy_file(src, dst, clone=clone, allow_hardlink=allow_hardlink)
+
+    if workers <= 1 or len(jobs) < _PARALLEL_THRESHOLD:
+        methods = [run(job) for job in jobs]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            methods = list(executor.map(run, jobs))
+    for method in methods:
+        counts[method] = counts.get(method, 0) + 1
+    if get_profiler() is not None:
+        count(files=len(jobs), bytes=sum(src.stat().st_size for src, _, _ in jobs))
+    logging.debug(f"Copied {len(jobs)} files: {counts}")
+    return counts
@@ -13,27 +13,34 @@
 # limitations under the License.
 
 # ruff: noqa: E722
+import hashlib
+import os
+import pathlib
 import subprocess
 import time
+from typing import TYPE_CHECKING, Any
 
-import google.auth
-from google.api_core.client_options import ClientOptions
-from google.api_core.exceptions import PermissionDenied
-from google.api_core.gapic_v1.client_info import ClientInfo
-from google.cloud.aiplatform import initializer
-from google.cloud.aiplatform_v1beta1.services.prediction_service import (
-    PredictionServiceClient,
-)
-from google.cloud.aiplatform_v1beta1.types.prediction_service import (
-    CountTokensRequest,
-)
 from rich.console import Console
 from rich.prompt import Confirm
 
+from src.cli.utils.check_cache import get_cached_check, store_check
 from src.cli.utils.version import PACKAGE_NAME, get_current_version
 
+if TYPE_CHECKING:
+    from google.api_core.gapic_v1.client_info import ClientInfo
+    from google.cloud.aiplatform_v1beta1.services.prediction_service import (
+        PredictionServiceClient,
+    )
+    from google.cloud.aiplatform_v1beta1.types.prediction_service import (
+        CountTokensRequest,
+    )
+
 console = Console()
 
+# Seconds before a gcloud lookup or a Vertex AI test request is given up
+GCLOUD_TIMEOUT = 30
+VERTEX_TIMEOUT = 30
+
 
 def enable_vertex_ai_api(
     project_id: str, auto_approve: bool = False, context: str | None = None
@@ -104,17 +111,9 @@ def _test_vertex_ai_connection(
 ) -> bool:
     """Test Vertex AI connection without raising exceptions."""
     try:
-        credentials, _ = google.auth.default()
-        client = PredictionServiceClient(
-            credentials=credentials,
-            client_options=ClientOptions(
-                api_endpoint=f"{location}-aiplatform.googleapis.com"
-            ),
-            client_info=get_client_info(context),
-            transport=initializer.global_config._api_transport,
-        )
+        client = get_prediction_client(location, context)
         request = get_dummy_request(project_id=project_id)
-        client.count_tokens(request=request)
+        client.count_tokens(request=request, timeout=VERTEX_TIMEOUT)
         return True
     except Exception:
         return False
@@ -127,27 +126,86 @@ def get_user_agent(context: str | None = None) -> str:
     return f"{prefix}{version}-{PACKAGE_NAME}/{prefix}{version}-{PACKAGE_NAME}"
 
 
-def get_client_info(context: str | None = None) -> ClientInfo:
+def get_client_info(context: str | None = None) -> "ClientInfo":
     """Returns ClientInfo with custom user agent."""
+    from google.api_core.gapic_v1.client_info import ClientInfo
+
     user_agent = get_user_agent(context)
     return ClientInfo(client_library_version=user_agent, user_agent=user_agent)
 
 
-def get_dummy_request(project_id: str) -> CountTokensRequest:
+def get_prediction_client(
+    location: str, context: str | None = None
+) -> "PredictionServiceClient":
+    """Creates a Vertex AI prediction client for a location.
+
+    The Vertex AI client libraries are imported here rather than at module
+    level because they take around a second to import.
+    """
+    import google.auth
+    from google.api_core.client_options import ClientOptions
+    from google.cloud.aiplatform import initializer
+    from google.cloud.aiplatform_v1beta1.services.prediction_service import (
+        PredictionServiceClient,
+    )
+
+    credentials, _ = google.auth.default()
+    return PredictionServiceClient(
+        credentials=credentials,
+        client_options=ClientOptions(
+            api_endpoint=f"{location}-aiplatform.googleapis.com"
+        ),
+        client_info=get_client_info(context),
+        transport=initializer.global_config._api_transport,
+    )
+
+
+def get_dummy_request(project_id: str) -> "CountTokensRequest":
     """Creates a simple test request for Gemini."""
+    from google.cloud.aiplatform_v1beta1.types.prediction_service import (
+        CountTokensRequest,
+    )
+
     return CountTokensRequest(
         contents=[{"role": "user", "parts": [{"text": "Hi"}]}],
         endpoint=f"projects/{project_id}/locations/global/publishers/google/models/gemini-2.0-flash",
     )
 
 
+def is_vertex_connection_verified(
+    account: str, project_id: str, location: str, context: str | None = None
+) -> bool:
+    """Check whether the Vertex AI connection was verified within the check TTL."""
+    return (
+        get_cached_check("vertex", account, project_id, location, context or "")
+        is not None
+    )
+
+
 def verify_vertex_connection(
     project_id: str,
     location: str = "us-central1",
     auto_approve: bool = False,
     context: str | None = None,
+    account: str | None = None,
+) -> None:
+    """Verifies Vertex AI connection with a test Gemini request.
+
+    With the account, a successful verification is reused for the check TTL,
+    keyed by account, project and location.
+    """
+    if account and is_vertex_connection_verified(
+        account, project_id, location, context
+    ):
+        return
+    _verify_vertex_connection(project_id, location, auto_approve, context)
+    if account:
+        store_check("vertex", account, project_id, location, context or "")
+
+
+def _verify_vertex_connection(
+    project_id: str, location: str, auto_approve: bool, context: str | None
 ) -> None:
-    """Verifies Vertex AI connection with a test Gemini request."""
     # First try direct connection - if it works, we're done
     if _test_vertex_ai_connection(project_id, location, context):
         return
@@ -157,19 +215,13 @@ def verify_vertex_connection(
         raise Exception("Vertex AI API is not enabled and user declined to enable it")
 
     # After enabling, test again with proper error handling
-    credentials, _ = google.auth.default()
-    client = PredictionServiceClient(
-        credentials=credentials,
-        client_options=ClientOptions(
-            api_endpoint=f"{location}-aiplatform.googleapis.com"
-        ),
-        client_info=get_client_info(context),
-        transport=initializer.global_config._api_transport,
-    )
+    client = get_prediction_client(location, context)
     request = get_dummy_request(project_id=project_id)
 
+    from google.api_core.exceptions import PermissionDenied
+
     try:
-        client.count_tokens(request=request)
+        client.count_tokens(request=request, timeout=VERTEX_TIMEOUT)
     except PermissionDenied as e:
         error_message = str(e)
         # Check if the error is specifically about API not being enabled
@@ -184,7 +236,7 @@ def verify_vertex_connection(
             )
             time.sleep(30)
             try:
-                client.count_tokens(request=request)
+                client.count_tokens(request=request, timeout=VERTEX_TIMEOUT)
             except PermissionDenied:
                 raise Exception(
                     "Vertex AI API is enabled but not yet available. Please wait a few more minutes and try again."
@@ -194,50 +246,108 @@ def verify_vertex_connection(
             raise
 
 
-def verify_credentials() -> dict:
-    """Verify GCP credentials and return current project and account."""
+def _gcloud_config_stamp() -> str:
+    """Identify the active gcloud configuration and when it last changed."""
+    config_dir = os.environ.get("CLOUDSDK_CONFIG")
+    if config_dir:
+        root = pathlib.Path(config_dir)
+    elif os.name == "nt":
+        root = pathlib.Path(os.environ.get("APPDATA", "")) / "gcloud"
+    else:
+        root = pathlib.Path.home() / ".config" / "gcloud"
+    name = os.environ.get("CLOUDSDK_ACTIVE_CONFIG_NAME")
+    if not name:
+        try:
+            name = (root / "active_config").read_text(encoding="utf-8").strip()
+        except OSError:
+            name = "default"
     try:
-        # Get credentials and project
-        credentials, project = google.auth.default()
+        mtime = (root / "configurations" / f"config_{name}").stat().st_mtime_ns
+    except OSError:
+        mtime = 0
+    return f"{root}:{name}:{mtime}:{os.environ.get('CLOUDSDK_CORE_ACCOUNT', '')}"
+
+
+def _credentials_fingerprint(credentials: Any, project: str | None) -> str:
+    """Hash what identifies the account behind the default credentials."""
+    parts = [
+        type(credentials).__name__,
+        project or "",
+        str(getattr(credentials, "service_account_email", "") or ""),
+        str(getattr(credentials, "client_id", "") or ""),
+        str(getattr(credentials, "refresh_token", "") or ""),
+        _gcloud_config_stamp(),
+    ]
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+def _find_account(credentials: Any) -> str | None:
+    """Find the account email of credentials, falling back to gcloud."""
+    account = None
+
+    # Method 1: Try _account attribute
+    if hasattr(credentials, "_account"):
+        account = credentials._account
+
+    # Method 2: Try service_account_email
+    if not account and hasattr(credentials, "service_account_email"):
+        account = credentials.service_account_email
+
+    # Method 3: Try getting from token info if available
+    if not account and hasattr(credentials, "id_token"):
+        try:
+            import jwt
+
+            decoded = jwt.decode(
+                credentials.id_token, options={"verify_signature": False}
+            )
+            account = decoded.get("email")
+        except:
+            pass
+
+    # Method 4: Try getting from gcloud config as fallback
+    if not account:
+        try:
+            result = subprocess.run(
+                ["gcloud", "config", "get-value", "account"],
+                capture_output=True,
+                text=True,
+                timeout=GCLOUD_TIMEOUT,
+            )
+            account = result.stdout.strip()
+        except:
+            pass
 
-        # Try multiple methods to get account email
-        account = None
+    return account or None
 
-        # Method 1: Try _account attribute
-        if hasattr(credentials, "_account"):
-            account = credentials._account
 
-        # Method 2: Try service_account_email
-        if not account and hasattr(credentials, "service_account_email"):
-            account = credentials.service_account_email
+# Shown as the account when the credentials' account can't be found
+UNKNOWN_ACCOUNT = "Unknown account"
 
-        # Method 3: Try getting from token info if available
-        if not account and hasattr(credentials, "id_token"):
-            try:
-                import jwt
 
-                decoded = jwt.decode(
-                    credentials.id_token, options={"verify_signature": False}
-                )
-                account = decoded.get("email")
-            except:
-                pass
+def verify_credentials() -> dict:
+    """Verify GCP credentials and return current project and account.
 
-        # Method 4: Try getting from gcloud config as fallback
-        if not account:
-            try:
-                result = subprocess.run(
-                    ["gcloud", "config", "get-value", "account"],
-                    capture_output=True,
-                    text=True,
-                )
-                account = result.stdout.strip()
-            except:
-                pass
-
-        # Fallback if all methods fail
-        if not account:
-            account = "Unknown account"
+    Finding the account may take a gcloud call, so it is reused for the check
+    TTL, keyed by the credentials and the active gcloud configuration.
+    """
+    import google.auth
+
+    try:
+        # Get credentials and project
+        credentials, project = google.auth.default()
+
+        fingerprint = _credentials_fingerprint(credentials, project)
+        cached = get_cached_check("credentials", fingerprint)
+        if cached and cached.get("account"):
+            return {"project": project, "account": cached["account"]}
+
+        account = _find_account(credentials)
+        if account:
+            store_check("credentials", fingerprint, result={"account": account})
+        else:
+            # Fallback if all methods fail
+            account = UNKNOWN_ACCOUNT
 
         return {"project": project, "account": account}
     except Exception as e:
@@ -0,0 +1,192 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Persistent bare-repository cache for remote templates.
+
+Each remote repository is mirrored once into a bare repository in the cache
+dir, keyed by its URL. A fetch first resolves the ref with `git ls-remote`;
+objects are only downloaded (shallowly) when the ref points at a commit the
+mirror doesn't have yet. Templates are then handed out as worktrees of the
+mirror with a sparse checkout of the template path, so repeated fetches of
+the same template cost a ref check and a local checkout instead of a clone.
+"""
+
+import hashlib
+import logging
+import os
+import pathlib
+import re
+import subprocess
+
+from .cache import get_cache_dir
+
+# Prevents git from prompting for credentials
+GIT_ENV = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+
+
+def run_git(*args: str, cwd: pathlib.Path | None = None) -> str:
+    """Run a git command and return its stdout.
+
+    Raises:
+        subprocess.CalledProcessError: If git exits with an error
+    """
+    logging.debug(f"Running git {' '.join(args)}")
+    result = subprocess.run(
+        ["git", *args],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+        encoding="utf-8",
+        env=GIT_ENV,
+    )
+    return result.stdout
+
+
+def get_mirror_path(repo_url: str) -> pathlib.Path:
+    """Get the cache location of the mirror of a repository."""
+    name = re.sub(r"[^A-Za-z0-9_.-]", "_", repo_url.rstrip("/").rsplit("/", 1)[-1])
+    digest = hashlib.sha256(repo_url.encode("utf-8")).hexdigest()[:16]
+    return get_cache_dir("git") / f"{name.removesuffix('.git')}-{digest}.git"
+
+
+class GitMirror:
+    """A bare repository mirroring the refs fetched from a remote."""
+
+    def __init__(self, repo_url: str, path: pathlib.Path | None = None):
+        self.repo_url = repo_url
+        self.path = path or get_mirror_path(repo_url)
+
+    def _git(self, *args: str) -> str:
+        return run_git("--git-dir", str(self.path), *args)
+
+    def _ensure(self) -> None:
+        if not (self.path / "HEAD").is_file():
+            run_git("init", "--quiet", "--bare", str(self.path))
+        # Keep the mirror pointing at the URL, e.g. after it was moved
+        self._git("config", "remote.origin.url", self.repo_url)
+
+    def _has_commit(self, sha: str) -> bool:
+        try:
+            self._git("cat-file", "-e", f"{sha}^{{commit}}")
+            return True
+        except subprocess.CalledProcessError:
+            return False
+
+    def _local_ref(self, git_ref: str) -> tuple[str, str] | None:
+        for ref in (f"refs/heads/{git_ref}", f"refs/tags/{git_ref}"):
+            try:
+                return ref, self._git("rev-parse", "--verify", ref).strip()
+            except subprocess.CalledProcessError:
+                continue
+        return None
+
+    def _remote_ref(self, git_ref: str) -> tuple[str, str] | None:
+        refs = {}
+        for line in self._git("ls-remote", "origin", git_ref).splitlines():
+            sha, _, ref = line.partition("\t")
+            refs[ref] = sha
+        for ref in (f"refs/heads/{git_ref}", f"refs/tags/{git_ref}"):
+            if ref in refs:
+                return ref, refs[ref]
+        return None
+
+    def resolve(self, git_ref: str) -> str:
+        """Resolve a branch or tag to a commit, fetching it if needed.
+
+        The remote is always asked for the current commit of the ref. When the
+        remote can't be reached, the commit fetched last time is used.
+
+        Args:
+            git_ref: Branch or tag name
+
+        Returns:
+            SHA of the commit (or tag) the ref points at
+
+        Raises:
+            subprocess.CalledProcessError: If the ref can't be resolved or fetched
+        """
+        self._ensure()
+        try:
+            remote = self._remote_ref(git_ref)
+        except subprocess.CalledProcessError as e:
+            local = self._local_ref(git_ref)
+            if local is None:
+                raise
+            logging.debug(f"Using cached {local[0]}, remote unavailable: {e.stderr}")
+            return local[1]
+        if remote is None:
+            raise subprocess.CalledProcessError(
+                128,
+                ["git", "ls-remote", "origin", git_ref],
+                stderr=f"fatal: Remote branch {git_ref} not found in upstream origin",
+            )
+
+        ref, sha = remote
+        if self._has_commit(sha):
+            logging.debug(f"Mirror of {self.repo_url} is up to date at {ref}")
+        else:
+            logging.debug(f"Fetching {ref} of {self.repo_url} into the mirror")
+            self._git("fetch", "--quiet", "--depth", "1", "origin", f"+{ref}:{ref}")
+        return sha
+
+    def add_worktree(
+        self, sha: str, destination: pathlib.Path, sparse_path: str = ""
+    ) -> pathlib.Path:
+        """Check out a commit of the mirror into a new worktree.
+
+        Args:
+            sha: Commit (or tag) to check out, as returned by resolve
+            destination: Directory for the worktree, which must not exist
+            sparse_path: Only check out this path of the repository, if set
+
+        Returns:
+            The destination directory
+
+        Raises:
+            subprocess.CalledProcessError: If a git command fails
+        """
+        # Forget worktrees whose directories were deleted by earlier runs
+        self._git("worktree", "prune")
+        self._git(
+            "worktree",
+            "add",
+            "--quiet",
+            "--detach",
+            "--no-checkout",
+            str(destination),
+            sha,
+        )
+        if sparse_path:
+            run_git("sparse-checkout", "set", sparse_path, cwd=destination)
+        run_git("checkout", "--quiet", "--detach", sha, cwd=destination)
+        return destination
+
+    def checkout(
+        self, git_ref: str, destination: pathlib.Path, sparse_path: str = ""
+    ) -> pathlib.Path:
+        """Resolve a ref and check it out into a new worktree of the mirror.
+
+        Args:
+            git_ref: Branch or tag name
+            destination: Directory for the worktree, which must not exist
+            sparse_path: Only check out this path of the repository, if set
+
+        Returns:
+            The destination directory
+
+        Raises:
+            subprocess.CalledProcessError: If a git command fails
+        """
+        return self.add_worktree(self.resolve(git_ref), destination, sparse_path)
@@ -0,0 +1,191 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Shared Jinja environment and persistent compiled-template cache.
+
+Compiled templates are stored in the user cache dir keyed by the template
+content (plus its name and the environment's syntax settings), so they are
+reused across CLI invocations even though templates are rendered from a fresh
+temporary staging directory every time.
+"""
+
+import functools
+import hashlib
+import logging
+import pathlib
+from types import CodeType
+from typing import Any
+
+from jinja2 import Environment, Template
+from jinja2.bccache import Bucket, FileSystemBytecodeCache
+
+from .cache import get_cache_dir, is_cache_enabled
+
+BYTECODE_CACHE_MAX_ENTRIES = 4096
+
+_SYNTAX_SETTINGS = (
+    "block_start_string",
+    "block_end_string",
+    "variable_start_string",
+    "variable_end_string",
+    "comment_start_string",
+    "comment_end_string",
+    "line_statement_prefix",
+    "line_comment_prefix",
+    "trim_blocks",
+    "lstrip_blocks",
+    "newline_sequence",
+    "keep_trailing_newline",
+    "optimized",
+    "autoescape",
+)
+
+
+class ContentHashBytecodeCache(FileSystemBytecodeCache):
+    """Filesystem bytecode cache keyed by template content instead of path.
+
+    Jinja's default key includes the template filename, which changes on every
+    run because templates are staged in a temporary directory.
+
+    Loaded and compiled code is also kept in memory, so a process rendering
+    many projects (e.g. create --matrix) reads the shared base template and
+    deployment target layers from disk only once.
+    """
+
+    def __init__(self, directory: str | None = None):
+        super().__init__(directory)
+        self._memory: dict[str, CodeType] = {}
+
+    def get_bucket(
+        self,
+        environment: Environment,
+        name: str,
+        filename: str | None,
+        source: str,
+    ) -> Bucket:
+        settings = [repr(getattr(environment, s, None)) for s in _SYNTAX_SETTINGS]
+        digest = hashlib.sha256()
+        for part in [*settings, *sorted(environment.extensions), name, source]:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        bucket = Bucket(
+            environment, digest.hexdigest(), self.get_source_checksum(source)
+        )
+        code = self._memory.get(bucket.key)
+        if code is not None:
+            bucket.code = code
+            return bucket
+        self.load_bytecode(bucket)
+        if bucket.code is not None:
+            self._remember(bucket.key, bucket.code)
+        return bucket
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        super().dump_bytecode(bucket)
+        if bucket.code is not None:
+            self._remember(bucket.key, bucket.code)
+
+    def _remember(self, key: str, code: CodeType) -> None:
+        if len(self._memory) >= BYTECODE_CACHE_MAX_ENTRIES:
+            self._memory.clear()
+        self._memory[key] = code
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        try:
+            data = pathlib.Path(self._get_cache_filename(bucket)).read_bytes()
+        except OSError:
+            return
+        bucket.bytecode_from_string(data)
+
+    def prune(self, max_entries: int = BYTECODE_CACHE_MAX_ENTRIES) -> None:
+        """Remove the oldest compiled templates beyond max_entries."""
+        entries = list(pathlib.Path(self.directory).glob("__jinja2_*.cache"))
+        if len(entries) <= max_entries:
+            return
+        entries.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+        for stale in entries[max_entries:]:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+
+@functools.lru_cache(maxsize=8)
+def _get_bytecode_cache(directory: str) -> ContentHashBytecodeCache:
+    bytecode_cache = ContentHashBytecodeCache(directory)
+    bytecode_cache.prune()
+    return bytecode_cache
+
+
+def get_bytecode_cache() -> ContentHashBytecodeCache | None:
+    """Get the persistent bytecode cache, or None if caching is disabled."""
+    if not is_cache_enabled():
+        return None
+    try:
+        directory = get_cache_dir("jinja")
+    except OSError as e:
+        logging.debug(f"Jinja bytecode cache unavailable: {e}")
+        return None
+    return _get_bytecode_cache(str(directory))
+
+
+@functools.lru_cache(maxsize=4)
+def _get_environment(cache_dir: str | None) -> Environment:
+    return Environment(
+        bytecode_cache=_get_bytecode_cache(cache_dir) if cache_dir else None
+    )
+
+
+def get_environment() -> Environment:
+    """Get the process-wide Jinja environment used to render single templates."""
+    bytecode_cache = get_bytecode_cache()
+    return _get_environment(bytecode_cache.directory if bytecode_cache else None)
+
+
+@functools.lru_cache(maxsize=64)
+def _get_template(environment: Environment, name: str, source: str) -> Template:
+    code = None
+    bytecode_cache = environment.bytecode_cache
+    bucket = None
+    if bytecode_cache is not None:
+        bucket = bytecode_cache.get_bucket(environment, name, None, source)
+        code = bucket.code
+    if code is None:
+        code = environment.compile(source, name)
+        if bucket is not None and bytecode_cache is not None:
+            bucket.code = code
+            try:
+                bytecode_cache.set_bucket(bucket)
+            except OSError as e:
+                logging.debug(f"Could not write Jinja bytecode cache: {e}")
+    return environment.template_class.from_code(
+        environment, code, environment.make_globals(None)
+    )
+
+
+def render_string(source: str, name: str = "<template>", **context: Any) -> str:
+    """Render template source through the shared environment.
+
+    Parsed templates are kept in memory for the life of the process and their
+    compiled bytecode is persisted across invocations.
+
+    Args:
+        source: Template source
+        name: Template name, used in error messages
+        **context: Template variables
+
+    Returns:
+        The rendered template
+    """
+    return _get_template(get_environment(), name, source).render(**context)
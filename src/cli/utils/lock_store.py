@@ -0,0 +1,195 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Deduplicated, compressed store for the bundled uv lock files.
+
+The lock files of the agent templates mostly resolve the same packages. Each
+lock is split into its header and its [[package]] entries, every distinct
+entry is stored once, zlib-compressed, in a pack file, and an index lists the
+entries making up each lock. Locks are assembled by streaming their entries
+out of the pack with the project name substituted.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import pathlib
+import re
+import threading
+import zlib
+from collections.abc import Iterable, Iterator
+
+from .registry import LOCKS_DIR
+
+LOCK_STORE_VERSION = 1
+INDEX_FILE = "index.json"
+PACK_FILE = "packages.pack"
+PROJECT_NAME_PLACEHOLDER = "{{cookiecutter.project_name}}"
+
+# Splits a lock before each [[package]] table, keeping the text intact
+_ENTRY_BOUNDARY = re.compile(r"^(?=\[\[package\]\]$)", re.MULTILINE)
+
+
+def split_lock(content: str) -> list[str]:
+    """Split lock file content into its header and [[package]] entries.
+
+    Joining the returned chunks gives back the original content.
+    """
+    return [chunk for chunk in _ENTRY_BOUNDARY.split(content) if chunk]
+
+
+class LockStore:
+    """Read-only view of a lock store directory.
+
+    Args:
+        root: Directory holding the index and pack files
+    """
+
+    def __init__(self, root: pathlib.Path = LOCKS_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        self._index: dict | None = None
+
+    def _load_index(self) -> dict:
+        with self._lock:
+            if self._index is None:
+                index_path = self.root / INDEX_FILE
+                try:
+                    with open(index_path, encoding="utf-8") as f:
+                        index = json.load(f)
+                except FileNotFoundError:
+                    index = {"version": LOCK_STORE_VERSION, "objects": [], "locks": {}}
+                if index.get("version") != LOCK_STORE_VERSION:
+                    raise ValueError(
+                        f"Unsupported lock store version in {index_path}: "
+                        f"{index.get('version')}"
+                    )
+                self._index = index
+            return self._index
+
+    def names(self) -> list[str]:
+        """Get the names of the stored lock files."""
+        return sorted(self._load_index()["locks"])
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._load_index()["locks"]
+
+    def iter_text(self, name: str, project_name: str | None = None) -> Iterator[str]:
+        """Stream the content of a stored lock file.
+
+        Args:
+            name: Lock file name, e.g. "uv-adk_base-cloud_run.lock"
+            project_name: Substituted for the project name placeholder, if given
+
+        Yields:
+            The lock file content, one chunk per entry
+
+        Raises:
+            FileNotFoundError: If the store has no lock of that name
+        """
+        index = self._load_index()
+        if name not in index["locks"]:
+            raise FileNotFoundError(f"Lock file not found: {self.root / name}")
+        objects = index["objects"]
+        with open(self.root / PACK_FILE, "rb") as pack:
+            for object_id in index["locks"][name]:
+                _, offset, size = objects[object_id]
+                pack.seek(offset)
+                chunk = zlib.decompress(pack.read(size)).decode("utf-8")
+                if project_name is not None:
+                    chunk = chunk.replace(PROJECT_NAME_PLACEHOLDER, project_name)
+                yield chunk
+
+    def read_text(self, name: str, project_name: str | None = None) -> str:
+        """Get the content of a stored lock file."""
+        return "".join(self.iter_text(name, project_name))
+
+
+class LockStoreWriter:
+    """Builds a lock store directory, replacing any store already there.
+
+    Args:
+        root: Directory to write the index and pack files to
+    """
+
+    def __init__(self, root: pathlib.Path = LOCKS_DIR):
+        self.root = root
+        self._chunks: list[bytes] = []
+        self._ids: dict[str, int] = {}
+        self._locks: dict[str, list[int]] = {}
+
+    def add(self, name: str, content: str) -> None:
+        """Add (or replace) a lock file."""
+        object_ids = []
+        for chunk in split_lock(content):
+            data = chunk.encode("utf-8")
+            digest = hashlib.sha256(data).hexdigest()
+            if digest not in self._ids:
+                self._ids[digest] = len(self._chunks)
+                self._chunks.append(data)
+            object_ids.append(self._ids[digest])
+        self._locks[name] = object_ids
+
+    def write(self) -> None:
+        """Write the pack and index files.
+
+        Only entries used by at least one lock are packed.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        used = sorted({i for ids in self._locks.values() for i in ids})
+        digests = {i: digest for digest, i in self._ids.items()}
+        new_ids: dict[int, int] = {}
+        objects = []
+        pack_tmp = self.root / f".{PACK_FILE}.tmp"
+        with open(pack_tmp, "wb") as pack:
+            for old_id in used:
+                compressed = zlib.compress(self._chunks[old_id], 9)
+                new_ids[old_id] = len(objects)
+                objects.append([digests[old_id], pack.tell(), len(compressed)])
+                pack.write(compressed)
+        index = {
+            "version": LOCK_STORE_VERSION,
+            "objects": objects,
+            "locks": {
+                name: [new_ids[i] for i in self._locks[name]]
+                for name in sorted(self._locks)
+            },
+        }
+        index_tmp = self.root / f".{INDEX_FILE}.tmp"
+        with open(index_tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f, separators=(",", ":"))
+            f.write("\n")
+        os.replace(pack_tmp, self.root / PACK_FILE)
+        os.replace(index_tmp, self.root / INDEX_FILE)
+
+
+def write_lock_store(
+    locks: Iterable[tuple[str, str]], root: pathlib.Path = LOCKS_DIR
+) -> None:
+    """Write a lock store from (name, content) pairs."""
+    writer = LockStoreWriter(root)
+    for name, content in locks:
+        writer.add(name, content)
+    writer.write()
+
+
+@functools.cache
+def _get_lock_store(root: pathlib.Path) -> LockStore:
+    return LockStore(root)
+
+
+def get_lock_store(root: pathlib.Path = LOCKS_DIR) -> LockStore:
+    """Get the process-wide store for a locks directory."""
+    return _get_lock_store(root.resolve())
@@ -0,0 +1,239 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Minimal Makefile parser used to merge base and remote template Makefiles.
+
+A Makefile is split in a single pass into rule blocks (the comment lines
+directly above a rule, the rule line and its recipe) and the text between
+them. Joining the blocks gives back the original text, so a remote Makefile is
+kept verbatim and only the base rules it lacks are appended.
+"""
+
+import logging
+import pathlib
+import re
+from dataclasses import dataclass, field
+
+MERGE_HEADER = "\n\n# --- Commands from Agent Starter Pack ---\n\n"
+
+# Rule line: targets, then ":" or "::" that doesn't start an assignment
+_RULE = re.compile(r"^(?P<targets>[^:#=\s][^:#=]*?)\s*(?P<sep>::?)(?![:=])")
+_INCLUDE = re.compile(r"^(?:-|s)?include\s+(?P<paths>.+)$")
+_DEFINE = re.compile(r"^(?:(?:export|override)\s+)*define\b")
+_ENDEF = re.compile(r"^endef\b")
+
+
+@dataclass
+class MakeRule:
+    """A rule with the comment lines directly above it and its recipe."""
+
+    targets: list[str]
+    prerequisites: list[str]
+    text: str
+
+
+@dataclass
+class Makefile:
+    """A parsed Makefile.
+
+    Attributes:
+        blocks: Rules and the raw text between them, in file order
+        rules: Rules by target, the first definition of a target wins
+        phony: Targets declared in .PHONY lists
+        includes: Paths of include directives, as written
+    """
+
+    blocks: list[MakeRule | str] = field(default_factory=list)
+    rules: dict[str, MakeRule] = field(default_factory=dict)
+    phony: list[str] = field(default_factory=list)
+    includes: list[str] = field(default_factory=list)
+
+    @property
+    def targets(self) -> set[str]:
+        """Targets of the rules, without special targets like .PHONY."""
+        return {target for target in self.rules if not target.startswith(".")}
+
+    def render(self) -> str:
+        return "".join(
+            block.text if isinstance(block, MakeRule) else block
+            for block in self.blocks
+        )
+
+
+def _logical_end(lines: list[str], start: int) -> int:
+    """Get the index of the last physical line of a logical line."""
+    end = start
+    while end + 1 < len(lines) and lines[end].rstrip("\r\n").endswith("\\"):
+        end += 1
+    return end
+
+
+def _join_logical(lines: list[str]) -> str:
+    return " ".join(line.rstrip("\r\n").rstrip("\\").strip() for line in lines)
+
+
+def _recipe_end(lines: list[str], start: int) -> int:
+    """Get the index of the first line after the recipe starting at start.
+
+    Recipe lines start with a tab. Blank and comment lines belong to the
+    recipe only if more recipe lines follow them.
+    """
+    end = start
+    while end < len(lines):
+        if lines[end].startswith("\t"):
+            end = _logical_end(lines, end) + 1
+            continue
+        ahead = end
+        while ahead < len(lines) and (
+            not lines[ahead].strip() or lines[ahead].startswith("#")
+        ):
+            ahead += 1
+        if ahead == end or ahead == len(lines) or not lines[ahead].startswith("\t"):
+            return end
+        end = ahead
+    return end
+
+
+def parse_makefile(content: str) -> Makefile:
+    """Parse Makefile content into rules and the text between them."""
+    makefile = Makefile()
+    lines = content.splitlines(keepends=True)
+    text: list[str] = []
+    comments: list[str] = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if line.startswith("#"):
+            comments.append(line)
+            i += 1
+            continue
+
+        end = _logical_end(lines, i)
+        logical = _join_logical(lines[i : end + 1])
+        rule_match = None if line[:1].isspace() else _RULE.match(logical)
+
+        if _DEFINE.match(logical):
+            end = i
+            while end + 1 < len(lines) and not _ENDEF.match(lines[end]):
+                end += 1
+        elif rule_match is not None:
+            recipe_end = _recipe_end(lines, end + 1)
+            rest = logical[rule_match.end() :].split(";", 1)[0].split("#", 1)[0]
+            rule = MakeRule(
+                targets=rule_match.group("targets").split(),
+                prerequisites=rest.split(),
+                text="".join(comments + lines[i:recipe_end]),
+            )
+            if text:
+                makefile.blocks.append("".join(text))
+                text = []
+            comments = []
+            makefile.blocks.append(rule)
+            for target in rule.targets:
+                makefile.rules.setdefault(target, rule)
+            if ".PHONY" in rule.targets:
+                makefile.phony.extend(
+                    name for name in rule.prerequisites if name not in makefile.phony
+                )
+            i = recipe_end
+            continue
+        elif include_match := _INCLUDE.match(logical):
+            makefile.includes.extend(include_match.group("paths").split())
+
+        text.extend(comments + lines[i : end + 1])
+        comments = []
+        i = end + 1
+
+    text.extend(comments)
+    if text:
+        makefile.blocks.append("".join(text))
+    return makefile
+
+
+def collect_targets(
+    makefile: Makefile,
+    base_dir: pathlib.Path | None = None,
+    _seen: set[pathlib.Path] | None = None,
+) -> set[str]:
+    """Get the targets of a Makefile and of the files it includes.
+
+    Args:
+        makefile: Parsed Makefile
+        base_dir: Directory include paths are relative to. Includes are only
+            followed if given. Absolute paths and paths containing variables
+            are skipped.
+    """
+    targets = makefile.targets
+    if base_dir is None:
+        return targets
+    seen = _seen if _seen is not None else set()
+    for pattern in makefile.includes:
+        if "$" in pattern or pathlib.PurePath(pattern).is_absolute():
+            continue
+        for path in sorted(base_dir.glob(pattern)):
+            resolved = path.resolve()
+            if resolved in seen or not path.is_file():
+                continue
+            seen.add(resolved)
+            try:
+                included = parse_makefile(path.read_text(encoding="utf-8"))
+            except (OSError, UnicodeDecodeError) as e:
+                logging.debug(f"Could not read included Makefile {path}: {e}")
+                continue
+            targets |= collect_targets(included, base_dir, seen)
+    return targets
+
+
+def merge_makefiles(
+    base: Makefile, remote: Makefile, remote_targets: set[str] | None = None
+) -> str:
+    """Append the base rules a remote Makefile lacks to the remote Makefile.
+
+    Rules are appended in order of their first target, together with a .PHONY
+    list of the appended targets that the base declares phony. A base rule is
+    only appended if none of its targets are defined in the remote Makefile.
+
+    Args:
+        base: Parsed base Makefile
+        remote: Parsed remote Makefile, kept verbatim
+        remote_targets: Targets defined by the remote Makefile and its
+            includes, defaults to the remote Makefile's own targets
+
+    Returns:
+        The merged Makefile content
+    """
+    if remote_targets is None:
+        remote_targets = remote.targets
+
+    missing: dict[int, MakeRule] = {}
+    for target in base.targets:
+        rule = base.rules[target]
+        if not any(name in remote_targets for name in rule.targets):
+            missing[id(rule)] = rule
+    if not missing:
+        return remote.render()
+
+    rules = sorted(missing.values(), key=lambda rule: rule.targets[0])
+    appended = [MERGE_HEADER]
+    phony = [
+        target
+        for rule in rules
+        for target in rule.targets
+        if target in base.phony and target not in remote.phony
+    ]
+    if phony:
+        appended.append(f".PHONY: {' '.join(phony)}\n\n")
+    for rule in rules:
+        appended.append(rule.text.rstrip("\n") + "\n\n")
+    return remote.render() + "".join(appended)
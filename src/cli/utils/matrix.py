@@ -0,0 +1,270 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Batch generation of many projects from a matrix spec.
+
+A matrix spec (YAML or JSON) lists the agents, deployment targets, session
+types and datastores to combine:
+
+    agents: [adk_base, agentic_rag]          # default: all local agents
+    deployment_targets: [agent_engine]       # default: all the agent supports
+    session_types: [in_memory, alloydb]      # cloud_run agents with sessions
+    datastores: [vertex_ai_search]           # agents with data ingestion
+    cicd_runner: google_cloud_build
+    region: us-central1
+    exclude:
+      - {agent: agentic_rag, deployment_target: cloud_run}
+
+Projects are rendered by a pool of worker processes. Each worker renders many
+projects, so imports, the template registry and compiled templates of the
+shared base template and deployment target layers are reused between them.
+Processes rather than threads are used because rendering is CPU bound Jinja
+work that threads would run one at a time.
+"""
+
+import importlib
+import json
+import logging
+import os
+import pathlib
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any
+
+import yaml
+
+from .datastores import DATASTORE_TYPES
+from .registry import get_registry
+
+DEFAULT_SESSION_TYPES = ["in_memory"]
+MAX_PROJECT_NAME_LENGTH = 26
+_JOB_KEYS = ("agent", "deployment_target", "session_type", "datastore")
+
+
+@dataclass(frozen=True)
+class MatrixJob:
+    """A single project of a matrix."""
+
+    project_name: str
+    agent: str
+    deployment_target: str
+    session_type: str | None = None
+    datastore: str | None = None
+    cicd_runner: str = "google_cloud_build"
+    region: str = "us-central1"
+
+
+@dataclass(frozen=True)
+class MatrixResult:
+    """Outcome of rendering a matrix job."""
+
+    job: MatrixJob
+    seconds: float
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def load_matrix_spec(spec_path: pathlib.Path) -> dict[str, Any]:
+    """Load a matrix spec from a YAML or JSON file.
+
+    Raises:
+        ValueError: If the spec can't be parsed or isn't a mapping
+    """
+    try:
+        with open(spec_path, encoding="utf-8") as f:
+            if spec_path.suffix == ".json":
+                spec = json.load(f)
+            else:
+                spec = yaml.safe_load(f)
+    except (json.JSONDecodeError, yaml.YAMLError) as err:
+        raise ValueError(f"Invalid matrix spec {spec_path}: {err}") from err
+    if not isinstance(spec, dict):
+        raise ValueError(f"Matrix spec {spec_path} must be a mapping")
+    unknown = set(spec) - {
+        "agents",
+        "deployment_targets",
+        "session_types",
+        "datastores",
+        "cicd_runner",
+        "region",
+        "exclude",
+    }
+    if unknown:
+        raise ValueError(f"Unknown matrix spec keys: {sorted(unknown)}")
+    for selector in spec.get("exclude", []):
+        if not isinstance(selector, dict) or set(selector) - set(_JOB_KEYS):
+            raise ValueError(
+                f"Invalid exclude entry {selector!r}, allowed keys: {list(_JOB_KEYS)}"
+            )
+    return spec
+
+
+def _as_list(value: Any) -> list[Any] | None:
+    if value is None:
+        return None
+    return value if isinstance(value, list) else [value]
+
+
+def expand_matrix(spec: dict[str, Any], name_prefix: str) -> list[MatrixJob]:
+    """Expand a matrix spec into jobs, following create's defaulting rules.
+
+    Session types only vary for cloud_run agents that require session
+    management; other agents use in-memory sessions (or Agent Engine's own).
+    Datastores only vary for agents that require data ingestion.
+
+    Args:
+        spec: Parsed matrix spec
+        name_prefix: Project names are the prefix followed by a job number
+
+    Returns:
+        The jobs, numbered in expansion order
+
+    Raises:
+        ValueError: If the spec references unknown agents, targets or datastores
+    """
+    entries = get_registry().agents()
+    agents = _as_list(spec.get("agents")) or list(entries)
+    unknown_agents = [agent for agent in agents if agent not in entries]
+    if unknown_agents:
+        raise ValueError(f"Unknown agents in matrix spec: {unknown_agents}")
+    datastores = _as_list(spec.get("datastores")) or DATASTORE_TYPES
+    unknown_datastores = [d for d in datastores if d not in DATASTORE_TYPES]
+    if unknown_datastores:
+        raise ValueError(f"Unknown datastores in matrix spec: {unknown_datastores}")
+    session_types = _as_list(spec.get("session_types")) or DEFAULT_SESSION_TYPES
+    targets_filter = _as_list(spec.get("deployment_targets"))
+    excludes = spec.get("exclude", [])
+
+    combinations = []
+    for agent in agents:
+        entry = entries[agent]
+        requires_session = bool(entry.settings.get("requires_session"))
+        for target in entry.targets:
+            if targets_filter is not None and target not in targets_filter:
+                continue
+            if not requires_session:
+                target_sessions: list[str | None] = ["in_memory"]
+            elif target == "cloud_run":
+                target_sessions = list(session_types)
+            else:
+                target_sessions = [None]
+            target_datastores: list[str | None] = (
+                list(datastores) if entry.requires_data_ingestion else [None]
+            )
+            for session_type in target_sessions:
+                for datastore in target_datastores:
+                    combination = dict(
+                        zip(
+                            _JOB_KEYS,
+                            (agent, target, session_type, datastore),
+                            strict=True,
+                        )
+                    )
+                    if not any(
+                        all(
+                            combination[key] == value for key, value in selector.items()
+                        )
+                        for selector in excludes
+                    ):
+                        combinations.append(combination)
+
+    width = len(str(len(combinations)))
+    if len(name_prefix) + 1 + width > MAX_PROJECT_NAME_LENGTH:
+        raise ValueError(
+            f"Project name prefix '{name_prefix}' is too long for "
+            f"{len(combinations)} projects"
+        )
+
+    return [
+        MatrixJob(
+            project_name=f"{name_prefix}-{number:0{width}d}",
+            cicd_runner=spec.get("cicd_runner", "google_cloud_build"),
+            region=spec.get("region", "us-central1"),
+            **combination,
+        )
+        for number, combination in enumerate(combinations, 1)
+    ]
+
+
+def render_job(job: MatrixJob, output_dir: pathlib.Path) -> MatrixResult:
+    """Render a single matrix project, capturing its timing and any error."""
+    from .template import get_template_path, process_template
+
+    start = time.perf_counter()
+    try:
+        process_template(
+            job.agent,
+            get_template_path(job.agent),
+            job.project_name,
+            deployment_target=job.deployment_target,
+            cicd_runner=job.cicd_runner,
+            include_data_ingestion=job.datastore is not None,
+            datastore=job.datastore,
+            session_type=job.session_type,
+            output_dir=output_dir,
+            region=job.region,
+        )
+    except Exception as e:
+        logging.debug(f"Failed to render {job.project_name}", exc_info=True)
+        return MatrixResult(job, time.perf_counter() - start, f"{e}")
+    return MatrixResult(job, time.perf_counter() - start)
+
+
+def _init_worker() -> None:
+    # Import the rendering stack once per worker instead of once per project
+    importlib.import_module(".template", __package__)
+
+
+def run_matrix(
+    jobs: Iterable[MatrixJob],
+    output_dir: pathlib.Path,
+    max_workers: int | None = None,
+    on_result: Callable[[MatrixResult], None] | None = None,
+) -> list[MatrixResult]:
+    """Render matrix jobs with a pool of worker processes.
+
+    Args:
+        jobs: Projects to render
+        output_dir: Directory the projects are created in
+        max_workers: Worker processes, defaults to the CPU count. With a single
+            worker, projects are rendered in this process.
+        on_result: Called with each result as soon as it is available
+
+    Returns:
+        Results in job order
+    """
+    jobs = list(jobs)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs)) or 1
+    results: dict[MatrixJob, MatrixResult] = {}
+
+    if workers == 1:
+        for job in jobs:
+            results[job] = render_job(job, output_dir)
+            if on_result:
+                on_result(results[job])
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker) as executor:
+            futures = [executor.submit(render_job, job, output_dir) for job in jobs]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result.job] = result
+                if on_result:
+                    on_result(result)
+    return [results[job] for job in jobs]
@@ -0,0 +1,196 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Layered overlay manifest for assembling a project template.
+
+A project template is the union of several source layers (base template,
+deployment target, data ingestion, frontend, agent folders). Later layers
+override files from earlier ones. Instead of copying every layer on top of the
+previous ones, the layers are resolved once into a manifest that maps each
+output path to the source file that wins.
+"""
+
+import hashlib
+import logging
+import os
+import pathlib
+import re
+from dataclasses import dataclass, field
+
+from .copy_engine import copy_many, matches_any
+
+
+class SkipRules:
+    """Exclusion rules compiled once and applied to many paths.
+
+    Directory walks prune skipped directories, so entries below an already
+    checked root only need their own name (and the agent specific exclusions)
+    tested.
+    """
+
+    def __init__(self, agent_name: str | None = None, agent_directory: str = "app"):
+        self.agent_name = agent_name
+        excluded = []
+        if agent_name == "live_api":
+            # Exclude the unit test utils folder and agent utils folder for live_api
+            excluded = ["tests/unit/test_utils", f"{agent_directory}/utils"]
+        self._excluded = (
+            re.compile("|".join(re.escape(e) for e in excluded)) if excluded else None
+        )
+
+    def skips_tree(self, path: pathlib.Path) -> bool:
+        """Check whether everything below path is skipped because of its ancestry."""
+        return ".git" in path.parts or "__pycache__" in str(path)
+
+    def skips_entry(self, path: str, name: str, is_dir: bool) -> bool:
+        """Check a walked entry whose parent directories were not skipped."""
+        if name.endswith(".pyc") and name.rfind(".") > 0:
+            return True
+        if "__pycache__" in name or name == ".git":
+            return True
+        if self._excluded is not None and self._excluded.search(path):
+            logging.debug(f"Excluding path for {self.agent_name}: {path}")
+            return True
+        return is_dir and name == ".template"
+
+    def skips(self, path: pathlib.Path) -> bool:
+        """Check a single path, including its ancestry."""
+        return self.skips_tree(path) or self.skips_entry(
+            str(path), path.name, path.is_dir()
+        )
+
+
+def should_skip(
+    path: pathlib.Path, agent_name: str | None = None, agent_directory: str = "app"
+) -> bool:
+    """Determine if a file/directory should be skipped when assembling a template."""
+    return SkipRules(agent_name, agent_directory).skips(path)
+
+
+@dataclass
+class TemplateLayer:
+    """A source directory overlaid onto the project template."""
+
+    name: str
+    source: pathlib.Path
+    target: str = ""
+    agent_name: str | None = None
+    agent_directory: str = "app"
+
+
+@dataclass
+class OverlayManifest:
+    """Precedence-resolved view of a set of template layers.
+
+    Attributes:
+        files: Output path (POSIX, relative to the project root) -> winning source file
+        origins: Output path -> name of the layer that provided it
+        directories: Output directories, including empty ones
+    """
+
+    files: dict[str, pathlib.Path] = field(default_factory=dict)
+    origins: dict[str, str] = field(default_factory=dict)
+    directories: set[str] = field(default_factory=set)
+
+    def fingerprint(self) -> str:
+        """Fingerprint the resolved sources from their paths, sizes and mtimes."""
+        digest = hashlib.sha256()
+        for output_path in sorted(self.files):
+            stat = self.files[output_path].stat()
+            digest.update(
+                f"{output_path}:{self.files[output_path]}:"
+                f"{stat.st_size}:{stat.st_mtime_ns}\n".encode()
+            )
+        for directory in sorted(self.directories):
+            digest.update(f"{directory}/\n".encode())
+        return digest.hexdigest()
+
+    def materialize(
+        self,
+        dst: pathlib.Path,
+        copy_without_render: list[str] | None = None,
+        max_workers: int | None = None,
+    ) -> None:
+        """Copy the winning file for every output path into dst.
+
+        dst is expected to be a staging directory that is only read from, so
+        files matching copy_without_render may be hardlinked to their source.
+
+        Args:
+            dst: Directory to populate
+            copy_without_render: Cookiecutter patterns of files copied verbatim
+            max_workers: Copy thread pool size
+        """
+        for directory in sorted(self.directories):
+            (dst / directory).mkdir(parents=True, exist_ok=True)
+        patterns = copy_without_render or []
+        counts = copy_many(
+            (
+                (source, dst / output_path, matches_any(output_path, patterns))
+                for output_path, source in self.files.items()
+            ),
+            allow_hardlink=True,
+            max_workers=max_workers,
+        )
+        logging.debug(
+            f"Materialized {len(self.files)} template files into {dst}: {counts}"
+        )
+
+
+def resolve_overlay_manifest(layers: list[TemplateLayer]) -> OverlayManifest:
+    """Walk all layers once and resolve which source wins for every output path.
+
+    Layers are applied in order, so a file from a later layer overrides the same
+    output path from an earlier one. Missing layer sources are ignored.
+
+    Args:
+        layers: Template layers in precedence order (lowest first)
+
+    Returns:
+        The resolved overlay manifest
+    """
+    manifest = OverlayManifest()
+    for layer in layers:
+        if not layer.source.is_dir():
+            logging.debug(f"Skipping missing template layer {layer.name}")
+            continue
+        target = pathlib.PurePosixPath(layer.target) if layer.target else None
+        if target is not None:
+            manifest.directories.add(target.as_posix())
+        rules = SkipRules(layer.agent_name, layer.agent_directory)
+        if rules.skips_tree(layer.source):
+            continue
+        for root, dirs, files in os.walk(layer.source):
+            root_path = pathlib.Path(root)
+            rel_root = root_path.relative_to(layer.source).as_posix()
+            out_root = pathlib.PurePosixPath(layer.target or ".") / rel_root
+
+            kept_dirs = []
+            for name in sorted(dirs):
+                if rules.skips_entry(os.path.join(root, name), name, True):
+                    logging.debug(f"Skipping file/directory: {root_path / name}")
+                    continue
+                kept_dirs.append(name)
+                manifest.directories.add((out_root / name).as_posix())
+            dirs[:] = kept_dirs
+
+            for name in sorted(files):
+                if rules.skips_entry(os.path.join(root, name), name, False):
+                    logging.debug(f"Skipping file/directory: {root_path / name}")
+                    continue
+                source_file = root_path / name
+                output_path = (out_root / name).as_posix()
+                manifest.files[output_path] = source_file
+                manifest.origins[output_path] = layer.name
+    return manifest
@@ -0,0 +1,231 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Render plans: the files create or enhance would touch, worked out up front.
+
+A plan resolves the template layers into an overlay manifest and renders the
+cookiecutter path templates of its output paths in memory. No file content is
+rendered and nothing is written; the destination is only read to tell files
+that would be created from ones that would be overwritten, preserved as
+starter_pack_* or deleted. process_template accepts a plan and then renders
+exactly the layers and configuration the plan was made from.
+"""
+
+import glob
+import os
+import pathlib
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from cookiecutter.generate import create_env_with_context, is_copy_only_path
+
+from .overlay import OverlayManifest, TemplateLayer
+
+PLAN_FORMAT_VERSION = 1
+
+CREATE = "create"
+OVERWRITE = "overwrite"
+PRESERVE = "preserve"
+DELETE = "delete"
+SKIP = "skip"
+ACTIONS = [CREATE, OVERWRITE, PRESERVE, DELETE, SKIP]
+
+
+def is_unused_path(name: str) -> bool:
+    """Check whether a generated file or directory is a conditional leftover."""
+    return name.startswith("unused_")
+
+
+def is_preserved_name(name: str) -> bool:
+    """Check whether an existing top-level file is kept rather than replaced."""
+    return name.lower().startswith("readme") or name == "pyproject.toml"
+
+
+@dataclass
+class PlannedFile:
+    """What a render does to one path.
+
+    Attributes:
+        path: Path relative to the destination
+        action: One of ACTIONS
+        source: Template file or other origin of the content, None for
+            paths that are kept or deleted
+        layer: Template layer that provided the file, if any
+    """
+
+    path: str
+    action: str
+    source: str | None = None
+    layer: str | None = None
+
+
+@dataclass
+class RenderPlan:
+    """The resolved inputs and file actions of a render.
+
+    Attributes:
+        options: process_template arguments the plan was made for
+        destination: Directory the project files are written to
+        template_config: Loaded template configuration
+        cookiecutter_config: Context the template is rendered with
+        agent_directory: Name of the agent directory
+        layers: Template layers, lowest precedence first
+        manifest: Winning source file for every template output path
+        files: File actions, sorted by path
+    """
+
+    options: dict[str, Any]
+    destination: pathlib.Path
+    template_config: dict[str, Any]
+    cookiecutter_config: dict[str, Any]
+    agent_directory: str
+    layers: list[TemplateLayer]
+    manifest: OverlayManifest
+    files: list[PlannedFile] = field(default_factory=list)
+
+    def summary(self) -> dict[str, int]:
+        """Count the files by action."""
+        counts = dict.fromkeys(ACTIONS, 0)
+        for planned in self.files:
+            counts[planned.action] += 1
+        return counts
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "format_version": PLAN_FORMAT_VERSION,
+            "agent": self.options.get("agent_name"),
+            "project_name": self.options.get("project_name"),
+            "destination": str(self.destination),
+            "in_folder": bool(self.options.get("in_folder")),
+            "layers": [layer.name for layer in self.layers],
+            "summary": self.summary(),
+            "files": [asdict(planned) for planned in self.files],
+        }
+
+
+def render_output_paths(
+    manifest: OverlayManifest, cookiecutter_config: dict[str, Any]
+) -> dict[str, str]:
+    """Render the cookiecutter path templates of a manifest's output paths.
+
+    Paths are rendered like cookiecutter does: directories copied without
+    rendering keep the names of everything below them, and files whose name
+    renders empty are not generated.
+
+    Returns:
+        Rendered project path -> template output path
+    """
+    context = {"cookiecutter": cookiecutter_config}
+    env = create_env_with_context(context)
+    rendered = {}
+    for output_path in sorted(manifest.files):
+        parts = output_path.split("/")
+        cut = next(
+            (
+                i
+                for i in range(1, len(parts))
+                if is_copy_only_path("/".join(parts[:i]), context)
+            ),
+            len(parts),
+        )
+        path = "/".join(
+            [env.from_string("/".join(parts[:cut])).render(**context), *parts[cut:]]
+        )
+        if not path or path.endswith("/"):
+            continue
+        rendered[path] = output_path
+    return rendered
+
+
+def plan_files(
+    generated: dict[str, tuple[str | None, str | None]],
+    destination: pathlib.Path,
+    in_folder: bool,
+    late_writes: dict[str, tuple[str | None, str | None]] | None = None,
+) -> list[PlannedFile]:
+    """Work out what writing a generated project to its destination does.
+
+    Mirrors the copy to destination of process_template: in in-folder mode,
+    existing README and pyproject.toml files are kept and the generated ones
+    written as starter_pack_*, generated directories replace existing ones,
+    and unused_* paths are removed afterwards. Otherwise an existing project
+    directory is replaced, with its README and pyproject.toml kept as
+    starter_pack_*.
+
+    Args:
+        generated: Project path -> (source, layer) of the generated files
+        destination: Directory the project files are written to
+        in_folder: Whether files are applied to an existing directory
+        late_writes: Files written after the project was copied, such as
+            the lock file, by project path
+
+    Returns:
+        The file actions, sorted by path
+    """
+    planned: dict[str, PlannedFile] = {}
+
+    def write(path: str, source: str | None, layer: str | None) -> None:
+        exists = os.path.lexists(destination / path)
+        planned[path] = PlannedFile(
+            path, OVERWRITE if exists else CREATE, source, layer
+        )
+
+    def delete_existing(path: pathlib.Path) -> None:
+        paths = [path] if not path.is_dir() or path.is_symlink() else path.rglob("*")
+        for existing in paths:
+            if existing.is_dir() and not existing.is_symlink():
+                continue
+            rel = existing.relative_to(destination).as_posix()
+            if rel not in planned or planned[rel].action == SKIP:
+                planned[rel] = PlannedFile(rel, DELETE)
+
+    kept = {}
+    for path, origin in generated.items():
+        if any(is_unused_path(part) for part in path.split("/")):
+            planned[path] = PlannedFile(path, SKIP, *origin)
+        else:
+            kept[path] = origin
+
+    if in_folder:
+        generated_dirs = set()
+        for path, (source, layer) in kept.items():
+            top, _, rest = path.partition("/")
+            if rest:
+                generated_dirs.add(top)
+            elif is_preserved_name(path) and (destination / path).is_file():
+                planned[path] = PlannedFile(path, PRESERVE)
+                path = f"starter_pack_{path}"
+            write(path, source, layer)
+        for top in sorted(generated_dirs):
+            if (destination / top).is_dir():
+                delete_existing(destination / top)
+    elif destination.exists():
+        for existing in sorted(destination.iterdir()):
+            if existing.is_file() and is_preserved_name(existing.name):
+                rel = f"starter_pack_{existing.name}"
+                planned[rel] = PlannedFile(rel, CREATE, str(existing))
+        delete_existing(destination)
+    if not in_folder:
+        for path, (source, layer) in kept.items():
+            write(path, source, layer)
+
+    for path, (source, layer) in (late_writes or {}).items():
+        write(path, source, layer)
+
+    if destination.exists():
+        for pattern in ("unused_*", "**/unused_*"):
+            for match in glob.glob(str(destination / pattern), recursive=True):
+                delete_existing(pathlib.Path(match))
+
+    return [planned[path] for path in sorted(planned)]
@@ -0,0 +1,215 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Per-phase timings and copy counters for create and enhance (--profile).
+
+Phases are timed with a monotonic clock and nest, so a phase entered inside
+another one is reported as "outer/inner"; each thread nests its own phases.
+Copy steps add the number of files and bytes they wrote to the innermost
+phase. Without an active profiler, phase and count do nothing beyond a
+context variable lookup.
+"""
+
+import json
+import pathlib
+import threading
+import time
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from rich.table import Table
+
+PROFILE_FORMAT_VERSION = 1
+
+_active: ContextVar["Profiler | None"] = ContextVar("asp_profiler", default=None)
+
+
+@dataclass
+class PhaseStats:
+    """Accumulated time and copy counters of a phase."""
+
+    seconds: float = 0.0
+    calls: int = 0
+    files: int = 0
+    bytes: int = 0
+
+
+class Profiler:
+    """Collects phase timings; phases are reported in the order first entered."""
+
+    def __init__(self) -> None:
+        self.phases: dict[str, PhaseStats] = {}
+        self._local = threading.local()
+        self._started = time.perf_counter()
+        self._stopped: float | None = None
+
+    @property
+    def _stack(self) -> list[str]:
+        """Phases running in the current thread, outermost first."""
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def phase(self, name: str) -> Generator[PhaseStats, None, None]:
+        """Time a phase, nested in the phase currently running."""
+        stack = self._stack
+        path = f"{stack[-1]}/{name}" if stack else name
+        stats = self.phases.setdefault(path, PhaseStats())
+        stack.append(path)
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.seconds += time.perf_counter() - start
+            stats.calls += 1
+            stack.pop()
+
+    def count(self, files: int = 0, bytes: int = 0) -> None:
+        """Add copied files and bytes to the innermost running phase."""
+        path = self._stack[-1] if self._stack else "(other)"
+        stats = self.phases.setdefault(path, PhaseStats())
+        stats.files += files
+        stats.bytes += bytes
+
+    def stop(self) -> None:
+        """Stop the total clock."""
+        if self._stopped is None:
+            self._stopped = time.perf_counter()
+
+    @property
+    def total_seconds(self) -> float:
+        end = self._stopped if self._stopped is not None else time.perf_counter()
+        return end - self._started
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "format_version": PROFILE_FORMAT_VERSION,
+            "total_seconds": round(self.total_seconds, 6),
+            "phases": [
+                {"name": name, **asdict(stats), "seconds": round(stats.seconds, 6)}
+                for name, stats in self.phases.items()
+            ],
+        }
+
+    def write_json(self, path: pathlib.Path, **metadata: Any) -> None:
+        """Write the timings as JSON, with metadata such as the version."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({**metadata, **self.to_dict()}, f, indent=2)
+            f.write("\n")
+
+    def table(self, title: str = "Profile") -> Table:
+        table = Table(title=title)
+        table.add_column("Phase")
+        table.add_column("Time (ms)", justify="right")
+        table.add_column("%", justify="right")
+        table.add_column("Calls", justify="right")
+        table.add_column("Files", justify="right")
+        table.add_column("Bytes", justify="right")
+        total = self.total_seconds or 1.0
+        for name, stats in self.phases.items():
+            depth = name.count("/")
+            table.add_row(
+                "  " * depth + name.rsplit("/", 1)[-1],
+                f"{stats.seconds * 1000:.1f}",
+                f"{stats.seconds / total * 100:.1f}",
+                str(stats.calls),
+                str(stats.files) if stats.files else "",
+                _format_bytes(stats.bytes) if stats.bytes else "",
+            )
+        table.add_row(
+            "total",
+            f"{self.total_seconds * 1000:.1f}",
+            "100.0",
+            "",
+            "",
+            "",
+            style="bold",
+        )
+        return table
+
+
+def _format_bytes(size: int) -> str:
+    value = float(size)
+    for unit in ("B", "KiB", "MiB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
+
+
+def get_profiler() -> Profiler | None:
+    """Get the active profiler, if any."""
+    return _active.get()
+
+
+def start_profiling(profiler: Profiler) -> Token:
+    """Make a profiler the active one for the current context.
+
+    Returns:
+        Token to pass to stop_profiling
+    """
+    return _active.set(profiler)
+
+
+def stop_profiling(token: Token) -> None:
+    """Restore the profiler that was active before start_profiling and stop it."""
+    profiler = _active.get()
+    _active.reset(token)
+    if profiler is not None:
+        profiler.stop()
+
+
+@contextmanager
+def profiling(profiler: Profiler) -> Generator[Profiler, None, None]:
+    """Make a profiler the active one while the block runs."""
+    token = start_profiling(profiler)
+    try:
+        yield profiler
+    finally:
+        stop_profiling(token)
+
+
+@contextmanager
+def phase(name: str) -> Generator[PhaseStats | None, None, None]:
+    """Time a phase with the active profiler, if any."""
+    profiler = _active.get()
+    if profiler is None:
+        yield None
+        return
+    with profiler.phase(name) as stats:
+        yield stats
+
+
+def count(files: int = 0, bytes: int = 0) -> None:
+    """Add copied files and bytes to the active profiler's current phase."""
+    profiler = _active.get()
+    if profiler is not None:
+        profiler.count(files, bytes)
+
+
+def counting_copy(copy_function: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a shutil style copy function to count what it copies."""
+
+    def copy(src: str, dst: str, *args: Any, **kwargs: Any) -> Any:
+        result = copy_function(src, dst, *args, **kwargs)
+        if _active.get() is not None:
+            count(files=1, bytes=pathlib.Path(src).stat().st_size)
+        return result
+
+    return copy
@@ -0,0 +1,132 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Region substitution for generated projects.
+
+Templates are written against the default region. When a different region is
+requested, region references (and the matching Vertex AI Search data store
+region) are substituted with a single compiled pattern while generated files
+are copied into place, so every file is read and written once.
+"""
+
+import logging
+import pathlib
+import re
+import shutil
+
+DEFAULT_REGION = "us-central1"
+
+# Files that may reference the region
+REGION_FILE_SUFFIXES = {".md", ".py", ".tfvars", ".yaml", ".tf", ".yml"}
+REGION_FILE_NAMES = {"Makefile", "makefile"}
+
+# Directories that shouldn't be modified
+_SKIP_DIRS = {".git", "__pycache__", "venv", ".venv", "node_modules"}
+
+# Spellings of the data store region setting, in order of precedence. Only the
+# first spelling present in a file is substituted.
+_DATA_STORE_REGION_VARIANTS = [
+    ('data_store_region = "us"', 'data_store_region = "{}"'),
+    ('data_store_region="us"', 'data_store_region="{}"'),
+    ('data-store-region="us"', 'data-store-region="{}"'),
+    ("_DATA_STORE_REGION: us", "_DATA_STORE_REGION: {}"),
+    ('"DATA_STORE_REGION", "us"', '"DATA_STORE_REGION", "{}"'),
+]
+
+
+def get_data_store_region(region: str) -> str:
+    """Map a GCP region to the Vertex AI Search data store location."""
+    if region.startswith("us"):
+        return "us"
+    if region.startswith("europe"):
+        return "eu"
+    return "global"
+
+
+class RegionRewriter:
+    """Substitute the default region in generated files."""
+
+    def __init__(self, region: str):
+        self.region = region
+        self.data_store_region = get_data_store_region(region)
+        self._variants = {
+            old: new.format(self.data_store_region)
+            for old, new in _DATA_STORE_REGION_VARIANTS
+        }
+        self._pattern = re.compile(
+            "|".join(re.escape(old) for old in [DEFAULT_REGION, *self._variants])
+        )
+
+    def applies_to(self, path: pathlib.Path) -> bool:
+        """Check whether a file is eligible for region substitution."""
+        return (
+            path.suffix in REGION_FILE_SUFFIXES or path.name in REGION_FILE_NAMES
+        ) and not _SKIP_DIRS.intersection(path.parts)
+
+    def substitute(self, content: str) -> str | None:
+        """Substitute region references in one scan, or None if there are none."""
+        matches = list(self._pattern.finditer(content))
+        if not matches:
+            return None
+        found = {m.group(0) for m in matches}
+        data_store_variant = next((v for v in self._variants if v in found), None)
+
+        parts = []
+        last = 0
+        for match in matches:
+            old = match.group(0)
+            if old == DEFAULT_REGION:
+                new = self.region
+            elif old == data_store_variant:
+                new = self._variants[old]
+            else:
+                continue
+            parts.append(content[last : match.start()])
+            parts.append(new)
+            last = match.end()
+        parts.append(content[last:])
+        return "".join(parts)
+
+    def rewrite(self, content: str) -> str:
+        """Substitute region references in a string."""
+        substituted = self.substitute(content)
+        return content if substituted is None else substituted
+
+    def rewrite_file(self, src: pathlib.Path) -> str | None:
+        """Get the substituted content of a file, or None if it has no changes."""
+        if not self.applies_to(src) or src.is_symlink():
+            return None
+        try:
+            return self.substitute(src.read_text(encoding="utf-8"))
+        except UnicodeDecodeError:
+            # Skip files that can't be read as text
+            return None
+
+    def copy(self, src: str | pathlib.Path, dst: str | pathlib.Path) -> None:
+        """Copy a file, substituting region references on the way.
+
+        Has the signature of shutil.copy2 so it can be used as the
+        copy_function of shutil.copytree.
+        """
+        src_path = pathlib.Path(src)
+        substituted = self.rewrite_file(src_path)
+        if substituted is not None:
+            logging.debug(f"Replacing region in {dst}")
+            dst_path = pathlib.Path(dst)
+            if dst_path.is_dir():
+                dst_path = dst_path / src_path.name
+            dst_path.write_text(substituted, encoding="utf-8")
+            shutil.copymode(src_path, dst_path)
+            return
+        shutil.copy2(src, dst)
@@ -0,0 +1,276 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Indexed registry of agent template configs.
+
+Each templateconfig.yaml is parsed at most once per process; later lookups
+only stat the file to check it hasn't changed. Parsed configs are also kept in
+an index in the cache dir, validated by mtime and size and then by content
+hash, so a new process only parses configs that actually changed.
+"""
+
+import copy
+import functools
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+import yaml
+
+from .cache import get_cache_dir, is_cache_enabled
+
+ROOT_DIR = pathlib.Path(__file__).parent.parent.parent.parent
+AGENTS_DIR = ROOT_DIR / "agents"
+LOCKS_DIR = ROOT_DIR / "src" / "resources" / "locks"
+
+TEMPLATE_CONFIG_FILE = "templateconfig.yaml"
+REGISTRY_INDEX_VERSION = "1"
+DEFAULT_FRONTEND = "streamlit"
+
+
+def _as_list(value: Any) -> list[str]:
+    if value is None:
+        return []
+    return list(value) if isinstance(value, list) else [value]
+
+
+def get_lock_filename(agent_name: str, deployment_target: str) -> str:
+    """Get the name of the lock file for an agent and deployment target."""
+    return f"uv-{agent_name}-{deployment_target}.lock"
+
+
+@dataclass(frozen=True)
+class TemplateEntry:
+    """A local agent template and its parsed config."""
+
+    name: str
+    config_path: pathlib.Path
+    config: dict[str, Any]
+
+    @property
+    def template_dir(self) -> pathlib.Path:
+        return self.config_path.parent
+
+    @property
+    def description(self) -> str:
+        return self.config.get("description", "No description available")
+
+    @property
+    def settings(self) -> dict[str, Any]:
+        return self.config.get("settings", {})
+
+    @property
+    def targets(self) -> list[str]:
+        return _as_list(self.settings.get("deployment_targets"))
+
+    @property
+    def tags(self) -> list[str]:
+        return _as_list(self.settings.get("tags"))
+
+    @property
+    def extra_dependencies(self) -> list[str]:
+        return _as_list(self.settings.get("extra_dependencies"))
+
+    @property
+    def frontend_type(self) -> str:
+        return self.settings.get("frontend_type", DEFAULT_FRONTEND)
+
+    @property
+    def requires_data_ingestion(self) -> bool:
+        return bool(self.settings.get("requires_data_ingestion"))
+
+    def lock_name(self, deployment_target: str) -> str:
+        """Get the name of the lock in the lock store for a deployment target."""
+        return get_lock_filename(self.name, deployment_target)
+
+
+class TemplateRegistry:
+    """Parse-once registry of the template configs below an agents directory.
+
+    Configs returned by load_config are copies, so callers may modify them.
+    """
+
+    def __init__(
+        self,
+        agents_dir: pathlib.Path = AGENTS_DIR,
+        index_path: pathlib.Path | None = None,
+    ):
+        self.agents_dir = agents_dir
+        self.index_path = index_path
+        self._lock = threading.RLock()
+        # Resolved config path -> (mtime_ns, size, sha256, config)
+        self._configs: dict[str, tuple[int, int, str, dict[str, Any]]] = {}
+        # Resolved config path -> (mtime_ns, size, error) for invalid configs
+        self._errors: dict[str, tuple[int, int, ValueError]] = {}
+        self._index: dict[str, dict[str, Any]] | None = None
+        self._index_dirty = False
+
+    def _load_index(self) -> dict[str, dict[str, Any]]:
+        if self._index is None:
+            self._index = {}
+            if self.index_path is not None:
+                try:
+                    with open(self.index_path, encoding="utf-8") as f:
+                        data = json.load(f)
+                    if data.get("version") == REGISTRY_INDEX_VERSION:
+                        self._index = data["entries"]
+                except (OSError, ValueError, KeyError, AttributeError):
+                    pass
+        return self._index
+
+    def _save_index(self) -> None:
+        if self.index_path is None or not self._index_dirty:
+            return
+        index = self._load_index()
+        # Drop configs that no longer exist, e.g. from removed remote templates
+        entries = {path: e for path, e in index.items() if os.path.exists(path)}
+        temp_path = self.index_path.with_name(
+            f"{self.index_path.name}.{os.getpid()}.tmp"
+        )
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": REGISTRY_INDEX_VERSION, "entries": entries}, f)
+            os.replace(temp_path, self.index_path)
+            self._index_dirty = False
+        except (OSError, TypeError, ValueError) as e:
+            logging.debug(f"Could not write template registry index: {e}")
+            temp_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _parse(config_path: pathlib.Path, content: bytes) -> dict[str, Any]:
+        try:
+            config = yaml.safe_load(content) or {}
+        except yaml.YAMLError as err:
+            raise ValueError(f"Invalid YAML in template config: {err}") from err
+        if not isinstance(config, dict):
+            raise ValueError(f"Invalid template config format in {config_path}")
+        return config
+
+    def _read_config(self, config_path: pathlib.Path) -> dict[str, Any] | None:
+        key = str(config_path.resolve())
+        try:
+            stat = config_path.stat()
+        except FileNotFoundError:
+            return None
+        cached = self._configs.get(key)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[3]
+        failed = self._errors.get(key)
+        if failed and failed[:2] == (stat.st_mtime_ns, stat.st_size):
+            raise failed[2]
+
+        index = self._load_index()
+        entry = index.get(key)
+        if entry and (entry["mtime_ns"], entry["size"]) == (
+            stat.st_mtime_ns,
+            stat.st_size,
+        ):
+            digest, config = entry["sha256"], entry["config"]
+        else:
+            content = config_path.read_bytes()
+            digest = hashlib.sha256(content).hexdigest()
+            if entry and entry["sha256"] == digest:
+                # Touched but unchanged (e.g. by a checkout)
+                config = entry["config"]
+            else:
+                logging.debug(f"Parsing template config {config_path}")
+                try:
+                    config = self._parse(config_path, content)
+                except ValueError as err:
+                    self._errors[key] = (stat.st_mtime_ns, stat.st_size, err)
+                    raise
+            index[key] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha256": digest,
+                "config": config,
+            }
+            self._index_dirty = True
+
+        self._configs[key] = (stat.st_mtime_ns, stat.st_size, digest, config)
+        return config
+
+    def load_config(self, template_dir: pathlib.Path) -> dict[str, Any] | None:
+        """Load the templateconfig.yaml of a template directory.
+
+        Args:
+            template_dir: The .template directory holding the config
+
+        Returns:
+            A copy of the parsed config, or None if there is no config file
+
+        Raises:
+            ValueError: If the config isn't valid YAML or isn't a mapping
+        """
+        with self._lock:
+            config = self._read_config(template_dir / TEMPLATE_CONFIG_FILE)
+            self._save_index()
+        return copy.deepcopy(config) if config is not None else None
+
+    def agents(self) -> dict[str, TemplateEntry]:
+        """Get every agent template with a valid config, by directory name."""
+        entries = {}
+        with self._lock:
+            for agent_dir in sorted(self.agents_dir.iterdir()):
+                if not agent_dir.is_dir() or agent_dir.name.startswith("__"):
+                    continue
+                config_path = agent_dir / ".template" / TEMPLATE_CONFIG_FILE
+                try:
+                    config = self._read_config(config_path)
+                except Exception as e:
+                    logging.warning(f"Could not load agent from {agent_dir}: {e}")
+                    continue
+                if config is not None:
+                    entries[agent_dir.name] = TemplateEntry(
+                        agent_dir.name, config_path, copy.deepcopy(config)
+                    )
+            self._save_index()
+        return entries
+
+    def get(self, agent_name: str) -> TemplateEntry | None:
+        """Get a single agent template, or None if it doesn't exist."""
+        config_path = self.agents_dir / agent_name / ".template" / TEMPLATE_CONFIG_FILE
+        with self._lock:
+            config = self._read_config(config_path)
+            self._save_index()
+        if config is None:
+            return None
+        return TemplateEntry(agent_name, config_path, copy.deepcopy(config))
+
+
+def _get_index_path() -> pathlib.Path | None:
+    if not is_cache_enabled():
+        return None
+    try:
+        return get_cache_dir("registry") / "index.json"
+    except OSError as e:
+        logging.debug(f"Template registry index unavailable: {e}")
+        return None
+
+
+@functools.lru_cache(maxsize=8)
+def _get_registry(
+    agents_dir: pathlib.Path, index_path: pathlib.Path | None
+) -> TemplateRegistry:
+    return TemplateRegistry(agents_dir, index_path)
+
+
+def get_registry(agents_dir: pathlib.Path = AGENTS_DIR) -> TemplateRegistry:
+    """Get the process-wide registry for an agents directory."""
+    return _get_registry(agents_dir.resolve(), _get_index_path())
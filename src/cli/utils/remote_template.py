@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import logging
 import os
 import pathlib
@@ -20,6 +21,7 @@ import shutil
 import subprocess
 import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any
 
@@ -27,9 +29,18 @@ if sys.version_info >= (3, 11):
     import tomllib
 else:
     import tomli as tomllib
-from jinja2 import Environment
 from rich.console import Console
 
+from .apply import ApplyEngine
+from .cache import get_cache_dir, is_cache_enabled
+from .git_cache import GitMirror
+from .jinja_cache import render_string
+from .makefile import collect_targets, merge_makefiles, parse_makefile
+from .region import DEFAULT_REGION, RegionRewriter
+
+ADK_MANIFEST_VERSION = "1"
+ADK_DISCOVERY_WORKERS = 8
+
 
 @dataclass
 class RemoteTemplateSpec:
@@ -132,7 +143,8 @@ def fetch_remote_template(
 ) -> tuple[pathlib.Path, pathlib.Path]:
     """Fetch remote template and return path to template directory.
 
-    Uses Git to clone the remote repository.
+    Uses the git mirror cache to check out the template path into a worktree,
+    or clones the remote repository when caching is disabled.
 
     Args:
         spec: Remote template specification
@@ -146,35 +158,39 @@ def fetch_remote_template(
     temp_path = pathlib.Path(temp_dir)
     repo_path = temp_path / "repo"
 
-    # Attempt Git Clone
     try:
-        clone_url = spec.repo_url
-        clone_cmd = [
-            "git",
-            "clone",
-            "--depth",
-            "1",
-            "--branch",
-            spec.git_ref,
-            clone_url,
-            str(repo_path),
-        ]
-        logging.debug(
-            f"Attempting to clone remote template with Git: {' '.join(clone_cmd)}"
-        )
-        # GIT_TERMINAL_PROMPT=0 prevents git from prompting for credentials
-        subprocess.run(
-            clone_cmd,
-            capture_output=True,
-            text=True,
-            check=True,
-            encoding="utf-8",
-            env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
-        )
-        logging.debug("Git clone successful.")
+        if is_cache_enabled():
+            GitMirror(spec.repo_url).checkout(
+                spec.git_ref, repo_path, sparse_path=spec.template_path
+            )
+            logging.debug("Checked out remote template from the git cache.")
+        else:
+            clone_cmd = [
+                "git",
+                "clone",
+                "--depth",
+                "1",
+                "--branch",
+                spec.git_ref,
+                spec.repo_url,
+                str(repo_path),
+            ]
+            logging.debug(
+                f"Attempting to clone remote template with Git: {' '.join(clone_cmd)}"
+            )
+            # GIT_TERMINAL_PROMPT=0 prevents git from prompting for credentials
+            subprocess.run(
+                clone_cmd,
+                capture_output=True,
+                text=True,
+                check=True,
+                encoding="utf-8",
+                env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+            )
+            logging.debug("Git clone successful.")
     except subprocess.CalledProcessError as e:
         shutil.rmtree(temp_path, ignore_errors=True)
-        raise RuntimeError(f"Git clone failed: {e.stderr.strip()}") from e
+        raise RuntimeError(f"Git clone failed: {(e.stderr or '').strip()}") from e
 
     # Process the successfully fetched template
     try:
@@ -367,9 +383,33 @@ def merge_template_configs(
     return deep_merge(merged_config, remote_config)
 
 
+def _load_adk_agent(
+    agent_dir: pathlib.Path, repo_path: pathlib.Path
+) -> dict[str, Any] | None:
+    """Load the listing info of a single ADK sample, or None if it fails."""
+    logging.debug(f"Processing agent directory: {agent_dir.name}")
+    try:
+        # Load configuration with ADK inference support
+        config = load_remote_template_config(template_dir=agent_dir, is_adk_sample=True)
+    except Exception as e:
+        logging.warning(f"Could not load agent from {agent_dir}: {e}")
+        return None
+
+    return {
+        "name": config.get("name", agent_dir.name),
+        "description": config.get("description", ""),
+        # Relative path from repo root
+        "path": str(agent_dir.relative_to(repo_path)),
+        "spec": f"adk@{agent_dir.name}",
+        "has_explicit_config": config.get("has_explicit_config", False),
+    }
+
+
 def discover_adk_agents(repo_path: pathlib.Path) -> dict[int, dict[str, Any]]:
     """Discover and load all ADK agents from a repository with inference support.
 
+    Agents are loaded concurrently, as most of the time is spent reading files.
+
     Args:
         repo_path: Path to the cloned ADK samples repository
 
@@ -381,62 +421,113 @@ def discover_adk_agents(repo_path: pathlib.Path) -> dict[int, dict[str, Any]]:
         - spec: adk@ specification string
         - has_explicit_config: Whether agent has explicit configuration
     """
-    import logging
-
-    adk_agents = {}
-
     # Search specifically for agents in python/agents/* directories
     agents_dir = repo_path / "python" / "agents"
     logging.debug(f"Looking for agents in: {agents_dir}")
-    if agents_dir.exists():
-        all_items = list(agents_dir.iterdir())
-        logging.debug(
-            f"Found items in agents directory: {[item.name for item in all_items]}"
-        )
+    if not agents_dir.exists():
+        return {}
 
-        # Collect all agents first, then sort by configuration type
-        all_agents = []
+    agent_dirs = []
+    for item in sorted(agents_dir.iterdir()):
+        if item.is_dir():
+            agent_dirs.append(item)
+        else:
+            logging.debug(f"Skipping non-directory: {item.name}")
+    if not agent_dirs:
+        return {}
 
-        for agent_dir in sorted(agents_dir.iterdir()):
-            if not agent_dir.is_dir():
-                logging.debug(f"Skipping non-directory: {agent_dir.name}")
-                continue
-            logging.debug(f"Processing agent directory: {agent_dir.name}")
+    with ThreadPoolExecutor(min(ADK_DISCOVERY_WORKERS, len(agent_dirs))) as executor:
+        loaded = executor.map(lambda d: _load_adk_agent(d, repo_path), agent_dirs)
+        all_agents = [agent_info for agent_info in loaded if agent_info is not None]
 
-            try:
-                # Load configuration with ADK inference support
-                config = load_remote_template_config(
-                    template_dir=agent_dir, is_adk_sample=True
-                )
+    # Sort agents: explicit config first, then inferred (both alphabetically within their groups)
+    all_agents.sort(key=lambda x: (not x["has_explicit_config"], x["name"].lower()))
 
-                agent_name = config.get("name", agent_dir.name)
-                description = config.get("description", "")
-                has_explicit_config = config.get("has_explicit_config", False)
+    # Convert to numbered dictionary
+    return dict(enumerate(all_agents, 1))
 
-                # Get the relative path from repo root
-                relative_path = agent_dir.relative_to(repo_path)
-                agent_spec_name = agent_dir.name
 
-                agent_info = {
-                    "name": agent_name,
-                    "description": description,
-                    "path": str(relative_path),
-                    "spec": f"adk@{agent_spec_name}",
-                    "has_explicit_config": has_explicit_config,
-                }
-                all_agents.append(agent_info)
+def _get_adk_manifest_path(commit: str) -> pathlib.Path:
+    return get_cache_dir("adk-samples") / f"{commit}.json"
 
-            except Exception as e:
-                logging.warning(f"Could not load agent from {agent_dir}: {e}")
 
-        # Sort agents: explicit config first, then inferred (both alphabetically within their groups)
-        all_agents.sort(key=lambda x: (not x["has_explicit_config"], x["name"].lower()))
+def load_adk_manifest(commit: str) -> dict[int, dict[str, Any]] | None:
+    """Load the cached agent listing of an ADK samples commit, if any."""
+    try:
+        with open(_get_adk_manifest_path(commit), encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != ADK_MANIFEST_VERSION:
+            return None
+        return dict(enumerate(manifest["agents"], 1))
+    except (OSError, ValueError, KeyError, AttributeError, TypeError):
+        return None
 
-        # Convert to numbered dictionary
-        for i, agent_info in enumerate(all_agents, 1):
-            adk_agents[i] = agent_info
 
-    return adk_agents
+def save_adk_manifest(commit: str, agents: dict[int, dict[str, Any]]) -> None:
+    """Cache the agent listing of an ADK samples commit."""
+    try:
+        manifest_path = _get_adk_manifest_path(commit)
+        temp_path = manifest_path.with_name(f"{manifest_path.name}.{os.getpid()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": ADK_MANIFEST_VERSION,
+                    "commit": commit,
+                    "agents": list(agents.values()),
+                },
+                f,
+            )
+        os.replace(temp_path, manifest_path)
+    except OSError as e:
+        logging.debug(f"Could not write ADK samples manifest: {e}")
+
+
+def get_adk_agents(spec: RemoteTemplateSpec) -> dict[int, dict[str, Any]]:
+    """Get the agents of an ADK samples repository, using the manifest cache.
+
+    The listing is cached per commit, so when the ref hasn't moved only the
+    ref is checked and nothing is checked out. Otherwise python/agents is
+    checked out from the git cache and the agents are discovered.
+
+    Args:
+        spec: Remote template specification of the ADK samples repository
+
+    Returns:
+        Agents numbered as by discover_adk_agents
+
+    Raises:
+        RuntimeError: If the repository can't be fetched
+    """
+    if not is_cache_enabled():
+        _, temp_path = fetch_remote_template(spec)
+        try:
+            return discover_adk_agents(temp_path / "repo")
+        finally:
+            shutil.rmtree(temp_path, ignore_errors=True)
+
+    mirror = GitMirror(spec.repo_url)
+    try:
+        commit = mirror.resolve(spec.git_ref)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Git clone failed: {(e.stderr or '').strip()}") from e
+
+    agents = load_adk_manifest(commit)
+    if agents is not None:
+        logging.debug(f"Using cached ADK samples manifest for {commit}")
+        return agents
+
+    temp_path = pathlib.Path(tempfile.mkdtemp(prefix="asp_remote_template_"))
+    try:
+        repo_path = mirror.add_worktree(
+            commit, temp_path / "repo", sparse_path="python/agents"
+        )
+        agents = discover_adk_agents(repo_path)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Git clone failed: {(e.stderr or '').strip()}") from e
+    finally:
+        shutil.rmtree(temp_path, ignore_errors=True)
+    save_adk_manifest(commit, agents)
+    return agents
 
 
 def display_adk_caveat_if_needed(agents: dict[int, dict[str, Any]]) -> None:
@@ -463,21 +554,24 @@ def render_and_merge_makefiles(
     final_destination: pathlib.Path,
     cookiecutter_config: dict,
     remote_template_path: pathlib.Path | None = None,
+    region: str = DEFAULT_REGION,
+    apply_engine: ApplyEngine | None = None,
 ) -> None:
     """
     Renders the base and remote Makefiles separately, then merges them.
 
     If remote_template_path is not provided, only the base Makefile is rendered.
+    A region other than the default is substituted in the merged Makefile.
+    With an apply_engine, the Makefile is only written if its content changed.
     """
 
-    env = Environment()
-
     # Render the base Makefile
     base_makefile_path = base_template_path / "Makefile"
     if base_makefile_path.exists():
         with open(base_makefile_path, encoding="utf-8") as f:
-            base_template = env.from_string(f.read())
-        rendered_base_makefile = base_template.render(cookiecutter=cookiecutter_config)
+            rendered_base_makefile = render_string(
+                f.read(), "Makefile", cookiecutter=cookiecutter_config
+            )
     else:
         rendered_base_makefile = ""
 
@@ -487,45 +581,31 @@ def render_and_merge_makefiles(
         remote_makefile_path = remote_template_path / "Makefile"
         if remote_makefile_path.exists():
             with open(remote_makefile_path, encoding="utf-8") as f:
-                remote_template = env.from_string(f.read())
-            rendered_remote_makefile = remote_template.render(
-                cookiecutter=cookiecutter_config
-            )
+                rendered_remote_makefile = render_string(
+                    f.read(), "Makefile", cookiecutter=cookiecutter_config
+                )
 
-    # Merge the rendered Makefiles
+    # Merge the rendered Makefiles: remote content first, then the base rules
+    # that neither the remote Makefile nor the files it includes define
     if rendered_base_makefile and rendered_remote_makefile:
-        # A simple merge: remote content first, then append missing commands from base
-        base_commands = set(
-            re.findall(r"^([a-zA-Z0-9_-]+):", rendered_base_makefile, re.MULTILINE)
+        remote_makefile = parse_makefile(rendered_remote_makefile)
+        final_makefile_content = merge_makefiles(
+            parse_makefile(rendered_base_makefile),
+            remote_makefile,
+            collect_targets(remote_makefile, remote_template_path),
         )
-        remote_commands = set(
-            re.findall(r"^([a-zA-Z0-9_-]+):", rendered_remote_makefile, re.MULTILINE)
-        )
-        missing_commands = base_commands - remote_commands
-
-        if missing_commands:
-            commands_to_append = ["\n\n# --- Commands from Agent Starter Pack ---\n\n"]
-            for command in sorted(missing_commands):
-                command_block_match = re.search(
-                    rf"^{command}:.*?(?=\n\n(?:^#.*\n)*?^[a-zA-Z0-9_-]+:|" + r"\Z)",
-                    rendered_base_makefile,
-                    re.MULTILINE | re.DOTALL,
-                )
-                if command_block_match:
-                    commands_to_append.append(command_block_match.group(0))
-                    commands_to_append.append("\n\n")
-
-            final_makefile_content = rendered_remote_makefile + "".join(
-                commands_to_append
-            )
-        else:
-            final_makefile_content = rendered_remote_makefile
     elif rendered_remote_makefile:
         final_makefile_content = rendered_remote_makefile
     else:
         final_makefile_content = rendered_base_makefile
 
+    if region != DEFAULT_REGION:
+        final_makefile_content = RegionRewriter(region).rewrite(final_makefile_content)
+
     # Write the final merged Makefile
-    with open(final_destination / "Makefile", "w", encoding="utf-8") as f:
-        f.write(final_makefile_content)
+    if apply_engine is not None:
+        apply_engine.write_text(final_destination / "Makefile", final_makefile_content)
+    else:
+        with open(final_destination / "Makefile", "w", encoding="utf-8") as f:
+            f.write(final_makefile_content)
     logging.debug("Rendered and merged Makefile written to final destination.")
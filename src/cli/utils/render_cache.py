@@ -0,0 +1,208 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Content-addressed cache for rendered (cookiecutter) project trees.
+
+Projects are rendered once per combination of template inputs with a sentinel
+project name. On a cache hit the cached tree is replayed into the destination
+and only the per-project values are substituted.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import re
+import shutil
+import uuid
+from typing import Any
+
+from .cache import get_cache_dir
+from .profiler import count
+
+RENDER_CACHE_VERSION = "1"
+RENDER_CACHE_MAX_ENTRIES = 32
+PROJECT_NAME_SENTINEL = "asp-render-cache-project"
+
+_SKIPPED_NAMES = {"__pycache__", ".git"}
+
+
+def get_render_cache_dir() -> pathlib.Path:
+    """Get the directory holding cached renders."""
+    return get_cache_dir("render")
+
+
+def fingerprint_sources(source_paths: list[pathlib.Path]) -> str:
+    """Fingerprint template source trees from file paths, sizes and mtimes.
+
+    Args:
+        source_paths: Files or directories that feed the render
+
+    Returns:
+        Hex digest that changes whenever any source file is added, removed or edited
+    """
+    digest = hashlib.sha256()
+    for source in source_paths:
+        digest.update(str(source).encode())
+        if not source.exists():
+            digest.update(b"<missing>")
+            continue
+        if source.is_file():
+            stat = source.stat()
+            digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+            continue
+        for root, dirs, files in os.walk(source):
+            dirs[:] = sorted(d for d in dirs if d not in _SKIPPED_NAMES)
+            for name in sorted(files):
+                if name.endswith(".pyc"):
+                    continue
+                path = pathlib.Path(root) / name
+                stat = path.stat()
+                rel_path = path.relative_to(source).as_posix()
+                digest.update(f"{rel_path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def compute_render_cache_key(
+    cookiecutter_config: dict[str, Any], sources_fingerprint: str
+) -> str:
+    """Compute the cache key for a render.
+
+    The key covers every cookiecutter input except the project name (which is
+    replayed on a hit) plus a fingerprint of the template sources.
+
+    Args:
+        cookiecutter_config: The cookiecutter context used for the render
+        sources_fingerprint: Fingerprint of the template sources feeding the render
+
+    Returns:
+        Hex digest identifying the render
+    """
+    inputs = {k: v for k, v in cookiecutter_config.items() if k != "project_name"}
+    payload = json.dumps(
+        {
+            "version": RENDER_CACHE_VERSION,
+            "inputs": inputs,
+            "sources": sources_fingerprint,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def lookup_render(key: str) -> pathlib.Path | None:
+    """Return the cached render for a key, or None on a miss."""
+    entry = get_render_cache_dir() / key
+    if not entry.is_dir():
+        return None
+    # Bump the mtime so pruning evicts the least recently used entries first
+    os.utime(entry)
+    logging.debug(f"Render cache hit: {key}")
+    return entry
+
+
+def store_render(key: str, rendered_dir: pathlib.Path) -> pathlib.Path:
+    """Store a rendered project tree under its key.
+
+    The entry is written to a temporary name and renamed into place so that
+    concurrent writers never expose a partially written render.
+
+    Args:
+        key: Render cache key
+        rendered_dir: Directory produced by cookiecutter with the sentinel name
+
+    Returns:
+        Path to the cache entry
+    """
+    cache_dir = get_render_cache_dir()
+    entry = cache_dir / key
+    staging = cache_dir / f".{key}.{uuid.uuid4().hex}.tmp"
+    shutil.copytree(rendered_dir, staging, symlinks=True)
+    try:
+        os.rename(staging, entry)
+        logging.debug(f"Stored render in cache: {key}")
+    except OSError:
+        # Another process stored the same render first
+        shutil.rmtree(staging, ignore_errors=True)
+    prune_render_cache()
+    return entry
+
+
+def prune_render_cache(max_entries: int = RENDER_CACHE_MAX_ENTRIES) -> None:
+    """Remove the least recently used renders beyond max_entries."""
+    cache_dir = get_render_cache_dir()
+    entries = [
+        p for p in cache_dir.iterdir() if p.is_dir() and not p.name.startswith(".")
+    ]
+    if len(entries) <= max_entries:
+        return
+    entries.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+    for stale in entries[max_entries:]:
+        logging.debug(f"Pruning render cache entry: {stale.name}")
+        shutil.rmtree(stale, ignore_errors=True)
+
+
+def get_project_name_replacements(project_name: str) -> dict[str, str]:
+    """Map the sentinel project name (and its templated variants) to the real one."""
+    return {
+        PROJECT_NAME_SENTINEL: project_name,
+        PROJECT_NAME_SENTINEL.replace("-", "_"): project_name.replace("-", "_"),
+    }
+
+
+def materialize_render(
+    src: pathlib.Path, dst: pathlib.Path, replacements: dict[str, str]
+) -> None:
+    """Copy a rendered tree, applying literal replacements to paths and contents.
+
+    Args:
+        src: Rendered project tree (e.g. a render cache entry)
+        dst: Destination directory to create
+        replacements: Literal strings to replace, mapped to their replacement
+    """
+    byte_replacements = {k.encode(): v.encode() for k, v in replacements.items()}
+    pattern = re.compile(
+        b"|".join(
+            re.escape(k) for k in sorted(byte_replacements, key=len, reverse=True)
+        )
+    )
+
+    def replace_name(name: str) -> str:
+        for old, new in replacements.items():
+            name = name.replace(old, new)
+        return name
+
+    dst.mkdir(parents=True, exist_ok=True)
+    for root, dirs, files in os.walk(src):
+        root_path = pathlib.Path(root)
+        target_root = dst / replace_name(root_path.relative_to(src).as_posix())
+        for name in dirs:
+            (target_root / replace_name(name)).mkdir(exist_ok=True)
+        for name in files:
+            source_file = root_path / name
+            target_file = target_root / replace_name(name)
+            if source_file.is_symlink():
+                os.symlink(os.readlink(source_file), target_file)
+                continue
+            content = source_file.read_bytes()
+            count(files=1, bytes=len(content))
+            if pattern.search(content):
+                target_file.write_bytes(
+                    pattern.sub(lambda m: byte_replacements[m.group(0)], content)
+                )
+                shutil.copymode(source_file, target_file)
+            else:
+                shutil.copy2(source_file, target_file)
@@ -18,21 +18,61 @@ import os
 import pathlib
 import shutil
 import tempfile
+from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any
 
 import yaml
-from cookiecutter.main import cookiecutter
+from cookiecutter.config import get_user_config
+from cookiecutter.exceptions import UndefinedVariableInTemplate
+from cookiecutter.generate import (
+    create_env_with_context,
+    find_template,
+    generate_context,
+    is_binary,
+    is_copy_only_path,
+    render_and_create_dir,
+)
+from cookiecutter.prompt import prompt_for_config
+from jinja2 import Environment, FileSystemLoader, UndefinedError
 from rich.console import Console
 from rich.prompt import IntPrompt, Prompt
 
 from src.cli.utils.version import get_current_version
 
+from .apply import ApplyEngine, ApplySummary
+from .archive import ArchiveWriter
+from .cache import is_cache_enabled
+from .copy_engine import copy_many, matches_any
 from .datastores import DATASTORES
+from .jinja_cache import get_bytecode_cache
+from .lock_store import get_lock_store
+from .overlay import (
+    OverlayManifest,
+    SkipRules,
+    TemplateLayer,
+    resolve_overlay_manifest,
+)
+from .plan import RenderPlan, is_unused_path, plan_files, render_output_paths
+from .profiler import counting_copy, phase
+from .region import DEFAULT_REGION, RegionRewriter
+from .registry import (
+    DEFAULT_FRONTEND,
+    get_lock_filename,
+    get_registry,
+)
 from .remote_template import (
     get_base_template_name,
     render_and_merge_makefiles,
 )
+from .render_cache import (
+    PROJECT_NAME_SENTINEL,
+    compute_render_cache_key,
+    get_project_name_replacements,
+    lookup_render,
+    materialize_render,
+    store_render,
+)
 
 
 @dataclass
@@ -74,9 +114,31 @@ def get_overwrite_folders(agent_directory: str) -> list[str]:
     return [agent_directory, "frontend", "tests", "notebooks"]
 
 
-TEMPLATE_CONFIG_FILE = "templateconfig.yaml"
 DEPLOYMENT_FOLDERS = ["cloud_run", "agent_engine"]
-DEFAULT_FRONTEND = "streamlit"
+
+
+@dataclass
+class RenderRecord:
+    """Inputs and output location of a completed local template render."""
+
+    cookiecutter_config: dict[str, Any]
+    layers: list[TemplateLayer]
+    manifest: OverlayManifest
+    destination: pathlib.Path
+
+
+_render_listeners: list[Callable[[RenderRecord], None]] = []
+
+
+def add_render_listener(listener: Callable[[RenderRecord], None]) -> None:
+    """Register a callback invoked after every successful local render."""
+    _render_listeners.append(listener)
+
+
+def remove_render_listener(listener: Callable[[RenderRecord], None]) -> None:
+    """Unregister a callback added with add_render_listener."""
+    if listener in _render_listeners:
+        _render_listeners.remove(listener)
 
 
 def get_available_agents(deployment_target: str | None = None) -> dict:
@@ -95,37 +157,19 @@ def get_available_agents(deployment_target: str | None = None) -> dict:
 
     agents_list = []
     priority_agents_dict = dict.fromkeys(PRIORITY_AGENTS)  # Track priority agents
-    agents_dir = pathlib.Path(__file__).parent.parent.parent.parent / "agents"
-
-    for agent_dir in agents_dir.iterdir():
-        if agent_dir.is_dir() and not agent_dir.name.startswith("__"):
-            template_config_path = agent_dir / ".template" / "templateconfig.yaml"
-            if template_config_path.exists():
-                try:
-                    with open(template_config_path, encoding="utf-8") as f:
-                        config = yaml.safe_load(f)
-                    agent_name = agent_dir.name
-
-                    # Skip if deployment target specified and agent doesn't support it
-                    if deployment_target:
-                        targets = config.get("settings", {}).get(
-                            "deployment_targets", []
-                        )
-                        if isinstance(targets, str):
-                            targets = [targets]
-                        if deployment_target not in targets:
-                            continue
-
-                    description = config.get("description", "No description available")
-                    agent_info = {"name": agent_name, "description": description}
-
-                    # Add to priority list or regular list based on agent name
-                    if agent_name in PRIORITY_AGENTS:
-                        priority_agents_dict[agent_name] = agent_info
-                    else:
-                        agents_list.append(agent_info)
-                except Exception as e:
-                    logging.warning(f"Could not load agent from {agent_dir}: {e}")
+
+    for agent_name, entry in get_registry().agents().items():
+        # Skip if deployment target specified and agent doesn't support it
+        if deployment_target and deployment_target not in entry.targets:
+            continue
+
+        agent_info = {"name": agent_name, "description": entry.description}
+
+        # Add to priority list or regular list based on agent name
+        if agent_name in PRIORITY_AGENTS:
+            priority_agents_dict[agent_name] = agent_info
+        else:
+            agents_list.append(agent_info)
 
     # Sort the non-priority agents
     agents_list.sort(key=lambda x: x["name"])
@@ -145,15 +189,13 @@ def get_available_agents(deployment_target: str | None = None) -> dict:
 
 
 def load_template_config(template_dir: pathlib.Path) -> dict[str, Any]:
-    """Read .templateconfig.yaml file to get agent configuration."""
-    config_file = template_dir / TEMPLATE_CONFIG_FILE
-    if not config_file.exists():
-        return {}
+    """Read .templateconfig.yaml file to get agent configuration.
 
+    Configs are served from the template registry, so each file is parsed at
+    most once per process.
+    """
     try:
-        with open(config_file, encoding="utf-8") as f:
-            config = yaml.safe_load(f)
-            return config if config else {}
+        return get_registry().load_config(template_dir) or {}
     except Exception as e:
         logging.error(f"Error loading template config: {e}")
         return {}
@@ -163,21 +205,15 @@ def get_deployment_targets(
     agent_name: str, remote_config: dict[str, Any] | None = None
 ) -> list:
     """Get available deployment targets for the selected agent."""
-    if remote_config:
-        config = remote_config
-    else:
-        template_path = (
-            pathlib.Path(__file__).parent.parent.parent.parent
-            / "agents"
-            / agent_name
-            / ".template"
-        )
-        config = load_template_config(template_path)
-
-    if not config:
-        return []
+    if not remote_config:
+        try:
+            entry = get_registry().get(agent_name)
+        except Exception as e:
+            logging.error(f"Error loading template config: {e}")
+            return []
+        return entry.targets if entry else []
 
-    targets = config.get("settings", {}).get("deployment_targets", [])
+    targets = remote_config.get("settings", {}).get("deployment_targets", [])
     return targets if isinstance(targets, list) else [targets]
 
 
@@ -408,33 +444,272 @@ def get_template_path(agent_name: str, debug: bool = False) -> pathlib.Path:
     return template_path
 
 
-def copy_data_ingestion_files(
-    project_template: pathlib.Path, datastore_type: str
-) -> None:
-    """Copy data processing files to the project template for cookiecutter templating.
+def get_frontend_path(frontend_type: str) -> pathlib.Path | None:
+    """Get the source folder for a frontend type, falling back to the default."""
+    # Skip frontend files if frontend_type is "None"
+    if frontend_type == "None":
+        logging.debug("Frontend type is 'None', skipping frontend files")
+        return None
+
+    # Use default frontend if none specified
+    frontend_type = frontend_type or DEFAULT_FRONTEND
+    frontends_path = (
+        pathlib.Path(__file__).parent.parent.parent / "frontends" / frontend_type
+    )
+    if frontends_path.exists():
+        return frontends_path
+
+    logging.warning(f"Frontend type directory not found: {frontends_path}")
+    if frontend_type != DEFAULT_FRONTEND:
+        logging.info(f"Falling back to default frontend: {DEFAULT_FRONTEND}")
+        return get_frontend_path(DEFAULT_FRONTEND)
+    return None
+
+
+def get_template_layers(
+    agent_name: str,
+    agent_path: pathlib.Path,
+    agent_directory: str,
+    template_agent_directory: str,
+    deployment_target: str | None = None,
+    include_data_ingestion: bool = False,
+    frontend_type: str = DEFAULT_FRONTEND,
+) -> list[TemplateLayer]:
+    """Get the source layers of a project template in precedence order.
 
     Args:
-        project_template: Path to the project template directory
-        datastore_type: Type of datastore to use for data ingestion
+        agent_name: Name of the agent (for agent-specific exclusions)
+        agent_path: Path to the agent folder (parent of .template)
+        agent_directory: Agent directory name in the generated project
+        template_agent_directory: Agent directory name inside agent_path
+        deployment_target: Optional deployment target
+        include_data_ingestion: Whether to include data ingestion files
+        frontend_type: Frontend type to include
+
+    Returns:
+        List of template layers, lowest precedence first
     """
-    data_ingestion_src = pathlib.Path(__file__).parent.parent.parent / "data_ingestion"
-    data_ingestion_dst = project_template / "data_ingestion"
+    src_path = pathlib.Path(__file__).parent.parent.parent
+    layers = [
+        TemplateLayer(
+            "base_template",
+            src_path / "base_template",
+            agent_name=agent_name,
+            agent_directory=agent_directory,
+        )
+    ]
+    if deployment_target and deployment_target in DEPLOYMENT_FOLDERS:
+        layers.append(
+            TemplateLayer(
+                f"deployment_targets/{deployment_target}",
+                src_path / "deployment_targets" / deployment_target,
+                agent_name=agent_name,
+                agent_directory=agent_directory,
+            )
+        )
+    if include_data_ingestion:
+        layers.append(
+            TemplateLayer(
+                "data_ingestion", src_path / "data_ingestion", target="data_ingestion"
+            )
+        )
+    frontend_path = get_frontend_path(frontend_type)
+    if frontend_path is not None:
+        layers.append(TemplateLayer(f"frontends/{frontend_path.name}", frontend_path))
+    if agent_path.exists():
+        agent_folders = [(template_agent_directory, agent_directory)] + [
+            (folder, folder) for folder in ["frontend", "tests", "notebooks"]
+        ]
+        for source_folder, target_folder in agent_folders:
+            layers.append(
+                TemplateLayer(
+                    f"{agent_path.name}/{source_folder}",
+                    agent_path / source_folder,
+                    target=target_folder,
+                    agent_name=agent_name,
+                    agent_directory=agent_directory,
+                )
+            )
+    return layers
 
-    if data_ingestion_src.exists():
-        logging.debug(
-            f"Copying data processing files from {data_ingestion_src} to {data_ingestion_dst}"
+
+def _render_file(
+    env: Environment,
+    name: str,
+    infile: str,
+    outfile: pathlib.Path,
+    context: dict[str, Any],
+) -> None:
+    """Render a template file, keeping its line endings."""
+    rendered = env.get_template(name.replace(os.path.sep, "/")).render(**context)
+    newline = context["cookiecutter"].get("_new_lines")
+    if not newline:
+        with open(infile, encoding="utf-8") as f:
+            f.readline()
+        newline = f.newlines[0] if isinstance(f.newlines, tuple) else f.newlines
+    with open(outfile, "w", encoding="utf-8", newline=newline) as f:
+        f.write(rendered)
+
+
+def generate_files(
+    template_dir: pathlib.Path,
+    context: dict[str, Any],
+    output_dir: pathlib.Path,
+) -> pathlib.Path:
+    """Render a cookiecutter template without changing the working directory.
+
+    Produces the same files as cookiecutter's generate_files with
+    overwrite_if_exists, which renders from inside the template directory and
+    so can't run in two threads of a process at once. Here every template path
+    is resolved against the template directory instead. Hooks are not run,
+    the templates assembled by process_template have none.
+
+    Args:
+        template_dir: Directory containing cookiecutter.json
+        context: Context from generate_context
+        output_dir: Directory to generate the project into
+
+    Returns:
+        Path to the generated project
+    """
+    env = create_env_with_context(context)
+    template_root = find_template(template_dir.resolve(), env)
+    env.loader = FileSystemLoader(
+        [str(template_root), str(template_root.parent / "templates")]
+    )
+    output_dir = output_dir.resolve()
+    try:
+        project_dir, _ = render_and_create_dir(
+            template_root.name, context, output_dir, env, overwrite_if_exists=True
         )
+    except UndefinedError as err:
+        msg = f"Unable to create project directory '{template_root.name}'"
+        raise UndefinedVariableInTemplate(msg, err, context) from err
+
+    def output_path(rel_path: str) -> pathlib.Path:
+        return project_dir / env.from_string(rel_path).render(**context)
 
-        copy_files(data_ingestion_src, data_ingestion_dst, overwrite=True)
+    for root, dirs, files in os.walk(template_root):
+        rel_root = os.path.relpath(root, template_root)
 
-        logging.debug(f"Data ingestion files prepared for datastore: {datastore_type}")
+        render_dirs = []
+        for name in sorted(dirs):
+            rel_dir = os.path.normpath(os.path.join(rel_root, name))
+            if not is_copy_only_path(rel_dir, context):
+                render_dirs.append(name)
+                continue
+            out_dir = output_path(rel_dir)
+            if out_dir.is_dir():
+                shutil.rmtree(out_dir)
+            shutil.copytree(os.path.join(root, name), out_dir)
+        dirs[:] = render_dirs
+        for name in dirs:
+            rel_dir = os.path.normpath(os.path.join(rel_root, name))
+            try:
+                render_and_create_dir(
+                    rel_dir, context, project_dir, env, overwrite_if_exists=True
+                )
+            except UndefinedError as err:
+                msg = f"Unable to create directory '{rel_dir}'"
+                raise UndefinedVariableInTemplate(msg, err, context) from err
+
+        for name in sorted(files):
+            infile = os.path.join(root, name)
+            rel_file = os.path.normpath(os.path.join(rel_root, name))
+            try:
+                outfile = output_path(rel_file)
+                if outfile.is_dir():
+                    # The file name rendered empty
+                    continue
+                if is_copy_only_path(rel_file, context) or is_binary(infile):
+                    shutil.copyfile(infile, outfile)
+                else:
+                    _render_file(env, rel_file, infile, outfile, context)
+            except UndefinedError as err:
+                msg = f"Unable to create file '{rel_file}'"
+                raise UndefinedVariableInTemplate(msg, err, context) from err
+            shutil.copymode(infile, outfile)
+
+    return project_dir
+
+
+def run_cookiecutter(
+    template_dir: pathlib.Path,
+    output_dir: pathlib.Path,
+    extra_context: dict[str, Any] | None = None,
+) -> pathlib.Path:
+    """Generate a project from a local cookiecutter template without prompting.
+
+    Equivalent to cookiecutter's main entry point with no_input and
+    overwrite_if_exists, except that templates are compiled through the
+    persistent Jinja bytecode cache and no replay file is written.
+
+    Args:
+        template_dir: Directory containing cookiecutter.json
+        output_dir: Directory to generate the project into
+        extra_context: Values overriding those in cookiecutter.json
+
+    Returns:
+        Path to the generated project
+    """
+    user_config = get_user_config()
+    context = generate_context(
+        context_file=str(template_dir / "cookiecutter.json"),
+        default_context=user_config["default_context"],
+        extra_context=extra_context,
+    )
+    context["_cookiecutter"] = {
+        k: v for k, v in context["cookiecutter"].items() if not k.startswith("_")
+    }
+    context["cookiecutter"].update(prompt_for_config(context, no_input=True))
+    context["cookiecutter"]["_template"] = str(template_dir)
+    context["cookiecutter"]["_output_dir"] = str(output_dir.resolve())
+    context["cookiecutter"]["_repo_dir"] = str(template_dir)
+    context["cookiecutter"]["_checkout"] = None
+
+    bytecode_cache = get_bytecode_cache()
+    if bytecode_cache is not None:
+        context["cookiecutter"]["_jinja2_env_vars"] = {
+            **context["cookiecutter"].get("_jinja2_env_vars", {}),
+            "bytecode_cache": bytecode_cache,
+        }
+
+    return generate_files(template_dir, context, output_dir)
+
+
+def get_remote_preserved_files(remote_template_path: pathlib.Path) -> list[str]:
+    """Get the base template files kept as starter_pack_* next to a remote template's."""
+    preserve_files = ["README.md"]
+
+    # Only preserve pyproject.toml if the remote template doesn't have starter pack integration
+    remote_pyproject = remote_template_path / "pyproject.toml"
+    if remote_pyproject.exists():
+        try:
+            remote_pyproject_content = remote_pyproject.read_text()
+            # Check for starter pack integration markers
+            has_starter_pack_integration = (
+                "[tool.agent-starter-pack]" in remote_pyproject_content
+            )
+            if not has_starter_pack_integration:
+                preserve_files.append("pyproject.toml")
+                logging.debug(
+                    "Remote pyproject.toml lacks starter pack integration - will preserve base template version"
+                )
+            else:
+                logging.debug(
+                    "Remote pyproject.toml has starter pack integration - using remote version only"
+                )
+        except Exception as e:
+            logging.warning(
+                f"Could not read remote pyproject.toml: {e}. Will preserve base template version."
+            )
+            preserve_files.append("pyproject.toml")
     else:
-        logging.warning(
-            f"Data processing source directory not found at {data_ingestion_src}"
-        )
+        preserve_files.append("pyproject.toml")
+    return preserve_files
 
 
-def process_template(
+def plan_template(
     agent_name: str,
     template_dir: pathlib.Path,
     project_name: str,
@@ -449,29 +724,38 @@ def process_template(
     in_folder: bool = False,
     cli_overrides: dict[str, Any] | None = None,
     agent_garden: bool = False,
-) -> None:
-    """Process the template directory and create a new project.
+    region: str = DEFAULT_REGION,
+    with_files: bool = True,
+) -> RenderPlan:
+    """Plan a render: resolve its configuration and layers, and its file actions.
+
+    Takes the arguments of process_template. Only template configs and
+    directory listings are read; no file is rendered or written.
 
     Args:
-        agent_name: Name of the agent template to use
-        template_dir: Directory containing the template files
-        project_name: Name of the project to create
-        deployment_target: Optional deployment target (agent_engine or cloud_run)
-        cicd_runner: Optional CI/CD runner to use
-        include_data_ingestion: Whether to include data pipeline components
-        datastore: Optional datastore type for data ingestion
-        session_type: Optional session type for cloud_run deployment
-        output_dir: Optional output directory path, defaults to current directory
-        remote_template_path: Optional path to remote template for overlay
-        remote_config: Optional remote template configuration
-        in_folder: Whether to template directly into the output directory instead of creating a subdirectory
-        cli_overrides: Optional CLI override values that should take precedence over template config
-        agent_garden: Whether this deployment is from Agent Garden
+        with_files: Whether to work out the file actions, which reads the
+            destination directory
+
+    Returns:
+        The plan, which process_template(**plan.options, plan=plan) renders
     """
-    logging.debug(f"Processing template from {template_dir}")
-    logging.debug(f"Project name: {project_name}")
-    logging.debug(f"Include pipeline: {datastore}")
-    logging.debug(f"Output directory: {output_dir}")
+    options = {
+        "agent_name": agent_name,
+        "template_dir": template_dir,
+        "project_name": project_name,
+        "deployment_target": deployment_target,
+        "cicd_runner": cicd_runner,
+        "include_data_ingestion": include_data_ingestion,
+        "datastore": datastore,
+        "session_type": session_type,
+        "output_dir": output_dir,
+        "remote_template_path": remote_template_path,
+        "remote_config": remote_config,
+        "in_folder": in_folder,
+        "cli_overrides": cli_overrides,
+        "agent_garden": agent_garden,
+        "region": region,
+    }
 
     def get_agent_directory(
         template_config: dict[str, Any], cli_overrides: dict[str, Any] | None = None
@@ -507,466 +791,566 @@ def process_template(
         f"agent path contents: {list(agent_path.iterdir()) if agent_path.exists() else 'N/A'}"
     )
 
-    base_template_path = pathlib.Path(__file__).parent.parent.parent / "base_template"
+    # Load and validate template config first
+    if is_remote:
+        config = remote_config or {}
+    else:
+        template_path = pathlib.Path(template_dir)
+        config = load_template_config(template_path)
 
-    # Use provided output_dir or current directory
-    destination_dir = output_dir if output_dir else pathlib.Path.cwd()
+    if not config:
+        raise ValueError("Could not load template config")
 
-    # Create output directory if it doesn't exist
-    if not destination_dir.exists():
-        destination_dir.mkdir(parents=True)
+    # Validate deployment target
+    available_targets = config.get("settings", {}).get("deployment_targets", [])
+    if isinstance(available_targets, str):
+        available_targets = [available_targets]
 
-    # Create a new temporary directory and use it as our working directory
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = pathlib.Path(temp_dir)
+    if deployment_target and deployment_target not in available_targets:
+        raise ValueError(
+            f"Invalid deployment target '{deployment_target}'. Available targets: {available_targets}"
+        )
 
-        # Important: Store the original working directory
-        original_dir = pathlib.Path.cwd()
+    # Use the already loaded config
+    template_config = config
+    agent_directory = get_agent_directory(template_config, cli_overrides)
 
-        try:
-            os.chdir(temp_path)  # Change to temp directory
+    # Frontend files are copied based on the template's own config
+    frontend_config = (
+        load_template_config(pathlib.Path(template_dir))
+        if is_remote
+        else template_config
+    )
+    copy_frontend_type = frontend_config.get("settings", {}).get(
+        "frontend_type", DEFAULT_FRONTEND
+    )
 
-            # Create the cookiecutter template structure
-            cookiecutter_template = temp_path / "template"
-            cookiecutter_template.mkdir(parents=True)
-            project_template = cookiecutter_template / "{{cookiecutter.project_name}}"
-            project_template.mkdir(parents=True)
+    # Create cookiecutter.json in the template root
+    # Get settings from template config
+    settings = template_config.get("settings", {})
+    extra_deps = settings.get("extra_dependencies", [])
+    frontend_type = settings.get("frontend_type", DEFAULT_FRONTEND)
+    tags = settings.get("tags", ["None"])
 
-            # 1. First copy base template files
-            base_template_path = (
-                pathlib.Path(__file__).parent.parent.parent / "base_template"
-            )
-            # Get agent directory from config early for use in file copying
-            # Load config early to get agent_directory
-            if is_remote:
-                early_config = remote_config or {}
-            else:
-                template_path = pathlib.Path(template_dir)
-                early_config = load_template_config(template_path)
-            agent_directory = get_agent_directory(early_config, cli_overrides)
-            copy_files(
-                base_template_path,
-                project_template,
-                agent_name,
-                overwrite=True,
-                agent_directory=agent_directory,
-            )
-            logging.debug(f"1. Copied base template from {base_template_path}")
-
-            # 2. Process deployment target if specified
-            if deployment_target and deployment_target in DEPLOYMENT_FOLDERS:
-                deployment_path = (
-                    pathlib.Path(__file__).parent.parent.parent
-                    / "deployment_targets"
-                    / deployment_target
-                )
-                if deployment_path.exists():
-                    copy_files(
-                        deployment_path,
-                        project_template,
-                        agent_name=agent_name,
-                        overwrite=True,
-                        agent_directory=agent_directory,
-                    )
-                    logging.debug(
-                        f"2. Processed deployment files for target: {deployment_target}"
-                    )
+    # Load adk-cheatsheet.md and llm.txt for injection
+    adk_cheatsheet_path = (
+        pathlib.Path(__file__).parent.parent.parent
+        / "resources"
+        / "docs"
+        / "adk-cheatsheet.md"
+    )
+    with open(adk_cheatsheet_path, encoding="utf-8") as f:
+        adk_cheatsheet_content = f.read()
+
+    llm_txt_path = pathlib.Path(__file__).parent.parent.parent.parent / "llm.txt"
+    with open(llm_txt_path, encoding="utf-8") as f:
+        llm_txt_content = f.read()
+
+    cookiecutter_config = {
+        "project_name": project_name,
+        "agent_name": agent_name,
+        "package_version": get_current_version(),
+        "agent_description": template_config.get("description", ""),
+        "example_question": template_config.get("example_question", "").ljust(61),
+        "settings": settings,
+        "tags": tags,
+        "deployment_target": deployment_target or "",
+        "cicd_runner": cicd_runner or "google_cloud_build",
+        "session_type": session_type or "",
+        "frontend_type": frontend_type,
+        "extra_dependencies": [extra_deps],
+        "data_ingestion": include_data_ingestion,
+        "datastore_type": datastore if datastore else "",
+        "agent_directory": agent_directory,
+        "agent_garden": agent_garden,
+        "adk_cheatsheet": adk_cheatsheet_content,
+        "llm_txt": llm_txt_content,
+        "_copy_without_render": [
+            "*.ipynb",  # Don't render notebooks
+            "*.json",  # Don't render JSON files
+            "frontend/*",  # Don't render frontend directory
+            "notebooks/*",  # Don't render notebooks directory
+            ".git/*",  # Don't render git directory
+            "__pycache__/*",  # Don't render cache
+            "**/__pycache__/*",
+            ".pytest_cache/*",
+            ".venv/*",
+            "*templates.py",  # Don't render templates files
+            "Makefile",  # Don't render Makefile - handled by render_and_merge_makefiles
+            # Don't render agent.py unless it's agentic_rag
+            f"{agent_directory}/agent.py" if agent_name != "agentic_rag" else "",
+        ],
+    }
 
-            # 3. Copy data ingestion files if needed
-            if include_data_ingestion and datastore:
-                logging.debug(
-                    f"3. Including data processing files with datastore: {datastore}"
-                )
-                copy_data_ingestion_files(project_template, datastore)
+    # Resolve all template layers into a single manifest of winning files
+    template_layers = get_template_layers(
+        agent_name,
+        agent_path,
+        agent_directory,
+        template_config.get("settings", {}).get("agent_directory", "app"),
+        deployment_target=deployment_target,
+        include_data_ingestion=include_data_ingestion and bool(datastore),
+        frontend_type=copy_frontend_type,
+    )
+    manifest = resolve_overlay_manifest(template_layers)
+    logging.debug(
+        f"Resolved {len(manifest.files)} template files from "
+        f"{len(template_layers)} layers"
+    )
 
-            # 4. Process frontend files
-            # Load template config
-            template_config = load_template_config(pathlib.Path(template_dir))
-            frontend_type = template_config.get("settings", {}).get(
-                "frontend_type", DEFAULT_FRONTEND
-            )
-            copy_frontend_files(frontend_type, project_template)
-            logging.debug(f"4. Processed frontend files for type: {frontend_type}")
+    destination_dir = (output_dir if output_dir else pathlib.Path.cwd()).resolve()
+    plan = RenderPlan(
+        options=options,
+        destination=destination_dir if in_folder else destination_dir / project_name,
+        template_config=template_config,
+        cookiecutter_config=cookiecutter_config,
+        agent_directory=agent_directory,
+        layers=template_layers,
+        manifest=manifest,
+    )
+    if not with_files:
+        return plan
 
-            # 6. Skip remote template files during cookiecutter processing
-            # Remote files will be copied after cookiecutter to avoid Jinja conflicts
-            if is_remote and remote_template_path:
-                logging.debug(
-                    "6. Skipping remote template files during cookiecutter processing - will copy after templating"
+    rendered = render_output_paths(
+        manifest, {**cookiecutter_config, "project_name": project_name}
+    )
+    generated: dict[str, tuple[str | None, str | None]] = {
+        path: (str(manifest.files[output_path]), manifest.origins[output_path])
+        for path, output_path in rendered.items()
+    }
+    late_writes: dict[str, tuple[str | None, str | None]] = {}
+    if is_remote and remote_template_path:
+        for preserve_file in get_remote_preserved_files(remote_template_path):
+            if (
+                preserve_file in generated
+                and (remote_template_path / preserve_file).exists()
+            ):
+                generated[f"starter_pack_{preserve_file}"] = generated[preserve_file]
+        remote_manifest = resolve_overlay_manifest(
+            [
+                TemplateLayer(
+                    "remote",
+                    remote_template_path,
+                    agent_name=agent_name,
+                    agent_directory=agent_directory,
                 )
+            ]
+        )
+        for path, source in remote_manifest.files.items():
+            generated[path] = (str(source), "remote")
+        for name in ["pyproject.toml", "uv.lock"]:
+            if (remote_template_path / name).exists():
+                late_writes[name] = (str(remote_template_path / name), "remote")
+    elif deployment_target:
+        late_writes["uv.lock"] = (
+            get_lock_filename(agent_name, deployment_target),
+            "lock store",
+        )
+    plan.files = plan_files(generated, plan.destination, in_folder, late_writes)
+    return plan
 
-            # Load and validate template config first
-            if is_remote:
-                config = remote_config or {}
-            else:
-                template_path = pathlib.Path(template_dir)
-                config = load_template_config(template_path)
 
-            if not config:
-                raise ValueError("Could not load template config")
+def process_template(
+    agent_name: str,
+    template_dir: pathlib.Path,
+    project_name: str,
+    deployment_target: str | None = None,
+    cicd_runner: str | None = None,
+    include_data_ingestion: bool = False,
+    datastore: str | None = None,
+    session_type: str | None = None,
+    output_dir: pathlib.Path | None = None,
+    remote_template_path: pathlib.Path | None = None,
+    remote_config: dict[str, Any] | None = None,
+    in_folder: bool = False,
+    cli_overrides: dict[str, Any] | None = None,
+    agent_garden: bool = False,
+    region: str = DEFAULT_REGION,
+    archive: ArchiveWriter | None = None,
+    plan: RenderPlan | None = None,
+) -> ApplySummary | None:
+    """Process the template directory and create a new project.
+
+    Args:
+        agent_name: Name of the agent template to use
+        template_dir: Directory containing the template files
+        project_name: Name of the project to create
+        deployment_target: Optional deployment target (agent_engine or cloud_run)
+        cicd_runner: Optional CI/CD runner to use
+        include_data_ingestion: Whether to include data pipeline components
+        datastore: Optional datastore type for data ingestion
+        session_type: Optional session type for cloud_run deployment
+        output_dir: Optional output directory path, defaults to current directory
+        remote_template_path: Optional path to remote template for overlay
+        remote_config: Optional remote template configuration
+        in_folder: Whether to template directly into the output directory instead of creating a subdirectory
+        cli_overrides: Optional CLI override values that should take precedence over template config
+        agent_garden: Whether this deployment is from Agent Garden
+        region: GCP region, substituted for the default region while the
+            generated files are copied into place
+        archive: Write the project to this archive, below a directory named
+            after the project, instead of into output_dir
+        plan: Plan from plan_template with the same arguments, whose
+            configuration and layers are rendered instead of resolving them again
+
+    Returns:
+        In in-folder mode, which files were added, modified, left unchanged
+        or removed in the destination directory; otherwise None
+    """
+    logging.debug(f"Processing template from {template_dir}")
+    logging.debug(f"Project name: {project_name}")
+    logging.debug(f"Include pipeline: {datastore}")
+    logging.debug(f"Output directory: {output_dir}")
+    if archive is not None and in_folder:
+        raise ValueError("A project can't be written to an archive in in-folder mode")
 
-            # Validate deployment target
-            available_targets = config.get("settings", {}).get("deployment_targets", [])
-            if isinstance(available_targets, str):
-                available_targets = [available_targets]
+    # Handle remote vs local templates
+    is_remote = remote_template_path is not None
 
-            if deployment_target and deployment_target not in available_targets:
-                raise ValueError(
-                    f"Invalid deployment target '{deployment_target}'. Available targets: {available_targets}"
-                )
+    base_template_path = pathlib.Path(__file__).parent.parent.parent / "base_template"
 
-            # Use the already loaded config
-            template_config = config
+    # Use provided output_dir or current directory
+    destination_dir = (output_dir if output_dir else pathlib.Path.cwd()).resolve()
 
-            # 5. Copy agent-specific files to override base template (using final config)
-            if agent_path.exists():
-                agent_directory = get_agent_directory(template_config, cli_overrides)
+    # Create output directory if it doesn't exist
+    if archive is None:
+        destination_dir.mkdir(parents=True, exist_ok=True)
 
-                # Get the template's default agent directory (usually "app")
-                template_agent_directory = template_config.get("settings", {}).get(
-                    "agent_directory", "app"
-                )
+    # Render in a private temporary directory. Every path below is absolute,
+    # so concurrent renders in one process don't interfere.
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = pathlib.Path(temp_dir)
 
-                # Copy agent directory (always from "app" to target directory)
-                source_agent_folder = agent_path / template_agent_directory
-                target_agent_folder = project_template / agent_directory
-                if source_agent_folder.exists():
-                    logging.debug(
-                        f"5. Copying agent folder {template_agent_directory} -> {agent_directory} with override"
-                    )
-                    copy_files(
-                        source_agent_folder,
-                        target_agent_folder,
+        try:
+            if plan is None:
+                with phase("resolve layers"):
+                    plan = plan_template(
                         agent_name,
-                        overwrite=True,
-                        agent_directory=agent_directory,
+                        template_dir,
+                        project_name,
+                        deployment_target=deployment_target,
+                        cicd_runner=cicd_runner,
+                        include_data_ingestion=include_data_ingestion,
+                        datastore=datastore,
+                        session_type=session_type,
+                        output_dir=output_dir,
+                        remote_template_path=remote_template_path,
+                        remote_config=remote_config,
+                        in_folder=in_folder,
+                        cli_overrides=cli_overrides,
+                        agent_garden=agent_garden,
+                        region=region,
+                        with_files=False,
                     )
+            cookiecutter_config = plan.cookiecutter_config
+            agent_directory = plan.agent_directory
+            template_layers = plan.layers
+            manifest = plan.manifest
 
-                # Copy other folders (frontend, tests, notebooks)
-                other_folders = ["frontend", "tests", "notebooks"]
-                for folder in other_folders:
-                    agent_folder = agent_path / folder
-                    project_folder = project_template / folder
-                    if agent_folder.exists():
-                        logging.debug(f"5. Copying {folder} folder with override")
-                        copy_files(
-                            agent_folder,
-                            project_folder,
-                            agent_name,
-                            overwrite=True,
-                            agent_directory=agent_directory,
-                        )
+            generated_project_dir = temp_path / project_name
 
-            # Check if data processing should be included
-            if include_data_ingestion and datastore:
-                logging.debug(
-                    f"Including data processing files with datastore: {datastore}"
+            # Local renders are cached by their inputs; remote templates are not
+            cache_key = None
+            cached_render = None
+            with phase("cache lookup"):
+                if (
+                    not is_remote
+                    and is_cache_enabled()
+                    and project_name != PROJECT_NAME_SENTINEL
+                ):
+                    cache_key = compute_render_cache_key(
+                        cookiecutter_config, manifest.fingerprint()
+                    )
+                    cached_render = lookup_render(cache_key)
+
+            if cached_render is not None:
+                with phase("cache replay"):
+                    materialize_render(
+                        cached_render,
+                        generated_project_dir,
+                        get_project_name_replacements(project_name),
+                    )
+                logging.debug(f"Replayed cached render from {cached_render}")
+            else:
+                # Render with a sentinel name so the output can be cached and
+                # replayed for any project name
+                render_name = PROJECT_NAME_SENTINEL if cache_key else project_name
+
+                # Create the cookiecutter template structure
+                cookiecutter_template = temp_path / "template"
+                cookiecutter_template.mkdir(parents=True)
+                project_template = (
+                    cookiecutter_template / "{{cookiecutter.project_name}}"
                 )
-                copy_data_ingestion_files(project_template, datastore)
-
-            # Create cookiecutter.json in the template root
-            # Get settings from template config
-            settings = template_config.get("settings", {})
-            extra_deps = settings.get("extra_dependencies", [])
-            frontend_type = settings.get("frontend_type", DEFAULT_FRONTEND)
-            tags = settings.get("tags", ["None"])
-
-            # Load adk-cheatsheet.md and llm.txt for injection
-            adk_cheatsheet_path = (
-                pathlib.Path(__file__).parent.parent.parent
-                / "resources"
-                / "docs"
-                / "adk-cheatsheet.md"
-            )
-            with open(adk_cheatsheet_path, encoding="utf-8") as f:
-                adk_cheatsheet_content = f.read()
+                project_template.mkdir(parents=True)
 
-            llm_txt_path = (
-                pathlib.Path(__file__).parent.parent.parent.parent / "llm.txt"
-            )
-            with open(llm_txt_path, encoding="utf-8") as f:
-                llm_txt_content = f.read()
-
-            cookiecutter_config = {
-                "project_name": project_name,
-                "agent_name": agent_name,
-                "package_version": get_current_version(),
-                "agent_description": template_config.get("description", ""),
-                "example_question": template_config.get("example_question", "").ljust(
-                    61
-                ),
-                "settings": settings,
-                "tags": tags,
-                "deployment_target": deployment_target or "",
-                "cicd_runner": cicd_runner or "google_cloud_build",
-                "session_type": session_type or "",
-                "frontend_type": frontend_type,
-                "extra_dependencies": [extra_deps],
-                "data_ingestion": include_data_ingestion,
-                "datastore_type": datastore if datastore else "",
-                "agent_directory": get_agent_directory(template_config, cli_overrides),
-                "agent_garden": agent_garden,
-                "adk_cheatsheet": adk_cheatsheet_content,
-                "llm_txt": llm_txt_content,
-                "_copy_without_render": [
-                    "*.ipynb",  # Don't render notebooks
-                    "*.json",  # Don't render JSON files
-                    "frontend/*",  # Don't render frontend directory
-                    "notebooks/*",  # Don't render notebooks directory
-                    ".git/*",  # Don't render git directory
-                    "__pycache__/*",  # Don't render cache
-                    "**/__pycache__/*",
-                    ".pytest_cache/*",
-                    ".venv/*",
-                    "*templates.py",  # Don't render templates files
-                    "Makefile",  # Don't render Makefile - handled by render_and_merge_makefiles
-                    # Don't render agent.py unless it's agentic_rag
-                    f"{get_agent_directory(template_config, cli_overrides)}/agent.py"
-                    if agent_name != "agentic_rag"
-                    else "",
-                ],
-            }
-
-            with open(
-                cookiecutter_template / "cookiecutter.json", "w", encoding="utf-8"
-            ) as f:
-                json.dump(cookiecutter_config, f, indent=4)
-
-            logging.debug(f"Template structure created at {cookiecutter_template}")
-            logging.debug(
-                f"Directory contents: {list(cookiecutter_template.iterdir())}"
-            )
+                # Copy only the winning file for each output path. Remote template
+                # files are copied after cookiecutter to avoid Jinja conflicts.
+                with phase("copy layers"):
+                    manifest.materialize(
+                        project_template,
+                        copy_without_render=cookiecutter_config["_copy_without_render"],
+                    )
 
-            # Process the template
-            cookiecutter(
-                str(cookiecutter_template),
-                no_input=True,
-                overwrite_if_exists=True,
-                extra_context={
-                    "project_name": project_name,
-                    "agent_name": agent_name,
-                },
-            )
-            logging.debug("Template processing completed successfully")
+                with open(
+                    cookiecutter_template / "cookiecutter.json", "w", encoding="utf-8"
+                ) as f:
+                    json.dump(
+                        {**cookiecutter_config, "project_name": render_name},
+                        f,
+                        indent=4,
+                    )
 
-            # Now overlay remote template files if present (after cookiecutter processing)
-            if is_remote and remote_template_path:
-                generated_project_dir = temp_path / project_name
+                logging.debug(f"Template structure created at {cookiecutter_template}")
                 logging.debug(
-                    f"Copying remote template files from {remote_template_path} to {generated_project_dir}"
+                    f"Directory contents: {list(cookiecutter_template.iterdir())}"
                 )
 
-                # Preserve base template README and pyproject.toml files before overwriting
-                preserve_files = ["README.md"]
-
-                # Only preserve pyproject.toml if the remote template doesn't have starter pack integration
-                remote_pyproject = remote_template_path / "pyproject.toml"
-                if remote_pyproject.exists():
-                    try:
-                        remote_pyproject_content = remote_pyproject.read_text()
-                        # Check for starter pack integration markers
-                        has_starter_pack_integration = (
-                            "[tool.agent-starter-pack]" in remote_pyproject_content
-                        )
-                        if not has_starter_pack_integration:
-                            preserve_files.append("pyproject.toml")
-                            logging.debug(
-                                "Remote pyproject.toml lacks starter pack integration - will preserve base template version"
-                            )
-                        else:
-                            logging.debug(
-                                "Remote pyproject.toml has starter pack integration - using remote version only"
-                            )
-                    except Exception as e:
-                        logging.warning(
-                            f"Could not read remote pyproject.toml: {e}. Will preserve base template version."
-                        )
-                        preserve_files.append("pyproject.toml")
-                else:
-                    preserve_files.append("pyproject.toml")
-
-                for preserve_file in preserve_files:
-                    base_file = generated_project_dir / preserve_file
-                    remote_file = remote_template_path / preserve_file
-
-                    if base_file.exists() and remote_file.exists():
-                        # Preserve the base template file with starter_pack prefix
-                        base_name = pathlib.Path(preserve_file).stem
-                        extension = pathlib.Path(preserve_file).suffix
-                        preserved_file = (
-                            generated_project_dir
-                            / f"starter_pack_{base_name}{extension}"
-                        )
-                        shutil.copy2(base_file, preserved_file)
-                        logging.debug(
-                            f"Preserved base template {preserve_file} as starter_pack_{base_name}{extension}"
+                # Process the template
+                with phase("cookiecutter"):
+                    run_cookiecutter(
+                        cookiecutter_template,
+                        output_dir=temp_path,
+                        extra_context={
+                            "project_name": render_name,
+                            "agent_name": agent_name,
+                        },
+                    )
+                logging.debug("Template processing completed successfully")
+
+                with phase("cache store"):
+                    if cache_key:
+                        rendered_dir = temp_path / render_name
+                        try:
+                            store_render(cache_key, rendered_dir)
+                        except OSError as e:
+                            logging.warning(f"Could not store render in cache: {e}")
+                        materialize_render(
+                            rendered_dir,
+                            generated_project_dir,
+                            get_project_name_replacements(project_name),
                         )
 
-                copy_files(
-                    remote_template_path,
-                    generated_project_dir,
-                    agent_name=agent_name,
-                    overwrite=True,
-                    agent_directory=agent_directory,
-                )
-                logging.debug("Remote template files copied successfully")
+            # Now overlay remote template files if present (after cookiecutter processing)
+            if is_remote and remote_template_path:
+                with phase("remote overlay"):
+                    generated_project_dir = temp_path / project_name
+                    logging.debug(
+                        f"Copying remote template files from {remote_template_path} to {generated_project_dir}"
+                    )
 
-            # Move the generated project to the final destination
-            generated_project_dir = temp_path / project_name
+                    # Preserve base template README and pyproject.toml files before overwriting
+                    preserve_files = get_remote_preserved_files(remote_template_path)
 
-            if in_folder:
-                # For in-folder mode, copy files directly to the destination directory
-                final_destination = destination_dir
-                logging.debug(
-                    f"In-folder mode: copying files from {generated_project_dir} to {final_destination}"
-                )
+                    for preserve_file in preserve_files:
+                        base_file = generated_project_dir / preserve_file
+                        remote_file = remote_template_path / preserve_file
 
-                if generated_project_dir.exists():
-                    # Copy all files from generated project to destination directory
-                    for item in generated_project_dir.iterdir():
-                        dest_item = final_destination / item.name
-
-                        # Special handling for README files - always preserve existing README
-                        # Special handling for pyproject.toml files - only preserve for in-folder updates
-                        should_preserve_file = item.name.lower().startswith(
-                            "readme"
-                        ) or (item.name == "pyproject.toml" and in_folder)
-                        if (
-                            should_preserve_file
-                            and (final_destination / item.name).exists()
-                        ):
-                            # The existing file stays, use base template file with starter_pack prefix
-                            base_name = item.stem
-                            extension = item.suffix
-                            dest_item = (
-                                final_destination
+                        if base_file.exists() and remote_file.exists():
+                            # Preserve the base template file with starter_pack prefix
+                            base_name = pathlib.Path(preserve_file).stem
+                            extension = pathlib.Path(preserve_file).suffix
+                            preserved_file = (
+                                generated_project_dir
                                 / f"starter_pack_{base_name}{extension}"
                             )
+                            shutil.copy2(base_file, preserved_file)
+                            logging.debug(
+                                f"Preserved base template {preserve_file} as starter_pack_{base_name}{extension}"
+                            )
 
-                            # Try to use base template file instead of templated file
-                            base_file = base_template_path / item.name
-                            if base_file.exists():
-                                logging.debug(
-                                    f"{item.name} conflict: preserving existing {item.name}, using base template {item.name} as starter_pack_{base_name}{extension}"
-                                )
-                                # Process the base template file through cookiecutter
-                                try:
-                                    import tempfile as tmp_module
-
-                                    with (
-                                        tmp_module.TemporaryDirectory() as temp_file_dir
-                                    ):
-                                        temp_file_path = pathlib.Path(temp_file_dir)
-
-                                        # Create a minimal cookiecutter structure for just the file
-                                        file_template_dir = (
-                                            temp_file_path / "file_template"
-                                        )
-                                        file_template_dir.mkdir()
-                                        file_project_dir = (
-                                            file_template_dir
-                                            / "{{cookiecutter.project_name}}"
-                                        )
-                                        file_project_dir.mkdir()
-
-                                        # Copy base file to template structure
-                                        shutil.copy2(
-                                            base_file, file_project_dir / item.name
-                                        )
+                    copy_files(
+                        remote_template_path,
+                        generated_project_dir,
+                        agent_name=agent_name,
+                        overwrite=True,
+                        agent_directory=agent_directory,
+                        copy_without_render=cookiecutter_config["_copy_without_render"],
+                    )
+                    logging.debug("Remote template files copied successfully")
 
-                                        # Create cookiecutter.json with same config as main template
-                                        with open(
-                                            file_template_dir / "cookiecutter.json",
-                                            "w",
-                                            encoding="utf-8",
-                                        ) as f:
-                                            json.dump(cookiecutter_config, f, indent=4)
-
-                                        # Process the file template
-                                        cookiecutter(
-                                            str(file_template_dir),
-                                            no_input=True,
-                                            overwrite_if_exists=True,
-                                            output_dir=str(temp_file_path),
-                                            extra_context={
-                                                "project_name": project_name,
-                                                "agent_name": agent_name,
-                                            },
-                                        )
+            # Move the generated project to the final destination, applying the
+            # region to each file as it is copied
+            with phase("copy to destination"):
+                generated_project_dir = temp_path / project_name
+                copy_generated = (
+                    RegionRewriter(region).copy
+                    if region != DEFAULT_REGION
+                    else shutil.copy2
+                )
 
-                                        # Copy the processed file
-                                        processed_file = (
-                                            temp_file_path / project_name / item.name
-                                        )
-                                        if processed_file.exists():
-                                            shutil.copy2(processed_file, dest_item)
-                                        else:
-                                            # Fallback to original behavior if processing fails
-                                            shutil.copy2(item, dest_item)
-
-                                except Exception as e:
-                                    logging.warning(
-                                        f"Failed to process base template {item.name}: {e}. Using templated {item.name} instead."
-                                    )
-                                    shutil.copy2(item, dest_item)
-                            else:
-                                # Fallback to original behavior if base file doesn't exist
-                                logging.debug(
-                                    f"{item.name} conflict: preserving existing {item.name}, saving templated {item.name} as starter_pack_{base_name}{extension}"
-                                )
-                                shutil.copy2(item, dest_item)
-                        else:
-                            # Normal file copying
-                            if item.is_dir():
-                                if dest_item.exists():
-                                    shutil.rmtree(dest_item)
-                                shutil.copytree(item, dest_item, dirs_exist_ok=True)
-                            else:
-                                shutil.copy2(item, dest_item)
+                if archive is not None:
+                    # Archive mode: finish the project in the temporary
+                    # directory, it is streamed to the archive at the end
+                    final_destination = generated_project_dir
+                    apply_engine = ApplyEngine(final_destination)
+                elif in_folder:
+                    # For in-folder mode, apply files directly to the destination
+                    # directory, only writing the ones whose content changed
+                    final_destination = destination_dir
+                    apply_engine = ApplyEngine(
+                        final_destination,
+                        RegionRewriter(region) if region != DEFAULT_REGION else None,
+                    )
                     logging.debug(
-                        f"Project files successfully copied to {final_destination}"
+                        f"In-folder mode: applying files from {generated_project_dir} to {final_destination}"
                     )
-            else:
-                # Standard mode: create project subdirectory
-                final_destination = destination_dir / project_name
-                logging.debug(
-                    f"Standard mode: moving project from {generated_project_dir} to {final_destination}"
-                )
 
-                if generated_project_dir.exists():
-                    # Check for existing README and pyproject.toml files before removing destination
-                    existing_preserved_files = []
-                    if final_destination.exists():
-                        for item in final_destination.iterdir():
-                            if item.is_file() and (
-                                item.name.lower().startswith("readme")
-                                or item.name == "pyproject.toml"
+                    if generated_project_dir.exists():
+                        # Apply all files from generated project to destination directory
+                        for item in sorted(generated_project_dir.iterdir()):
+                            # The Makefile is rendered and merged separately below
+                            if is_unused_path(item.name) or item.name == "Makefile":
+                                continue
+                            dest_item = final_destination / item.name
+
+                            # Special handling for README files - always preserve existing README
+                            # Special handling for pyproject.toml files - only preserve for in-folder updates
+                            should_preserve_file = item.name.lower().startswith(
+                                "readme"
+                            ) or (item.name == "pyproject.toml" and in_folder)
+                            if (
+                                should_preserve_file
+                                and (final_destination / item.name).exists()
                             ):
-                                existing_preserved_files.append(
-                                    (item.name, item.read_text())
+                                # The existing file stays, use base template file with starter_pack prefix
+                                base_name = item.stem
+                                extension = item.suffix
+                                dest_item = (
+                                    final_destination
+                                    / f"starter_pack_{base_name}{extension}"
                                 )
-                        shutil.rmtree(final_destination)
 
-                    shutil.copytree(
-                        generated_project_dir, final_destination, dirs_exist_ok=True
+                                # Try to use base template file instead of templated file
+                                base_file = base_template_path / item.name
+                                if base_file.exists():
+                                    logging.debug(
+                                        f"{item.name} conflict: preserving existing {item.name}, using base template {item.name} as starter_pack_{base_name}{extension}"
+                                    )
+                                    # Process the base template file through cookiecutter
+                                    try:
+                                        import tempfile as tmp_module
+
+                                        with (
+                                            tmp_module.TemporaryDirectory() as temp_file_dir
+                                        ):
+                                            temp_file_path = pathlib.Path(temp_file_dir)
+
+                                            # Create a minimal cookiecutter structure for just the file
+                                            file_template_dir = (
+                                                temp_file_path / "file_template"
+                                            )
+                                            file_template_dir.mkdir()
+                                            file_project_dir = (
+                                                file_template_dir
+                                                / "{{cookiecutter.project_name}}"
+                                            )
+                                            file_project_dir.mkdir()
+
+                                            # Copy base file to template structure
+                                            shutil.copy2(
+                                                base_file, file_project_dir / item.name
+                                            )
+
+                                            # Create cookiecutter.json with same config as main template
+                                            with open(
+                                                file_template_dir / "cookiecutter.json",
+                                                "w",
+                                                encoding="utf-8",
+                                            ) as f:
+                                                json.dump(
+                                                    cookiecutter_config, f, indent=4
+                                                )
+
+                                            # Process the file template
+                                            run_cookiecutter(
+                                                file_template_dir,
+                                                output_dir=temp_file_path,
+                                                extra_context={
+                                                    "project_name": project_name,
+                                                    "agent_name": agent_name,
+                                                },
+                                            )
+
+                                            # Copy the processed file
+                                            processed_file = (
+                                                temp_file_path
+                                                / project_name
+                                                / item.name
+                                            )
+                                            if processed_file.exists():
+                                                apply_engine.copy_file(
+                                                    processed_file, dest_item
+                                                )
+                                            else:
+                                                # Fallback to original behavior if processing fails
+                                                apply_engine.copy_file(item, dest_item)
+
+                                    except Exception as e:
+                                        logging.warning(
+                                            f"Failed to process base template {item.name}: {e}. Using templated {item.name} instead."
+                                        )
+                                        apply_engine.copy_file(item, dest_item)
+                                else:
+                                    # Fallback to original behavior if base file doesn't exist
+                                    logging.debug(
+                                        f"{item.name} conflict: preserving existing {item.name}, saving templated {item.name} as starter_pack_{base_name}{extension}"
+                                    )
+                                    apply_engine.copy_file(item, dest_item)
+                            else:
+                                # Generated directories replace existing ones, but
+                                # files with unchanged content are left untouched
+                                apply_engine.apply(item, dest_item, skip=is_unused_path)
+                        logging.debug(
+                            f"Project files successfully applied to {final_destination}: "
+                            f"{apply_engine.summary}"
+                        )
+                else:
+                    # Standard mode: create project subdirectory
+                    final_destination = destination_dir / project_name
+                    apply_engine = ApplyEngine(final_destination)
+                    logging.debug(
+                        f"Standard mode: moving project from {generated_project_dir} to {final_destination}"
                     )
 
-                    # Restore existing README and pyproject.toml files with starter_pack prefix
-                    for file_name, file_content in existing_preserved_files:
-                        base_name = pathlib.Path(file_name).stem
-                        extension = pathlib.Path(file_name).suffix
-                        preserved_file_path = (
-                            final_destination / f"starter_pack_{base_name}{extension}"
+                    if generated_project_dir.exists():
+                        # Check for existing README and pyproject.toml files before removing destination
+                        existing_preserved_files = []
+                        if final_destination.exists():
+                            for item in final_destination.iterdir():
+                                if item.is_file() and (
+                                    item.name.lower().startswith("readme")
+                                    or item.name == "pyproject.toml"
+                                ):
+                                    existing_preserved_files.append(
+                                        (item.name, item.read_text())
+                                    )
+                            shutil.rmtree(final_destination)
+
+                        shutil.copytree(
+                            generated_project_dir,
+                            final_destination,
+                            dirs_exist_ok=True,
+                            copy_function=counting_copy(copy_generated),
                         )
-                        preserved_file_path.write_text(file_content)
+
+                        # Restore existing README and pyproject.toml files with starter_pack prefix
+                        for file_name, file_content in existing_preserved_files:
+                            base_name = pathlib.Path(file_name).stem
+                            extension = pathlib.Path(file_name).suffix
+                            preserved_file_path = (
+                                final_destination
+                                / f"starter_pack_{base_name}{extension}"
+                            )
+                            preserved_file_path.write_text(file_content)
+                            logging.debug(
+                                f"File preservation: existing {file_name} preserved as starter_pack_{base_name}{extension}"
+                            )
+
                         logging.debug(
-                            f"File preservation: existing {file_name} preserved as starter_pack_{base_name}{extension}"
+                            f"Project successfully created at {final_destination}"
                         )
 
-                    logging.debug(
-                        f"Project successfully created at {final_destination}"
-                    )
-
             # Always check if the project was successfully created before proceeding
             if not final_destination.exists():
                 logging.error(
@@ -979,99 +1363,95 @@ def process_template(
             # Render and merge Makefiles.
             # If it's a local template, remote_template_path will be None,
             # and only the base Makefile will be rendered.
-            render_and_merge_makefiles(
-                base_template_path=base_template_path,
-                final_destination=final_destination,
-                cookiecutter_config=cookiecutter_config,
-                remote_template_path=remote_template_path,
-            )
-
-            # Delete appropriate files based on ADK tag
-            agent_directory = get_agent_directory(template_config, cli_overrides)
+            with phase("makefile merge"):
+                render_and_merge_makefiles(
+                    base_template_path=base_template_path,
+                    final_destination=final_destination,
+                    cookiecutter_config=cookiecutter_config,
+                    remote_template_path=remote_template_path,
+                    region=region,
+                    apply_engine=apply_engine,
+                )
 
             # Clean up unused_* files and directories created by conditional templates
             import glob
 
-            unused_patterns = [
-                final_destination / "unused_*",
-                final_destination / "**" / "unused_*",
-            ]
-
-            for pattern in unused_patterns:
-                for unused_path_str in glob.glob(str(pattern), recursive=True):
-                    unused_path = pathlib.Path(unused_path_str)
-                    if unused_path.exists():
-                        if unused_path.is_dir():
-                            shutil.rmtree(unused_path)
-                            logging.debug(f"Deleted unused directory: {unused_path}")
-                        else:
-                            unused_path.unlink()
-                            logging.debug(f"Deleted unused file: {unused_path}")
+            with phase("unused cleanup"):
+                unused_patterns = [
+                    final_destination / "unused_*",
+                    final_destination / "**" / "unused_*",
+                ]
+
+                for pattern in unused_patterns:
+                    for unused_path_str in glob.glob(str(pattern), recursive=True):
+                        unused_path = pathlib.Path(unused_path_str)
+                        if unused_path.exists():
+                            if unused_path.is_dir():
+                                shutil.rmtree(unused_path)
+                                logging.debug(
+                                    f"Deleted unused directory: {unused_path}"
+                                )
+                            else:
+                                unused_path.unlink()
+                                logging.debug(f"Deleted unused file: {unused_path}")
 
             # Handle pyproject.toml and uv.lock files
-            if is_remote and remote_template_path:
-                # For remote templates, use their pyproject.toml and uv.lock if they exist
-                remote_pyproject = remote_template_path / "pyproject.toml"
-                remote_uv_lock = remote_template_path / "uv.lock"
-
-                if remote_pyproject.exists():
-                    shutil.copy2(remote_pyproject, final_destination / "pyproject.toml")
-                    logging.debug("Used pyproject.toml from remote template")
-
-                if remote_uv_lock.exists():
-                    shutil.copy2(remote_uv_lock, final_destination / "uv.lock")
-                    logging.debug("Used uv.lock from remote template")
-            elif deployment_target:
-                # For local templates, use the existing logic
-                lock_path = (
-                    pathlib.Path(__file__).parent.parent.parent.parent
-                    / "src"
-                    / "resources"
-                    / "locks"
-                    / f"uv-{agent_name}-{deployment_target}.lock"
-                )
-                logging.debug(f"Looking for lock file at: {lock_path}")
-                logging.debug(f"Lock file exists: {lock_path.exists()}")
-                if not lock_path.exists():
-                    raise FileNotFoundError(f"Lock file not found: {lock_path}")
-                # Copy and rename to uv.lock in the project directory
-                shutil.copy2(lock_path, final_destination / "uv.lock")
-                logging.debug(
-                    f"Copied lock file from {lock_path} to {final_destination}/uv.lock"
-                )
+            with phase("lock file"):
+                if is_remote and remote_template_path:
+                    # For remote templates, use their pyproject.toml and uv.lock if they exist
+                    remote_pyproject = remote_template_path / "pyproject.toml"
+                    remote_uv_lock = remote_template_path / "uv.lock"
+
+                    if remote_pyproject.exists():
+                        apply_engine.copy_file(
+                            remote_pyproject, final_destination / "pyproject.toml"
+                        )
+                        logging.debug("Used pyproject.toml from remote template")
 
-                # Replace cookiecutter project name with actual project name in lock file
-                lock_file_path = final_destination / "uv.lock"
-                with open(lock_file_path, "r+", encoding="utf-8") as f:
-                    content = f.read()
-                    f.seek(0)
-                    f.write(
-                        content.replace("{{cookiecutter.project_name}}", project_name)
+                    if remote_uv_lock.exists():
+                        apply_engine.copy_file(
+                            remote_uv_lock, final_destination / "uv.lock"
+                        )
+                        logging.debug("Used uv.lock from remote template")
+                elif deployment_target:
+                    # For local templates, assemble uv.lock from the lock store,
+                    # replacing the cookiecutter project name with the actual one
+                    lock_name = get_lock_filename(agent_name, deployment_target)
+                    lock_file_path = final_destination / "uv.lock"
+                    apply_engine.write_chunks(
+                        lock_file_path,
+                        get_lock_store().iter_text(lock_name, project_name),
+                    )
+                    logging.debug(
+                        f"Wrote lock file {lock_name} to {lock_file_path} with the project name"
                     )
-                    f.truncate()
-                logging.debug(f"Updated project name in lock file at {lock_file_path}")
 
-        except Exception as e:
-            logging.error(f"Failed to process template: {e!s}")
-            raise
+            if archive is not None:
+                with phase("write archive"):
+                    rewriter = (
+                        RegionRewriter(region) if region != DEFAULT_REGION else None
+                    )
+                    archive.add_tree(
+                        final_destination,
+                        project_name,
+                        rewrite=rewriter.rewrite_file if rewriter else None,
+                    )
 
-        finally:
-            # Always restore the original working directory
-            os.chdir(original_dir)
+            if not is_remote:
+                record = RenderRecord(
+                    cookiecutter_config=cookiecutter_config,
+                    layers=template_layers,
+                    manifest=manifest,
+                    destination=final_destination,
+                )
+                for listener in list(_render_listeners):
+                    listener(record)
 
+            return apply_engine.summary if in_folder else None
 
-def should_exclude_path(
-    path: pathlib.Path, agent_name: str, agent_directory: str = "app"
-) -> bool:
-    """Determine if a path should be excluded based on the agent type."""
-    if agent_name == "live_api":
-        # Exclude the unit test utils folder and agent utils folder for live_api
-        if "tests/unit/test_utils" in str(path) or f"{agent_directory}/utils" in str(
-            path
-        ):
-            logging.debug(f"Excluding path for live_api: {path}")
-            return True
-    return False
+        except Exception as e:
+            logging.error(f"Failed to process template: {e!s}")
+            raise
 
 
 def copy_files(
@@ -1080,108 +1460,63 @@ def copy_files(
     agent_name: str | None = None,
     overwrite: bool = False,
     agent_directory: str = "app",
+    copy_without_render: list[str] | None = None,
+    max_workers: int | None = None,
 ) -> None:
     """
     Copy files with configurable behavior for exclusions and overwrites.
 
+    The tree is walked once with the exclusion rules compiled up front, then
+    the file copies run on a bounded thread pool.
+
     Args:
         src: Source path
         dst: Destination path
         agent_name: Name of the agent (for agent-specific exclusions)
         overwrite: Whether to overwrite existing files (True) or skip them (False)
         agent_directory: Name of the agent directory (for agent-specific exclusions)
+        copy_without_render: Patterns of files copied verbatim, which are
+            reflinked instead of copied where the filesystem supports it
+        max_workers: Copy thread pool size
     """
-
-    def should_skip(path: pathlib.Path) -> bool:
-        """Determine if a file/directory should be skipped during copying."""
-        if path.suffix in [".pyc"]:
-            return True
-        if "__pycache__" in str(path) or path.name == "__pycache__":
-            return True
-        if ".git" in path.parts:
-            return True
-        if agent_name is not None and should_exclude_path(
-            path, agent_name, agent_directory
-        ):
-            return True
-        if path.is_dir() and path.name == ".template":
-            return True
-        return False
-
-    if src.is_dir():
-        if not dst.exists():
-            dst.mkdir(parents=True)
-        for item in src.iterdir():
-            if should_skip(item):
-                logging.debug(f"Skipping file/directory: {item}")
-                continue
-
-            d = dst / item.name
-            if item.is_dir():
-                copy_files(item, d, agent_name, overwrite, agent_directory)
-            else:
-                if overwrite or not d.exists():
-                    logging.debug(f"Copying file: {item} -> {d}")
-                    shutil.copy2(item, d)
-                else:
-                    logging.debug(f"Skipping existing file: {d}")
-    else:
-        if not should_skip(src):
+    rules = SkipRules(agent_name, agent_directory)
+    if not src.is_dir():
+        if not rules.skips(src):
             if overwrite or not dst.exists():
                 shutil.copy2(src, dst)
-
-
-def copy_frontend_files(frontend_type: str, project_template: pathlib.Path) -> None:
-    """Copy files from the specified frontend folder directly to project root."""
-    # Skip copying if frontend_type is "None"
-    if frontend_type == "None":
-        logging.debug("Frontend type is 'None', skipping frontend files")
         return
 
-    # Use default frontend if none specified
-    frontend_type = frontend_type or DEFAULT_FRONTEND
-
-    # Get the frontends directory path
-    frontends_path = (
-        pathlib.Path(__file__).parent.parent.parent / "frontends" / frontend_type
-    )
-
-    if frontends_path.exists():
-        logging.debug(f"Copying frontend files from {frontends_path}")
-        # Copy frontend files directly to project root instead of a nested frontend directory
-        copy_files(frontends_path, project_template, overwrite=True)
-    else:
-        logging.warning(f"Frontend type directory not found: {frontends_path}")
-        if frontend_type != DEFAULT_FRONTEND:
-            logging.info(f"Falling back to default frontend: {DEFAULT_FRONTEND}")
-            copy_frontend_files(DEFAULT_FRONTEND, project_template)
+    if not dst.exists():
+        dst.mkdir(parents=True)
+    if rules.skips_tree(src):
+        return
 
+    patterns = copy_without_render or []
+    jobs = []
+    for root, dirs, files in os.walk(src, followlinks=True):
+        rel_root = os.path.relpath(root, src)
+        target_root = dst if rel_root == "." else dst / rel_root
 
-def copy_deployment_files(
-    deployment_target: str,
-    agent_name: str,
-    project_template: pathlib.Path,
-    agent_directory: str = "app",
-) -> None:
-    """Copy files from the specified deployment target folder."""
-    if not deployment_target:
-        return
+        kept_dirs = []
+        for name in dirs:
+            if rules.skips_entry(os.path.join(root, name), name, True):
+                logging.debug(f"Skipping file/directory: {os.path.join(root, name)}")
+                continue
+            kept_dirs.append(name)
+            (target_root / name).mkdir(exist_ok=True)
+        dirs[:] = kept_dirs
 
-    deployment_path = (
-        pathlib.Path(__file__).parent.parent.parent
-        / "deployment_targets"
-        / deployment_target
-    )
+        for name in files:
+            item = os.path.join(root, name)
+            if rules.skips_entry(item, name, False):
+                logging.debug(f"Skipping file/directory: {item}")
+                continue
+            d = target_root / name
+            if overwrite or not d.exists():
+                logging.debug(f"Copying file: {item} -> {d}")
+                rel_path = name if rel_root == "." else f"{rel_root}/{name}"
+                jobs.append((pathlib.Path(item), d, matches_any(rel_path, patterns)))
+            else:
+                logging.debug(f"Skipping existing file: {d}")
 
-    if deployment_path.exists():
-        logging.debug(f"Copying deployment files from {deployment_path}")
-        # Pass agent_name to respect agent-specific exclusions
-        copy_files(
-            deployment_path,
-            project_template,
-            agent_name=agent_name,
-            overwrite=True,
-            agent_directory=agent_directory,
-        )
-    else:
-        logging.warning(f"Deployment target directory not found: {deployment_path}")
+    copy_many(jobs, max_workers=max_workers)
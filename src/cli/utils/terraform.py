@@ -0,0 +1,217 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Terraform init and apply of the setup-cicd environments.
+
+The environments are independent Terraform roots with their own state, so
+they are applied concurrently, each with its own log file. All of them use
+one provider plugin cache in the user cache, so providers are downloaded
+once rather than per environment and run. Terraform doesn't support
+concurrent writes to the plugin cache, so the inits run one at a time.
+
+An init is skipped when the directory was initialized before with the same
+arguments, Terraform files (including backend.tf) and dependency lock file.
+A stamp with their hash is kept in the .terraform directory for this.
+"""
+
+import contextvars
+import hashlib
+import os
+import tempfile
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from .cache import get_cache_dir
+from .profiler import phase
+
+INIT_STAMP = "asp-init.sha256"
+LOCK_FILE = ".terraform.lock.hcl"
+
+
+def get_plugin_cache_dir() -> Path:
+    """Get the provider plugin cache, honouring TF_PLUGIN_CACHE_DIR."""
+    configured = os.environ.get("TF_PLUGIN_CACHE_DIR")
+    if configured:
+        return Path(configured)
+    return get_cache_dir("terraform-plugins")
+
+
+def get_terraform_env() -> dict[str, str]:
+    """Get the environment variables for running Terraform non-interactively."""
+    return {
+        "TF_PLUGIN_CACHE_DIR": str(get_plugin_cache_dir()),
+        "TF_IN_AUTOMATION": "1",
+    }
+
+
+def init_fingerprint(tf_dir: Path, init_args: list[str]) -> str:
+    """Hash the init arguments, Terraform files and dependency lock file."""
+    digest = hashlib.sha256("\0".join(init_args).encode())
+    for path in sorted([*tf_dir.glob("*.tf"), tf_dir / LOCK_FILE]):
+        try:
+            content = path.read_bytes()
+        except OSError:
+            continue
+        digest.update(f"\0{path.name}\0{len(content)}\0".encode())
+        digest.update(content)
+    return digest.hexdigest()
+
+
+def needs_init(tf_dir: Path, init_args: list[str]) -> bool:
+    """Check whether the directory isn't initialized for its current files."""
+    terraform_dir = tf_dir / ".terraform"
+    if not terraform_dir.is_dir():
+        return True
+    try:
+        stamp = (terraform_dir / INIT_STAMP).read_text(encoding="utf-8")
+    except OSError:
+        return True
+    return stamp.strip() != init_fingerprint(tf_dir, init_args)
+
+
+def mark_initialized(tf_dir: Path, init_args: list[str]) -> None:
+    """Record a successful init, once Terraform created the .terraform directory."""
+    terraform_dir = tf_dir / ".terraform"
+    if terraform_dir.is_dir():
+        (terraform_dir / INIT_STAMP).write_text(
+            init_fingerprint(tf_dir, init_args) + "\n", encoding="utf-8"
+        )
+
+
+@dataclass
+class TerraformStage:
+    """One Terraform root to initialize and apply.
+
+    Attributes:
+        name: Environment name, used for the timings and the log file
+        tf_dir: Terraform root directory
+        var_file: Variables file, relative to tf_dir
+        local_state: Whether to initialize without the remote backend
+        env_vars: Extra environment variables for Terraform
+    """
+
+    name: str
+    tf_dir: Path
+    var_file: str = "vars/env.tfvars"
+    local_state: bool = False
+    env_vars: dict[str, str] | None = None
+
+    @property
+    def init_args(self) -> list[str]:
+        return ["terraform", "init", "-input=false"] + (
+            ["-backend=false"] if self.local_state else []
+        )
+
+    @property
+    def apply_args(self) -> list[str]:
+        return [
+            "terraform",
+            "apply",
+            "-input=false",
+            f"-var-file={self.var_file}",
+            "-auto-approve",
+        ]
+
+
+def print_log_tail(log_file: Path, lines: int = 20) -> None:
+    """Print the end of a log file."""
+    try:
+        content = log_file.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return
+    print("\n".join(content.splitlines()[-lines:]))
+
+
+def run_stages(
+    stages: list[TerraformStage],
+    run_command: Callable[..., object],
+    log_dir: Path | None = None,
+) -> None:
+    """Initialize and apply Terraform roots, applying them concurrently.
+
+    Each stage is timed as "<name>/init" and "<name>/apply" phases of the
+    active profiler.
+
+    Args:
+        stages: Terraform roots to set up
+        run_command: Runs a command, like cicd.run_command
+        log_dir: Directory for a <name>.log file per stage, a new temporary
+            directory by default. A single stage logs to the terminal.
+
+    Raises:
+        The first error of a failed stage, after all stages finished
+    """
+    env = get_terraform_env()
+    init_lock = threading.Lock()
+    log_files: dict[str, Path] = {}
+    if len(stages) > 1:
+        if log_dir is None:
+            log_dir = Path(tempfile.mkdtemp(prefix="asp-terraform-"))
+        log_dir.mkdir(parents=True, exist_ok=True)
+        log_files = {stage.name: log_dir / f"{stage.name}.log" for stage in stages}
+        print(f"\n📝 Terraform output of each environment is logged to {log_dir}")
+
+    def run_stage(stage: TerraformStage) -> None:
+        env_vars = {**env, **(stage.env_vars or {})}
+        log_file = log_files.get(stage.name)
+        try:
+            set_up(stage, env_vars, log_file)
+        except Exception:
+            if log_file is not None:
+                print(f"\n❌ Terraform failed for {stage.name}, see {log_file}:")
+                print_log_tail(log_file)
+            raise
+
+    def set_up(
+        stage: TerraformStage, env_vars: dict[str, str], log_file: Path | None
+    ) -> None:
+        with phase(stage.name):
+            with init_lock, phase("init"):
+                if needs_init(stage.tf_dir, stage.init_args):
+                    print(f"\n🔧 Initializing Terraform in {stage.tf_dir}...")
+                    run_command(
+                        stage.init_args,
+                        cwd=stage.tf_dir,
+                        env_vars=env_vars,
+                        log_file=log_file,
+                    )
+                    mark_initialized(stage.tf_dir, stage.init_args)
+                else:
+                    print(f"\n⏭️ Terraform in {stage.tf_dir} is already initialized")
+            with phase("apply"):
+                print(f"\n🚀 Applying Terraform configuration in {stage.tf_dir}...")
+                run_command(
+                    stage.apply_args,
+                    cwd=stage.tf_dir,
+                    env_vars=env_vars,
+                    log_file=log_file,
+                )
+
+    if len(stages) <= 1:
+        for stage in stages:
+            run_stage(stage)
+        return
+
+    with ThreadPoolExecutor(max_workers=len(stages)) as executor:
+        # Each stage runs in a copy of the context, so it sees the profiler
+        futures = [
+            executor.submit(contextvars.copy_context().run, run_stage, stage)
+            for stage in stages
+        ]
+    errors = [future.exception() for future in futures if future.exception()]
+    if errors:
+        raise errors[0]
@@ -12,19 +12,34 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Version checking utilities for the CLI."""
+"""Version checking utilities for the CLI.
 
+The update check runs on a background thread and its result is cached on disk,
+so it never delays a command. The notice is printed to stderr when the command
+finishes, and only if the result is available by then. Keeping it off stdout
+leaves output such as a --plan or an --output-archive - stream intact.
+"""
+
+import json
 import logging
+import os
+import threading
+import time
 from importlib.metadata import PackageNotFoundError, version
 
-import requests
-from packaging import version as pkg_version
 from rich.console import Console
 
-console = Console()
+from .cache import get_cache_dir, is_cache_enabled
+
+console = Console(stderr=True)
 
 PACKAGE_NAME = "agent-starter-pack"
 
+UPDATE_CHECK_TTL_ENV_VAR = "ASP_UPDATE_CHECK_TTL"
+NO_UPDATE_CHECK_ENV_VAR = "ASP_NO_UPDATE_CHECK"
+DEFAULT_UPDATE_CHECK_TTL = 24 * 60 * 60
+UPDATE_CHECK_CACHE_FILE = "latest_version.json"
+
 
 def get_current_version() -> str:
     """Get the current installed version of the package."""
@@ -37,6 +52,8 @@ def get_current_version() -> str:
 
 def get_latest_version() -> str:
     """Get the latest version available on PyPI."""
+    import requests
+
     try:
         response = requests.get(f"https://pypi.org/pypi/{PACKAGE_NAME}/json", timeout=2)
         if response.status_code == 200:
@@ -46,24 +63,148 @@ def get_latest_version() -> str:
         return "0.0.0"  # Default if PyPI can't be reached
 
 
-def check_for_updates() -> tuple[bool, str, str]:
+def check_for_updates(latest: str | None = None) -> tuple[bool, str, str]:
     """Check if a newer version of the package is available.
 
+    Args:
+        latest: Latest known version, fetched from PyPI if not given
+
     Returns:
         Tuple of (needs_update, current_version, latest_version)
     """
+    from packaging import version as pkg_version
+
     current = get_current_version()
-    latest = get_latest_version()
+    if latest is None:
+        latest = get_latest_version()
 
     needs_update = pkg_version.parse(latest) > pkg_version.parse(current)
 
     return needs_update, current, latest
 
 
-def display_update_message() -> None:
-    """Check for updates and display a message if an update is available."""
+def is_update_check_enabled() -> bool:
+    """Return False when the update check has been disabled through the environment."""
+    return os.environ.get(NO_UPDATE_CHECK_ENV_VAR, "").lower() not in (
+        "1",
+        "true",
+        "yes",
+    )
+
+
+def get_update_check_ttl() -> float:
+    """Get how long, in seconds, a cached update check stays valid."""
+    try:
+        return float(os.environ.get(UPDATE_CHECK_TTL_ENV_VAR, DEFAULT_UPDATE_CHECK_TTL))
+    except ValueError:
+        return DEFAULT_UPDATE_CHECK_TTL
+
+
+def _get_cache_file() -> str | None:
+    if not is_cache_enabled():
+        return None
+    try:
+        return str(get_cache_dir("update-check") / UPDATE_CHECK_CACHE_FILE)
+    except OSError as e:
+        logging.debug(f"Update check cache unavailable: {e}")
+        return None
+
+
+def load_cached_latest_version(cache_file: str, ttl: float) -> str | None:
+    """Load the latest version from the cache, or None if missing or expired."""
+    try:
+        with open(cache_file, encoding="utf-8") as f:
+            cached = json.load(f)
+        if time.time() - float(cached["checked_at"]) < ttl:
+            return str(cached["latest"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def save_cached_latest_version(cache_file: str, latest: str) -> None:
+    """Record the latest version in the cache."""
+    temp_file = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump({"checked_at": time.time(), "latest": latest}, f)
+        os.replace(temp_file, cache_file)
+    except OSError as e:
+        logging.debug(f"Could not write update check cache: {e}")
+
+
+class UpdateCheck:
+    """Update check that never blocks the caller.
+
+    A cached result that is still within the TTL is used as is. Otherwise
+    PyPI is queried on a daemon thread and the result is written back to the
+    cache, where the next invocation picks it up if this one exits first.
+    """
+
+    def __init__(self, cache_file: str | None, ttl: float):
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self._latest: str | None = None
+        self._ready = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "UpdateCheck":
+        if self.cache_file:
+            self._latest = load_cached_latest_version(self.cache_file, self.ttl)
+        if self._latest is not None:
+            self._ready.set()
+        else:
+            self._thread = threading.Thread(
+                target=self._fetch, name="update-check", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def _fetch(self) -> None:
+        latest = get_latest_version()
+        if self.cache_file:
+            save_cached_latest_version(self.cache_file, latest)
+        self._latest = latest
+        self._ready.set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait for the result, returning whether it is ready."""
+        return self._ready.wait(timeout)
+
+    def result(self) -> tuple[bool, str, str] | None:
+        """Get (needs_update, current, latest) if ready, without waiting."""
+        if not self._ready.is_set() or self._latest is None:
+            return None
+        return check_for_updates(self._latest)
+
+
+def start_update_check() -> UpdateCheck | None:
+    """Start checking for updates in the background.
+
+    Returns:
+        The running check, or None if update checks are disabled
+    """
+    if not is_update_check_enabled():
+        return None
+    return UpdateCheck(_get_cache_file(), get_update_check_ttl()).start()
+
+
+def display_update_message(update_check: UpdateCheck | None = None) -> None:
+    """Display a message if an update is available.
+
+    Args:
+        update_check: A check started with start_update_check. The message is
+            only shown if its result is ready. Without one, PyPI is queried
+            synchronously.
+    """
     try:
-        needs_update, current, latest = check_for_updates()
+        if update_check is None:
+            needs_update, current, latest = check_for_updates()
+        else:
+            result = update_check.result()
+            if result is None:
+                return
+            needs_update, current, latest = result
 
         if needs_update:
             console.print(
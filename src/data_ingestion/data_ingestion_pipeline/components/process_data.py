@@ -59,25 +59,27 @@ def process_data(
         deduped_table: Table for storing deduplicated results
         location: BigQuery location
     """
+    import io
     import logging
-    from datetime import datetime, timedelta
+    import uuid
+    from collections.abc import Iterable
+    from datetime import datetime, timedelta, timezone
 
     import backoff
     import bigframes.ml.llm as llm
     import bigframes.pandas as bpd
     import google.api_core.exceptions
-    import swifter
-    from google.cloud import bigquery
-    from langchain.text_splitter import RecursiveCharacterTextSplitter
-    from markdownify import markdownify
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from google.cloud import bigquery, bigquery_storage
 
     # Initialize logging
     logging.basicConfig(level=logging.INFO)
-    logging.info(f"Using {swifter} for apply operations.")
 
     # Initialize clients
     logging.info("Initializing clients...")
     bq_client = bigquery.Client(project=project_id, location=location)
+    bqstorage_client = bigquery_storage.BigQueryReadClient()
     bpd.options.bigquery.project = project_id
     bpd.options.bigquery.location = location
     logging.info("Clients initialized.")
@@ -103,13 +105,16 @@ def process_data(
 
     logging.info(f"Date range set: START_DATE={START_DATE}, END_DATE={END_DATE}")
 
-    def fetch_stackoverflow_data(
+    def fetch_stackoverflow_batches(
         dataset_suffix: str, start_date: str, end_date: str
-    ) -> bpd.DataFrame:
-        """Fetch StackOverflow data from BigQuery."""
+    ) -> Iterable[pa.RecordBatch]:
+        """Fetch the latest edit of each StackOverflow question in the window.
+
+        The query runs once and its result is streamed as Arrow record batches
+        through the BigQuery Storage Read API.
+        """
         query = f"""
             SELECT
-                creation_date,
                 last_edit_date,
                 question_id,
                 question_title,
@@ -118,23 +123,125 @@ def process_data(
             FROM `production-ai-template.stackoverflow_qa_{dataset_suffix}.stackoverflow_python_questions_and_answers`
             WHERE TRUE
                 {f'AND TIMESTAMP_TRUNC(creation_date, DAY) BETWEEN TIMESTAMP("{start_date}") AND TIMESTAMP("{end_date}")' if is_incremental else ""}
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY question_id ORDER BY last_edit_date DESC
+            ) = 1
         """
         logging.info("Fetching StackOverflow data from BigQuery...")
-        return bpd.read_gbq(query)
-
-    def convert_html_to_markdown(html: str) -> str:
-        """Convert HTML into Markdown for easier parsing and rendering after LLM response."""
-        return markdownify(html).strip()
-
-    def create_answers_markdown(answers: list) -> str:
-        """Convert each answer's HTML to markdown and concatenate into a single markdown text."""
-        answers_md = ""
-        for index, answer_record in enumerate(answers):
-            answers_md += (
-                f"\n\n## Answer {index + 1}:\n"  # Answer number is H2 heading size
+        return (
+            bq_client.query(query)
+            .result()
+            .to_arrow_iterable(bqstorage_client=bqstorage_client)
+        )
+
+    def chunk_questions(
+        batches: Iterable[pa.RecordBatch], chunk_size: int, chunk_overlap: int
+    ) -> pa.Table:
+        """Turn batches of questions into a table of markdown text chunks.
+
+        Each batch is transformed locally in one pass: the question and its
+        answers are converted from HTML to markdown and concatenated, the text
+        is split into chunks and every chunk gets an id. Self-contained, so it
+        also runs on a local Parquet stand-in of the fetched data.
+
+        Returns:
+            One row per chunk, empty if there are no questions
+        """
+        import pyarrow as pa
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+        from markdownify import markdownify
+
+        def convert_html_to_markdown(html: str | None) -> str:
+            """Convert HTML into Markdown for easier parsing and rendering after LLM response."""
+            return markdownify(html or "").strip()
+
+        def create_full_text_markdown(
+            title: str | None, text: str | None, answers: list | None
+        ) -> str:
+            """Concatenate the question and its answers into one markdown text."""
+            full_text_md = f"# {title or ''}\n"  # Title is H1 heading size
+            full_text_md += convert_html_to_markdown(text) + "\n"
+            for index, answer_record in enumerate(answers or []):
+                # Answer number is H2 heading size
+                full_text_md += f"\n\n## Answer {index + 1}:\n"
+                full_text_md += convert_html_to_markdown(answer_record["body"])
+            return full_text_md
+
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            length_function=len,
+        )
+        schema = pa.schema(
+            [
+                ("last_edit_date", pa.timestamp("us", tz="UTC")),
+                ("question_id", pa.int64()),
+                ("question_text", pa.string()),
+                ("full_text_md", pa.string()),
+                ("text_chunk", pa.string()),
+                ("chunk_id", pa.string()),
+            ]
+        )
+        kept_columns = ["last_edit_date", "question_id", "question_text"]
+        tables = []
+        for batch in batches:
+            questions = pa.Table.from_batches([batch])
+            full_texts, rows, text_chunks, chunk_ids = [], [], [], []
+            for row, (question_id, title, text, answers) in enumerate(
+                zip(
+                    questions.column("question_id").to_pylist(),
+                    questions.column("question_title").to_pylist(),
+                    questions.column("question_text").to_pylist(),
+                    questions.column("answers").to_pylist(),
+                )
+            ):
+                full_texts.append(create_full_text_markdown(title, text, answers))
+                for chunk_index, text_chunk in enumerate(
+                    text_splitter.split_text(full_texts[-1])
+                ):
+                    rows.append(row)
+                    text_chunks.append(text_chunk)
+                    chunk_ids.append(f"{question_id}__{chunk_index}")
+
+            # One row per chunk, with the columns of its question repeated
+            take = pa.array(rows, type=pa.int64())
+            chunks = questions.select(kept_columns).take(take)
+            chunks = chunks.append_column(
+                "full_text_md", pa.array(full_texts, type=pa.string()).take(take)
             )
-            answers_md += convert_html_to_markdown(answer_record["body"])
-        return answers_md
+            chunks = chunks.append_column(
+                "text_chunk", pa.array(text_chunks, type=pa.string())
+            )
+            chunks = chunks.append_column(
+                "chunk_id", pa.array(chunk_ids, type=pa.string())
+            )
+            tables.append(chunks.cast(schema))
+        return pa.concat_tables(tables) if tables else schema.empty_table()
+
+    def load_chunks(chunks: pa.Table) -> str:
+        """Write the chunks to a staging table in one bulk Parquet load.
+
+        Returns:
+            ID of the staging table, which expires after a day
+        """
+        dataset = bigquery.Dataset(f"{project_id}.{destination_dataset}")
+        dataset.location = location
+        bq_client.create_dataset(dataset, exists_ok=True)
+
+        table_id = f"{project_id}.{destination_dataset}._text_chunks_{uuid.uuid4().hex}"
+        buffer = io.BytesIO()
+        pq.write_table(chunks, buffer)
+        buffer.seek(0)
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.PARQUET,
+            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+        )
+        bq_client.load_table_from_file(buffer, table_id, job_config=job_config).result()
+
+        table = bq_client.get_table(table_id)
+        table.expires = datetime.now(timezone.utc) + timedelta(days=1)
+        bq_client.update_table(table, ["expires"])
+        return table_id
 
     def create_table_if_not_exist(
         df: bpd.DataFrame,
@@ -158,133 +265,94 @@ def process_data(
         bq_client.create_dataset(dataset, exists_ok=True)
         bq_client.create_table(table=table, exists_ok=True)
 
-    # Fetch and preprocess data
-    logging.info("Fetching and preprocessing data...")
-    df = fetch_stackoverflow_data(
+    # Fetch the window once and transform it locally, batch by batch
+    logging.info("Fetching data and splitting it into markdown chunks...")
+    batches = fetch_stackoverflow_batches(
         start_date=START_DATE.strftime("%Y-%m-%d"),
         end_date=END_DATE.strftime("%Y-%m-%d"),
         dataset_suffix=location.lower().replace("-", "_"),
     )
-    df = (
-        df.sort_values("last_edit_date", ascending=False)
-        .drop_duplicates("question_id")
-        .reset_index(drop=True)
-    )
-    logging.info("Data fetched and preprocessed.")
+    chunks = chunk_questions(batches, chunk_size, chunk_overlap)
+    logging.info(f"Created {chunks.num_rows} chunks.")
 
-    # Convert content to markdown
-    logging.info("Converting content to markdown...")
+    if chunks.num_rows == 0:
+        # An empty window is a no-op, the tables are handed on unchanged
+        logging.info("No new questions to process, the tables are unchanged.")
+    else:
+        # Write the chunks back in one bulk load
+        logging.info("Loading chunks into BigQuery...")
+        df = bpd.read_gbq(load_chunks(chunks))
+        logging.info("Chunks loaded.")
 
-    # Create markdown fields efficiently
-    df["question_title_md"] = (
-        "# " + df["question_title"] + "\n"
-    )  # Title is H1 heading size
-    df["question_text_md"] = (
-        df["question_text"].to_pandas().swifter.apply(convert_html_to_markdown) + "\n"
-    )
-    df["answers_md"] = df["answers"].to_pandas().swifter.apply(create_answers_markdown)
-
-    # Create a column containing the whole markdown text
-    df["full_text_md"] = (
-        df["question_title_md"] + df["question_text_md"] + df["answers_md"]
-    )
-    logging.info("Content converted to markdown.")
+        # Generate embeddings
+        logging.info("Generating embeddings...")
 
-    # Keep only necessary columns
-    df = df[["last_edit_date", "question_id", "question_text", "full_text_md"]]
-
-    # Split text into chunks
-    logging.info("Splitting text into chunks...")
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        length_function=len,
-    )
-
-    df["text_chunk"] = (
-        df["full_text_md"]
-        .to_pandas()
-        .astype(object)
-        .swifter.apply(text_splitter.split_text)
-    )
-    logging.info("Text split into chunks.")
-
-    # Create chunk IDs and explode chunks into rows
-    logging.info("Creating chunk IDs and exploding chunks into rows...")
-    chunk_ids = [
-        str(idx) for text_chunk in df["text_chunk"] for idx in range(len(text_chunk))
-    ]
-    df = df.explode("text_chunk").reset_index(drop=True)
-    df["chunk_id"] = df["question_id"].astype("string") + "__" + chunk_ids
-    logging.info("Chunk IDs created and chunks exploded.")
-
-    # Generate embeddings
-    logging.info("Generating embeddings...")
-
-    # The first invocation in a new project might fail due to permission propagation.
-    @backoff.on_exception(
-        backoff.expo, google.api_core.exceptions.InvalidArgument, max_tries=10
-    )
-    def create_embedder() -> llm.TextEmbeddingGenerator:
-        return llm.TextEmbeddingGenerator(model_name="text-embedding-005")
+        # The first invocation in a new project might fail due to permission propagation.
+        @backoff.on_exception(
+            backoff.expo, google.api_core.exceptions.InvalidArgument, max_tries=10
+        )
+        def create_embedder() -> llm.TextEmbeddingGenerator:
+            return llm.TextEmbeddingGenerator(model_name="text-embedding-005")
 
-    embedder = create_embedder()
+        embedder = create_embedder()
 
-    embeddings_df = embedder.predict(df["text_chunk"])
-    logging.info("Embeddings generated.")
+        embeddings_df = embedder.predict(df["text_chunk"])
+        logging.info("Embeddings generated.")
 
-    df = df.assign(
-        embedding=embeddings_df["ml_generate_embedding_result"],
-        embedding_statistics=embeddings_df["ml_generate_embedding_statistics"],
-        embedding_status=embeddings_df["ml_generate_embedding_status"],
-        creation_timestamp=datetime.now(),
-    )
+        df = df.assign(
+            embedding=embeddings_df["ml_generate_embedding_result"],
+            embedding_statistics=embeddings_df["ml_generate_embedding_statistics"],
+            embedding_status=embeddings_df["ml_generate_embedding_status"],
+            creation_timestamp=datetime.now(),
+        )
 
-    # Store results in BigQuery
-    PARTITION_DATE_COLUMN = "creation_timestamp"
-
-    # Create and populate incremental table
-    logging.info("Creating and populating incremental table...")
-    create_table_if_not_exist(
-        df=df,
-        project_id=project_id,
-        dataset_id=destination_dataset,
-        table_id=destination_table,
-        partition_column=PARTITION_DATE_COLUMN,
-    )
+        # Store results in BigQuery
+        PARTITION_DATE_COLUMN = "creation_timestamp"
+
+        # Create and populate incremental table
+        logging.info("Creating and populating incremental table...")
+        create_table_if_not_exist(
+            df=df,
+            project_id=project_id,
+            dataset_id=destination_dataset,
+            table_id=destination_table,
+            partition_column=PARTITION_DATE_COLUMN,
+        )
 
-    if_exists_mode = "append" if is_incremental else "replace"
-    df.to_gbq(
-        destination_table=f"{destination_dataset}.{destination_table}",
-        if_exists=if_exists_mode,
-    )
-    logging.info("Incremental table created and populated.")
+        if_exists_mode = "append" if is_incremental else "replace"
+        df.to_gbq(
+            destination_table=f"{destination_dataset}.{destination_table}",
+            if_exists=if_exists_mode,
+        )
+        logging.info("Incremental table created and populated.")
 
-    # Create deduplicated table
-    logging.info("Creating deduplicated table...")
-    df_questions = bpd.read_gbq(
-        f"{destination_dataset}.{destination_table}", use_cache=False
-    )
-    max_date_df = (
-        df_questions.groupby("question_id")["creation_timestamp"].max().reset_index()
-    )
-    df_questions_dedup = max_date_df.merge(
-        df_questions, how="inner", on=["question_id", "creation_timestamp"]
-    )
+        # Create deduplicated table
+        logging.info("Creating deduplicated table...")
+        df_questions = bpd.read_gbq(
+            f"{destination_dataset}.{destination_table}", use_cache=False
+        )
+        max_date_df = (
+            df_questions.groupby("question_id")["creation_timestamp"]
+            .max()
+            .reset_index()
+        )
+        df_questions_dedup = max_date_df.merge(
+            df_questions, how="inner", on=["question_id", "creation_timestamp"]
+        )
 
-    create_table_if_not_exist(
-        df=df_questions_dedup,
-        project_id=project_id,
-        dataset_id=destination_dataset,
-        table_id=deduped_table,
-        partition_column=PARTITION_DATE_COLUMN,
-    )
+        create_table_if_not_exist(
+            df=df_questions_dedup,
+            project_id=project_id,
+            dataset_id=destination_dataset,
+            table_id=deduped_table,
+            partition_column=PARTITION_DATE_COLUMN,
+        )
 
-    df_questions_dedup.to_gbq(
-        destination_table=f"{destination_dataset}.{deduped_table}",
-        if_exists="replace",
-    )
-    logging.info("Deduplicated table created and populated.")
+        df_questions_dedup.to_gbq(
+            destination_table=f"{destination_dataset}.{deduped_table}",
+            if_exists="replace",
+        )
+        logging.info("Deduplicated table created and populated.")
 
     # Export to JSONL
     logging.info("Exporting to JSONL...")
@@ -359,25 +427,27 @@ def process_data(
         deduped_table: Table for storing deduplicated results
         location: BigQuery location
     """
+    import io
     import logging
-    from datetime import datetime, timedelta
+    import uuid
+    from collections.abc import Iterable
+    from datetime import datetime, timedelta, timezone
 
     import backoff
     import bigframes.ml.llm as llm
     import bigframes.pandas as bpd
     import google.api_core.exceptions
-    import swifter
-    from google.cloud import bigquery
-    from langchain.text_splitter import RecursiveCharacterTextSplitter
-    from markdownify import markdownify
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from google.cloud import bigquery, bigquery_storage
 
     # Initialize logging
     logging.basicConfig(level=logging.INFO)
-    logging.info(f"Using {swifter} for apply operations.")
 
     # Initialize clients
     logging.info("Initializing clients...")
     bq_client = bigquery.Client(project=project_id, location=location)
+    bqstorage_client = bigquery_storage.BigQueryReadClient()
     bpd.options.bigquery.project = project_id
     bpd.options.bigquery.location = location
     logging.info("Clients initialized.")
@@ -403,13 +473,16 @@ def process_data(
 
     logging.info(f"Date range set: START_DATE={START_DATE}, END_DATE={END_DATE}")
 
-    def fetch_stackoverflow_data(
+    def fetch_stackoverflow_batches(
         dataset_suffix: str, start_date: str, end_date: str
-    ) -> bpd.DataFrame:
-        """Fetch StackOverflow data from BigQuery."""
+    ) -> Iterable[pa.RecordBatch]:
+        """Fetch the latest edit of each StackOverflow question in the window.
+
+        The query runs once and its result is streamed as Arrow record batches
+        through the BigQuery Storage Read API.
+        """
         query = f"""
             SELECT
-                creation_date,
                 last_edit_date,
                 question_id,
                 question_title,
@@ -418,23 +491,125 @@ def process_data(
             FROM `production-ai-template.stackoverflow_qa_{dataset_suffix}.stackoverflow_python_questions_and_answers`
             WHERE TRUE
                 {f'AND TIMESTAMP_TRUNC(creation_date, DAY) BETWEEN TIMESTAMP("{start_date}") AND TIMESTAMP("{end_date}")' if is_incremental else ""}
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY question_id ORDER BY last_edit_date DESC
+            ) = 1
         """
         logging.info("Fetching StackOverflow data from BigQuery...")
-        return bpd.read_gbq(query)
-
-    def convert_html_to_markdown(html: str) -> str:
-        """Convert HTML into Markdown for easier parsing and rendering after LLM response."""
-        return markdownify(html).strip()
-
-    def create_answers_markdown(answers: list) -> str:
-        """Convert each answer's HTML to markdown and concatenate into a single markdown text."""
-        answers_md = ""
-        for index, answer_record in enumerate(answers):
-            answers_md += (
-                f"\n\n## Answer {index + 1}:\n"  # Answer number is H2 heading size
+        return (
+            bq_client.query(query)
+            .result()
+            .to_arrow_iterable(bqstorage_client=bqstorage_client)
+        )
+
+    def chunk_questions(
+        batches: Iterable[pa.RecordBatch], chunk_size: int, chunk_overlap: int
+    ) -> pa.Table:
+        """Turn batches of questions into a table of markdown text chunks.
+
+        Each batch is transformed locally in one pass: the question and its
+        answers are converted from HTML to markdown and concatenated, the text
+        is split into chunks and every chunk gets an id. Self-contained, so it
+        also runs on a local Parquet stand-in of the fetched data.
+
+        Returns:
+            One row per chunk, empty if there are no questions
+        """
+        import pyarrow as pa
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+        from markdownify import markdownify
+
+        def convert_html_to_markdown(html: str | None) -> str:
+            """Convert HTML into Markdown for easier parsing and rendering after LLM response."""
+            return markdownify(html or "").strip()
+
+        def create_full_text_markdown(
+            title: str | None, text: str | None, answers: list | None
+        ) -> str:
+            """Concatenate the question and its answers into one markdown text."""
+            full_text_md = f"# {title or ''}\n"  # Title is H1 heading size
+            full_text_md += convert_html_to_markdown(text) + "\n"
+            for index, answer_record in enumerate(answers or []):
+                # Answer number is H2 heading size
+                full_text_md += f"\n\n## Answer {index + 1}:\n"
+                full_text_md += convert_html_to_markdown(answer_record["body"])
+            return full_text_md
+
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            length_function=len,
+        )
+        schema = pa.schema(
+            [
+                ("last_edit_date", pa.timestamp("us", tz="UTC")),
+                ("question_id", pa.int64()),
+                ("question_text", pa.string()),
+                ("full_text_md", pa.string()),
+                ("text_chunk", pa.string()),
+                ("chunk_id", pa.string()),
+            ]
+        )
+        kept_columns = ["last_edit_date", "question_id", "question_text"]
+        tables = []
+        for batch in batches:
+            questions = pa.Table.from_batches([batch])
+            full_texts, rows, text_chunks, chunk_ids = [], [], [], []
+            for row, (question_id, title, text, answers) in enumerate(
+                zip(
+                    questions.column("question_id").to_pylist(),
+                    questions.column("question_title").to_pylist(),
+                    questions.column("question_text").to_pylist(),
+                    questions.column("answers").to_pylist(),
+                )
+            ):
+                full_texts.append(create_full_text_markdown(title, text, answers))
+                for chunk_index, text_chunk in enumerate(
+                    text_splitter.split_text(full_texts[-1])
+                ):
+                    rows.append(row)
+                    text_chunks.append(text_chunk)
+                    chunk_ids.append(f"{question_id}__{chunk_index}")
+
+            # One row per chunk, with the columns of its question repeated
+            take = pa.array(rows, type=pa.int64())
+            chunks = questions.select(kept_columns).take(take)
+            chunks = chunks.append_column(
+                "full_text_md", pa.array(full_texts, type=pa.string()).take(take)
             )
-            answers_md += convert_html_to_markdown(answer_record["body"])
-        return answers_md
+            chunks = chunks.append_column(
+                "text_chunk", pa.array(text_chunks, type=pa.string())
+            )
+            chunks = chunks.append_column(
+                "chunk_id", pa.array(chunk_ids, type=pa.string())
+            )
+            tables.append(chunks.cast(schema))
+        return pa.concat_tables(tables) if tables else schema.empty_table()
+
+    def load_chunks(chunks: pa.Table) -> str:
+        """Write the chunks to a staging table in one bulk Parquet load.
+
+        Returns:
+            ID of the staging table, which expires after a day
+        """
+        dataset = bigquery.Dataset(f"{project_id}.{destination_dataset}")
+        dataset.location = location
+        bq_client.create_dataset(dataset, exists_ok=True)
+
+        table_id = f"{project_id}.{destination_dataset}._text_chunks_{uuid.uuid4().hex}"
+        buffer = io.BytesIO()
+        pq.write_table(chunks, buffer)
+        buffer.seek(0)
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.PARQUET,
+            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+        )
+        bq_client.load_table_from_file(buffer, table_id, job_config=job_config).result()
+
+        table = bq_client.get_table(table_id)
+        table.expires = datetime.now(timezone.utc) + timedelta(days=1)
+        bq_client.update_table(table, ["expires"])
+        return table_id
 
     def create_table_if_not_exist(
         df: bpd.DataFrame,
@@ -458,133 +633,94 @@ def process_data(
         bq_client.create_dataset(dataset, exists_ok=True)
         bq_client.create_table(table=table, exists_ok=True)
 
-    # Fetch and preprocess data
-    logging.info("Fetching and preprocessing data...")
-    df = fetch_stackoverflow_data(
+    # Fetch the window once and transform it locally, batch by batch
+    logging.info("Fetching data and splitting it into markdown chunks...")
+    batches = fetch_stackoverflow_batches(
         start_date=START_DATE.strftime("%Y-%m-%d"),
         end_date=END_DATE.strftime("%Y-%m-%d"),
         dataset_suffix=location.lower().replace("-", "_"),
     )
-    df = (
-        df.sort_values("last_edit_date", ascending=False)
-        .drop_duplicates("question_id")
-        .reset_index(drop=True)
-    )
-    logging.info("Data fetched and preprocessed.")
+    chunks = chunk_questions(batches, chunk_size, chunk_overlap)
+    logging.info(f"Created {chunks.num_rows} chunks.")
 
-    # Convert content to markdown
-    logging.info("Converting content to markdown...")
+    if chunks.num_rows == 0:
+        # An empty window is a no-op, the tables are handed on unchanged
+        logging.info("No new questions to process, the tables are unchanged.")
+    else:
+        # Write the chunks back in one bulk load
+        logging.info("Loading chunks into BigQuery...")
+        df = bpd.read_gbq(load_chunks(chunks))
+        logging.info("Chunks loaded.")
 
-    # Create markdown fields efficiently
-    df["question_title_md"] = (
-        "# " + df["question_title"] + "\n"
-    )  # Title is H1 heading size
-    df["question_text_md"] = (
-        df["question_text"].to_pandas().swifter.apply(convert_html_to_markdown) + "\n"
-    )
-    df["answers_md"] = df["answers"].to_pandas().swifter.apply(create_answers_markdown)
-
-    # Create a column containing the whole markdown text
-    df["full_text_md"] = (
-        df["question_title_md"] + df["question_text_md"] + df["answers_md"]
-    )
-    logging.info("Content converted to markdown.")
+        # Generate embeddings
+        logging.info("Generating embeddings...")
 
-    # Keep only necessary columns
-    df = df[["last_edit_date", "question_id", "question_text", "full_text_md"]]
-
-    # Split text into chunks
-    logging.info("Splitting text into chunks...")
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        length_function=len,
-    )
-
-    df["text_chunk"] = (
-        df["full_text_md"]
-        .to_pandas()
-        .astype(object)
-        .swifter.apply(text_splitter.split_text)
-    )
-    logging.info("Text split into chunks.")
-
-    # Create chunk IDs and explode chunks into rows
-    logging.info("Creating chunk IDs and exploding chunks into rows...")
-    chunk_ids = [
-        str(idx) for text_chunk in df["text_chunk"] for idx in range(len(text_chunk))
-    ]
-    df = df.explode("text_chunk").reset_index(drop=True)
-    df["chunk_id"] = df["question_id"].astype("string") + "__" + chunk_ids
-    logging.info("Chunk IDs created and chunks exploded.")
-
-    # Generate embeddings
-    logging.info("Generating embeddings...")
-
-    # The first invocation in a new project might fail due to permission propagation.
-    @backoff.on_exception(
-        backoff.expo, google.api_core.exceptions.InvalidArgument, max_tries=10
-    )
-    def create_embedder() -> llm.TextEmbeddingGenerator:
-        return llm.TextEmbeddingGenerator(model_name="text-embedding-005")
+        # The first invocation in a new project might fail due to permission propagation.
+        @backoff.on_exception(
+            backoff.expo, google.api_core.exceptions.InvalidArgument, max_tries=10
+        )
+        def create_embedder() -> llm.TextEmbeddingGenerator:
+            return llm.TextEmbeddingGenerator(model_name="text-embedding-005")
 
-    embedder = create_embedder()
+        embedder = create_embedder()
 
-    embeddings_df = embedder.predict(df["text_chunk"])
-    logging.info("Embeddings generated.")
+        embeddings_df = embedder.predict(df["text_chunk"])
+        logging.info("Embeddings generated.")
 
-    df = df.assign(
-        embedding=embeddings_df["ml_generate_embedding_result"],
-        embedding_statistics=embeddings_df["ml_generate_embedding_statistics"],
-        embedding_status=embeddings_df["ml_generate_embedding_status"],
-        creation_timestamp=datetime.now(),
-    )
+        df = df.assign(
+            embedding=embeddings_df["ml_generate_embedding_result"],
+            embedding_statistics=embeddings_df["ml_generate_embedding_statistics"],
+            embedding_status=embeddings_df["ml_generate_embedding_status"],
+            creation_timestamp=datetime.now(),
+        )
 
-    # Store results in BigQuery
-    PARTITION_DATE_COLUMN = "creation_timestamp"
-
-    # Create and populate incremental table
-    logging.info("Creating and populating incremental table...")
-    create_table_if_not_exist(
-        df=df,
-        project_id=project_id,
-        dataset_id=destination_dataset,
-        table_id=destination_table,
-        partition_column=PARTITION_DATE_COLUMN,
-    )
+        # Store results in BigQuery
+        PARTITION_DATE_COLUMN = "creation_timestamp"
+
+        # Create and populate incremental table
+        logging.info("Creating and populating incremental table...")
+        create_table_if_not_exist(
+            df=df,
+            project_id=project_id,
+            dataset_id=destination_dataset,
+            table_id=destination_table,
+            partition_column=PARTITION_DATE_COLUMN,
+        )
 
-    if_exists_mode = "append" if is_incremental else "replace"
-    df.to_gbq(
-        destination_table=f"{destination_dataset}.{destination_table}",
-        if_exists=if_exists_mode,
-    )
-    logging.info("Incremental table created and populated.")
+        if_exists_mode = "append" if is_incremental else "replace"
+        df.to_gbq(
+            destination_table=f"{destination_dataset}.{destination_table}",
+            if_exists=if_exists_mode,
+        )
+        logging.info("Incremental table created and populated.")
 
-    # Create deduplicated table
-    logging.info("Creating deduplicated table...")
-    df_questions = bpd.read_gbq(
-        f"{destination_dataset}.{destination_table}", use_cache=False
-    )
-    max_date_df = (
-        df_questions.groupby("question_id")["creation_timestamp"].max().reset_index()
-    )
-    df_questions_dedup = max_date_df.merge(
-        df_questions, how="inner", on=["question_id", "creation_timestamp"]
-    )
+        # Create deduplicated table
+        logging.info("Creating deduplicated table...")
+        df_questions = bpd.read_gbq(
+            f"{destination_dataset}.{destination_table}", use_cache=False
+        )
+        max_date_df = (
+            df_questions.groupby("question_id")["creation_timestamp"]
+            .max()
+            .reset_index()
+        )
+        df_questions_dedup = max_date_df.merge(
+            df_questions, how="inner", on=["question_id", "creation_timestamp"]
+        )
 
-    create_table_if_not_exist(
-        df=df_questions_dedup,
-        project_id=project_id,
-        dataset_id=destination_dataset,
-        table_id=deduped_table,
-        partition_column=PARTITION_DATE_COLUMN,
-    )
+        create_table_if_not_exist(
+            df=df_questions_dedup,
+            project_id=project_id,
+            dataset_id=destination_dataset,
+            table_id=deduped_table,
+            partition_column=PARTITION_DATE_COLUMN,
+        )
 
-    df_questions_dedup.to_gbq(
-        destination_table=f"{destination_dataset}.{deduped_table}",
-        if_exists="replace",
-    )
-    logging.info("Deduplicated table created and populated.")
+        df_questions_dedup.to_gbq(
+            destination_table=f"{destination_dataset}.{deduped_table}",
+            if_exists="replace",
+        )
+        logging.info("Deduplicated table created and populated.")
     # Set artifact metadata (important!)
     output_table.uri = (
         f"bq://{project_id}.{destination_dataset}.{deduped_table}"  # Full BQ URI
@@ -15,33 +15,53 @@
 
 """Utility script to generate lock files for all agent and deployment target combinations."""
 
+import hashlib
+import json
 import logging
+import os
 import pathlib
-import shutil
 import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import click
 from jinja2 import Template
-from lock_utils import get_agent_configs, get_lock_filename
 
+from src.cli.utils.lock_store import LockStore, write_lock_store
+from src.cli.utils.registry import LOCKS_DIR, get_lock_filename
+from src.utils.lock_utils import get_agent_configs
 
-def ensure_lock_dir() -> pathlib.Path:
-    """Ensure the locks directory exists and is empty.
+# Records the hash of the pyproject.toml each stored lock was generated from
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
 
-    Returns:
-        Path to the locks directory
-    """
-    lock_dir = pathlib.Path("src/resources/locks")
 
-    # Remove if exists
-    if lock_dir.exists():
-        shutil.rmtree(lock_dir)
+def pyproject_digest(pyproject_content: str) -> str:
+    """Get the hash identifying a rendered pyproject.toml."""
+    return hashlib.sha256(pyproject_content.encode("utf-8")).hexdigest()
+
 
-    # Create fresh directory
-    lock_dir.mkdir(parents=True)
+def load_manifest(lock_dir: pathlib.Path) -> dict[str, str]:
+    """Load the pyproject hashes of the last run, by lock file name."""
+    try:
+        with open(lock_dir / MANIFEST_FILE, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return dict(manifest.get("pyprojects", {}))
 
-    return lock_dir
+
+def save_manifest(lock_dir: pathlib.Path, digests: dict[str, str]) -> None:
+    """Save the pyproject hashes of the stored locks."""
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "pyprojects": dict(sorted(digests.items())),
+    }
+    with open(lock_dir / MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
 
 
 def generate_pyproject(
@@ -75,8 +95,17 @@ def generate_pyproject(
     return result
 
 
-def generate_lock_file(pyproject_content: str, output_path: pathlib.Path) -> None:
-    """Generate uv.lock file from pyproject content."""
+def generate_lock_file(
+    pyproject_content: str, uv_cache_dir: pathlib.Path | None = None
+) -> str:
+    """Generate uv.lock content from pyproject content.
+
+    The project name is replaced with the cookiecutter placeholder.
+
+    Args:
+        pyproject_content: Rendered pyproject.toml
+        uv_cache_dir: uv cache to resolve with, defaults to uv's own cache
+    """
     with tempfile.TemporaryDirectory() as tmpdir:
         tmp_dir = pathlib.Path(tmpdir)
 
@@ -84,20 +113,14 @@ def generate_lock_file(pyproject_content: str, output_path: pathlib.Path) -> Non
         with open(tmp_dir / "pyproject.toml", "w", encoding="utf-8") as f:
             f.write(pyproject_content)
 
-        # Run uv pip compile to generate lock file
-        subprocess.run(["uv", "lock"], cwd=tmp_dir, check=True)
+        # Run uv lock to generate lock file
+        command = ["uv", "lock"]
+        if uv_cache_dir is not None:
+            command += ["--cache-dir", str(uv_cache_dir)]
+        subprocess.run(command, cwd=tmp_dir, check=True)
         # Replace locked-template with {{cookiecutter.project_name}} in generated lock file
-        lock_file_path = tmp_dir / "uv.lock"
-        with open(lock_file_path, "r+", encoding="utf-8") as f:
-            lock_content = f.read()
-            f.seek(0)
-            f.write(
-                lock_content.replace("locked-template", "{{cookiecutter.project_name}}")
-            )
-            f.truncate()
-
-        # Copy the generated lock file to output location
-        shutil.copy2(lock_file_path, output_path)
+        lock_content = (tmp_dir / "uv.lock").read_text(encoding="utf-8")
+        return lock_content.replace("locked-template", "{{cookiecutter.project_name}}")
 
 
 @click.command()
@@ -107,26 +130,79 @@ def generate_lock_file(pyproject_content: str, output_path: pathlib.Path) -> Non
     default="src/base_template/pyproject.toml",
     help="Path to template pyproject.toml",
 )
-def main(template: pathlib.Path) -> None:
-    """Generate lock files for all agent and deployment target combinations."""
-    lock_dir = ensure_lock_dir()
-    agent_configs = get_agent_configs()
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Regenerate every lock file, even if its pyproject.toml is unchanged",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    help="Concurrent uv lock runs (default: number of CPUs)",
+)
+@click.option(
+    "--uv-cache-dir",
+    type=click.Path(file_okay=False, path_type=pathlib.Path),
+    help="uv cache shared by all runs (default: uv's own cache)",
+)
+def main(
+    template: pathlib.Path,
+    force: bool,
+    jobs: int | None,
+    uv_cache_dir: pathlib.Path | None,
+) -> None:
+    """Generate lock files for all agent and deployment target combinations.
+
+    Lock files whose rendered pyproject.toml hashes the same as in the last
+    run are kept as they are, unless --force is given.
+    """
+    store = LockStore(LOCKS_DIR)
+    previous = {} if force else load_manifest(LOCKS_DIR)
+    digests: dict[str, str] = {}
+    pending: dict[str, str] = {}
+    locks: dict[str, str] = {}
 
-    for agent_name, config in agent_configs.items():
+    for agent_name, config in get_agent_configs().items():
         for target in config["deployment_targets"]:
-            print(f"Generating lock file for {agent_name} with {target}...")
-
-            # Generate pyproject content
+            lock_filename = get_lock_filename(agent_name, target)
             content = generate_pyproject(
                 template,
                 deployment_target=target,
                 config=config,
             )
-
-            # Generate lock file
-            output_path = lock_dir / get_lock_filename(agent_name, target)
-            generate_lock_file(content, output_path)
-            print(f"Generated {output_path}")
+            digests[lock_filename] = pyproject_digest(content)
+            if (
+                previous.get(lock_filename) == digests[lock_filename]
+                and lock_filename in store
+            ):
+                print(f"Skipping {lock_filename}, pyproject.toml is unchanged")
+                locks[lock_filename] = store.read_text(lock_filename)
+            else:
+                pending[lock_filename] = content
+
+    if pending:
+        workers = min(jobs or os.cpu_count() or 1, len(pending))
+        print(f"Generating {len(pending)} lock files with {workers} workers...")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(generate_lock_file, content, uv_cache_dir): name
+                for name, content in pending.items()
+            }
+            for future in as_completed(futures):
+                lock_filename = futures[future]
+                locks[lock_filename] = future.result()
+                print(f"Generated {lock_filename}")
+
+    if not pending and sorted(locks) == store.names():
+        save_manifest(LOCKS_DIR, digests)
+        print("Lock files are up to date")
+        return
+
+    # Add locks in a fixed order so the pack only changes with its content
+    write_lock_store(sorted(locks.items()), LOCKS_DIR)
+    save_manifest(LOCKS_DIR, digests)
+    print(f"Wrote lock store to {LOCKS_DIR}")
 
 
 if __name__ == "__main__":
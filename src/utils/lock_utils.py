@@ -15,65 +15,25 @@
 """Utilities for managing uv lock files and dependencies."""
 
 import pathlib
-from pathlib import Path
-from typing import NamedTuple
 
-import yaml
-
-
-class AgentConfig(NamedTuple):
-    """Configuration for an agent template."""
-
-    targets: set[str]
-    dependencies: list[str]
+from src.cli.utils.registry import get_registry
 
 
 def get_agent_configs(
     agents_dir: pathlib.Path = pathlib.Path("agents"),
-) -> dict[str, AgentConfig]:
-    """Get all agents and their supported deployment targets.
-
-    Args:
-        agents_dir: Path to the agents directory
-
-    Returns:
-        Dictionary mapping agent names to their configuration
-    """
-    agent_configs = {}
-
-    for agent_dir in agents_dir.iterdir():
-        if not agent_dir.is_dir():
-            continue
+) -> dict[str, dict]:
+    """Get all agents and their template settings.
 
-        config_file = agent_dir / ".template" / "templateconfig.yaml"
-        if not config_file.exists():
-            continue
-
-        with open(config_file, encoding="utf-8") as f:
-            config = yaml.safe_load(f)
-
-        agent_name = agent_dir.name
-        settings = config.get("settings", {})
-
-        agent_configs[agent_name] = settings
-
-    return agent_configs
-
-
-def get_lock_filename(agent_name: str, deployment_target: str) -> str:
-    """Generate the lock filename for a given agent and deployment target.
+    Configs come from the template registry, so each templateconfig.yaml is
+    parsed at most once per process.
 
     Args:
-        agent_name: Name of the agent
-        deployment_target: Target deployment platform
+        agents_dir: Path to the agents directory
 
     Returns:
-        Formatted lock filename
+        Dictionary mapping agent names to their template settings
     """
-    return f"uv-{agent_name}-{deployment_target}.lock"
-
-
-def get_lock_path(agent_name: str, deployment_target: str) -> Path:
-    """Get the path to the appropriate lock file."""
-    lock_filename = get_lock_filename(agent_name, deployment_target)
-    return Path("src/resources/locks") / lock_filename
+    return {
+        agent_name: entry.settings
+        for agent_name, entry in get_registry(agents_dir).agents().items()
+    }
@@ -16,15 +16,184 @@ import logging
 import pathlib
 import shutil
 import subprocess
+import tempfile
+import threading
 import time
+from typing import Any
 
 import click
+from binaryornot.check import is_binary
+from cookiecutter.environment import StrictEnvironment
+from cookiecutter.prompt import prompt_for_config
 from rich.console import Console
-from watchdog.events import FileSystemEventHandler
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
 from watchdog.observers import Observer
 
+from src.cli.commands.create import create
+from src.cli.utils.copy_engine import matches_any
+from src.cli.utils.region import DEFAULT_REGION, RegionRewriter
+from src.cli.utils.template import (
+    RenderRecord,
+    add_render_listener,
+    remove_render_listener,
+)
+
 console = Console()
 
+ROOT_DIR = pathlib.Path(__file__).parent.parent.parent.resolve()
+# Changes to the CLI itself can't be picked up by the running interpreter
+CLI_CODE_DIRS = [ROOT_DIR / "src" / "cli", ROOT_DIR / "src" / "utils"]
+# Outputs post-processed after cookiecutter, which need a full rebuild
+FULL_REBUILD_OUTPUTS = {"Makefile", "uv.lock"}
+
+
+def is_ignored(path: str) -> bool:
+    """Ignore editor and interpreter artifacts."""
+    name = pathlib.Path(path).name
+    return (
+        "__pycache__" in path
+        or "/.git/" in path
+        or name.endswith((".pyc", ".swp", ".swx", "~"))
+        or name.startswith(".#")
+    )
+
+
+class RebuildScheduler:
+    """Coalesce bursts of file events into a single rebuild.
+
+    Every event restarts the debounce window. Once no event has arrived for
+    `debounce` seconds, all changed paths are handed to the callback together.
+    Events arriving during a rebuild are queued for the next one, never dropped.
+    """
+
+    def __init__(self, callback: Any, debounce: float = 0.05):
+        self.callback = callback
+        self.debounce = debounce
+        self._pending: dict[str, str] = {}
+        self._last_event = 0.0
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def notify(self, path: str, event_type: str) -> None:
+        with self._condition:
+            # A deletion or creation outranks a modification of the same path
+            if self._pending.get(path) in (None, "modified"):
+                self._pending[path] = event_type
+            self._last_event = time.monotonic()
+            self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                quiet_for = time.monotonic() - self._last_event
+                if quiet_for < self.debounce:
+                    self._condition.wait(self.debounce - quiet_for)
+                    continue
+                batch, self._pending = self._pending, {}
+            self.callback(batch)
+
+
+class IncrementalRenderer:
+    """Re-render only the output files affected by a changed template source.
+
+    The renderer is primed from the RenderRecord of the last full build: the
+    overlay manifest maps every output path to the source file that won, and
+    the cookiecutter context is rebuilt the same way cookiecutter does it.
+    """
+
+    def __init__(self, record: RenderRecord, region: str):
+        self.record = record
+        self.region = region
+        config = dict(record.cookiecutter_config)
+        self.copy_without_render = config.get("_copy_without_render", [])
+        self.context = {
+            "cookiecutter": prompt_for_config({"cookiecutter": config}, no_input=True)
+        }
+        self.env = StrictEnvironment(context=self.context, keep_trailing_newline=True)
+        self.outputs: dict[pathlib.Path, list[str]] = {}
+        for output_path, source in record.manifest.files.items():
+            self.outputs.setdefault(source.resolve(), []).append(output_path)
+        self.layer_sources = [layer.source.resolve() for layer in record.layers]
+
+    def in_layers(self, path: pathlib.Path) -> bool:
+        return any(path.is_relative_to(source) for source in self.layer_sources)
+
+    def affected_outputs(self, path: pathlib.Path) -> list[str] | None:
+        """Output paths produced from path, or None if a full rebuild is needed."""
+        outputs = self.outputs.get(path)
+        if outputs is None:
+            # Sources shadowed by a later layer or skipped don't reach the project
+            return [] if self.in_layers(path) else None
+        if FULL_REBUILD_OUTPUTS.intersection(outputs):
+            return None
+        return outputs
+
+    def render_path(self, output_path: str) -> str | None:
+        """Render an output path, or None if the file isn't generated."""
+        parts = [
+            self.env.from_string(part).render(**self.context)
+            for part in output_path.split("/")
+        ]
+        if any(not part or part.startswith("unused_") for part in parts):
+            return None
+        return "/".join(parts)
+
+    def render(self, output_paths: list[str]) -> list[str]:
+        """Render output paths into the project, returning the files written."""
+        written = []
+        with tempfile.TemporaryDirectory() as staging_dir:
+            staging = pathlib.Path(staging_dir)
+            for output_path in output_paths:
+                rendered_path = self.render_path(output_path)
+                if rendered_path is None:
+                    continue
+                source = self.record.manifest.files[output_path]
+                target = staging / rendered_path
+                target.parent.mkdir(parents=True, exist_ok=True)
+                if matches_any(output_path, self.copy_without_render) or is_binary(
+                    str(source)
+                ):
+                    shutil.copy2(source, target)
+                else:
+                    with open(source, encoding="utf-8") as f:
+                        content = f.read()
+                        newline = (
+                            f.newlines[0]
+                            if isinstance(f.newlines, tuple)
+                            else f.newlines
+                        )
+                    rendered = self.env.from_string(content).render(**self.context)
+                    with open(target, "w", encoding="utf-8", newline=newline) as f:
+                        f.write(rendered)
+                    shutil.copymode(source, target)
+                written.append(rendered_path)
+
+            copy = (
+                RegionRewriter(self.region).copy
+                if self.region != DEFAULT_REGION
+                else shutil.copy2
+            )
+            for rendered_path in written:
+                destination = self.record.destination / rendered_path
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                copy(staging / rendered_path, destination)
+        return written
+
 
 class TemplateHandler(FileSystemEventHandler):
     def __init__(
@@ -35,6 +204,7 @@ class TemplateHandler(FileSystemEventHandler):
         output_dir: str | None,
         region: str,
         extra_params: str | None = None,
+        debounce: float = 0.05,
     ):
         self.agent_name = agent_name
         self.project_name = project_name
@@ -42,71 +212,154 @@ class TemplateHandler(FileSystemEventHandler):
         self.output_dir = output_dir
         self.region = region
         self.extra_params = extra_params
-        self.last_rebuild = 0
-        self.rebuild_cooldown = 1  # Seconds to wait between rebuilds
+        self.renderer: IncrementalRenderer | None = None
+        self.scheduler = RebuildScheduler(self.rebuild_changes, debounce=debounce)
 
-    def on_modified(self, event):
-        if event.is_directory:
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        if event.is_directory or event.event_type in ("opened", "closed"):
             return
+        paths = [str(event.src_path)]
+        if event.event_type == "moved":
+            paths.append(str(event.dest_path))
+        for path in paths:
+            if not is_ignored(path):
+                self.scheduler.notify(path, event.event_type)
 
-        # Implement cooldown to prevent multiple rapid rebuilds
-        current_time = time.time()
-        if current_time - self.last_rebuild < self.rebuild_cooldown:
-            return
+    @property
+    def project_path(self) -> pathlib.Path:
+        return (
+            pathlib.Path(self.output_dir) / self.project_name
+            if self.output_dir
+            else pathlib.Path(self.project_name)
+        )
 
-        self.last_rebuild = current_time
+    def create_args(self, skip_checks: bool = False) -> list[str]:
+        args = [
+            str(self.project_name),
+            "--agent",
+            self.agent_name,
+            "--deployment-target",
+            self.deployment_target,
+            "--output-dir",
+            str(self.output_dir) if self.output_dir else ".",
+            "--auto-approve",
+            "--region",
+            self.region,
+        ]
+        if skip_checks:
+            args.append("--skip-checks")
 
-        console.print(f"Detected change in {event.src_path}")
-        self.rebuild_template()
+        # Add extra parameters if provided
+        if self.extra_params:
+            # Split comma-separated parameters and add them individually
+            for param in self.extra_params.split(","):
+                args.append(param.strip())
+        return args
+
+    def affected_outputs(
+        self, paths: list[pathlib.Path], changes: dict[str, str]
+    ) -> list[str] | None:
+        """Output paths to re-render, or None if a full rebuild is needed."""
+        if self.renderer is None or any(
+            event_type != "modified" for event_type in changes.values()
+        ):
+            return None
+        outputs: list[str] = []
+        for path in paths:
+            affected = self.renderer.affected_outputs(path)
+            if affected is None:
+                return None
+            outputs.extend(affected)
+        return outputs
+
+    def rebuild_changes(self, changes: dict[str, str]) -> None:
+        """Apply a coalesced batch of changes, as incrementally as possible."""
+        for changed in changes:
+            console.print(f"Detected change in {changed}")
+        start = time.perf_counter()
+
+        paths = [pathlib.Path(path).resolve() for path in changes]
+        if any(
+            path.is_relative_to(code_dir) and path.suffix == ".py"
+            for path in paths
+            for code_dir in CLI_CODE_DIRS
+        ):
+            console.print(
+                "CLI code changed, rebuilding in a new process", style="yellow"
+            )
+            self.rebuild_template(in_process=False)
+            return
+
+        outputs = self.affected_outputs(paths, changes)
+        if outputs is None:
+            self.rebuild_template(skip_checks=True)
+            return
 
-    def rebuild_template(self):
         try:
-            # Clean output directory
-            project_path = (
-                pathlib.Path(self.output_dir) / self.project_name
-                if self.output_dir
-                else pathlib.Path(self.project_name)
+            written = self.renderer.render(outputs) if self.renderer else []
+        except Exception as e:
+            console.print(f"Error rendering template: {e}", style="bold red")
+            return
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if written:
+            console.print(
+                f"✨ Re-rendered {', '.join(written)} in {elapsed_ms:.0f} ms",
+                style="bold green",
             )
+        else:
+            console.print("No generated files affected", style="dim")
 
+    def on_render(self, record: RenderRecord) -> None:
+        self.renderer = IncrementalRenderer(record, self.region)
+
+    def rebuild_template(
+        self, in_process: bool = True, skip_checks: bool = False
+    ) -> None:
+        start = time.perf_counter()
+        try:
             # Check if the project directory exists and remove it
+            project_path = self.project_path
             if project_path.exists():
                 console.print(
                     f"Removing existing directory: {project_path}", style="yellow"
                 )
                 shutil.rmtree(project_path)
 
-            # Rebuild using the CLI tool with agent and deployment target
-            cmd = [
-                "uv",
-                "run",
-                "-m",
-                "src.cli.main",
-                "create",
-                str(self.project_name),
-                "--agent",
-                self.agent_name,
-                "--deployment-target",
-                self.deployment_target,
-                "--output-dir",
-                str(self.output_dir) if self.output_dir else ".",
-                "--auto-approve",
-                "--region",
-                self.region,
-            ]
-            
-            # Add extra parameters if provided
-            if self.extra_params:
-                # Split comma-separated parameters and add them individually
-                for param in self.extra_params.split(','):
-                    cmd.append(param.strip())
-                
-            console.print(f"Executing: {' '.join(cmd)}", style="bold blue")
-            subprocess.run(cmd, check=True)
-
-            console.print("✨ Template rebuilt successfully!", style="bold green")
+            self.renderer = None
+            if in_process:
+                console.print(
+                    f"Running: create {' '.join(self.create_args(skip_checks))}",
+                    style="bold blue",
+                )
+                add_render_listener(self.on_render)
+                try:
+                    create.main(
+                        args=self.create_args(skip_checks),
+                        prog_name="create",
+                        standalone_mode=False,
+                    )
+                finally:
+                    remove_render_listener(self.on_render)
+            else:
+                # Rebuild using the CLI tool with agent and deployment target
+                cmd = ["uv", "run", "-m", "src.cli.main", "create", *self.create_args()]
+                console.print(f"Executing: {' '.join(cmd)}", style="bold blue")
+                subprocess.run(cmd, check=True)
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            console.print(
+                f"✨ Template rebuilt successfully in {elapsed_ms:.0f} ms!",
+                style="bold green",
+            )
 
         except subprocess.CalledProcessError as e:
             console.print(f"Error rebuilding template: {e}", style="bold red")
+        except SystemExit as e:
+            # The create command reports its own errors before exiting
+            if e.code:
+                console.print(
+                    f"Error rebuilding template: exit code {e.code}", style="bold red"
+                )
         except Exception as e:
             console.print(f"Unexpected error: {e}", style="bold red")
 
@@ -123,8 +376,17 @@ class TemplateHandler(FileSystemEventHandler):
     help="Output directory for the project",
 )
 @click.option("--debug", is_flag=True, help="Enable debug logging")
-@click.option("--region", default="us-central1", help="GCP region to use")
-@click.option("--extra-params", help="Additional parameters to pass to the create command")
+@click.option("--region", default=DEFAULT_REGION, help="GCP region to use")
+@click.option(
+    "--extra-params", help="Additional parameters to pass to the create command"
+)
+@click.option(
+    "--debounce",
+    type=float,
+    default=0.05,
+    show_default=True,
+    help="Seconds without changes before a burst of edits is rebuilt",
+)
 def watch(
     agent: str,
     project_name: str,
@@ -133,10 +395,14 @@ def watch(
     debug: bool,
     region: str,
     extra_params: str | None,
-):
+    debounce: float,
+) -> None:
     """
     Watch a agent's template and automatically rebuild when changes are detected.
 
+    Template edits re-render only the generated files they affect, in process.
+    Changes that can't be mapped to generated files trigger a full rebuild.
+
     agent: Name of the agent to watch (e.g., langgraph_base_react)
     PROJECT_NAME: Name of the project to generate
     """
@@ -144,9 +410,8 @@ def watch(
         logging.basicConfig(level=logging.DEBUG)
 
     # Get directories to watch
-    root_dir = pathlib.Path(__file__).parent.parent.parent.resolve()
-    src_dir = root_dir / "src"
-    agents_dir = root_dir / "agents"
+    src_dir = ROOT_DIR / "src"
+    agents_dir = ROOT_DIR / "agents"
 
     if not agents_dir.exists():
         raise click.BadParameter(f"agents directory not found: {agents_dir}")
@@ -176,19 +441,21 @@ def watch(
         output_dir=output_dir,
         region=region,
         extra_params=extra_params,
+        debounce=debounce,
     )
 
     observer = Observer()
     # Watch both src and agents directories
     observer.schedule(event_handler, str(src_dir), recursive=True)
     observer.schedule(event_handler, str(agents_dir), recursive=True)
-    observer.start()
 
     try:
         # Trigger initial build
         console.print("\n🏗️ Performing initial build...", style="bold blue")
         event_handler.rebuild_template()
 
+        event_handler.scheduler.start()
+        observer.start()
         console.print(
             "\n🔍 Watching for changes (Press Ctrl+C to stop)...", style="bold blue"
         )
@@ -197,7 +464,9 @@ def watch(
     except KeyboardInterrupt:
         console.print("\n⏹️ Stopping watch...", style="bold yellow")
         observer.stop()
-    observer.join()
+        event_handler.scheduler.stop()
+    if observer.is_alive():
+        observer.join()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,110 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark the parsed Makefile merge against the old regex merge.
+
+The regex merge ran one DOTALL search over the whole base Makefile per missing
+target. The parsed merge indexes both Makefiles in a single pass each.
+
+Usage:
+    uv run python -m tests.benchmarks.bench_makefile_merge [--runs 5]
+"""
+
+import argparse
+import re
+import statistics
+import time
+from collections.abc import Callable
+
+from rich.console import Console
+from rich.table import Table
+
+from src.cli.utils.makefile import merge_makefiles, parse_makefile
+
+console = Console()
+
+SIZES = [100, 1000, 5000]
+
+
+def make_makefile(prefix: str, targets: int) -> str:
+    """Generate a Makefile with commented, multi-line rules."""
+    rules = []
+    for i in range(targets):
+        rules.append(
+            f"# Run step {i} of {prefix}\n"
+            f"{prefix}-{i}: {prefix}-{max(i - 1, 0)}\n"
+            f"\t@echo 'step {i}' && \\\n"
+            f"\t\tuv run python -m {prefix}.step_{i}\n"
+        )
+    return "\n".join(rules)
+
+
+def regex_merge(base: str, remote: str) -> str:
+    """The merge of render_and_merge_makefiles before the Makefile parser."""
+    base_commands = set(re.findall(r"^([a-zA-Z0-9_-]+):", base, re.MULTILINE))
+    remote_commands = set(re.findall(r"^([a-zA-Z0-9_-]+):", remote, re.MULTILINE))
+    missing_commands = base_commands - remote_commands
+    if not missing_commands:
+        return remote
+    commands_to_append = ["\n\n# --- Commands from Agent Starter Pack ---\n\n"]
+    for command in sorted(missing_commands):
+        match = re.search(
+            rf"^{command}:.*?(?=\n\n(?:^#.*\n)*?^[a-zA-Z0-9_-]+:|" + r"\Z)",
+            base,
+            re.MULTILINE | re.DOTALL,
+        )
+        if match:
+            commands_to_append.append(match.group(0))
+            commands_to_append.append("\n\n")
+    return remote + "".join(commands_to_append)
+
+
+def parsed_merge(base: str, remote: str) -> str:
+    return merge_makefiles(parse_makefile(base), parse_makefile(remote))
+
+
+def median_ms(
+    merge: Callable[[str, str], str], base: str, remote: str, runs: int
+) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        merge(base, remote)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    table = Table(title="Makefile merge (remote and base with N targets each)")
+    table.add_column("Targets", justify="right")
+    table.add_column("Regex merge (ms)", justify="right")
+    table.add_column("Parsed merge (ms)", justify="right")
+    for size in SIZES:
+        # Half of the base targets are missing from the remote Makefile
+        base = make_makefile("base", size) + make_makefile("shared", size // 2)
+        remote = make_makefile("remote", size) + make_makefile("shared", size // 2)
+        table.add_row(
+            str(size),
+            f"{median_ms(regex_merge, base, remote, args.runs):.1f}",
+            f"{median_ms(parsed_merge, base, remote, args.runs):.1f}",
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark the process_data transforms on a local Parquet stand-in.
+
+The component used to pull question_text, answers and full_text_md out of
+BigFrames one column at a time and write each result back. It now
+materializes the fetched window once as Arrow record batches, runs all
+transforms on them and writes the chunks back in one Parquet load.
+
+Offline, a synthetic Parquet file stands in for the fetched window. The
+batch transform is taken from the rendered component source itself; the
+old per-column pandas transforms are reproduced here. BigQuery round trips
+can't be timed offline and are only counted.
+
+Usage:
+    uv run --with pyarrow --with pandas --with markdownify \\
+        --with "langchain==0.3.18" \\
+        python -m tests.benchmarks.bench_process_data [--questions 5000] [--runs 5]
+"""
+
+import argparse
+import io
+import pathlib
+import random
+import statistics
+import tempfile
+import time
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime, timedelta
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from markdownify import markdownify
+from rich.console import Console
+from rich.table import Table
+
+from tests.utils.components import load_component_function
+
+console = Console()
+
+CHUNK_SIZE = 1500
+CHUNK_OVERLAP = 20
+BATCH_SIZE = 1024
+
+# Fetch, 3 column downloads and 3 uploads before, a stream and a load after
+ROUND_TRIPS_PER_COLUMN = 7
+ROUND_TRIPS_BATCHED = 2
+
+WORDS = "python list dict async await import class yield lambda pandas numpy".split()
+
+
+def html_paragraphs(rng: random.Random, count: int) -> str:
+    paragraphs = []
+    for _ in range(count):
+        words = " ".join(rng.choices(WORDS, k=rng.randint(20, 80)))
+        paragraphs.append(f"<p>{words} <code>{rng.choice(WORDS)}()</code></p>")
+    if rng.random() < 0.5:
+        paragraphs.append("<pre><code>for x in range(10):\n    print(x)</code></pre>")
+    return "\n".join(paragraphs)
+
+
+def write_stand_in(path: pathlib.Path, questions: int) -> None:
+    """Write a synthetic fetched window, with the schema of the fetch query."""
+    rng = random.Random(0)
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    table = pa.table(
+        {
+            "last_edit_date": pa.array(
+                [start + timedelta(minutes=i) for i in range(questions)],
+                type=pa.timestamp("us", tz="UTC"),
+            ),
+            "question_id": pa.array(range(questions), type=pa.int64()),
+            "question_title": [
+                " ".join(rng.choices(WORDS, k=8)) for _ in range(questions)
+            ],
+            "question_text": [
+                html_paragraphs(rng, rng.randint(1, 6)) for _ in range(questions)
+            ],
+            "answers": [
+                [
+                    {"body": html_paragraphs(rng, rng.randint(1, 8))}
+                    for _ in range(rng.randint(0, 4))
+                ]
+                for _ in range(questions)
+            ],
+        }
+    )
+    pq.write_table(table, path)
+
+
+def per_column(path: pathlib.Path) -> pd.DataFrame:
+    """Transform the window column by column, like the component used to."""
+
+    def convert_html_to_markdown(html: str) -> str:
+        return markdownify(html).strip()
+
+    def create_answers_markdown(answers: list) -> str:
+        answers_md = ""
+        for index, answer_record in enumerate(answers):
+            answers_md += f"\n\n## Answer {index + 1}:\n"
+            answers_md += convert_html_to_markdown(answer_record["body"])
+        return answers_md
+
+    df = pd.read_parquet(path)
+    df["question_title_md"] = "# " + df["question_title"] + "\n"
+    df["question_text_md"] = (
+        df["question_text"].copy().apply(convert_html_to_markdown) + "\n"
+    )
+    df["answers_md"] = df["answers"].copy().apply(create_answers_markdown)
+    df["full_text_md"] = (
+        df["question_title_md"] + df["question_text_md"] + df["answers_md"]
+    )
+    df = df[["last_edit_date", "question_id", "question_text", "full_text_md"]]
+
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP, length_function=len
+    )
+    df["text_chunk"] = (
+        df["full_text_md"].copy().astype(object).apply(text_splitter.split_text)
+    )
+    chunk_ids = [
+        str(idx) for text_chunk in df["text_chunk"] for idx in range(len(text_chunk))
+    ]
+    df = df.explode("text_chunk").reset_index(drop=True)
+    df["chunk_id"] = df["question_id"].astype("string") + "__" + chunk_ids
+    return df
+
+
+def batched(path: pathlib.Path, chunk_questions: Callable[..., pa.Table]) -> pa.Table:
+    """Transform the window batch by batch and serialize the bulk load."""
+    batches = pq.ParquetFile(path).iter_batches(batch_size=BATCH_SIZE)
+    chunks = chunk_questions(batches, CHUNK_SIZE, CHUNK_OVERLAP)
+    pq.write_table(chunks, io.BytesIO())
+    return chunks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--questions", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    chunk_questions = load_component_function(
+        "process_data", "chunk_questions", {"pa": pa, "Iterable": Iterable}
+    )
+    per_column_times, batched_times = [], []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = pathlib.Path(temp_dir) / "window.parquet"
+        write_stand_in(path, args.questions)
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            old = per_column(path)
+            per_column_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            new = batched(path, chunk_questions)
+            batched_times.append(time.perf_counter() - start)
+
+    old_chunks = sorted(zip(old["chunk_id"], old["text_chunk"], strict=True))
+    new_chunks = sorted(
+        zip(
+            new.column("chunk_id").to_pylist(),
+            new.column("text_chunk").to_pylist(),
+            strict=True,
+        )
+    )
+    if old_chunks != new_chunks:
+        raise SystemExit("The two pipelines produced different chunks")
+
+    table = Table(title=f"process_data transforms, {args.questions} questions")
+    table.add_column("Pipeline")
+    table.add_column("Median (ms)", justify="right")
+    table.add_column("Chunks", justify="right")
+    table.add_column("BigQuery round trips", justify="right")
+    table.add_row(
+        "per-column pandas",
+        f"{statistics.median(per_column_times) * 1000:.0f}",
+        str(len(old)),
+        str(ROUND_TRIPS_PER_COLUMN),
+    )
+    table.add_row(
+        "Arrow batches",
+        f"{statistics.median(batched_times) * 1000:.0f}",
+        str(new.num_rows),
+        str(ROUND_TRIPS_BATCHED),
+    )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark region substitution during rendering against the old post-pass.
+
+The post-pass walked the generated project after rendering, read every
+region-bearing file and wrote back the ones that changed. Rendering with the
+region applies the substitution while files are copied into place.
+
+Usage:
+    uv run python -m tests.benchmarks.bench_region_rewrite [--runs 5]
+"""
+
+import argparse
+import pathlib
+import statistics
+import tempfile
+import time
+
+from rich.console import Console
+from rich.table import Table
+
+from src.cli.utils.region import RegionRewriter
+from src.cli.utils.template import get_template_path, process_template
+
+console = Console()
+
+AGENT = "agentic_rag"
+REGION = "europe-west4"
+
+
+def render(output_dir: pathlib.Path, region: str) -> pathlib.Path:
+    process_template(
+        AGENT,
+        get_template_path(AGENT),
+        "bench-project",
+        deployment_target="cloud_run",
+        include_data_ingestion=True,
+        datastore="vertex_ai_search",
+        session_type="in_memory",
+        output_dir=output_dir,
+        region=region,
+    )
+    return output_dir / "bench-project"
+
+
+def post_pass(root: pathlib.Path, rewriter: RegionRewriter) -> None:
+    """Substitute region references in place, like the old post-pass did."""
+    for path in root.rglob("*"):
+        if path.is_file() and rewriter.applies_to(path.relative_to(root)):
+            try:
+                substituted = rewriter.substitute(path.read_text(encoding="utf-8"))
+            except UnicodeDecodeError:
+                continue
+            if substituted is not None:
+                path.write_text(substituted, encoding="utf-8")
+
+
+def post_pass_io(project: pathlib.Path, rewriter: RegionRewriter) -> tuple[int, int]:
+    """Count the files the post-pass reads and writes in a project."""
+    read = written = 0
+    for path in project.rglob("*"):
+        if path.is_file() and rewriter.applies_to(path.relative_to(project)):
+            read += 1
+            try:
+                content = path.read_text(encoding="utf-8")
+            except UnicodeDecodeError:
+                continue
+            if rewriter.substitute(content) is not None:
+                written += 1
+    return read, written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    rewriter = RegionRewriter(REGION)
+    post_pass_times, in_render_times = [], []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = pathlib.Path(temp_dir)
+        for run in range(args.runs):
+            start = time.perf_counter()
+            project = render(temp_path / f"post-{run}", "us-central1")
+            post_pass(project, rewriter)
+            post_pass_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            render(temp_path / f"render-{run}", REGION)
+            in_render_times.append(time.perf_counter() - start)
+
+        read, written = post_pass_io(render(temp_path / "io", "us-central1"), rewriter)
+
+    table = Table(title=f"{AGENT} (cloud_run, vertex_ai_search) in {REGION}")
+    table.add_column("Pipeline")
+    table.add_column("Median (ms)", justify="right")
+    table.add_column("Post-pass reads", justify="right")
+    table.add_column("Post-pass writes", justify="right")
+    table.add_row(
+        "render + post-pass",
+        f"{statistics.median(post_pass_times) * 1000:.0f}",
+        str(read),
+        str(written),
+    )
+    table.add_row(
+        "region during render",
+        f"{statistics.median(in_render_times) * 1000:.0f}",
+        "0",
+        "0",
+    )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -39,9 +39,7 @@ requires_session = false
 
 @patch("src.cli.commands.create.setup_gcp_environment")
 @patch("src.cli.commands.create.process_template")
-@patch("src.cli.commands.create.replace_region_in_files")
 def test_create_with_local_path(
-    mock_replace_region: Mock,
     mock_process_template: Mock,
     mock_setup_gcp: Mock,
     tmp_path: pathlib.Path,
@@ -84,9 +82,7 @@ def test_create_with_local_path(
 
 @patch("src.cli.commands.create.setup_gcp_environment")
 @patch("src.cli.commands.create.process_template")
-@patch("src.cli.commands.create.replace_region_in_files")
 def test_create_with_in_folder_flag(
-    mock_replace_region: Mock,
     mock_process_template: Mock,
     mock_setup_gcp: Mock,
     tmp_path: pathlib.Path,
@@ -132,9 +128,7 @@ def test_create_with_in_folder_flag(
 
 @patch("src.cli.commands.create.setup_gcp_environment")
 @patch("src.cli.commands.create.process_template")
-@patch("src.cli.commands.create.replace_region_in_files")
 def test_create_with_in_folder_is_permissive(
-    mock_replace_region: Mock,
     mock_process_template: Mock,
     mock_setup_gcp: Mock,
     tmp_path: pathlib.Path,
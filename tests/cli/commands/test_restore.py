@@ -0,0 +1,59 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import pathlib
+
+from click.testing import CliRunner
+
+from src.cli.commands.restore import restore
+from src.cli.utils.backup import create_snapshot, list_snapshots
+
+
+def test_restore_newest_backup(tmp_path: pathlib.Path) -> None:
+    """Test that restore reverts the project to the newest backup."""
+    (tmp_path / "agent.py").write_text("v1\n", encoding="utf-8")
+    create_snapshot(tmp_path, now=datetime.datetime(2025, 1, 1))
+    (tmp_path / "agent.py").write_text("v2\n", encoding="utf-8")
+    newest = create_snapshot(tmp_path, now=datetime.datetime(2025, 1, 2))
+    (tmp_path / "agent.py").write_text("templated\n", encoding="utf-8")
+    (tmp_path / "Makefile").write_text("install:\n", encoding="utf-8")
+
+    runner = CliRunner()
+    listed = runner.invoke(restore, ["--dir", str(tmp_path), "--list"])
+    assert listed.exit_code == 0, listed.output
+    assert newest.path.name in listed.output
+
+    result = runner.invoke(
+        restore, ["--dir", str(tmp_path), "--delete", "--auto-approve"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "0 unchanged, 1 deleted" in result.output
+    assert (tmp_path / "agent.py").read_text(encoding="utf-8") == "v2\n"
+    assert not (tmp_path / "Makefile").exists()
+
+    pruned = runner.invoke(restore, ["--dir", str(tmp_path), "--keep", "1"])
+    assert pruned.exit_code == 0, pruned.output
+    assert list_snapshots(tmp_path) == [newest.path]
+
+
+def test_restore_unknown_backup(tmp_path: pathlib.Path) -> None:
+    """Test that an unknown backup name is reported."""
+    create_snapshot(tmp_path)
+
+    result = CliRunner().invoke(restore, ["nope", "--dir", str(tmp_path)])
+
+    assert result.exit_code != 0
+    assert "Backup 'nope' not found" in result.output
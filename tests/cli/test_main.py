@@ -0,0 +1,117 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the CLI entry point and its startup time."""
+
+import os
+import pathlib
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+from click.testing import CliRunner
+
+from src.cli.main import LAZY_COMMANDS, cli
+
+ROOT_DIR = pathlib.Path(__file__).parent.parent.parent
+
+# Wall-clock budgets for a fresh interpreter, including interpreter startup.
+# Importing every command eagerly took over 4 seconds.
+STARTUP_BUDGETS = {
+    "--version": 1.5,
+    "list": 3.0,
+}
+
+# Modules that are only needed once a command does real work
+HEAVY_MODULES = [
+    "cookiecutter",
+    "google.cloud.aiplatform",
+    "google.auth",
+    "backoff",
+    "requests",
+    "src.cli.commands.create",
+]
+
+
+def run_cli(*args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    # Make the update check fail immediately instead of reaching PyPI
+    env["HTTPS_PROXY"] = "http://127.0.0.1:9"
+    return subprocess.run(
+        [sys.executable, "-m", "src.cli.main", *args],
+        cwd=ROOT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def test_commands_are_registered_lazily() -> None:
+    """Test that listing commands doesn't import them"""
+    ctx = cli.make_context("cli", [], resilient_parsing=True)
+
+    assert cli.list_commands(ctx) == sorted(LAZY_COMMANDS)
+    create = cli.get_command(ctx, "create")
+    assert create is not None and create.name == "create"
+    assert cli.get_command(ctx, "missing") is None
+
+
+def test_help_lists_all_commands() -> None:
+    """Test that --help still shows every command with its description"""
+    result = CliRunner().invoke(cli, ["--help"])
+
+    assert result.exit_code == 0
+    for name in LAZY_COMMANDS:
+        assert name in result.output
+    assert "Set up CI/CD infrastructure" in result.output
+
+
+def test_version_does_not_import_commands() -> None:
+    """Test that --version loads none of the heavy dependencies"""
+    script = textwrap.dedent(
+        f"""
+        import sys
+        from src.cli.main import cli
+        cli(["--version"], standalone_mode=False)
+        print("loaded:", [m for m in {HEAVY_MODULES!r} if m in sys.modules])
+        """
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip().splitlines()[-1] == "loaded: []"
+
+
+@pytest.mark.parametrize("command", sorted(STARTUP_BUDGETS))
+def test_startup_time_budget(command: str) -> None:
+    """Test that cheap commands stay within their wall-clock budget"""
+    # Warm up the bytecode of the CLI modules so only the import cost is timed
+    run_cli(command)
+
+    start = time.perf_counter()
+    result = run_cli(command)
+    elapsed = time.perf_counter() - start
+
+    assert result.returncode == 0, result.stderr
+    assert elapsed < STARTUP_BUDGETS[command], (
+        f"`{command}` took {elapsed:.2f}s, budget is {STARTUP_BUDGETS[command]}s"
+    )
@@ -0,0 +1,106 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for content-aware writes into existing directories."""
+
+import os
+import pathlib
+
+from src.cli.utils.apply import ApplyEngine, ApplySummary
+from src.cli.utils.region import RegionRewriter
+from src.cli.utils.template import get_template_path, process_template
+
+
+def write(path: pathlib.Path, content: str) -> pathlib.Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def mtimes(root: pathlib.Path) -> dict[str, int]:
+    return {
+        path.relative_to(root).as_posix(): path.stat().st_mtime_ns
+        for path in root.rglob("*")
+        if path.is_file() and ".backup_" not in path.as_posix()
+    }
+
+
+def test_copy_tree_only_writes_changed_files(tmp_path: pathlib.Path) -> None:
+    """Test added, modified, unchanged and removed files of a directory"""
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    write(src / "app" / "same.py", "same\n")
+    write(src / "app" / "changed.py", "new\n")
+    write(src / "app" / "new.py", "added\n")
+    write(src / "app" / "unused_tool.py", "skipped\n")
+    same = write(dst / "app" / "same.py", "same\n")
+    write(dst / "app" / "changed.py", "old\n")
+    write(dst / "app" / "stale" / "old.py", "stale\n")
+    os.utime(same, ns=(0, 0))
+
+    engine = ApplyEngine(dst)
+    engine.apply(src / "app", dst / "app", skip=lambda n: n.startswith("unused_"))
+
+    summary = engine.summary
+    assert summary.added == ["app/new.py"]
+    assert summary.modified == ["app/changed.py"]
+    assert summary.unchanged == ["app/same.py"]
+    assert summary.removed == ["app/stale/old.py"]
+    assert str(summary) == "1 added, 1 modified, 1 unchanged, 1 removed"
+    assert same.stat().st_mtime_ns == 0
+    assert (dst / "app" / "changed.py").read_text(encoding="utf-8") == "new\n"
+    assert not (dst / "app" / "stale").exists()
+    assert not (dst / "app" / "unused_tool.py").exists()
+
+
+def test_region_is_compared_after_substitution(tmp_path: pathlib.Path) -> None:
+    """Test that a file already rewritten for the region is left alone"""
+    src = write(tmp_path / "vars.tfvars", 'region = "us-central1"\n')
+    dst = write(tmp_path / "out" / "vars.tfvars", 'region = "europe-west1"\n')
+    os.utime(dst, ns=(0, 0))
+
+    engine = ApplyEngine(tmp_path / "out", RegionRewriter("europe-west1"))
+    assert engine.copy_file(src, dst) == "unchanged"
+    assert dst.stat().st_mtime_ns == 0
+
+    engine = ApplyEngine(tmp_path / "out", RegionRewriter("asia-east1"))
+    assert engine.copy_file(src, dst) == "modified"
+    assert dst.read_text(encoding="utf-8") == 'region = "asia-east1"\n'
+
+
+def test_reapplying_in_folder_is_a_no_op(tmp_path: pathlib.Path) -> None:
+    """Test that a second in-folder render leaves every file untouched"""
+    write(tmp_path / "app" / "agent.py", "root_agent = None\n")
+
+    def render() -> ApplySummary | None:
+        return process_template(
+            "adk_base",
+            get_template_path("adk_base"),
+            "infolder",
+            deployment_target="agent_engine",
+            cicd_runner="google_cloud_build",
+            output_dir=tmp_path,
+            in_folder=True,
+        )
+
+    # The second run adds starter_pack_README.md and starter_pack_pyproject.toml
+    # next to the README and pyproject.toml written by the first
+    render()
+    render()
+    before = mtimes(tmp_path)
+    summary = render()
+
+    assert summary is not None
+    assert not summary.changed
+    assert "app/agent.py" in summary.unchanged and "uv.lock" in summary.unchanged
+    assert mtimes(tmp_path) == before
@@ -0,0 +1,143 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for streaming generated projects to archives."""
+
+import io
+import pathlib
+import tarfile
+import zipfile
+
+import pytest
+
+from src.cli.utils.archive import ArchiveWriter, guess_archive_format, open_archive
+from src.cli.utils.template import get_template_path, process_template
+
+
+class PipeStream(io.RawIOBase):
+    """A write-only stream that can't seek, like stdout or a socket."""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b: bytes) -> int:  # type: ignore[override]
+        self.data.extend(b)
+        return len(b)
+
+
+def make_tree(root: pathlib.Path) -> None:
+    (root / "pkg").mkdir(parents=True)
+    (root / "pkg" / "app.py").write_text("REGION = 'us-central1'\n")
+    (root / "run.sh").write_text("#!/bin/sh\n")
+    (root / "run.sh").chmod(0o755)
+
+
+def test_guess_archive_format() -> None:
+    assert guess_archive_format("project.zip") == "zip"
+    assert guess_archive_format("project.TGZ") == "tar.gz"
+    assert guess_archive_format("project.tar") == "tar"
+    assert guess_archive_format("-") == "tar.gz"
+
+
+@pytest.mark.parametrize("archive_format", ["tar", "tar.gz", "zip"])
+def test_writes_tree_to_unseekable_stream(
+    tmp_path: pathlib.Path, archive_format: str
+) -> None:
+    """Test that entries, modes and rewritten contents reach a non-seekable stream"""
+    make_tree(tmp_path / "src")
+    stream = PipeStream()
+    with ArchiveWriter(stream, archive_format) as archive:  # type: ignore[arg-type]
+        archive.add_tree(
+            tmp_path / "src",
+            "demo",
+            rewrite=lambda p: (
+                p.read_text().replace("us-central1", "europe-west1")
+                if p.suffix == ".py"
+                else None
+            ),
+        )
+
+    data = io.BytesIO(bytes(stream.data))
+    if archive_format == "zip":
+        with zipfile.ZipFile(data) as zf:
+            names = zf.namelist()
+            app = zf.read("demo/pkg/app.py").decode()
+            mode = zf.getinfo("demo/run.sh").external_attr >> 16
+    else:
+        with tarfile.open(fileobj=data) as tf:
+            names = tf.getnames()
+            member = tf.extractfile("demo/pkg/app.py")
+            assert member is not None
+            app = member.read().decode()
+            mode = tf.getmember("demo/run.sh").mode
+    assert [name.rstrip("/") for name in names] == [
+        "demo",
+        "demo/run.sh",
+        "demo/pkg",
+        "demo/pkg/app.py",
+    ]
+    assert app == "REGION = 'europe-west1'\n"
+    assert mode & 0o100
+
+
+def test_failed_archive_leaves_no_file(tmp_path: pathlib.Path) -> None:
+    """Test that an archive file only appears once it is complete"""
+    target = tmp_path / "project.zip"
+    with pytest.raises(RuntimeError), open_archive(target):
+        raise RuntimeError("render failed")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_process_template_archive_matches_directory(
+    tmp_path: pathlib.Path,
+) -> None:
+    """Test that an archived project has the same files as one written to disk"""
+    kwargs = {
+        "deployment_target": "cloud_run",
+        "session_type": "in_memory",
+        "region": "europe-west1",
+    }
+    process_template(
+        "adk_base",
+        get_template_path("adk_base"),
+        "archived",
+        output_dir=tmp_path / "dir",
+        **kwargs,
+    )
+    with open_archive(tmp_path / "archived.tar.gz") as archive:
+        process_template(
+            "adk_base",
+            get_template_path("adk_base"),
+            "archived",
+            output_dir=tmp_path / "unused",
+            archive=archive,
+            **kwargs,
+        )
+
+    assert not (tmp_path / "unused").exists()
+    with tarfile.open(tmp_path / "archived.tar.gz") as tf:
+        archived = {
+            member.name: tf.extractfile(member).read()  # type: ignore[union-attr]
+            for member in tf.getmembers()
+            if member.isfile()
+        }
+    on_disk = tmp_path / "dir"
+    assert archived == {
+        path.relative_to(on_disk).as_posix(): path.read_bytes()
+        for path in on_disk.rglob("*")
+        if path.is_file()
+    }
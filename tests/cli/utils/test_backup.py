@@ -0,0 +1,132 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for incremental project snapshots."""
+
+import datetime
+import os
+import pathlib
+
+import pytest
+
+from src.cli.utils.backup import (
+    create_snapshot,
+    get_backup_retention,
+    list_snapshots,
+    prune_snapshots,
+    restore_snapshot,
+)
+
+T0 = datetime.datetime(2025, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def project(tmp_path: pathlib.Path) -> pathlib.Path:
+    project = tmp_path / "project"
+    (project / "app").mkdir(parents=True)
+    (project / "app" / "agent.py").write_text("agent = 1\n", encoding="utf-8")
+    (project / "data.bin").write_bytes(b"\0" * 4096)
+    (project / ".git").mkdir()
+    (project / ".git" / "HEAD").write_text("ref\n", encoding="utf-8")
+    return project
+
+
+def at(minutes: int) -> datetime.datetime:
+    return T0 + datetime.timedelta(minutes=minutes)
+
+
+def test_snapshot_skips_ignored_directories(project: pathlib.Path) -> None:
+    """Test that a first snapshot copies the project without .git"""
+    result = create_snapshot(project, now=T0)
+
+    assert result.path.name == ".backup_project_20250101_120000"
+    assert (result.copied, result.linked) == (2, 0)
+    assert (result.path / "app" / "agent.py").read_text(encoding="utf-8") == (
+        "agent = 1\n"
+    )
+    assert not (result.path / ".git").exists()
+    # A snapshot never shares an inode with the working tree
+    assert not os.path.samefile(result.path / "data.bin", project / "data.bin")
+
+
+def test_unchanged_files_are_linked_to_previous_snapshot(
+    project: pathlib.Path,
+) -> None:
+    """Test that only changed files are copied by later snapshots"""
+    first = create_snapshot(project, now=at(0))
+    (project / "app" / "agent.py").write_text("agent = 2\n", encoding="utf-8")
+
+    second = create_snapshot(project, now=at(1))
+
+    assert (second.copied, second.linked) == (1, 1)
+    assert os.path.samefile(first.path / "data.bin", second.path / "data.bin")
+    assert (first.path / "app" / "agent.py").read_text(encoding="utf-8") == (
+        "agent = 1\n"
+    )
+    assert not (second.path / first.path.name).exists()
+
+
+def test_snapshots_in_the_same_second_get_distinct_names(
+    project: pathlib.Path,
+) -> None:
+    """Test that a second snapshot with the same timestamp doesn't collide"""
+    first = create_snapshot(project, now=T0)
+    second = create_snapshot(project, now=T0)
+
+    assert second.path.name == f"{first.path.name}_2"
+    assert list_snapshots(project) == [first.path, second.path]
+
+
+def test_prune_keeps_newest_snapshots(project: pathlib.Path) -> None:
+    """Test that pruning removes the oldest snapshots only"""
+    snapshots = [create_snapshot(project, now=at(i)).path for i in range(4)]
+
+    pruned = prune_snapshots(project, keep=2)
+
+    assert pruned == snapshots[:2]
+    assert list_snapshots(project) == snapshots[2:]
+    # Files linked from a pruned snapshot are still intact
+    assert (snapshots[3] / "data.bin").read_bytes() == b"\0" * 4096
+
+
+def test_restore_reverts_changes(project: pathlib.Path) -> None:
+    """Test restoring changed, deleted and added files"""
+    snapshot = create_snapshot(project, now=T0).path
+    (project / "app" / "agent.py").write_text("templated\n", encoding="utf-8")
+    (project / "data.bin").unlink()
+    (project / "Makefile").write_text("install:\n", encoding="utf-8")
+    (project / "deployment").mkdir()
+    (project / "deployment" / "main.tf").write_text("", encoding="utf-8")
+
+    kept = restore_snapshot(snapshot, project)
+    assert (kept.restored, kept.unchanged, kept.removed) == (2, 0, 0)
+    assert (project / "Makefile").exists()
+
+    result = restore_snapshot(snapshot, project, delete=True)
+    assert (result.restored, result.unchanged, result.removed) == (0, 2, 2)
+    assert (project / "app" / "agent.py").read_text(encoding="utf-8") == "agent = 1\n"
+    assert (project / "data.bin").exists()
+    assert not (project / "Makefile").exists()
+    assert not (project / "deployment").exists()
+    assert (project / ".git" / "HEAD").exists()
+    assert snapshot.exists()
+
+
+def test_backup_retention_from_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test ASP_BACKUP_RETENTION parsing"""
+    assert get_backup_retention() == 5
+    monkeypatch.setenv("ASP_BACKUP_RETENTION", "0")
+    assert get_backup_retention() == 0
+    monkeypatch.setenv("ASP_BACKUP_RETENTION", "many")
+    assert get_backup_retention() == 5
@@ -0,0 +1,131 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the cache of GCP environment checks."""
+
+import os
+import pathlib
+import subprocess
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.cli.commands import create
+from src.cli.utils import gcp
+from src.cli.utils.check_cache import get_cached_check, store_check
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ASP_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("ASP_NO_CACHE", raising=False)
+    monkeypatch.delenv("ASP_CHECK_TTL", raising=False)
+
+
+def test_checks_expire_after_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a stored check is only returned within the TTL and its key"""
+    store_check("vertex", "me@example.com", "proj", "us-central1", result={"x": 1})
+
+    assert get_cached_check("vertex", "me@example.com", "proj", "us-central1") == {
+        "x": 1
+    }
+    assert get_cached_check("vertex", "me@example.com", "proj", "europe-west1") is None
+    assert (
+        get_cached_check("vertex", "other@example.com", "proj", "us-central1") is None
+    )
+
+    monkeypatch.setenv("ASP_CHECK_TTL", "60")
+    later = time.time() + 61
+    with patch("src.cli.utils.check_cache.time.time", return_value=later):
+        assert (
+            get_cached_check("vertex", "me@example.com", "proj", "us-central1") is None
+        )
+
+
+@pytest.mark.parametrize("env", [{"ASP_CHECK_TTL": "0"}, {"ASP_NO_CACHE": "1"}])
+def test_cache_can_be_disabled(
+    monkeypatch: pytest.MonkeyPatch, env: dict[str, str]
+) -> None:
+    """Test that ASP_CHECK_TTL=0 and ASP_NO_CACHE turn the cache off"""
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    store_check("vertex", "me@example.com", "proj", "us-central1")
+    assert get_cached_check("vertex", "me@example.com", "proj", "us-central1") is None
+
+
+def test_vertex_verification_is_reused() -> None:
+    """Test that only successful Vertex AI checks are remembered"""
+    with patch.object(
+        gcp, "_verify_vertex_connection", side_effect=[Exception("denied"), None, None]
+    ) as verify:
+        with pytest.raises(Exception, match="denied"):
+            gcp.verify_vertex_connection("proj", "us-central1", account="me@x.com")
+        gcp.verify_vertex_connection("proj", "us-central1", account="me@x.com")
+        gcp.verify_vertex_connection("proj", "us-central1", account="me@x.com")
+        gcp.verify_vertex_connection("proj", "europe-west1", account="me@x.com")
+
+    assert verify.call_count == 3
+    assert gcp.is_vertex_connection_verified("me@x.com", "proj", "us-central1")
+    assert not gcp.is_vertex_connection_verified("me@x.com", "proj", "us-east1")
+
+
+def test_account_lookup_is_reused_until_gcloud_config_changes(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that gcloud is asked for the account once per configuration"""
+    config_dir = tmp_path / "gcloud"
+    (config_dir / "configurations").mkdir(parents=True)
+    config_file = config_dir / "configurations" / "config_default"
+    config_file.write_text("[core]\naccount = me@example.com\n")
+    monkeypatch.setenv("CLOUDSDK_CONFIG", str(config_dir))
+    credentials = MagicMock(spec=["refresh_token", "client_id"])
+    credentials.refresh_token = "token"
+    credentials.client_id = "client"
+    gcloud = subprocess.CompletedProcess([], 0, stdout="me@example.com\n")
+
+    with (
+        patch("google.auth.default", return_value=(credentials, "proj")),
+        patch.object(gcp.subprocess, "run", return_value=gcloud) as run,
+    ):
+        first = gcp.verify_credentials()
+        second = gcp.verify_credentials()
+        assert run.call_count == 1
+
+        os.utime(config_file, ns=(0, 0))
+        gcp.verify_credentials()
+        assert run.call_count == 2
+
+    assert first == second == {"project": "proj", "account": "me@example.com"}
+
+
+def test_unknown_account_is_never_cached() -> None:
+    """Test that credentials without a known account always set up and verify"""
+    store_check("vertex", gcp.UNKNOWN_ACCOUNT, "proj", "us-central1", "")
+    creds_info = {"project": "proj", "account": gcp.UNKNOWN_ACCOUNT}
+
+    with (
+        patch.object(create, "verify_credentials", return_value=creds_info),
+        patch.object(create, "set_gcp_project") as set_project,
+        patch.object(gcp, "_verify_vertex_connection") as verify,
+    ):
+        create.setup_gcp_environment(
+            auto_approve=True, skip_checks=False, region="us-central1", debug=False
+        )
+        create.setup_gcp_environment(
+            auto_approve=True, skip_checks=False, region="us-central1", debug=False
+        )
+
+    assert set_project.call_count == 2
+    assert verify.call_count == 2
@@ -14,11 +14,49 @@
 
 """Tests for CI/CD utility functions."""
 
+import json
+import os
+import pathlib
+import sys
+import textwrap
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from cli.utils.cicd import ProjectConfig, print_cicd_summary, run_command
+from cli.utils.cicd import (
+    ProjectConfig,
+    ensure_apis_enabled,
+    print_cicd_summary,
+    run_command,
+)
+
+FAKE_GCLOUD = """\
+import fcntl, json, pathlib, sys
+
+state_file = pathlib.Path(__file__).with_name("state.json")
+# Calls run concurrently, so updates of the state are serialized
+lock = open(state_file.with_suffix(".lock"), "w")
+fcntl.flock(lock, fcntl.LOCK_EX)
+state = json.loads(state_file.read_text())
+args = sys.argv[1:]
+state["calls"].append(args)
+if args[:2] == ["services", "list"]:
+    # Newly enabled services show up after a few list calls
+    for name, remaining in list(state["pending"].items()):
+        if remaining <= 0:
+            state["enabled"].append(name)
+            del state["pending"][name]
+        else:
+            state["pending"][name] = remaining - 1
+    print("\\n".join(state["enabled"]))
+elif args[:2] == ["services", "enable"]:
+    for name in args[2:]:
+        if not name.startswith("--"):
+            state["pending"][name] = state["lag"]
+elif args[:2] == ["projects", "describe"]:
+    print("123456")
+state_file.write_text(json.dumps(state))
+"""
 
 
 @pytest.fixture
@@ -87,3 +125,72 @@ def test_run_command(capsys: pytest.CaptureFixture) -> None:
         captured = capsys.readouterr()
         assert "🔄 Running command: test command" in captured.out
         assert result.stdout == "test output"
+
+
+@pytest.fixture
+def fake_gcloud(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    """Put a gcloud stub on PATH that records its calls in state.json"""
+    script = tmp_path / "fake_gcloud.py"
+    script.write_text(FAKE_GCLOUD)
+    gcloud = tmp_path / "gcloud"
+    gcloud.write_text(
+        textwrap.dedent(f"""\
+            #!/bin/sh
+            exec "{sys.executable}" "{script}" "$@"
+            """)
+    )
+    gcloud.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    state_file = tmp_path / "state.json"
+
+    def configure(enabled: list[str], lag: int = 0) -> pathlib.Path:
+        state = {"enabled": enabled, "pending": {}, "lag": lag, "calls": []}
+        state_file.write_text(json.dumps(state))
+        return state_file
+
+    return configure
+
+
+def test_ensure_apis_enabled_batches_and_polls(fake_gcloud) -> None:
+    """Test that missing APIs are enabled in one call and polled until listed"""
+    state_file = fake_gcloud(["run.googleapis.com"], lag=2)
+
+    ensure_apis_enabled(
+        "my-project",
+        ["run.googleapis.com", "cloudbuild.googleapis.com", "iam.googleapis.com"],
+        poll_interval=0,
+    )
+
+    state = json.loads(state_file.read_text())
+    calls = [call[:2] for call in state["calls"]]
+    enables = [call for call in state["calls"] if call[:2] == ["services", "enable"]]
+    assert enables == [
+        [
+            "services",
+            "enable",
+            "cloudbuild.googleapis.com",
+            "iam.googleapis.com",
+            "--project=my-project",
+        ]
+    ]
+    # One listing before enabling, then polls until the lag has passed
+    assert calls.count(["services", "list"]) == 4
+    assert calls.count(["projects", "describe"]) == 1
+    assert calls[-1] == ["projects", "add-iam-policy-binding"]
+    assert (
+        "--member=serviceAccount:service-123456@gcp-sa-cloudbuild.iam.gserviceaccount.com"
+        in state["calls"][-1]
+    )
+
+
+def test_ensure_apis_enabled_times_out(fake_gcloud) -> None:
+    """Test that an API that never shows up as enabled fails the setup"""
+    state_file = fake_gcloud([], lag=1000)
+
+    with pytest.raises(TimeoutError, match=r"cloudbuild\.googleapis\.com"):
+        ensure_apis_enabled(
+            "my-project", ["cloudbuild.googleapis.com"], poll_interval=0, timeout=0
+        )
+
+    calls = [call[:2] for call in json.loads(state_file.read_text())["calls"]]
+    assert ["projects", "add-iam-policy-binding"] not in calls
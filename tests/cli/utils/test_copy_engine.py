@@ -0,0 +1,99 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the file copy engine and copy_files."""
+
+import pathlib
+
+from src.cli.utils.copy_engine import copy_file, copy_many, matches_any
+from src.cli.utils.template import copy_files
+
+
+def write(path: pathlib.Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def test_copy_file_only_clones_when_allowed(tmp_path: pathlib.Path) -> None:
+    """Test that only files marked for cloning are reflinked or hardlinked"""
+    src = tmp_path / "src.txt"
+    write(src, "content")
+
+    assert copy_file(src, tmp_path / "copy.txt") == "copy"
+    assert copy_file(src, tmp_path / "clone.txt", clone=True, allow_hardlink=True) in {
+        "reflink",
+        "hardlink",
+    }
+    # Overwriting an existing destination works for every method
+    write(tmp_path / "existing.txt", "old")
+    copy_file(src, tmp_path / "existing.txt", clone=True, allow_hardlink=True)
+    assert (tmp_path / "existing.txt").read_text(encoding="utf-8") == "content"
+
+    assert (tmp_path / "copy.txt").stat().st_ino != src.stat().st_ino
+
+
+def test_copy_many_parallel(tmp_path: pathlib.Path) -> None:
+    """Test that a batch of files is copied on the thread pool"""
+    src = tmp_path / "src"
+    dst = tmp_path / "dst"
+    dst.mkdir()
+    for i in range(50):
+        write(src / f"{i}.txt", str(i))
+
+    counts = copy_many(
+        ((src / f"{i}.txt", dst / f"{i}.txt", False) for i in range(50)),
+        max_workers=4,
+    )
+
+    assert counts == {"copy": 50}
+    assert all(
+        (dst / f"{i}.txt").read_text(encoding="utf-8") == str(i) for i in range(50)
+    )
+
+
+def test_matches_any() -> None:
+    """Test cookiecutter style pattern matching"""
+    patterns = ["*.json", "frontend/*", ""]
+    assert matches_any("data/config.json", patterns)
+    assert matches_any("frontend/src/App.tsx", patterns)
+    assert not matches_any("app/agent.py", patterns)
+
+
+def test_copy_files_rules_and_overwrite(tmp_path: pathlib.Path) -> None:
+    """Test exclusions, nested directories and the overwrite flag"""
+    src = tmp_path / "src"
+    dst = tmp_path / "dst"
+    write(src / "README.md", "new readme")
+    write(src / "app" / "agent.py", "agent")
+    write(src / "app" / "utils" / "helpers.py", "helpers")
+    write(src / "app" / "agent.pyc", "compiled")
+    write(src / "__pycache__" / "x.pyc", "compiled")
+    write(src / ".git" / "HEAD", "ref")
+    write(src / ".template" / "templateconfig.yaml", "config")
+    write(dst / "README.md", "old readme")
+
+    copy_files(src, dst, agent_name="live_api")
+
+    assert (dst / "README.md").read_text(encoding="utf-8") == "old readme"
+    assert (dst / "app" / "agent.py").read_text(encoding="utf-8") == "agent"
+    assert not (dst / "app" / "utils").exists()
+    assert not (dst / "app" / "agent.pyc").exists()
+    assert not (dst / "__pycache__").exists()
+    assert not (dst / ".git").exists()
+    assert not (dst / ".template").exists()
+
+    copy_files(src, dst, overwrite=True, copy_without_render=["*.md"])
+
+    assert (dst / "README.md").read_text(encoding="utf-8") == "new readme"
+    assert (dst / "app" / "utils" / "helpers.py").exists()
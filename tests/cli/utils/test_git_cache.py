@@ -0,0 +1,204 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the git mirror cache used by remote templates and ADK samples."""
+
+import pathlib
+import shutil
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+from src.cli.utils.git_cache import get_mirror_path, run_git
+from src.cli.utils.remote_template import (
+    RemoteTemplateSpec,
+    fetch_remote_template,
+    get_adk_agents,
+)
+
+
+def commit_files(repo: pathlib.Path, files: dict[str, str]) -> None:
+    for name, content in files.items():
+        path = repo / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+    run_git("add", "-A", cwd=repo)
+    run_git(
+        "-c",
+        "user.name=Test",
+        "-c",
+        "user.email=test@example.com",
+        "commit",
+        "--quiet",
+        "-m",
+        "update",
+        cwd=repo,
+    )
+
+
+@pytest.fixture
+def remote_repo(tmp_path: pathlib.Path) -> pathlib.Path:
+    repo = tmp_path / "remote"
+    run_git("init", "--quiet", "--initial-branch", "main", str(repo))
+    commit_files(
+        repo,
+        {
+            "README.md": "samples\n",
+            "python/agents/sample/pyproject.toml": "[project]\nname = 'sample'\n",
+            "python/agents/other/pyproject.toml": "[project]\nname = 'other'\n",
+        },
+    )
+    return repo
+
+
+def make_spec(repo: pathlib.Path, git_ref: str = "main") -> RemoteTemplateSpec:
+    return RemoteTemplateSpec(
+        repo_url=repo.as_uri(),
+        template_path="python/agents/sample",
+        git_ref=git_ref,
+    )
+
+
+def test_sparse_checkout_of_template_path(remote_repo: pathlib.Path) -> None:
+    """Test that only the template path is checked out from the mirror"""
+    template_dir, temp_dir = fetch_remote_template(make_spec(remote_repo))
+
+    try:
+        assert template_dir == temp_dir / "repo" / "python" / "agents" / "sample"
+        assert (template_dir / "pyproject.toml").read_text(encoding="utf-8") == (
+            "[project]\nname = 'sample'\n"
+        )
+        assert not (temp_dir / "repo" / "python" / "agents" / "other").exists()
+        assert (get_mirror_path(remote_repo.as_uri()) / "HEAD").is_file()
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def test_repeated_fetch_only_checks_the_ref(remote_repo: pathlib.Path) -> None:
+    """Test that an unchanged ref is served from the mirror without fetching"""
+    _, temp_dir = fetch_remote_template(make_spec(remote_repo))
+    shutil.rmtree(temp_dir)
+
+    with patch("src.cli.utils.git_cache.run_git", wraps=run_git) as mock_git:
+        _, temp_dir = fetch_remote_template(make_spec(remote_repo))
+    shutil.rmtree(temp_dir)
+
+    # Mirror commands are run as `git --git-dir <mirror> <command> ...`
+    commands = [
+        call.args[2] for call in mock_git.call_args_list if call.args[0] == "--git-dir"
+    ]
+    assert "ls-remote" in commands
+    assert "fetch" not in commands
+
+
+def test_new_commits_are_fetched(remote_repo: pathlib.Path) -> None:
+    """Test that a moved ref is fetched into the existing mirror"""
+    _, temp_dir = fetch_remote_template(make_spec(remote_repo))
+    shutil.rmtree(temp_dir)
+    commit_files(remote_repo, {"python/agents/sample/agent.py": "VERSION = 2\n"})
+
+    template_dir, temp_dir = fetch_remote_template(make_spec(remote_repo))
+
+    try:
+        assert (template_dir / "agent.py").read_text(encoding="utf-8") == (
+            "VERSION = 2\n"
+        )
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def test_cached_ref_is_used_when_remote_is_unreachable(
+    remote_repo: pathlib.Path, tmp_path: pathlib.Path
+) -> None:
+    """Test that a previously fetched ref works without the remote"""
+    spec = make_spec(remote_repo)
+    _, temp_dir = fetch_remote_template(spec)
+    shutil.rmtree(temp_dir)
+    remote_repo.rename(tmp_path / "moved")
+
+    template_dir, temp_dir = fetch_remote_template(spec)
+
+    try:
+        assert (template_dir / "pyproject.toml").exists()
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def test_unknown_ref_fails_and_cleans_up(
+    remote_repo: pathlib.Path, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a missing branch is reported as a failed clone"""
+    temp_root = tmp_path / "tmp"
+    temp_root.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(temp_root))
+
+    with pytest.raises(RuntimeError, match="Remote branch nope not found"):
+        fetch_remote_template(make_spec(remote_repo, git_ref="nope"))
+
+    assert list(temp_root.iterdir()) == []
+
+
+def test_clone_is_used_when_cache_is_disabled(
+    remote_repo: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that ASP_NO_CACHE bypasses the mirror"""
+    monkeypatch.setenv("ASP_NO_CACHE", "1")
+
+    template_dir, temp_dir = fetch_remote_template(make_spec(remote_repo))
+
+    try:
+        assert (template_dir / "pyproject.toml").exists()
+        assert (temp_dir / "repo" / "python" / "agents" / "other").exists()
+        assert not get_mirror_path(remote_repo.as_uri()).exists()
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def test_adk_manifest_is_reused_at_the_same_commit(
+    remote_repo: pathlib.Path,
+) -> None:
+    """Test that ADK samples are only discovered once per commit"""
+    spec = RemoteTemplateSpec(remote_repo.as_uri(), "", "main", is_adk_samples=True)
+    commit_files(
+        remote_repo,
+        {
+            "python/agents/explicit/pyproject.toml": (
+                "[project]\nname = 'explicit'\n"
+                "[tool.agent-starter-pack]\ndescription = 'Configured'\n"
+            )
+        },
+    )
+
+    agents = get_adk_agents(spec)
+    with patch(
+        "src.cli.utils.remote_template.GitMirror.add_worktree"
+    ) as mock_add_worktree:
+        cached = get_adk_agents(spec)
+
+    mock_add_worktree.assert_not_called()
+    assert cached == agents
+    assert [
+        (a["name"], a["spec"], a["has_explicit_config"]) for a in agents.values()
+    ] == [
+        ("explicit", "adk@explicit", True),
+        ("other", "adk@other", False),
+        ("sample", "adk@sample", False),
+    ]
+    assert agents[1]["description"] == "Configured"
+
+    commit_files(
+        remote_repo, {"python/agents/new/pyproject.toml": "[project]\nname = 'new'\n"}
+    )
+    assert "adk@new" in {a["spec"] for a in get_adk_agents(spec).values()}
@@ -0,0 +1,76 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the shared Jinja environment and bytecode cache."""
+
+import pathlib
+
+import pytest
+from jinja2 import Environment, FileSystemLoader
+
+from src.cli.utils.jinja_cache import (
+    ContentHashBytecodeCache,
+    get_bytecode_cache,
+    render_string,
+)
+
+
+@pytest.fixture
+def cache_dir(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    """Point the CLI cache at a temporary directory"""
+    cache = tmp_path / "cache"
+    monkeypatch.setenv("ASP_CACHE_DIR", str(cache))
+    monkeypatch.delenv("ASP_NO_CACHE", raising=False)
+    return cache
+
+
+def test_render_string_persists_bytecode(cache_dir: pathlib.Path) -> None:
+    """Test that rendering stores compiled bytecode in the cache dir"""
+    source = "Hello {{ cookiecutter.project_name }}!"
+
+    assert render_string(source, cookiecutter={"project_name": "a"}) == "Hello a!"
+    assert render_string(source, cookiecutter={"project_name": "b"}) == "Hello b!"
+    assert len(list((cache_dir / "jinja").glob("__jinja2_*.cache"))) == 1
+
+
+def test_bytecode_cache_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that ASP_NO_CACHE disables the bytecode cache"""
+    monkeypatch.setenv("ASP_NO_CACHE", "1")
+
+    assert get_bytecode_cache() is None
+    assert render_string("{{ x }}", x=1) == "1"
+
+
+def test_bytecode_cache_key_ignores_filename(tmp_path: pathlib.Path) -> None:
+    """Test that the same template staged in different directories shares bytecode"""
+    bytecode_cache = ContentHashBytecodeCache(str(tmp_path / "bytecode"))
+    (tmp_path / "bytecode").mkdir()
+    for staging in ["one", "two"]:
+        template_dir = tmp_path / staging
+        template_dir.mkdir()
+        (template_dir / "README.md").write_text("# {{ name }}\n", encoding="utf-8")
+        env = Environment(
+            loader=FileSystemLoader(str(template_dir)),
+            bytecode_cache=bytecode_cache,
+        )
+        assert env.get_template("README.md").render(name=staging) == f"# {staging}"
+
+    assert len(list((tmp_path / "bytecode").iterdir())) == 1
+
+    (tmp_path / "two" / "README.md").write_text("## {{ name }}\n", encoding="utf-8")
+    env = Environment(
+        loader=FileSystemLoader(str(tmp_path / "two")), bytecode_cache=bytecode_cache
+    )
+    assert env.get_template("README.md").render(name="x") == "## x"
+    assert len(list((tmp_path / "bytecode").iterdir())) == 2
@@ -0,0 +1,94 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the deduplicated lock file store."""
+
+import json
+import pathlib
+
+import pytest
+
+from src.cli.utils.apply import ApplyEngine
+from src.cli.utils.lock_store import (
+    INDEX_FILE,
+    LockStore,
+    LockStoreWriter,
+    get_lock_store,
+    split_lock,
+)
+from src.cli.utils.registry import get_registry
+
+HEADER = 'version = 1\nrequires-python = ">=3.10"\n\n'
+SHARED = '[[package]]\nname = "shared"\nversion = "1.0"\n\n'
+PROJECT = (
+    '[[package]]\nname = "{{cookiecutter.project_name}}"\nsource = { editable = "." }\n'
+)
+
+
+def lock(*entries: str) -> str:
+    return HEADER + "".join(entries)
+
+
+def test_split_lock_is_lossless() -> None:
+    """Test that the chunks of a lock join back to the original content"""
+    content = lock(SHARED, PROJECT)
+    assert split_lock(content) == [HEADER, SHARED, PROJECT]
+    assert "".join(split_lock(content)) == content
+
+
+def test_store_deduplicates_and_substitutes(tmp_path: pathlib.Path) -> None:
+    """Test that shared entries are stored once and the project name substituted"""
+    writer = LockStoreWriter(tmp_path)
+    writer.add("uv-a-cloud_run.lock", lock(SHARED, PROJECT))
+    writer.add("uv-b-cloud_run.lock", lock(SHARED, '[[package]]\nname = "b"\n'))
+    writer.write()
+
+    index = json.loads((tmp_path / INDEX_FILE).read_text(encoding="utf-8"))
+    assert len(index["objects"]) == 4
+
+    store = LockStore(tmp_path)
+    assert store.names() == ["uv-a-cloud_run.lock", "uv-b-cloud_run.lock"]
+    assert store.read_text("uv-a-cloud_run.lock") == lock(SHARED, PROJECT)
+    assert 'name = "my-agent"' in store.read_text("uv-a-cloud_run.lock", "my-agent")
+
+    with pytest.raises(FileNotFoundError):
+        store.read_text("uv-missing-cloud_run.lock")
+
+
+def test_write_chunks_only_replaces_changed_lock(tmp_path: pathlib.Path) -> None:
+    """Test that a streamed lock is only written when its content changes"""
+    writer = LockStoreWriter(tmp_path / "store")
+    writer.add("uv-a-cloud_run.lock", lock(SHARED, PROJECT))
+    writer.write()
+    store = LockStore(tmp_path / "store")
+    dst = tmp_path / "project" / "uv.lock"
+
+    engine = ApplyEngine(tmp_path / "project")
+    chunks = store.iter_text("uv-a-cloud_run.lock", "my-agent")
+    assert engine.write_chunks(dst, chunks) == "added"
+    chunks = store.iter_text("uv-a-cloud_run.lock", "my-agent")
+    assert engine.write_chunks(dst, chunks) == "unchanged"
+    chunks = store.iter_text("uv-a-cloud_run.lock", "other-agent")
+    assert engine.write_chunks(dst, chunks) == "modified"
+    assert list(dst.parent.iterdir()) == [dst]
+
+
+def test_bundled_store_has_a_lock_per_template_target() -> None:
+    """Test that the bundled store covers every local agent and deployment target"""
+    store = get_lock_store()
+    for entry in get_registry().agents().values():
+        for target in entry.targets:
+            content = store.read_text(entry.lock_name(target), "my-agent")
+            assert content.startswith("version = ")
+            assert 'name = "my-agent"' in content
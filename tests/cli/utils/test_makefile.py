@@ -0,0 +1,98 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the Makefile parser and merge."""
+
+import pathlib
+
+from src.cli.utils.makefile import (
+    MERGE_HEADER,
+    collect_targets,
+    merge_makefiles,
+    parse_makefile,
+)
+
+BASE = """\
+PROJECT := demo
+.PHONY: install lint test
+
+# Install dependencies
+install:
+\tuv sync --dev
+
+# Run the linters
+lint: install
+\tuv run ruff check . \\
+\t\t--diff
+
+\tuv run mypy .
+
+test:
+\tuv run pytest
+"""
+
+
+def test_parse_is_lossless_and_indexes_rules() -> None:
+    """Test that rules, .PHONY lists and assignments are told apart"""
+    makefile = parse_makefile(BASE)
+
+    assert makefile.render() == BASE
+    assert makefile.targets == {"install", "lint", "test"}
+    assert makefile.phony == ["install", "lint", "test"]
+    lint = makefile.rules["lint"]
+    assert lint.prerequisites == ["install"]
+    assert lint.text.startswith("# Run the linters\nlint: install\n")
+    assert lint.text.endswith("\tuv run mypy .\n")
+
+
+def test_parse_skips_assignments_and_define_blocks() -> None:
+    """Test that := assignments and define bodies aren't taken for rules"""
+    content = (
+        "A := x\nB ::= y\nC = a:b\ndefine RECIPE\nfoo: bar\nendef\nreal:\n\t@true\n"
+    )
+    makefile = parse_makefile(content)
+    assert makefile.targets == {"real"}
+    assert makefile.render() == content
+
+
+def test_merge_appends_missing_rules_with_comments_and_phony() -> None:
+    """Test that only the base rules the remote lacks are appended"""
+    remote = "include extra.mk\n\ninstall:\n\tpip install .\n"
+    merged = merge_makefiles(parse_makefile(BASE), parse_makefile(remote))
+
+    assert merged.startswith(remote + MERGE_HEADER)
+    appended = merged[len(remote + MERGE_HEADER) :]
+    assert appended.startswith(".PHONY: lint test\n\n# Run the linters\nlint:")
+    assert "uv sync" not in appended
+    assert appended.index("lint:") < appended.index("test:")
+
+
+def test_merge_without_missing_rules_keeps_remote() -> None:
+    """Test that the remote Makefile is kept verbatim when nothing is missing"""
+    remote = "install:\n\t@true\nlint:\n\t@true\ntest:\n\t@true\n"
+    assert merge_makefiles(parse_makefile(BASE), parse_makefile(remote)) == remote
+
+
+def test_included_targets_are_not_appended(tmp_path: pathlib.Path) -> None:
+    """Test that targets defined in included files count as defined"""
+    (tmp_path / "mk").mkdir()
+    (tmp_path / "mk" / "lint.mk").write_text("lint:\n\t@true\n", encoding="utf-8")
+    (tmp_path / "mk" / "test.mk").write_text(
+        "include mk/lint.mk\ntest:\n\t@true\n", encoding="utf-8"
+    )
+    remote = parse_makefile("include mk/test.mk $(EXTRA)\ninstall:\n\t@true\n")
+
+    targets = collect_targets(remote, tmp_path)
+    assert targets == {"install", "lint", "test"}
+    assert merge_makefiles(parse_makefile(BASE), remote, targets) == remote.render()
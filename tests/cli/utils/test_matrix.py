@@ -0,0 +1,116 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for batch project generation from a matrix spec."""
+
+import json
+import pathlib
+
+import pytest
+from click.testing import CliRunner
+
+from src.cli.commands.create import create
+from src.cli.utils.matrix import (
+    MatrixJob,
+    expand_matrix,
+    load_matrix_spec,
+    run_matrix,
+)
+
+
+def test_load_matrix_spec_yaml_and_json(tmp_path: pathlib.Path) -> None:
+    """Test that YAML and JSON specs load to the same mapping"""
+    spec = {"agents": ["adk_base"], "exclude": [{"deployment_target": "cloud_run"}]}
+    (tmp_path / "spec.json").write_text(json.dumps(spec), encoding="utf-8")
+    (tmp_path / "spec.yaml").write_text(
+        "agents: [adk_base]\nexclude:\n  - deployment_target: cloud_run\n",
+        encoding="utf-8",
+    )
+
+    assert load_matrix_spec(tmp_path / "spec.json") == spec
+    assert load_matrix_spec(tmp_path / "spec.yaml") == spec
+
+
+def test_load_matrix_spec_rejects_unknown_keys(tmp_path: pathlib.Path) -> None:
+    """Test that typos in a spec are reported instead of ignored"""
+    (tmp_path / "spec.yaml").write_text("agent: [adk_base]\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="Unknown matrix spec keys"):
+        load_matrix_spec(tmp_path / "spec.yaml")
+
+
+def test_expand_matrix_follows_create_defaults() -> None:
+    """Test session and datastore expansion per agent and target"""
+    jobs = expand_matrix(
+        {
+            "agents": ["adk_base", "agentic_rag"],
+            "session_types": ["in_memory", "alloydb"],
+            "datastores": ["vertex_ai_search"],
+            "exclude": [{"agent": "adk_base", "session_type": "alloydb"}],
+        },
+        "fleet",
+    )
+
+    assert [
+        (job.project_name, job.agent, job.deployment_target, job.session_type)
+        for job in jobs
+    ] == [
+        ("fleet-1", "adk_base", "agent_engine", None),
+        ("fleet-2", "adk_base", "cloud_run", "in_memory"),
+        ("fleet-3", "agentic_rag", "agent_engine", None),
+        ("fleet-4", "agentic_rag", "cloud_run", "in_memory"),
+        ("fleet-5", "agentic_rag", "cloud_run", "alloydb"),
+    ]
+    assert {job.datastore for job in jobs if job.agent == "agentic_rag"} == {
+        "vertex_ai_search"
+    }
+    assert {job.datastore for job in jobs if job.agent == "adk_base"} == {None}
+
+
+def test_expand_matrix_rejects_unknown_agents() -> None:
+    """Test that unknown agents fail before anything is rendered"""
+    with pytest.raises(ValueError, match="Unknown agents"):
+        expand_matrix({"agents": ["no_such_agent"]}, "fleet")
+
+
+def test_run_matrix_renders_every_job(tmp_path: pathlib.Path) -> None:
+    """Test that each job is rendered and reported in job order"""
+    jobs = [
+        MatrixJob("batch-1", "adk_base", "agent_engine"),
+        MatrixJob("batch-2", "adk_base", "cloud_run", session_type="in_memory"),
+        MatrixJob("batch-3", "no_such_agent", "cloud_run"),
+    ]
+
+    results = run_matrix(jobs, tmp_path, max_workers=1)
+
+    assert [result.job for result in results] == jobs
+    assert [result.ok for result in results] == [True, True, False]
+    assert (tmp_path / "batch-1" / "pyproject.toml").exists()
+    assert (tmp_path / "batch-2" / "Dockerfile").exists()
+    assert not (tmp_path / "batch-3").exists()
+
+
+def test_matrix_option_conflicts_with_single_project_options(
+    tmp_path: pathlib.Path,
+) -> None:
+    """Test that per-project options are rejected in matrix mode"""
+    spec = tmp_path / "spec.yaml"
+    spec.write_text("agents: [adk_base]\n", encoding="utf-8")
+
+    result = CliRunner().invoke(
+        create, ["fleet", "--matrix", str(spec), "--agent", "adk_base"]
+    )
+
+    assert result.exit_code != 0
+    assert "--agent can't be combined with --matrix" in result.output
@@ -0,0 +1,107 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the layered overlay manifest."""
+
+import pathlib
+
+from src.cli.utils.overlay import TemplateLayer, resolve_overlay_manifest
+
+
+def write(path: pathlib.Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def test_later_layer_wins(tmp_path: pathlib.Path) -> None:
+    """Test that a later layer overrides the same output path"""
+    base = tmp_path / "base"
+    target = tmp_path / "target"
+    write(base / "README.md", "base")
+    write(base / "Makefile", "base")
+    write(target / "README.md", "target")
+
+    manifest = resolve_overlay_manifest(
+        [TemplateLayer("base", base), TemplateLayer("target", target)]
+    )
+
+    assert manifest.files["README.md"] == target / "README.md"
+    assert manifest.files["Makefile"] == base / "Makefile"
+    assert manifest.origins == {"README.md": "target", "Makefile": "base"}
+
+
+def test_layer_target_and_empty_directories(tmp_path: pathlib.Path) -> None:
+    """Test that layers map into their target folder and keep empty directories"""
+    agent = tmp_path / "agent"
+    write(agent / "app" / "agent.py", "agent")
+    (agent / "app" / "empty").mkdir()
+
+    manifest = resolve_overlay_manifest(
+        [TemplateLayer("agent", agent / "app", target="my_agent")]
+    )
+
+    assert set(manifest.files) == {"my_agent/agent.py"}
+    assert {"my_agent", "my_agent/empty"} <= manifest.directories
+
+    output = tmp_path / "output"
+    manifest.materialize(output)
+    assert (output / "my_agent" / "agent.py").read_text() == "agent"
+    assert (output / "my_agent" / "empty").is_dir()
+
+
+def test_skipped_paths_and_missing_layers(tmp_path: pathlib.Path) -> None:
+    """Test that build artifacts, .template folders and missing layers are skipped"""
+    base = tmp_path / "base"
+    write(base / "main.py", "code")
+    write(base / "main.pyc", "compiled")
+    write(base / "__pycache__" / "main.cpython-311.pyc", "compiled")
+    write(base / ".template" / "templateconfig.yaml", "config")
+
+    manifest = resolve_overlay_manifest(
+        [TemplateLayer("base", base), TemplateLayer("missing", tmp_path / "nope")]
+    )
+
+    assert set(manifest.files) == {"main.py"}
+    assert "__pycache__" not in manifest.directories
+    assert ".template" not in manifest.directories
+
+
+def test_agent_specific_exclusions(tmp_path: pathlib.Path) -> None:
+    """Test that live_api exclusions apply to layers that carry the agent name"""
+    base = tmp_path / "base"
+    write(base / "app" / "utils" / "helpers.py", "helpers")
+    write(base / "app" / "server.py", "server")
+
+    live_api = resolve_overlay_manifest(
+        [TemplateLayer("base", base, agent_name="live_api")]
+    )
+    other = resolve_overlay_manifest(
+        [TemplateLayer("base", base, agent_name="adk_base")]
+    )
+
+    assert set(live_api.files) == {"app/server.py"}
+    assert "app/utils/helpers.py" in other.files
+
+
+def test_fingerprint_changes_with_sources(tmp_path: pathlib.Path) -> None:
+    """Test that the fingerprint tracks the winning sources"""
+    base = tmp_path / "base"
+    write(base / "README.md", "base")
+    layers = [TemplateLayer("base", base)]
+    first = resolve_overlay_manifest(layers).fingerprint()
+
+    assert resolve_overlay_manifest(layers).fingerprint() == first
+
+    write(base / "NEW.md", "new")
+    assert resolve_overlay_manifest(layers).fingerprint() != first
@@ -0,0 +1,125 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for render plans."""
+
+import json
+import pathlib
+
+import pytest
+
+from src.cli.utils.plan import (
+    CREATE,
+    DELETE,
+    OVERWRITE,
+    PRESERVE,
+    SKIP,
+    plan_files,
+)
+from src.cli.utils.template import get_template_path, plan_template, process_template
+
+
+def project_files(root: pathlib.Path) -> set[str]:
+    return {
+        path.relative_to(root).as_posix()
+        for path in root.rglob("*")
+        if path.is_file() or path.is_symlink()
+    }
+
+
+@pytest.mark.parametrize(
+    "agent,target,session",
+    [("adk_base", "cloud_run", "in_memory"), ("langgraph_base_react", None, None)],
+)
+def test_plan_matches_applied_render(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    agent: str,
+    target: str | None,
+    session: str | None,
+) -> None:
+    """Test that a plan lists the files its own apply produces, and writes none"""
+    monkeypatch.setenv("ASP_NO_CACHE", "1")
+    plan = plan_template(
+        agent,
+        get_template_path(agent),
+        "demo",
+        deployment_target=target,
+        session_type=session,
+        output_dir=tmp_path,
+    )
+    assert not (tmp_path / "demo").exists()
+
+    process_template(**plan.options, plan=plan)
+
+    written = {f.path for f in plan.files if f.action in (CREATE, OVERWRITE)}
+    assert written == project_files(tmp_path / "demo")
+    assert {f.action for f in plan.files} <= {CREATE, SKIP}
+    data = json.loads(json.dumps(plan.to_dict()))
+    assert data["destination"] == str(tmp_path / "demo")
+    assert data["layers"][0] == "base_template"
+    assert data["summary"][CREATE] == len(written)
+
+
+def test_in_folder_plan_preserves_and_deletes(tmp_path: pathlib.Path) -> None:
+    """Test the file actions of applying a project to an existing folder"""
+    (tmp_path / "README.md").write_text("mine")
+    (tmp_path / "Makefile").write_text("mine")
+    (tmp_path / "notes.txt").write_text("mine")
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "agent.py").write_text("mine")
+    (tmp_path / "app" / "old.py").write_text("mine")
+    (tmp_path / "unused_stale").mkdir()
+    (tmp_path / "unused_stale" / "x.txt").write_text("mine")
+    generated = {
+        "README.md": ("README.md", "base"),
+        "Makefile": ("Makefile", "base"),
+        "app/agent.py": ("app/agent.py", "agent"),
+        "unused_deployment/main.tf": ("main.tf", "base"),
+    }
+
+    actions = {
+        f.path: f.action for f in plan_files(generated, tmp_path, in_folder=True)
+    }
+
+    assert actions == {
+        "README.md": PRESERVE,
+        "starter_pack_README.md": CREATE,
+        "Makefile": OVERWRITE,
+        "app/agent.py": OVERWRITE,
+        "app/old.py": DELETE,
+        "unused_deployment/main.tf": SKIP,
+        "unused_stale/x.txt": DELETE,
+    }
+
+
+def test_plan_replacing_existing_project(tmp_path: pathlib.Path) -> None:
+    """Test that an existing project is replaced, keeping its pyproject.toml"""
+    (tmp_path / "pyproject.toml").write_text("mine")
+    (tmp_path / "stale.py").write_text("mine")
+    generated = {"pyproject.toml": ("pyproject.toml", "base")}
+
+    files = plan_files(
+        generated,
+        tmp_path,
+        in_folder=False,
+        late_writes={"uv.lock": ("uv-cloud_run.lock", "lock store")},
+    )
+
+    assert [(f.path, f.action) for f in files] == [
+        ("pyproject.toml", OVERWRITE),
+        ("stale.py", DELETE),
+        ("starter_pack_pyproject.toml", CREATE),
+        ("uv.lock", CREATE),
+    ]
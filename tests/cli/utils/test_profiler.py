@@ -0,0 +1,84 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the --profile phase timings."""
+
+import json
+import pathlib
+
+import pytest
+
+from src.cli.utils.profiler import (
+    PROFILE_FORMAT_VERSION,
+    Profiler,
+    count,
+    get_profiler,
+    phase,
+    profiling,
+)
+from src.cli.utils.template import get_template_path, process_template
+
+
+def test_phases_nest_and_counts_land_in_innermost_phase(
+    tmp_path: pathlib.Path,
+) -> None:
+    """Test that nested phases get path names and count goes to the inner one"""
+    with profiling(Profiler()) as profiler:
+        with phase("outer"):
+            count(files=1, bytes=10)
+            with phase("inner"):
+                count(files=2, bytes=20)
+            with phase("inner"):
+                pass
+    assert get_profiler() is None
+
+    assert list(profiler.phases) == ["outer", "outer/inner"]
+    assert profiler.phases["outer"].files == 1
+    assert profiler.phases["outer/inner"].files == 2
+    assert profiler.phases["outer/inner"].calls == 2
+
+    output = tmp_path / "profile.json"
+    profiler.write_json(output, package_version="1.0.0")
+    data = json.loads(output.read_text(encoding="utf-8"))
+    assert data["format_version"] == PROFILE_FORMAT_VERSION
+    assert data["package_version"] == "1.0.0"
+    assert [p["name"] for p in data["phases"]] == ["outer", "outer/inner"]
+
+
+def test_phase_without_profiler_does_nothing() -> None:
+    """Test that phase and count are no-ops without an active profiler"""
+    with phase("anything") as stats:
+        count(files=1, bytes=1)
+    assert stats is None
+
+
+def test_process_template_records_phases(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that rendering a template records its phases and copied files"""
+    monkeypatch.setenv("ASP_NO_CACHE", "1")
+    with profiling(Profiler()) as profiler:
+        process_template(
+            "adk_base",
+            get_template_path("adk_base"),
+            "profiled-project",
+            deployment_target="agent_engine",
+            output_dir=tmp_path,
+        )
+
+    assert "copy layers" in profiler.phases
+    assert "cookiecutter" in profiler.phases
+    assert "lock file" in profiler.phases
+    assert profiler.phases["copy layers"].files > 0
+    assert profiler.phases["copy to destination"].bytes > 0
@@ -0,0 +1,122 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for region substitution in generated projects."""
+
+import pathlib
+
+import pytest
+
+from src.cli.utils.region import RegionRewriter, get_data_store_region
+from src.cli.utils.template import get_template_path, process_template
+
+
+@pytest.mark.parametrize(
+    "region,expected",
+    [("us-east1", "us"), ("europe-west1", "eu"), ("asia-east1", "global")],
+)
+def test_get_data_store_region(region: str, expected: str) -> None:
+    """Test the mapping from region to data store location"""
+    assert get_data_store_region(region) == expected
+
+
+def test_substitute_region_and_data_store_region() -> None:
+    """Test that the region and the first data store spelling are substituted"""
+    rewriter = RegionRewriter("europe-west1")
+    content = (
+        'region = "us-central1"\n'
+        'data_store_region = "us"\n'
+        "_DATA_STORE_REGION: us\n"
+        "location: us-central1\n"
+    )
+
+    assert rewriter.substitute(content) == (
+        'region = "europe-west1"\n'
+        'data_store_region = "eu"\n'
+        "_DATA_STORE_REGION: us\n"
+        "location: europe-west1\n"
+    )
+    assert rewriter.substitute("nothing to see here") is None
+
+
+def test_copy_only_rewrites_eligible_files(tmp_path: pathlib.Path) -> None:
+    """Test that only region-bearing file types are rewritten when copied"""
+    rewriter = RegionRewriter("asia-east1")
+    src = tmp_path / "src"
+    dst = tmp_path / "dst"
+    src.mkdir()
+    dst.mkdir()
+    (src / "main.tf").write_text('region = "us-central1"\n', encoding="utf-8")
+    (src / "data.json").write_text('{"region": "us-central1"}', encoding="utf-8")
+
+    rewriter.copy(src / "main.tf", dst / "main.tf")
+    rewriter.copy(src / "data.json", dst / "data.json")
+
+    assert (dst / "main.tf").read_text(encoding="utf-8") == 'region = "asia-east1"\n'
+    assert (dst / "data.json").read_text(encoding="utf-8") == (
+        '{"region": "us-central1"}'
+    )
+
+
+def rewrite_in_place(root: pathlib.Path, rewriter: RegionRewriter) -> None:
+    """Substitute region references in place, like the old post-pass did."""
+    for path in root.rglob("*"):
+        if path.is_file() and rewriter.applies_to(path.relative_to(root)):
+            try:
+                substituted = rewriter.substitute(path.read_text(encoding="utf-8"))
+            except UnicodeDecodeError:
+                continue
+            if substituted is not None:
+                path.write_text(substituted, encoding="utf-8")
+
+
+def test_region_applied_during_render_matches_post_pass(
+    tmp_path: pathlib.Path,
+) -> None:
+    """Test that rendering with a region equals rewriting a default render"""
+    region = "europe-west4"
+
+    def render(output_dir: pathlib.Path, region: str) -> pathlib.Path:
+        process_template(
+            "agentic_rag",
+            get_template_path("agentic_rag"),
+            "region-project",
+            deployment_target="cloud_run",
+            include_data_ingestion=True,
+            datastore="vertex_ai_search",
+            session_type="in_memory",
+            output_dir=output_dir,
+            region=region,
+        )
+        return output_dir / "region-project"
+
+    rendered = render(tmp_path / "rendered", region)
+    post_pass = render(tmp_path / "post_pass", "us-central1")
+    rewrite_in_place(post_pass, RegionRewriter(region))
+
+    rendered_files = sorted(
+        p.relative_to(rendered) for p in rendered.rglob("*") if p.is_file()
+    )
+    post_pass_files = sorted(
+        p.relative_to(post_pass) for p in post_pass.rglob("*") if p.is_file()
+    )
+    assert rendered_files == post_pass_files
+    for rel_path in rendered_files:
+        assert (rendered / rel_path).read_bytes() == (
+            post_pass / rel_path
+        ).read_bytes(), rel_path
+    assert region in (rendered / "Makefile").read_text(encoding="utf-8")
+    assert region in (rendered / "deployment" / "terraform" / "variables.tf").read_text(
+        encoding="utf-8"
+    )
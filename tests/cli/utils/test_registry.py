@@ -0,0 +1,129 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the template registry."""
+
+import os
+import pathlib
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from src.cli.utils.registry import TemplateRegistry, get_registry
+from src.cli.utils.template import get_available_agents
+
+
+def write_config(agents_dir: pathlib.Path, name: str, content: str) -> pathlib.Path:
+    config_path = agents_dir / name / ".template" / "templateconfig.yaml"
+    config_path.parent.mkdir(parents=True, exist_ok=True)
+    config_path.write_text(content, encoding="utf-8")
+    return config_path
+
+
+@pytest.fixture
+def agents_dir(tmp_path: pathlib.Path) -> pathlib.Path:
+    agents = tmp_path / "agents"
+    write_config(
+        agents,
+        "alpha",
+        "description: Alpha\n"
+        "settings:\n"
+        "  deployment_targets: cloud_run\n"
+        "  tags: [adk]\n"
+        '  extra_dependencies: ["google-adk"]\n',
+    )
+    write_config(agents, "beta", "description: Beta\nsettings: {}\n")
+    write_config(agents, "broken", "description: [unclosed\n")
+    (agents / "__pycache__").mkdir()
+    return agents
+
+
+def count_parses() -> Any:
+    return patch("src.cli.utils.registry.yaml.safe_load", wraps=yaml.safe_load)
+
+
+def test_typed_lookups(agents_dir: pathlib.Path) -> None:
+    """Test the typed accessors of a template entry"""
+    agents = TemplateRegistry(agents_dir).agents()
+
+    assert list(agents) == ["alpha", "beta"]
+    alpha, beta = agents["alpha"], agents["beta"]
+    assert alpha.targets == ["cloud_run"]
+    assert alpha.tags == ["adk"]
+    assert alpha.extra_dependencies == ["google-adk"]
+    assert alpha.frontend_type == "streamlit"
+    assert alpha.lock_name("cloud_run") == "uv-alpha-cloud_run.lock"
+    assert beta.targets == [] and beta.tags == []
+
+
+def test_configs_are_parsed_once_per_process(agents_dir: pathlib.Path) -> None:
+    """Test that repeated lookups don't parse unchanged configs again"""
+    registry = TemplateRegistry(agents_dir)
+
+    with count_parses() as safe_load:
+        registry.agents()
+        registry.agents()
+        registry.get("alpha")
+        config = registry.load_config(agents_dir / "alpha" / ".template")
+
+    # alpha, beta and the broken config, once each
+    assert safe_load.call_count == 3
+    assert config is not None
+    config["settings"]["tags"].append("mutated")
+    assert registry.get("alpha").tags == ["adk"]  # type: ignore[union-attr]
+
+
+def test_changed_config_is_parsed_again(agents_dir: pathlib.Path) -> None:
+    """Test that an edited config is picked up by the same registry"""
+    registry = TemplateRegistry(agents_dir)
+    assert registry.get("beta").description == "Beta"  # type: ignore[union-attr]
+
+    write_config(agents_dir, "beta", "description: Beta v2\nsettings: {}\n")
+
+    assert registry.get("beta").description == "Beta v2"  # type: ignore[union-attr]
+
+
+def test_index_is_reused_across_processes(
+    agents_dir: pathlib.Path, tmp_path: pathlib.Path
+) -> None:
+    """Test that a fresh registry reuses the persisted index"""
+    index_path = tmp_path / "index.json"
+    TemplateRegistry(agents_dir, index_path).agents()
+    assert index_path.exists()
+
+    # Touching a config without changing it is validated by content hash
+    alpha = agents_dir / "alpha" / ".template" / "templateconfig.yaml"
+    stat = alpha.stat()
+    os.utime(alpha, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    write_config(agents_dir, "beta", "description: Changed\nsettings: {}\n")
+
+    with count_parses() as safe_load:
+        agents = TemplateRegistry(agents_dir, index_path).agents()
+
+    # Only the edited config and the one that failed to parse
+    assert safe_load.call_count == 2
+    assert agents["alpha"].tags == ["adk"]
+    assert agents["beta"].description == "Changed"
+
+
+def test_available_agents_match_registry() -> None:
+    """Test that the agent listing is built from the registry"""
+    agents = get_available_agents()
+    entries = get_registry().agents()
+
+    assert {agent["name"] for agent in agents.values()} == set(entries)
+    for agent in get_available_agents(deployment_target="agent_engine").values():
+        assert "agent_engine" in entries[agent["name"]].targets
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import pathlib
 import subprocess
 from typing import Any
@@ -149,6 +150,8 @@ class TestFetchRemoteTemplate:
             pathlib.Path("/tmp/test_dir"), ignore_errors=True
         )
 
+    # The mocked git output below is only meaningful for a plain clone
+    @patch.dict(os.environ, {"ASP_NO_CACHE": "1"})
     @patch("subprocess.run")
     @patch("tempfile.mkdtemp")
     @patch("pathlib.Path.exists")
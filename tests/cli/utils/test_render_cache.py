@@ -0,0 +1,170 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the content-addressed render cache."""
+
+import os
+import pathlib
+
+import pytest
+
+from src.cli.utils.render_cache import (
+    PROJECT_NAME_SENTINEL,
+    compute_render_cache_key,
+    fingerprint_sources,
+    get_project_name_replacements,
+    lookup_render,
+    materialize_render,
+    prune_render_cache,
+    store_render,
+)
+from src.cli.utils.template import get_template_path, process_template
+
+
+@pytest.fixture
+def cache_dir(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    """Point the CLI cache at a temporary directory"""
+    cache = tmp_path / "cache"
+    monkeypatch.setenv("ASP_CACHE_DIR", str(cache))
+    monkeypatch.delenv("ASP_NO_CACHE", raising=False)
+    return cache
+
+
+def test_fingerprint_changes_when_source_changes(tmp_path: pathlib.Path) -> None:
+    """Test that editing, adding or removing a source file changes the fingerprint"""
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "a.txt").write_text("one")
+    first = fingerprint_sources([source])
+
+    assert fingerprint_sources([source]) == first
+
+    (source / "a.txt").write_text("one plus")
+    second = fingerprint_sources([source])
+    assert second != first
+
+    (source / "b.txt").write_text("two")
+    third = fingerprint_sources([source])
+    assert third != second
+
+    (source / "b.txt").unlink()
+    assert fingerprint_sources([source]) != third
+
+
+def test_cache_key_ignores_project_name(tmp_path: pathlib.Path) -> None:
+    """Test that the cache key depends on inputs other than the project name"""
+    config = {"project_name": "one", "deployment_target": "cloud_run"}
+    fingerprint = fingerprint_sources([tmp_path])
+    key = compute_render_cache_key(config, fingerprint)
+
+    assert (
+        compute_render_cache_key({**config, "project_name": "two"}, fingerprint) == key
+    )
+    assert (
+        compute_render_cache_key(
+            {**config, "deployment_target": "agent_engine"}, fingerprint
+        )
+        != key
+    )
+    assert compute_render_cache_key(config, "other-fingerprint") != key
+
+
+def test_materialize_replaces_project_name(tmp_path: pathlib.Path) -> None:
+    """Test that the sentinel is replaced in paths and file contents"""
+    rendered = tmp_path / "rendered"
+    (rendered / "deployment").mkdir(parents=True)
+    (rendered / "README.md").write_text(f"# {PROJECT_NAME_SENTINEL}\n")
+    underscored = PROJECT_NAME_SENTINEL.replace("-", "_")
+    (rendered / "deployment" / f"{underscored}.tf").write_text(
+        f'dataset = "{underscored}_data"\n'
+    )
+    (rendered / "binary.bin").write_bytes(b"\x00\x01\x02")
+
+    output = tmp_path / "output"
+    materialize_render(rendered, output, get_project_name_replacements("my-agent"))
+
+    assert (output / "README.md").read_text() == "# my-agent\n"
+    assert (output / "deployment" / "my_agent.tf").read_text() == (
+        'dataset = "my_agent_data"\n'
+    )
+    assert (output / "binary.bin").read_bytes() == b"\x00\x01\x02"
+
+
+def test_store_and_lookup_render(
+    tmp_path: pathlib.Path, cache_dir: pathlib.Path
+) -> None:
+    """Test storing a render and looking it up by key"""
+    rendered = tmp_path / "rendered"
+    rendered.mkdir()
+    (rendered / "file.txt").write_text("content")
+
+    assert lookup_render("abc") is None
+
+    store_render("abc", rendered)
+    entry = lookup_render("abc")
+
+    assert entry is not None
+    assert (entry / "file.txt").read_text() == "content"
+
+
+def test_prune_render_cache(tmp_path: pathlib.Path, cache_dir: pathlib.Path) -> None:
+    """Test that only the most recently used entries are kept"""
+    rendered = tmp_path / "rendered"
+    rendered.mkdir()
+    for i in range(3):
+        entry = store_render(f"key{i}", rendered)
+        os.utime(entry, (i, i))
+
+    prune_render_cache(max_entries=2)
+
+    assert lookup_render("key0") is None
+    assert lookup_render("key1") is not None
+    assert lookup_render("key2") is not None
+
+
+def test_process_template_cache_hit_matches_fresh_render(
+    tmp_path: pathlib.Path, cache_dir: pathlib.Path
+) -> None:
+    """Test that a replayed render produces the same project as a fresh one"""
+
+    def render(project_name: str, output_dir: pathlib.Path) -> None:
+        process_template(
+            "adk_base",
+            get_template_path("adk_base"),
+            project_name,
+            deployment_target="agent_engine",
+            output_dir=output_dir,
+        )
+
+    render("first-project", tmp_path / "first")
+    assert len(list((cache_dir / "render").iterdir())) == 1
+
+    render("second-project", tmp_path / "second")
+    assert len(list((cache_dir / "render").iterdir())) == 1
+
+    first = tmp_path / "first" / "first-project"
+    second = tmp_path / "second" / "second-project"
+    first_files = sorted(p.relative_to(first) for p in first.rglob("*"))
+    second_files = sorted(p.relative_to(second) for p in second.rglob("*"))
+    assert first_files == second_files
+
+    for rel_path in first_files:
+        if (first / rel_path).is_file():
+            expected = (
+                (first / rel_path)
+                .read_bytes()
+                .replace(b"first-project", b"second-project")
+                .replace(b"first_project", b"second_project")
+            )
+            assert (second / rel_path).read_bytes() == expected, rel_path
@@ -0,0 +1,142 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for rendering templates without changing the working directory."""
+
+import filecmp
+import json
+import os
+import pathlib
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from cookiecutter.generate import generate_files as cookiecutter_generate_files
+
+from src.cli.utils.template import (
+    get_template_path,
+    process_template,
+    run_cookiecutter,
+)
+
+JOBS = [
+    ("adk_base", "agent_engine", None),
+    ("adk_base", "cloud_run", "in_memory"),
+    ("agentic_rag", "agent_engine", None),
+    ("agentic_rag", "cloud_run", "alloydb"),
+    ("langgraph_base_react", "cloud_run", "in_memory"),
+    ("live_api", "cloud_run", "in_memory"),
+]
+
+
+def render(
+    agent: str, target: str, session: str | None, name: str, out: pathlib.Path
+) -> None:
+    process_template(
+        agent,
+        get_template_path(agent),
+        name,
+        deployment_target=target,
+        session_type=session,
+        include_data_ingestion=agent == "agentic_rag",
+        datastore="vertex_ai_search" if agent == "agentic_rag" else None,
+        output_dir=out,
+    )
+
+
+def same_tree(left: pathlib.Path, right: pathlib.Path) -> bool:
+    cmp = filecmp.dircmp(left, right, ignore=[])
+    pending = [cmp]
+    while pending:
+        current = pending.pop()
+        if current.left_only or current.right_only or current.funny_files:
+            return False
+        _, mismatch, errors = filecmp.cmpfiles(
+            current.left, current.right, current.common_files, shallow=False
+        )
+        if mismatch or errors:
+            return False
+        pending.extend(current.subdirs.values())
+    return True
+
+
+def test_generate_files_matches_cookiecutter(tmp_path: pathlib.Path) -> None:
+    """Test that rendering without chdir gives cookiecutter's output"""
+    template = tmp_path / "template"
+    project = template / "{{cookiecutter.project_name}}"
+    (project / "{{cookiecutter.package}}").mkdir(parents=True)
+    (project / "static").mkdir()
+    (project / "static" / "raw.txt").write_text("{{ not rendered }}")
+    (project / "{{cookiecutter.package}}" / "main.py").write_text(
+        "NAME = '{{cookiecutter.project_name}}'\r\n"
+    )
+    (project / "{% if cookiecutter.extra %}extra.txt{% endif %}").write_text("x")
+    (project / "image.bin").write_bytes(bytes(range(256)))
+    (project / "run.sh").write_text("#!/bin/sh\n")
+    (project / "run.sh").chmod(0o755)
+    (template / "cookiecutter.json").write_text(
+        json.dumps(
+            {
+                "project_name": "demo",
+                "package": "pkg",
+                "extra": "",
+                "_copy_without_render": ["static"],
+            }
+        )
+    )
+
+    generated = run_cookiecutter(template, tmp_path / "ours")
+    context = json.loads((template / "cookiecutter.json").read_text())
+    expected = cookiecutter_generate_files(
+        repo_dir=str(template),
+        context={"cookiecutter": context},
+        output_dir=str(tmp_path / "theirs"),
+        overwrite_if_exists=True,
+    )
+
+    assert generated == tmp_path / "ours" / "demo"
+    assert same_tree(generated, pathlib.Path(expected))
+    assert not (generated / "extra.txt").exists()
+    assert os.access(generated / "run.sh", os.X_OK)
+
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_concurrent_renders_are_isolated(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch, use_cache: bool
+) -> None:
+    """Test that renders in a thread pool match the same renders run one by one"""
+    monkeypatch.setenv("ASP_CACHE_DIR", str(tmp_path / "cache"))
+    if use_cache:
+        monkeypatch.delenv("ASP_NO_CACHE", raising=False)
+    else:
+        monkeypatch.setenv("ASP_NO_CACHE", "1")
+    cwd = pathlib.Path.cwd()
+    jobs = [(*job, f"project-{i}") for i, job in enumerate(JOBS * 2)]
+
+    for *job, name in jobs[: len(JOBS)]:
+        render(*job, name, tmp_path / "sequential")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [
+            executor.submit(render, *job, tmp_path / "concurrent") for job in jobs
+        ]
+        for future in futures:
+            future.result()
+
+    assert pathlib.Path.cwd() == cwd
+    for *_, name in jobs[: len(JOBS)]:
+        assert same_tree(tmp_path / "sequential" / name, tmp_path / "concurrent" / name)
+    # Repeated renders of a template get their own project name
+    for *_, name in jobs[len(JOBS) :]:
+        assert (tmp_path / "concurrent" / name / "pyproject.toml").is_file()
+        lock = (tmp_path / "concurrent" / name / "uv.lock").read_text()
+        assert f'name = "{name}"' in lock
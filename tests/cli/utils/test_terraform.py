@@ -0,0 +1,124 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the concurrent Terraform setup of setup-cicd."""
+
+import pathlib
+import subprocess
+import threading
+from typing import Any
+
+import pytest
+
+from src.cli.utils.profiler import Profiler, profiling
+from src.cli.utils.terraform import TerraformStage, run_stages
+
+
+class FakeTerraform:
+    """Records Terraform calls; applies wait for each other to prove overlap."""
+
+    def __init__(self, concurrent_applies: int = 1, fail: str | None = None):
+        self.calls: list[tuple[str, str, dict[str, Any]]] = []
+        self.barrier = threading.Barrier(concurrent_applies, timeout=10)
+        self.fail = fail
+        self.lock = threading.Lock()
+
+    def __call__(self, cmd: list[str], cwd: pathlib.Path, **kwargs: Any) -> None:
+        with self.lock:
+            self.calls.append((cmd[1], cwd.name, kwargs))
+        if kwargs.get("log_file"):
+            with open(kwargs["log_file"], "a", encoding="utf-8") as f:
+                f.write(f"terraform {cmd[1]} in {cwd.name}\n")
+        if cmd[1] == "init":
+            (cwd / ".terraform").mkdir(exist_ok=True)
+        elif cmd[1] == "apply":
+            self.barrier.wait()
+            if cwd.name == self.fail:
+                raise subprocess.CalledProcessError(1, cmd)
+
+
+@pytest.fixture
+def tf_root(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    monkeypatch.setenv("TF_PLUGIN_CACHE_DIR", str(tmp_path / "plugins"))
+    root = tmp_path / "terraform"
+    for tf_dir in (root, root / "dev"):
+        tf_dir.mkdir(parents=True)
+        (tf_dir / "main.tf").write_text('resource "x" "y" {}\n')
+        (tf_dir / "backend.tf").write_text('terraform { backend "gcs" {} }\n')
+    return root
+
+
+def test_environments_apply_concurrently_with_own_logs(
+    tf_root: pathlib.Path, tmp_path: pathlib.Path
+) -> None:
+    """Test that both applies overlap, log separately and share a plugin cache"""
+    terraform = FakeTerraform(concurrent_applies=2)
+    stages = [TerraformStage("prod", tf_root), TerraformStage("dev", tf_root / "dev")]
+
+    with profiling(Profiler()) as profiler:
+        run_stages(stages, terraform, log_dir=tmp_path / "logs_dir")
+
+    assert sorted((cmd, cwd) for cmd, cwd, _ in terraform.calls) == [
+        ("apply", "dev"),
+        ("apply", "terraform"),
+        ("init", "dev"),
+        ("init", "terraform"),
+    ]
+    assert {
+        kwargs["env_vars"]["TF_PLUGIN_CACHE_DIR"] for *_, kwargs in terraform.calls
+    } == {str(tmp_path / "plugins")}
+    assert (tmp_path / "logs_dir" / "dev.log").read_text() == (
+        "terraform init in dev\nterraform apply in dev\n"
+    )
+    assert {"dev/init", "dev/apply", "prod/init", "prod/apply"} <= set(profiler.phases)
+
+
+def test_init_is_skipped_until_backend_changes(tf_root: pathlib.Path) -> None:
+    """Test that re-running skips init unless the backend config changed"""
+    stages = [TerraformStage("dev", tf_root / "dev")]
+
+    terraform = FakeTerraform()
+    run_stages(stages, terraform)
+    run_stages(stages, terraform)
+    assert [cmd for cmd, *_ in terraform.calls] == ["init", "apply", "apply"]
+
+    (tf_root / "dev" / "backend.tf").write_text('terraform { backend "local" {} }\n')
+    terraform.calls.clear()
+    run_stages(stages, terraform)
+    assert [cmd for cmd, *_ in terraform.calls] == ["init", "apply"]
+
+    # Switching to local state needs another init too
+    terraform.calls.clear()
+    run_stages([TerraformStage("dev", tf_root / "dev", local_state=True)], terraform)
+    assert terraform.calls[0][0] == "init"
+    assert (
+        "-backend=false" in TerraformStage("dev", tf_root, local_state=True).init_args
+    )
+
+
+def test_failed_stage_raises_after_others_finish(
+    tf_root: pathlib.Path, tmp_path: pathlib.Path, capsys: pytest.CaptureFixture
+) -> None:
+    """Test that a failed environment fails the run and shows its log"""
+    terraform = FakeTerraform(concurrent_applies=2, fail="dev")
+    stages = [TerraformStage("prod", tf_root), TerraformStage("dev", tf_root / "dev")]
+
+    with pytest.raises(subprocess.CalledProcessError):
+        run_stages(stages, terraform, log_dir=tmp_path)
+
+    assert ("apply", "terraform") in [(cmd, cwd) for cmd, cwd, _ in terraform.calls]
+    assert "-input=false" in stages[1].apply_args
+    output = capsys.readouterr().out
+    assert f"Terraform failed for dev, see {tmp_path / 'dev.log'}" in output
+    assert "terraform apply in dev" in output
@@ -0,0 +1,191 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the background update check."""
+
+import gzip
+import io
+import json
+import pathlib
+import tarfile
+import threading
+import time
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from src.cli.main import cli
+from src.cli.utils.version import (
+    UpdateCheck,
+    display_update_message,
+    load_cached_latest_version,
+    start_update_check,
+)
+
+
+def write_cache(cache_file: pathlib.Path, latest: str, age: float = 0) -> None:
+    cache_file.write_text(
+        json.dumps({"checked_at": time.time() - age, "latest": latest}),
+        encoding="utf-8",
+    )
+
+
+def test_fresh_cache_is_used_without_querying_pypi(tmp_path: pathlib.Path) -> None:
+    """Test that a cached result within the TTL skips the network"""
+    cache_file = tmp_path / "latest_version.json"
+    write_cache(cache_file, "99.0.0")
+
+    with (
+        patch("src.cli.utils.version.get_latest_version") as mock_latest,
+        patch("src.cli.utils.version.get_current_version", return_value="1.0.0"),
+    ):
+        check = UpdateCheck(str(cache_file), ttl=60).start()
+        assert check.result() == (True, "1.0.0", "99.0.0")
+
+    mock_latest.assert_not_called()
+
+
+def test_expired_cache_is_refreshed_in_background(tmp_path: pathlib.Path) -> None:
+    """Test that an expired result is fetched again and written back"""
+    cache_file = tmp_path / "latest_version.json"
+    write_cache(cache_file, "1.0.0", age=120)
+
+    with (
+        patch("src.cli.utils.version.get_latest_version", return_value="2.0.0"),
+        patch("src.cli.utils.version.get_current_version", return_value="1.0.0"),
+    ):
+        check = UpdateCheck(str(cache_file), ttl=60).start()
+        assert check.wait(timeout=5)
+        assert check.result() == (True, "1.0.0", "2.0.0")
+
+    assert load_cached_latest_version(str(cache_file), ttl=60) == "2.0.0"
+
+
+def test_pending_check_prints_nothing(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that the notice is skipped when the check hasn't finished"""
+    release = threading.Event()
+
+    def slow_latest_version() -> str:
+        release.wait(timeout=5)
+        return "99.0.0"
+
+    with patch(
+        "src.cli.utils.version.get_latest_version", side_effect=slow_latest_version
+    ):
+        check = UpdateCheck(None, ttl=60).start()
+        start = time.perf_counter()
+        display_update_message(check)
+        elapsed = time.perf_counter() - start
+        release.set()
+        check.wait(timeout=5)
+
+    assert elapsed < 1
+    assert "Update available" not in capsys.readouterr().err
+
+
+def test_update_check_can_be_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that ASP_NO_UPDATE_CHECK turns the check off"""
+    monkeypatch.setenv("ASP_NO_UPDATE_CHECK", "1")
+    with patch("src.cli.utils.version.get_latest_version") as mock_latest:
+        assert start_update_check() is None
+    mock_latest.assert_not_called()
+
+
+def test_notice_is_printed_after_the_command(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the CLI prints a ready result once the command has run"""
+    monkeypatch.setenv("ASP_CACHE_DIR", str(tmp_path))
+    update_dir = tmp_path / "update-check"
+    update_dir.mkdir()
+    write_cache(update_dir / "latest_version.json", "99.0.0")
+
+    with (
+        patch("src.cli.utils.version.get_latest_version") as mock_latest,
+        patch("src.cli.utils.version.get_current_version", return_value="1.0.0"),
+    ):
+        result = CliRunner().invoke(cli, ["list"])
+
+    assert result.exit_code == 0, result.output
+    mock_latest.assert_not_called()
+    command_output, _, notice = result.output.partition("Update available")
+    assert "adk_base" in command_output
+    assert "1.0.0 → 99.0.0" in notice
+
+
+@pytest.fixture
+def cached_update(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[None]:
+    """Have a newer version in the update check cache"""
+    monkeypatch.setenv("ASP_CACHE_DIR", str(tmp_path / "cache"))
+    update_dir = tmp_path / "cache" / "update-check"
+    update_dir.mkdir(parents=True)
+    write_cache(update_dir / "latest_version.json", "99.0.0")
+    with patch("src.cli.utils.version.get_current_version", return_value="1.0.0"):
+        yield
+
+
+def test_notice_stays_out_of_archive_on_stdout(
+    cached_update: None, tmp_path: pathlib.Path
+) -> None:
+    """Test that --output-archive - writes nothing but the archive to stdout"""
+    result = CliRunner().invoke(
+        cli,
+        [
+            "create",
+            "archived",
+            "-a",
+            "adk_base",
+            "-d",
+            "cloud_run",
+            "--output-archive",
+            "-",
+            "--output-dir",
+            str(tmp_path),
+            "--auto-approve",
+            "--skip-checks",
+        ],
+    )
+
+    assert result.exit_code == 0, result.stderr
+    assert "Update available" in result.stderr
+    # Like tar, gzip rejects trailing data after the archive
+    tar_data = gzip.decompress(result.stdout_bytes)
+    with tarfile.open(fileobj=io.BytesIO(tar_data)) as tf:
+        assert "archived/pyproject.toml" in tf.getnames()
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["create", "planned", "-a", "adk_base", "-d", "cloud_run"],
+        ["enhance", "adk_base", "-d", "cloud_run"],
+    ],
+)
+def test_notice_stays_out_of_plan_on_stdout(
+    cached_update: None, tmp_path: pathlib.Path, args: list[str]
+) -> None:
+    """Test that --plan stdout stays parseable JSON when an update is available"""
+    runner = CliRunner()
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        result = runner.invoke(
+            cli, [*args, "--plan", "--auto-approve", "--skip-checks"]
+        )
+
+    assert result.exit_code == 0, result.stderr
+    assert "Update available" in result.stderr
+    assert "summary" in json.loads(result.stdout)
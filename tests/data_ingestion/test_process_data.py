@@ -0,0 +1,117 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the local transforms of the process_data component."""
+
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime
+
+import pyarrow as pa
+import pytest
+
+from tests.utils.components import load_component_function
+
+ANSWER_TYPE = pa.struct([("body", pa.string())])
+
+
+@pytest.fixture(params=["vertex_ai_search", "vertex_ai_vector_search"])
+def chunk_questions(request: pytest.FixtureRequest) -> Callable[..., pa.Table]:
+    return load_component_function(
+        "process_data",
+        "chunk_questions",
+        {"pa": pa, "Iterable": Iterable},
+        datastore_type=request.param,
+    )
+
+
+def question_batch(rows: list[dict]) -> pa.RecordBatch:
+    """Build a batch with the schema of the fetch query."""
+    return pa.RecordBatch.from_pylist(
+        rows,
+        schema=pa.schema(
+            [
+                ("last_edit_date", pa.timestamp("us", tz="UTC")),
+                ("question_id", pa.int64()),
+                ("question_title", pa.string()),
+                ("question_text", pa.string()),
+                ("answers", pa.list_(ANSWER_TYPE)),
+            ]
+        ),
+    )
+
+
+def test_questions_are_chunked(chunk_questions: Callable[..., pa.Table]) -> None:
+    """Test markdown, chunks and ids, including questions with missing fields"""
+    edited = datetime(2024, 1, 1, tzinfo=UTC)
+    batch = question_batch(
+        [
+            {
+                "last_edit_date": edited,
+                "question_id": 1,
+                "question_title": "Sort a list",
+                "question_text": "<p>How do I <b>sort</b>?</p>",
+                "answers": [{"body": "<p>Use <code>sorted</code>.</p>"}],
+            },
+            {
+                "last_edit_date": edited,
+                "question_id": 2,
+                "question_title": None,
+                "question_text": None,
+                "answers": None,
+            },
+            {
+                "last_edit_date": edited,
+                "question_id": 3,
+                "question_title": "Long",
+                "question_text": "<p>" + "word " * 60 + "</p>",
+                "answers": [],
+            },
+        ]
+    )
+
+    chunks = chunk_questions([batch], 100, 0)
+
+    rows = {row["chunk_id"]: row for row in chunks.to_pylist()}
+    assert rows["1__0"]["full_text_md"] == (
+        "# Sort a list\nHow do I **sort**?\n\n\n## Answer 1:\nUse `sorted`."
+    )
+    assert rows["1__0"]["last_edit_date"] == edited
+    assert rows["2__0"]["text_chunk"] == "#"
+    assert [chunk_id for chunk_id in rows if chunk_id.startswith("3__")] == [
+        "3__0",
+        "3__1",
+        "3__2",
+        "3__3",
+    ]
+    assert {row["question_id"] for row in rows.values()} == {1, 2, 3}
+    assert all(len(row["text_chunk"]) <= 100 for row in rows.values())
+
+
+def test_empty_window_gives_empty_table(
+    chunk_questions: Callable[..., pa.Table],
+) -> None:
+    """Test that no questions give an empty table rather than an error"""
+    no_batches = chunk_questions([], 100, 0)
+    empty_batch = chunk_questions([question_batch([])], 100, 0)
+
+    assert no_batches.num_rows == empty_batch.num_rows == 0
+    assert no_batches.schema == empty_batch.schema
+    assert no_batches.column_names == [
+        "last_edit_date",
+        "question_id",
+        "question_text",
+        "full_text_md",
+        "text_chunk",
+        "chunk_id",
+    ]
@@ -0,0 +1,63 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Load functions nested in the data ingestion pipeline components.
+
+Pipeline components only ship their own source, so their helpers are nested
+inside them. These helpers are taken from the rendered component source and
+compiled on their own, so they can run without kfp or BigQuery.
+"""
+
+import ast
+import pathlib
+from collections.abc import Callable
+from typing import Any
+
+COMPONENTS_DIR = pathlib.Path("src/data_ingestion/data_ingestion_pipeline/components")
+
+
+def load_component_function(
+    component: str,
+    name: str,
+    namespace: dict[str, Any],
+    datastore_type: str = "vertex_ai_search",
+) -> Callable[..., Any]:
+    """Compile a function nested in a component.
+
+    Args:
+        component: Component function, also the name of its module
+        name: Name of the function nested in the component
+        namespace: Globals of the function, such as the modules its
+            annotations refer to
+        datastore_type: Datastore to render the component template for
+    """
+    from jinja2 import Template
+
+    path = COMPONENTS_DIR / f"{component}.py"
+    source = Template(path.read_text(encoding="utf-8")).render(
+        cookiecutter={"datastore_type": datastore_type}
+    )
+    component_def = next(
+        node
+        for node in ast.parse(source).body
+        if isinstance(node, ast.FunctionDef) and node.name == component
+    )
+    function_def = next(
+        node
+        for node in component_def.body
+        if isinstance(node, ast.FunctionDef) and node.name == name
+    )
+    module = ast.Module(body=[function_def], type_ignores=[])
+    exec(compile(module, str(path), "exec"), namespace)
+    return namespace[name]
@@ -0,0 +1,141 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for lock file generation."""
+
+import os
+import pathlib
+import sys
+import textwrap
+
+import pytest
+from click.testing import CliRunner
+
+from src.cli.utils.lock_store import LockStore
+from src.cli.utils.registry import LOCKS_DIR, get_lock_filename
+from src.utils import generate_locks
+from src.utils.lock_utils import get_agent_configs
+
+TEMPLATE = pathlib.Path("src/base_template/pyproject.toml").resolve()
+
+FAKE_UV = """\
+import hashlib, pathlib, sys
+
+pyproject = pathlib.Path("pyproject.toml").read_text()
+digest = hashlib.sha256(pyproject.encode()).hexdigest()
+# Appends of one short line don't interleave between concurrent runs
+with open(pathlib.Path(__file__).with_name("calls.log"), "a") as f:
+    f.write(" ".join(sys.argv[1:]) + "\\n")
+pathlib.Path("uv.lock").write_text(
+    "version = 1\\n\\n"
+    '[[package]]\\nname = "locked-template"\\nversion = "0.1.0"\\n\\n'
+    f'[[package]]\\nname = "dep"\\nversion = "{digest[:8]}"\\n'
+)
+"""
+
+
+@pytest.fixture
+def fake_uv(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    """Put a uv stub on PATH and return a reader of its recorded calls"""
+    script = tmp_path / "fake_uv.py"
+    script.write_text(FAKE_UV)
+    uv = tmp_path / "uv"
+    uv.write_text(
+        textwrap.dedent(f"""\
+            #!/bin/sh
+            exec "{sys.executable}" "{script}" "$@"
+            """)
+    )
+    uv.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    calls_log = tmp_path / "calls.log"
+
+    def calls() -> int:
+        count = len(calls_log.read_text().splitlines()) if calls_log.exists() else 0
+        calls_log.unlink(missing_ok=True)
+        return count
+
+    return calls
+
+
+@pytest.fixture
+def agent_configs(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> dict:
+    """Generate the locks of two fake agents into a temporary lock directory"""
+    configs = {
+        "agent_a": {"deployment_targets": ["agent_engine", "cloud_run"]},
+        "agent_b": {"deployment_targets": ["cloud_run"]},
+    }
+    locks_dir = tmp_path / "locks"
+    locks_dir.mkdir()
+    monkeypatch.setattr(generate_locks, "LOCKS_DIR", locks_dir)
+    monkeypatch.setattr(generate_locks, "get_agent_configs", lambda: configs)
+    return configs
+
+
+def generate(*args: str) -> str:
+    result = CliRunner().invoke(
+        generate_locks.main,
+        ["--template", str(TEMPLATE), *args],
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+def test_only_changed_locks_are_regenerated(fake_uv, agent_configs: dict) -> None:
+    """Test that locks are regenerated when forced or when their pyproject changed"""
+    generate()
+    assert fake_uv() == 3
+    locks_dir = generate_locks.LOCKS_DIR
+    before_names = LockStore(locks_dir).names()
+    assert before_names == [
+        "uv-agent_a-agent_engine.lock",
+        "uv-agent_a-cloud_run.lock",
+        "uv-agent_b-cloud_run.lock",
+    ]
+
+    output = generate()
+    assert fake_uv() == 0
+    assert output.count("pyproject.toml is unchanged") == 3
+    assert "Lock files are up to date" in output
+
+    generate("--force")
+    assert fake_uv() == 3
+
+    before = {name: LockStore(locks_dir).read_text(name) for name in before_names}
+    agent_configs["agent_b"]["extra_dependencies"] = ["requests"]
+    output = generate()
+    assert fake_uv() == 1
+    assert "Generated uv-agent_b-cloud_run.lock" in output
+    after = {name: LockStore(locks_dir).read_text(name) for name in before_names}
+    assert [name for name in before_names if after[name] != before[name]] == [
+        "uv-agent_b-cloud_run.lock"
+    ]
+    manifest = generate_locks.load_manifest(locks_dir)
+    assert sorted(manifest) == LockStore(locks_dir).names()
+
+
+def test_committed_manifest_matches_lock_store() -> None:
+    """Test that the committed manifest lists every stored lock at its pyproject"""
+    manifest = generate_locks.load_manifest(LOCKS_DIR)
+    expected = {
+        get_lock_filename(agent_name, target): generate_locks.pyproject_digest(
+            generate_locks.generate_pyproject(TEMPLATE, target, config)
+        )
+        for agent_name, config in get_agent_configs().items()
+        for target in config["deployment_targets"]
+    }
+
+    assert sorted(manifest) == LockStore(LOCKS_DIR).names()
+    assert manifest == expected
@@ -0,0 +1,145 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the watch mode rebuild scheduler and incremental renderer."""
+
+import pathlib
+import threading
+import time
+
+import pytest
+
+from src.cli.utils.overlay import TemplateLayer, resolve_overlay_manifest
+from src.cli.utils.template import RenderRecord
+from src.utils.watch_and_rebuild import IncrementalRenderer, RebuildScheduler
+
+
+class RecordingCallback:
+    """Records rebuild batches, optionally blocking the first rebuild."""
+
+    def __init__(self, block_first: bool = False):
+        self.batches: list[dict[str, str]] = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        if not block_first:
+            self.release.set()
+
+    def __call__(self, batch: dict[str, str]) -> None:
+        self.batches.append(batch)
+        self.started.set()
+        self.release.wait(timeout=10)
+
+
+def settle(scheduler: RebuildScheduler) -> None:
+    """Wait long enough for any further rebuild to have been started."""
+    time.sleep(scheduler.debounce * 5)
+    scheduler.stop()
+
+
+def test_burst_of_events_is_one_rebuild() -> None:
+    """Test that events within the debounce window are coalesced"""
+    callback = RecordingCallback()
+    scheduler = RebuildScheduler(callback, debounce=0.1)
+    scheduler.start()
+
+    scheduler.notify("a.txt", "modified")
+    scheduler.notify("b.txt", "modified")
+    scheduler.notify("a.txt", "deleted")
+    scheduler.notify("a.txt", "modified")
+    assert callback.started.wait(timeout=5)
+    settle(scheduler)
+
+    assert callback.batches == [{"a.txt": "deleted", "b.txt": "modified"}]
+
+
+def test_event_during_rebuild_schedules_one_follow_up() -> None:
+    """Test that changes arriving during a rebuild are rebuilt once afterwards"""
+    callback = RecordingCallback(block_first=True)
+    scheduler = RebuildScheduler(callback, debounce=0.02)
+    scheduler.start()
+
+    scheduler.notify("a.txt", "modified")
+    assert callback.started.wait(timeout=5)
+    scheduler.notify("b.txt", "modified")
+    scheduler.notify("c.txt", "created")
+    callback.release.set()
+    deadline = time.monotonic() + 5
+    while len(callback.batches) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    settle(scheduler)
+
+    assert callback.batches == [
+        {"a.txt": "modified"},
+        {"b.txt": "modified", "c.txt": "created"},
+    ]
+
+
+@pytest.fixture
+def renderer(tmp_path: pathlib.Path) -> IncrementalRenderer:
+    """Prime a renderer with a base layer and an overlay shadowing one file"""
+    base = tmp_path / "base"
+    overlay = tmp_path / "overlay"
+    for layer_dir in (base, overlay, base / "docs"):
+        layer_dir.mkdir(parents=True, exist_ok=True)
+    (base / "app.py").write_text("name = 'base'\n")
+    (base / "Makefile").write_text("install:\n")
+    (base / "docs" / "{{cookiecutter.project_name}}.md").write_text(
+        "# {{cookiecutter.project_name}}\n"
+    )
+    (overlay / "app.py").write_text("name = '{{cookiecutter.project_name}}'\n")
+    layers = [TemplateLayer("base", base), TemplateLayer("agent", overlay)]
+
+    destination = tmp_path / "out" / "demo"
+    (destination / "docs").mkdir(parents=True)
+    for stale in ("app.py", "Makefile", "docs/demo.md"):
+        (destination / stale).write_text("stale\n")
+
+    record = RenderRecord(
+        cookiecutter_config={"project_name": "demo"},
+        layers=layers,
+        manifest=resolve_overlay_manifest(layers),
+        destination=destination,
+    )
+    return IncrementalRenderer(record, region="us-central1")
+
+
+def test_affected_outputs_follow_overlay(
+    renderer: IncrementalRenderer, tmp_path: pathlib.Path
+) -> None:
+    """Test which outputs a changed template source maps to"""
+    base, overlay = tmp_path / "base", tmp_path / "overlay"
+
+    assert renderer.affected_outputs(overlay / "app.py") == ["app.py"]
+    assert renderer.affected_outputs(
+        base / "docs" / "{{cookiecutter.project_name}}.md"
+    ) == ["docs/{{cookiecutter.project_name}}.md"]
+    # Shadowed by the overlay, so nothing generated changes
+    assert renderer.affected_outputs(base / "app.py") == []
+    # Post-processed outputs and files outside the layers need a full rebuild
+    assert renderer.affected_outputs(base / "Makefile") is None
+    assert renderer.affected_outputs(tmp_path / "elsewhere.py") is None
+
+
+def test_render_rewrites_only_affected_outputs(
+    renderer: IncrementalRenderer,
+) -> None:
+    """Test that rendering writes the given outputs and leaves the rest alone"""
+    destination = renderer.record.destination
+
+    written = renderer.render(["app.py", "docs/{{cookiecutter.project_name}}.md"])
+
+    assert written == ["app.py", "docs/demo.md"]
+    assert (destination / "app.py").read_text() == "name = 'demo'\n"
+    assert (destination / "docs" / "demo.md").read_text() == "# demo\n"
+    assert (destination / "Makefile").read_text() == "stale\n"